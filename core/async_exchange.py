@@ -0,0 +1,286 @@
+"""
+core/async_exchange.py
+
+ccxt.async_support tabanlı ExchangeManager arka ucu (kütüphane; GUI kullanmaz).
+- Tüm async ccxt istemcileri tek bir event loop thread'inde yaşar; bağımsız
+  istekler (birden çok borsaya bağlanma, bakiye + ticker) sırayla değil
+  eşzamanlı gider
+- Dışarıya thread-safe ince bir cephe sunar: her metot hemen
+  concurrent.futures.Future döndürür; çağıran bloklamak isterse future.result()
+- Dönüş biçimleri senkron ExchangeManager ile aynıdır (balance_summary,
+  ticker_summary, futures_symbols)
+- İstekler senkron istemcilerle aynı borsa bütçesinden geçer
+  (core.rate_limiter.install_async) ve aynı gecikme izleme / uyarlanır
+  zaman aşımına bağlanır (core.latency_monitor.install_async)
+- Uygulamanın bağlantı ve emir akışı senkron ExchangeManager'da kalır:
+  istemciler ExchangeRegistry'den paylaşılır, emir öncesi bakiye
+  AccountState önbelleğinden, fiyat MarketDataHub'dan okunur. Bu arka uç
+  çok borsalı toplu işler (script, benchmark) içindir
+
+Kullanım:
+    manager = get_async_exchange_manager()
+    results = manager.connect_many([{"exchange_name": "binance", ...}, {"exchange_name": "bybit", ...}]).result()
+    balance, ticker = manager.get_order_context("BTC/USDT:USDT").result(timeout=10)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+from core.exchange_manager import balance_summary, exchange_config, futures_symbols, ticker_summary
+from core.exchange_registry import venue_name
+from core.latency_monitor import get_latency_monitor, install_async as install_latency_monitor
+from core.market_cache import load_markets_async
+from core.rate_limiter import Lane, get_rate_limiter, install_async as install_rate_limiter, request_lane
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import ccxt.async_support as ccxt_async
+    _HAS_ASYNC_CCXT = True
+except ImportError:          # aiohttp kurulu değil
+    ccxt_async = None
+    _HAS_ASYNC_CCXT = False
+
+
+class EventLoopThread:
+    """Arka planda çalışan tek asyncio event loop'u"""
+
+    def __init__(self, name: str = "exchange-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._started = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def start(self) -> None:
+        if not self._thread.is_alive():
+            self._thread.start()
+            self._started.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._started.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def submit(self, coro: Awaitable) -> Future:
+        """Coroutine'i loop'ta çalıştır (herhangi bir thread'den)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        if self._thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+
+
+class AsyncExchangeManager:
+    """
+    Async ccxt istemcilerini yöneten, Future döndüren ExchangeManager karşılığı.
+
+    exchange_classes: Borsa adı → ccxt.async_support sınıfı (testlerde sahte
+        HTTP sunucusuna yönlendirilmiş sınıflar verilebilir)
+
+    NOT:
+    - self.exchanges sadece loop thread'inde değiştirilir
+    - Bağlantı test çağrısı ve hata davranışı ExchangeManager ile aynıdır:
+      bakiye/ticker hatada {} döner, create_order hatayı yükseltir
+    """
+
+    def __init__(self, exchange_classes: Optional[Dict[str, Any]] = None):
+        if exchange_classes is None:
+            if not _HAS_ASYNC_CCXT:
+                raise RuntimeError("ccxt.async_support is not available (install aiohttp)")
+            exchange_classes = {
+                'binance': ccxt_async.binance,
+                'bybit': ccxt_async.bybit,
+                'kucoin': ccxt_async.kucoin,
+                'mexc': ccxt_async.mexc,
+                'okx': ccxt_async.okx,
+            }
+        self.exchange_classes = exchange_classes
+        self.exchanges: Dict[str, Any] = {}
+        self.active_exchange: Optional[str] = None
+        self._loop = EventLoopThread()
+        self._loop.start()
+        logger.info("AsyncExchangeManager initialized")
+
+    def submit(self, coro: Awaitable) -> Future:
+        return self._loop.submit(coro)
+
+    def get_exchange(self, exchange_name: Optional[str] = None):
+        name = (exchange_name or self.active_exchange or '').lower()
+        return self.exchanges.get(name)
+
+    # ------------------------------------------------------------------
+    # Coroutine'ler (loop thread'inde)
+    # ------------------------------------------------------------------
+
+    async def _connect(self, exchange_name: str, api_key: str, secret_key: str,
+                       testnet: bool = True, passphrase: Optional[str] = None) -> bool:
+        exchange_name = exchange_name.lower()
+        exchange_class = self.exchange_classes.get(exchange_name)
+        if exchange_class is None:
+            logger.error(f"Unsupported exchange: {exchange_name}")
+            return False
+
+        exchange = exchange_class(exchange_config(exchange_name, api_key, secret_key, passphrase))
+        if testnet:
+            try:
+                exchange.set_sandbox_mode(True)
+            except Exception as e:
+                logger.warning(f"Could not enable sandbox mode: {e}")
+        # Senkron istemcilerle aynı borsa bütçesi ve uyarlanır zaman aşımı
+        venue = venue_name(exchange_name, testnet)
+        install_rate_limiter(exchange, get_rate_limiter(venue, exchange.rateLimit))
+        install_latency_monitor(exchange, get_latency_monitor(), venue)
+
+        try:
+            # Test connection (marketler paylaşılan önbellekten)
+            await load_markets_async(exchange)
+            await exchange.fetch_balance()
+        except Exception as e:
+            logger.error(f"Failed to connect to {exchange_name}: {e}")
+            await exchange.close()
+            return False
+
+        old = self.exchanges.pop(exchange_name, None)
+        if old is not None:
+            await old.close()
+        self.exchanges[exchange_name] = exchange
+        self.active_exchange = exchange_name
+        logger.info(f"✅ Connected to {exchange_name} (async)")
+        return True
+
+    async def _balance(self, exchange_name: Optional[str] = None) -> Dict[str, Any]:
+        exchange = self.get_exchange(exchange_name)
+        if exchange is None:
+            logger.error("No exchange available")
+            return {}
+        try:
+            return balance_summary(await exchange.fetch_balance())
+        except Exception as e:
+            logger.error(f"Error fetching balance: {e}")
+            return {}
+
+    async def _ticker(self, symbol: str, exchange_name: Optional[str] = None) -> Dict[str, Any]:
+        exchange = self.get_exchange(exchange_name)
+        if exchange is None:
+            logger.error("No exchange available")
+            return {}
+        try:
+            await load_markets_async(exchange)
+            return ticker_summary(await exchange.fetch_ticker(symbol))
+        except Exception as e:
+            logger.error(f"Error fetching ticker for {symbol}: {e}")
+            return {}
+
+    async def _markets(self, exchange_name: Optional[str] = None) -> List[str]:
+        exchange = self.get_exchange(exchange_name)
+        if exchange is None:
+            logger.error("No exchange available")
+            return []
+        try:
+            return futures_symbols(await load_markets_async(exchange))
+        except Exception as e:
+            logger.error(f"Error fetching markets: {e}")
+            return []
+
+    async def _create_order(self, symbol: str, side: str, order_type: str, amount: float,
+                            price: Optional[float] = None, params: Optional[Dict[str, Any]] = None,
+                            exchange_name: Optional[str] = None) -> Dict[str, Any]:
+        exchange = self.get_exchange(exchange_name)
+        if exchange is None:
+            raise RuntimeError("No exchange available for create_order")
+        await load_markets_async(exchange)
+        order_type = order_type.lower()
+        order = await exchange.create_order(
+            symbol, order_type, side.lower(), amount,
+            None if order_type == "market" else price, params or {},
+        )
+        logger.info("Order created on %s: %s %s %s @ %s", exchange.id, side, amount, symbol, price)
+        return order
+
+    async def _gather_connect(self, connections: List[Dict[str, Any]]) -> Dict[str, bool]:
+        results = await asyncio.gather(*(self._connect(**c) for c in connections), return_exceptions=True)
+        return {c['exchange_name'].lower(): r is True for c, r in zip(connections, results)}
+
+    async def _order_context(self, symbol: str, exchange_name: Optional[str] = None) -> Tuple[Dict, Dict]:
+        # Emir akışı okumaları emir şeridinden (gather'ın task'ları şeridi devralır)
+        with request_lane(Lane.ORDER):
+            balance, ticker = await asyncio.gather(self._balance(exchange_name), self._ticker(symbol, exchange_name))
+        return balance, ticker
+
+    async def _close_all(self) -> None:
+        exchanges = list(self.exchanges.values())
+        self.exchanges.clear()
+        self.active_exchange = None
+        await asyncio.gather(*(e.close() for e in exchanges), return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Thread-safe cephe (Future döndürür)
+    # ------------------------------------------------------------------
+
+    def connect_exchange(self, exchange_name: str, api_key: str, secret_key: str,
+                         testnet: bool = True, passphrase: Optional[str] = None) -> Future:
+        """Future[bool]"""
+        return self.submit(self._connect(exchange_name, api_key, secret_key, testnet, passphrase))
+
+    def connect_many(self, connections: List[Dict[str, Any]]) -> Future:
+        """
+        Birden çok borsaya eşzamanlı bağlan.
+        connections: connect_exchange argümanları sözlük olarak
+        Returns: Future[{exchange_name: bool}]
+        """
+        return self.submit(self._gather_connect(connections))
+
+    def get_balance(self, exchange_name: Optional[str] = None) -> Future:
+        """Future[{'total', 'free', 'used', 'currency'}]"""
+        return self.submit(self._balance(exchange_name))
+
+    def get_ticker(self, symbol: str, exchange_name: Optional[str] = None) -> Future:
+        return self.submit(self._ticker(symbol, exchange_name))
+
+    def get_markets(self, exchange_name: Optional[str] = None) -> Future:
+        return self.submit(self._markets(exchange_name))
+
+    def create_order(self, symbol: str, side: str, order_type: str, amount: float,
+                     price: Optional[float] = None, params: Optional[Dict[str, Any]] = None,
+                     exchange_name: Optional[str] = None) -> Future:
+        """Future[ccxt order]; hata future'da yükselir"""
+        return self.submit(self._create_order(symbol, side, order_type, amount, price, params, exchange_name))
+
+    def get_order_context(self, symbol: str, exchange_name: Optional[str] = None) -> Future:
+        """Emir öncesi bakiye + ticker tek turda: Future[(balance, ticker)]"""
+        return self.submit(self._order_context(symbol, exchange_name))
+
+    def close(self, timeout: float = 5.0) -> None:
+        """İstemci oturumlarını kapat ve loop thread'ini durdur"""
+        if not self._loop.running:
+            return
+        try:
+            self.submit(self._close_all()).result(timeout)
+        except Exception as e:
+            logger.error(f"Error closing async exchanges: {e}")
+        self._loop.stop(timeout)
+        logger.info("AsyncExchangeManager closed")
+
+
+# Singleton instance
+_async_manager_instance: Optional[AsyncExchangeManager] = None
+
+
+def get_async_exchange_manager() -> AsyncExchangeManager:
+    """Get singleton AsyncExchangeManager instance"""
+    global _async_manager_instance
+    if _async_manager_instance is None:
+        _async_manager_instance = AsyncExchangeManager()
+    return _async_manager_instance
@@ -0,0 +1,72 @@
+"""
+core/command_context.py
+
+Sesli komutlar arası oturum bağlamı.
+- Onaylanan son alış/satış emri saklanır; timeout dolunca unutulur
+- CommandParser eksik alanları (yön, sembol, miktar, kaldıraç) buradan doldurur:
+  "aynısından 50 dolar daha", "şimdi ETH 5x", "aynısını sat"
+- Limit fiyat ve SL/TP taşınmaz (her emre özgüdür)
+- Aksiyonsuz takip cümlesi sembol dışında yeni bir alan içermeli; coin miktarı başka sembole taşınmaz
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+from typing import Callable, Optional
+
+from core.command_parser import ParsedCommand
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CommandContext:
+    """
+    Son emri timeout süresince hatırlayan bağlam.
+
+    Kullanım:
+        context = CommandContext(timeout=60)
+        cmd = parser.parse("şimdi eth 20 dolar", context=context)
+        ...onaydan sonra...
+        context.remember(cmd)
+    """
+
+    # Önceki emirden taşınabilen alanlar
+    CARRIED_FIELDS = ("symbol", "amount", "leverage")
+
+    def __init__(self, timeout: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        """
+        timeout: Son emirden sonra bağlamın geçerli kaldığı süre (sn)
+        clock: Zaman kaynağı (testlerde değiştirilebilir)
+        """
+        self.timeout = timeout
+        self._clock = clock
+        self._last: Optional[ParsedCommand] = None
+        self._updated_at = 0.0
+
+    def remember(self, cmd: Optional[ParsedCommand]) -> None:
+        """Onaylanan alış/satış emrini sakla (diğer komutlar bağlamı değiştirmez)."""
+        if cmd is None or cmd.action not in ("buy", "sell"):
+            return
+        self._last = copy.deepcopy(cmd)
+        self._updated_at = self._clock()
+        logger.debug(f"Command context updated: {cmd.action} {cmd.symbol} {cmd.amount}")
+
+    def last_order(self) -> Optional[ParsedCommand]:
+        """Süresi dolmamış son emir (yoksa None)."""
+        if self._last is None:
+            return None
+        if self._clock() - self._updated_at > self.timeout:
+            logger.debug("Command context expired")
+            self.clear()
+            return None
+        return self._last
+
+    @property
+    def is_active(self) -> bool:
+        return self.last_order() is not None
+
+    def clear(self) -> None:
+        self._last = None
+        self._updated_at = 0.0
@@ -0,0 +1,91 @@
+"""
+core/command_deduplicator.py
+
+Tekrarlanan sesli komutların bastırılması.
+- Çakışan kayıt pencereleri veya kullanıcının kendini tekrarlaması aynı
+  transcript'i saniyeler içinde iki kez getirebilir
+- Anahtar: normalize edilmiş ParsedCommand alanları (ham metin değil);
+  "al BTC 100 dolar" ve "BTC al 100 dolar." aynı komuttur
+- Pencere içindeki tekrar, doğrulama/onay/borsa/DB işinden önce düşürülür
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from core.command_parser import ParsedCommand
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def command_key(cmd: ParsedCommand) -> Tuple:
+    """Komutu karşılaştırılabilir anahtara çevir (metin ve güven skorları hariç)"""
+    def _num(value):
+        return None if value is None else round(float(value), 8)
+
+    return (
+        cmd.action,
+        cmd.symbol,
+        _num(cmd.amount),
+        cmd.amount_type,
+        _num(cmd.balance_percent),
+        cmd.leverage,
+        cmd.order_type.value if cmd.order_type else None,
+        _num(cmd.price),
+        _num(cmd.stop_loss),
+        _num(cmd.take_profit),
+    )
+
+
+class CommandDeduplicator:
+    """
+    Zaman pencereli tekrar filtresi.
+
+    Kullanım:
+        dedup = CommandDeduplicator(window=3.0)
+        if dedup.is_duplicate(parsed):
+            return          # bastırıldı
+    """
+
+    def __init__(self, window: float = 3.0, clock: Callable[[], float] = time.monotonic):
+        """
+        window: Aynı komutun tekrar sayıldığı süre (sn); 0 = kapalı
+        clock: Zaman kaynağı (testlerde değiştirilebilir)
+        """
+        self.window = window
+        self._clock = clock
+        self._seen: Dict[Tuple, float] = {}
+        self.suppressed = 0
+
+    def is_duplicate(self, cmd: Optional[ParsedCommand]) -> bool:
+        """
+        Komut pencere içinde daha önce görüldüyse True.
+        Görülmediyse kaydeder ve False döner.
+        """
+        if cmd is None or self.window <= 0:
+            return False
+
+        now = self._clock()
+        self._prune(now)
+
+        key = command_key(cmd)
+        if key in self._seen:
+            self.suppressed += 1
+            logger.info(
+                f"Duplicate voice command suppressed ({now - self._seen[key]:.1f}s after previous): "
+                f"{cmd.raw_text!r}"
+            )
+            return True
+
+        self._seen[key] = now
+        return False
+
+    def _prune(self, now: float) -> None:
+        expired = [key for key, seen_at in self._seen.items() if now - seen_at > self.window]
+        for key in expired:
+            del self._seen[key]
+
+    def clear(self) -> None:
+        self._seen.clear()
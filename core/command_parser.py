@@ -5,10 +5,16 @@ Command Parser - Doğal Dil → Trading Komutları
 """
 
 import re
-from typing import Optional, Tuple, Dict, Any, List
-from dataclasses import dataclass
+from typing import Optional, Tuple, Dict, Any, List, Set
+from dataclasses import dataclass, field
 from enum import Enum
 
+from core.phrase_matcher import TokenTrie, CharTrie, PhraseMatch, tokenize
+from core.symbol_index import SymbolIndex
+from core.spoken_numbers import (
+    NUMBER_VOCABULARY, NumberSpan, find_numbers, number_vocabulary, parse_number, replace_numbers,
+)
+
 
 class OrderSide(Enum):
     BUY = "buy"
@@ -26,13 +32,43 @@ class ParsedCommand:
     action: str                    # "buy", "sell", "close", "cancel", "status", "balance"
     side: Optional[OrderSide] = None
     symbol: Optional[str] = None   # "BTCUSDT", "ETHUSDT", vb.
-    amount: Optional[float] = None # USD cinsinden miktar
+    amount: Optional[float] = None # amount_type'a göre USD tutarı veya coin miktarı
     leverage: Optional[int] = None
     order_type: OrderType = OrderType.MARKET
     price: Optional[float] = None  # Limit order için
     raw_text: str = ""             # Orijinal metin
     confidence: float = 1.0        # Ayrıştırma güvenilirliği (0-1)
-    
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    amount_type: str = "usd"       # "usd": USD tutarı, "qty": coin miktarı ("0.5 btc")
+    balance_percent: Optional[float] = None  # "bakiyenin yüzde onu" → 10.0
+    field_confidence: Dict[str, float] = field(default_factory=dict)  # Alan → güven (0-1)
+    inferred_fields: List[str] = field(default_factory=list)  # Önceki emirden doldurulan alanlar
+    asr_confidence: float = 1.0    # Whisper transcript güveni; ayrıştırma güvenine katılmaz
+
+
+@dataclass
+class _ScanResult:
+    """Tek geçişlik taramanın sonucu"""
+    actions: List[str] = field(default_factory=list)   # Metindeki sıraya göre
+    action_scores: Dict[str, float] = field(default_factory=dict)  # 1.0 = tam eşleşme, <1 = bulanık
+    symbols: List[str] = field(default_factory=list)
+    symbol_matches: List[PhraseMatch] = field(default_factory=list)
+    numbers: List[PhraseMatch] = field(default_factory=list)
+    fields: List[Tuple[PhraseMatch, float]] = field(default_factory=list)  # Emir alanı kelimeleri + skor
+    tokens: List[Tuple[str, int, int]] = field(default_factory=list)
+    free_tokens: List[str] = field(default_factory=list)  # Hiçbir phrase'e ait olmayan token'lar
+    language: Optional[str] = None                        # Kullanılan grammar'ın dili
+
+
+@dataclass
+class _Grammar:
+    """Tek bir dil için derlenmiş sözlük (None = tüm diller)"""
+    language: Optional[str]
+    matcher: TokenTrie
+    vocabulary: Set[str] = field(default_factory=set)               # Düzeltilmeyecek token'lar
+    fuzzy_vocabulary: CharTrie = field(default_factory=CharTrie)   # Aksiyon kelimesi token'ları
+
 
 class CommandParser:
     """
@@ -135,31 +171,250 @@ class CommandParser:
         'ne kadar', 'sermaye'
     ]
     
-    # Miktar kalıpları
-    AMOUNT_PATTERNS = [
-        r'(\d+(?:[.,]\d+)?)\s*(?:dolar|dollar|\$|usd|usdt)',
-        r'(\d+(?:[.,]\d+)?)\s*(?:tl|lira|türk lirası)',
-        r'(\d+(?:[.,]\d+)?)\s*(?:euro|€|eur)',
-        r'(\d+)\s*(?:k|bin)',  # "5k" veya "5 bin"
-        r'(\d+(?:[.,]\d+)?)',  # Sadece sayı
+    # Birden fazla aksiyon eşleşirse öncelik sırası
+    ACTION_PRIORITY = ("close", "cancel", "buy", "sell", "status", "balance")
+    
+    # Sembol kaynağına göre güven çarpanı: sabit alias kesin, borsa sözlüğündeki
+    # serbest kelime olası, fonetik eşleşme tahmin (onay gerektirir)
+    SYMBOL_SOURCE_SCORES = {"alias": 1.0, "exact": 0.85, "phonetic": 0.6}
+    
+    # Sayının hemen ardından gelen para birimi (miktar adayını güçlendirir)
+    CURRENCY_PATTERN = re.compile(
+        r'\s*(?:(?:dolar|dollars?|usdt|usd|tl|lira\w*|türk lira\w*|euro|eur)(?!\w)|\$|€)'
+    )
+    
+    # Sayı sözcükleri (TR + EN); değerler core.spoken_numbers tarafından hesaplanır
+    NUMBER_WORDS = NUMBER_VOCABULARY
+    
+    # Emir alanı kelimeleri: önündeki/arkasındaki sayıyı ilgili alana bağlar
+    # ("limit 65000", "stop 63000", "10 kaldıraç", "bakiyenin yüzde onu")
+    LEVERAGE_KEYWORDS = [
+        'kaldıraç', 'kaldıraçla', 'kaldıraçlı', 'kaldıraç ile', 'kat kaldıraç', 'leverage'
+    ]
+    
+    LIMIT_KEYWORDS = [
+        'limit', 'limit fiyat', 'limit fiyatı', 'limit fiyatla', 'limit price',
+        'fiyat', 'fiyattan', 'fiyatından', 'price'
+    ]
+    
+    STOP_LOSS_KEYWORDS = [
+        'stop', 'stop loss', 'stoploss', 'stop lost', 'sl', 'zarar durdur', 'zarar kes'
+    ]
+    
+    TAKE_PROFIT_KEYWORDS = [
+        'take profit', 'takeprofit', 'tp', 'kar al', 'kâr al', 'kar hedefi',
+        'kâr hedefi', 'hedef', 'target'
+    ]
+    
+    PERCENT_KEYWORDS = ['yüzde', 'percent', 'yüzdesi', 'yüzdesini']
+    
+    BALANCE_REF_KEYWORDS = [
+        'bakiyenin', 'bakiyemin', 'sermayenin', 'sermayemin', 'hesabın', 'hesabımın',
+        'of balance', 'of my balance', 'of the balance', 'of my account'
     ]
     
-    # Türkçe sayı kelimeleri
-    NUMBER_WORDS = {
-        'bir': 1, 'iki': 2, 'üç': 3, 'dört': 4, 'beş': 5,
-        'altı': 6, 'yedi': 7, 'sekiz': 8, 'dokuz': 9, 'on': 10,
-        'yirmi': 20, 'otuz': 30, 'kırk': 40, 'elli': 50,
-        'altmış': 60, 'yetmiş': 70, 'seksen': 80, 'doksan': 90,
-        'yüz': 100, 'bin': 1000,
+    QUANTITY_KEYWORDS = ['adet', 'tane', 'units']
+    
+    MARKET_KEYWORDS = ['market', 'piyasa', 'piyasadan']
+    
+    # Önceki emre atıf ("aynısından 50 dolar daha", "şimdi eth 20 dolar", "same again 5x")
+    FOLLOW_UP_KEYWORDS = [
+        'aynı', 'aynısı', 'aynısını', 'aynısından', 'aynı şekilde', 'aynı kaldıraçla',
+        'daha', 'bir daha', 'tekrar', 'şimdi', 'şimdi de',
+        'same', 'same again', 'again', 'more', 'now', 'another'
+    ]
+    
+    # Dile göre derlenen grammar'lar. Whisper'ın algıladığı dil verilirse sadece o dilin
+    # kelimeleri + ortak kelimeler taranır (İngilizce "on" / "sat" Türkçe komut sayılmaz)
+    GRAMMAR_LANGUAGES = ("tr", "en")
+    
+    # Sadece İngilizce grammar'da olan kelimeler
+    ENGLISH_KEYWORDS = frozenset({
+        'buy', 'sell', 'close', 'cancel', 'status', 'balance', 'leverage',
+        'limit price', 'price', 'target', 'percent', 'units',
+        'of balance', 'of my balance', 'of the balance', 'of my account',
+        'same', 'same again', 'again', 'more', 'now', 'another',
+    })
+    
+    # Her iki dilde kullanılan trading terimleri (coin isimleri de ortaktır)
+    SHARED_KEYWORDS = frozenset({
+        'long', 'short', 'limit', 'market', 'stop', 'stop loss', 'stoploss', 'stop lost',
+        'sl', 'tp', 'take profit', 'takeprofit',
+    })
+    
+    # Bağlamdan doldurulan alanların özet etiketi
+    INFERRED_FIELD_LABELS = {
+        "action": "yön", "symbol": "sembol", "amount": "miktar", "leverage": "kaldıraç",
     }
     
-    def __init__(self, default_symbol: str = "BTCUSDT"):
+    # Sayıyla birlikte değer taşıyan alanlar
+    NUMERIC_FIELDS = ("leverage", "price", "stop_loss", "take_profit", "percent")
+    
+    # Sayıya yapışık işaretler
+    LEVERAGE_SUFFIX = re.compile(r'\s*(?:x|kat)(?!\w)')        # "10x", "yirmi kat"
+    PRICE_SUFFIX = re.compile(r"'?(?:den|dan|ten|tan)(?!\w)")  # "65000'den al"
+    AT_PRICE_PATTERN = re.compile(r'(?:\bat|@)\s*$')           # "... at 65000"
+    
+    # Alan kelimesi ile sayı arasında izin verilen boşluk/bağlaçlar ("stop at 63000", "63000'de stop")
+    FIELD_GAP_PATTERN = re.compile(
+        r"[\s:=@'\-]*(?:(?:at|to|from|on|de|da|den|dan|seviyesi|seviyesinde)(?!\w)[\s:=@'\-]*)?"
+    )
+    
+    # "yüzde onu", "yüzde yirmisi": sayı sözcüğünün iyelik/belirtme eki
+    _PERCENT_SUFFIX_MAX = 4
+    
+    def __init__(self, default_symbol: str = "BTCUSDT", symbol_index: Optional[SymbolIndex] = None,
+                 fuzzy: bool = True, intent_classifier=None):
+        """
+        symbol_index: Borsa marketlerinden oluşturulan sembol sözlüğü. Verilirse
+            sabit alias'larda bulunmayan coin'ler (ve ASR yazım hataları) buradan çözülür.
+        fuzzy: Aksiyon kelimelerinde ASR hatalarını düzelt ("kapad" → "kapat")
+        intent_classifier: core.intent_classifier.IntentClassifier. Birden fazla aksiyon
+            eşleşirse sabit öncelik sırası yerine sınıflandırıcının sıralaması kullanılır.
+        """
         self.default_symbol = default_symbol
+        self.symbol_index = symbol_index
+        self.fuzzy = fuzzy
+        self.intent_classifier = intent_classifier
+        if symbol_index is not None:
+            symbol_index.add_spoken_names(self.CRYPTO_ALIASES)
+        # Dil bilinmiyorsa (None) tüm kelimeleri içeren karma grammar kullanılır
+        self._grammars: Dict[Optional[str], _Grammar] = {
+            language: self._build_grammar(language) for language in (None,) + self.GRAMMAR_LANGUAGES
+        }
+    
+    @classmethod
+    def keyword_language(cls, keyword: str) -> Optional[str]:
+        """Kelimenin dili: "en", "tr" veya ortaksa None"""
+        if keyword in cls.ENGLISH_KEYWORDS:
+            return "en"
+        if keyword in cls.SHARED_KEYWORDS:
+            return None
+        return "tr"
     
-    def parse(self, text: str) -> Optional[ParsedCommand]:
+    def _grammar(self, language: Optional[str]) -> _Grammar:
+        """Dil koduna göre grammar ("tr-TR" → "tr"; desteklenmeyen dil → karma)"""
+        if language:
+            language = language.lower().split("-")[0].split("_")[0]
+        return self._grammars.get(language) or self._grammars[None]
+    
+    def _build_grammar(self, language: Optional[str] = None) -> _Grammar:
+        """Anahtar kelime, alias ve sayı kelimelerini tek bir trie'ye derle"""
+        grammar = _Grammar(language=language, matcher=TokenTrie())
+        matcher = grammar.matcher
+        
+        def in_language(keyword: str) -> bool:
+            return language is None or self.keyword_language(keyword) in (None, language)
+        
+        keyword_lists = {
+            "close": self.CLOSE_KEYWORDS,
+            "cancel": self.CANCEL_KEYWORDS,
+            "buy": self.BUY_KEYWORDS,
+            "sell": self.SELL_KEYWORDS,
+            "status": self.STATUS_KEYWORDS,
+            "balance": self.BALANCE_KEYWORDS,
+        }
+        # Anahtar kelimeler de girdiyle aynı normalizasyondan geçer (ı → i vb.)
+        for action, keywords in keyword_lists.items():
+            for keyword in filter(in_language, keywords):
+                keyword = self._normalize_text(keyword)
+                matcher.add(keyword, "action", action)
+                # Bulanık düzeltme sadece aksiyon kelimelerine yapılır
+                for token in TokenTrie.split(keyword):
+                    grammar.fuzzy_vocabulary.add(token)
+        
+        # Emir alanı kelimeleri ("kar al" gibi aksiyon kelimesi içerenler en uzun eşleşmeyle maskelenir)
+        field_lists = {
+            "leverage": self.LEVERAGE_KEYWORDS,
+            "price": self.LIMIT_KEYWORDS,
+            "stop_loss": self.STOP_LOSS_KEYWORDS,
+            "take_profit": self.TAKE_PROFIT_KEYWORDS,
+            "percent": self.PERCENT_KEYWORDS,
+            "balance_ref": self.BALANCE_REF_KEYWORDS,
+            "quantity": self.QUANTITY_KEYWORDS,
+            "market": self.MARKET_KEYWORDS,
+            "follow_up": self.FOLLOW_UP_KEYWORDS,
+        }
+        for name, keywords in field_lists.items():
+            for keyword in filter(in_language, keywords):
+                matcher.add(self._normalize_text(keyword), "field", name)
+
+        for alias, symbol in self.CRYPTO_ALIASES.items():
+            matcher.add(self._normalize_text(alias), "symbol", symbol)
+        
+        number_words = self.NUMBER_WORDS if language is None else number_vocabulary(language)
+        for word in number_words:
+            matcher.add(self._normalize_text(word), "number", word)
+        
+        # Tam eşleşen hiçbir token düzeltilmez
+        phrase_lists = [list(filter(in_language, keywords))
+                        for keywords in list(keyword_lists.values()) + list(field_lists.values())]
+        for phrase in phrase_lists + [self.CRYPTO_ALIASES, number_words]:
+            for entry in phrase:
+                grammar.vocabulary.update(TokenTrie.split(self._normalize_text(entry)))
+        
+        return grammar
+    
+    def _correct_tokens(self, tokens: List[Tuple[str, int, int]],
+                        grammar: _Grammar) -> Tuple[List[Tuple[str, int, int]], Dict[int, float]]:
+        """
+        Bilinmeyen token'ları en yakın aksiyon kelimesine düzelt.
+        Returns: (düzeltilmiş token listesi, {token indeksi: skor})
+        """
+        scores: Dict[int, float] = {}
+        corrected = None
+        for i, (token, start, end) in enumerate(tokens):
+            if token in grammar.vocabulary or not token.isalpha():
+                continue
+            match = grammar.fuzzy_vocabulary.correct(token)
+            if match is None:
+                continue
+            if corrected is None:
+                corrected = list(tokens)
+            corrected[i] = (match[0], start, end)
+            scores[i] = match[1]
+        return (corrected or tokens), scores
+    
+    def _scan(self, text: str, grammar: Optional[_Grammar] = None) -> _ScanResult:
+        """Normalize edilmiş metni tek geçişte tara (grammar verilmezse karma grammar)"""
+        grammar = grammar or self._grammars[None]
+        tokens = tokenize(text)
+        scores: Dict[int, float] = {}
+        if self.fuzzy:
+            tokens, scores = self._correct_tokens(tokens, grammar)
+        result = _ScanResult(tokens=tokens, language=grammar.language)
+        pos = 0
+        for match in grammar.matcher.iter_matches(text, tokens):
+            if match.token_start >= pos:
+                result.free_tokens.extend(t[0] for t in tokens[pos:match.token_start])
+                pos = match.token_end
+            score = min((scores.get(i, 1.0) for i in range(match.token_start, match.token_end)), default=1.0)
+            if match.kind == "action":
+                result.actions.append(match.value)
+                result.action_scores[match.value] = max(score, result.action_scores.get(match.value, 0.0))
+            elif match.kind == "symbol":
+                result.symbols.append(match.value)
+                result.symbol_matches.append(match)
+            elif match.kind == "number":
+                result.numbers.append(match)
+            elif match.kind == "field":
+                result.fields.append((match, score))
+        result.free_tokens.extend(t[0] for t in tokens[pos:])
+        return result
+    
+    def parse(self, text: str, asr_confidence: float = 1.0, context=None,
+              language: Optional[str] = None) -> Optional[ParsedCommand]:
         """
         Metni ayrıştır ve ParsedCommand döndür.
         Tanınamayan komutlar için None döner.
+
+        asr_confidence: Whisper'ın transcript güveni (0-1). cmd.asr_confidence'a yazılır ama
+            cmd.confidence'a katılmaz: Whisper kendi eşiğiyle (min_confidence) zaten eler,
+            burada tekrar çarpmak geçerli komutları doğrulayıcının 0.5 sınırının altına iter.
+        context: core.command_context.CommandContext. Verilirse eksik yön/sembol/miktar/kaldıraç
+            önceki emirden doldurulur ve cmd.inferred_fields'a yazılır.
+        language: Whisper'ın algıladığı dil ("tr", "en"). Verilirse sadece o dilin grammar'ı
+            kullanılır; None veya desteklenmeyen dilde tüm diller taranır.
         """
         if not text:
             return None
@@ -168,37 +423,103 @@ class CommandParser:
         text = self._normalize_text(text)
         original_text = text
         
-        # Aksiyonu belirle
-        action = self._detect_action(text)
+        # Aksiyon, sembol ve sayı kelimeleri tek geçişte bulunur
+        scan = self._scan(text, self._grammar(language))
+        
+        previous = context.last_order() if context is not None else None
+        
+        # Aksiyonu belirle; yoksa takip cümlesi önceki emrin yönünü alır ("şimdi eth 20 dolar")
+        action = self._detect_action(text, scan)
+        inferred = []
+        if not action and previous is not None and self._is_follow_up(scan):
+            action = previous.action
+            inferred.append("action")
         if not action:
             return None
         
-        # Temel komut oluştur
+        # Temel komut oluştur (bulanık eşleşme skoru güveni düşürür)
         cmd = ParsedCommand(
             action=action,
             raw_text=original_text,
+            confidence=scan.action_scores.get(action, 1.0),
+            inferred_fields=inferred,
+            asr_confidence=max(0.0, min(1.0, asr_confidence)),
         )
+        if inferred:
+            cmd.confidence *= 0.9
         
         # Aksiyon tipine göre ek bilgileri çıkar
         if action in ("buy", "sell"):
             cmd.side = OrderSide.BUY if action == "buy" else OrderSide.SELL
-            cmd.symbol = self._extract_symbol(text)
-            cmd.amount = self._extract_amount(text)
+            cmd.symbol, source = self._match_symbol(scan)
+            cmd.field_confidence["action"] = cmd.confidence
+            if cmd.symbol:
+                cmd.confidence *= self.SYMBOL_SOURCE_SCORES[source]
+                cmd.field_confidence["symbol"] = cmd.confidence
+            
+            # Miktar, kaldıraç, limit fiyat, SL/TP ve bakiye yüzdesi tek geçişte
+            self._extract_order_fields(text, scan, cmd, base_confidence=cmd.confidence)
+            
+            # Aksiyonsuz takip cümlesi sembol dışında yeni bir emir alanı söylemeli;
+            # tek başına "eth", "daha", "more" önceki emrin kopyası olarak çalıştırılmaz
+            if "action" in inferred and not self._has_order_fields(cmd):
+                return None
+            
+            if previous is not None:
+                self._fill_from_previous(cmd, previous)
             
             # Sembol bulunamadıysa varsayılanı kullan
             if not cmd.symbol:
                 cmd.symbol = self.default_symbol
                 cmd.confidence *= 0.8
+                cmd.field_confidence["symbol"] = cmd.confidence
             
-            # Miktar bulunamadıysa güvenilirliği düşür
-            if not cmd.amount:
+            # Miktar bulunamadıysa güvenilirliği düşür ("bakiyenin yüzde onu" miktar yerine geçer)
+            if not cmd.amount and not cmd.balance_percent:
+                cmd.confidence *= 0.5
+            
+            # "limit" dendi ama fiyat yok
+            if cmd.order_type == OrderType.LIMIT and cmd.price is None:
                 cmd.confidence *= 0.5
         
         elif action == "close":
-            cmd.symbol = self._extract_symbol(text)
+            cmd.symbol = self._extract_symbol(text, scan)
         
         return cmd
     
+    def _is_follow_up(self, scan: _ScanResult) -> bool:
+        """Aksiyonsuz cümle önceki emre atıf mı? ("aynısından 50 dolar daha", "şimdi eth 5x")"""
+        return bool(scan.symbols) or any(m.value == "follow_up" for m, _ in scan.fields)
+    
+    @staticmethod
+    def _has_order_fields(cmd: ParsedCommand) -> bool:
+        """Cümlede sembol dışında bir emir alanı (miktar, kaldıraç, fiyat, SL/TP) söylendi mi?"""
+        return any(value is not None for value in (
+            cmd.amount, cmd.balance_percent, cmd.leverage, cmd.price, cmd.stop_loss, cmd.take_profit
+        ))
+    
+    def _fill_from_previous(self, cmd: ParsedCommand, previous: ParsedCommand) -> None:
+        """
+        Söylenmeyen sembol/miktar/kaldıracı önceki emirden al.
+        Coin miktarı ("0.5 btc") başka sembole taşınmaz; USD tutarı ve bakiye yüzdesi taşınır.
+        """
+        if not cmd.symbol and previous.symbol:
+            cmd.symbol = previous.symbol
+            cmd.inferred_fields.append("symbol")
+            cmd.field_confidence["symbol"] = cmd.confidence
+        qty_on_other_symbol = (previous.amount_type == "qty" and not previous.balance_percent
+                               and cmd.symbol != previous.symbol)
+        if (not cmd.amount and not cmd.balance_percent and not qty_on_other_symbol
+                and (previous.amount or previous.balance_percent)):
+            cmd.amount, cmd.amount_type = previous.amount, previous.amount_type
+            cmd.balance_percent = previous.balance_percent
+            cmd.inferred_fields.append("amount")
+            cmd.field_confidence["amount"] = cmd.confidence
+        if cmd.leverage is None and previous.leverage is not None:
+            cmd.leverage = previous.leverage
+            cmd.inferred_fields.append("leverage")
+            cmd.field_confidence["leverage"] = cmd.confidence
+    
     def _normalize_text(self, text: str) -> str:
         """Metni normalize et"""
         text = text.lower().strip()
@@ -220,99 +541,239 @@ class CommandParser:
         
         return text
     
-    def _detect_action(self, text: str) -> Optional[str]:
+    def _detect_action(self, text: str, scan: Optional[_ScanResult] = None) -> Optional[str]:
         """Aksiyon türünü belirle"""
-        text_lower = text.lower()
+        if scan is None:
+            scan = self._scan(self._normalize_text(text))
+        
+        # Tam eşleşmeler bulanık eşleşmelerden önce gelir
+        candidates = [a for a in self.ACTION_PRIORITY if scan.action_scores.get(a) == 1.0]
+        if not candidates:
+            candidates = [a for a in self.ACTION_PRIORITY if a in scan.action_scores]
+        if not candidates:
+            return None
         
-        # Öncelik sırasına göre kontrol et
-        for keyword in self.CLOSE_KEYWORDS:
-            if keyword in text_lower:
-                return "close"
+        # Birden fazla aday: eğitilmiş sınıflandırıcı varsa ona sor, yoksa öncelik sırası
+        if len(candidates) > 1 and self.intent_classifier is not None and self.intent_classifier.is_trained:
+            ranked = self.intent_classifier.rank(text, candidates)
+            if ranked:
+                return ranked[0][0]
         
-        for keyword in self.CANCEL_KEYWORDS:
-            if keyword in text_lower:
-                return "cancel"
+        return candidates[0]
+    
+    def _extract_symbol(self, text: str, scan: Optional[_ScanResult] = None) -> Optional[str]:
+        """Kripto sembolünü çıkar (metindeki ilk alias, yoksa borsa sözlüğü)"""
+        if scan is None:
+            scan = self._scan(self._normalize_text(text))
+        return self._match_symbol(scan)[0]
+    
+    def _match_symbol(self, scan: _ScanResult) -> Tuple[Optional[str], Optional[str]]:
+        """
+        (sembol, kaynak): kaynak "alias" (sabit alias), "exact" (borsa sözlüğünde
+        base / konuşma ismi) veya "phonetic"; bulunamazsa (None, None)
+        """
+        if scan.symbols:
+            return scan.symbols[0], "alias"
+        
+        # Sabit alias yoksa borsa marketlerinden çöz; tam eşleşme fonetikten önce gelir
+        if self.symbol_index is not None and len(self.symbol_index):
+            phonetic = None
+            for token in scan.free_tokens:
+                if token.isdigit():
+                    continue
+                match = self.symbol_index.match(token)
+                if match is None:
+                    continue
+                if match[1] == "exact":
+                    return match
+                phonetic = phonetic or match
+            if phonetic:
+                return phonetic
         
-        for keyword in self.BUY_KEYWORDS:
-            if keyword in text_lower:
-                return "buy"
+        return None, None
+    
+    def _extract_amount(self, text: str, scan: Optional[_ScanResult] = None) -> Optional[float]:
+        """
+        Miktar bilgisini çıkar.
+        Para birimiyle biten ("150 dolar", "$20") ilk sayı tercih edilir, yoksa ilk sayı.
+        """
+        if scan is None:
+            text = self._normalize_text(text)
+            scan = self._scan(text)
         
-        for keyword in self.SELL_KEYWORDS:
-            if keyword in text_lower:
-                return "sell"
+        # Ne rakam ne sayı sözcüğü varsa tokenize etmeye gerek yok
+        if not scan.numbers and not any(ch.isdigit() for ch in text):
+            return None
         
-        for keyword in self.STATUS_KEYWORDS:
-            if keyword in text_lower:
-                return "status"
+        spans = find_numbers(text, scan.language)
+        if not spans:
+            return None
         
-        for keyword in self.BALANCE_KEYWORDS:
-            if keyword in text_lower:
-                return "balance"
+        for span in spans:
+            if self.CURRENCY_PATTERN.match(text, span.end) or text[:span.start].rstrip().endswith('$'):
+                return span.value
         
-        return None
+        return spans[0].value
     
-    def _extract_symbol(self, text: str) -> Optional[str]:
-        """Kripto sembolünü çıkar"""
-        text_lower = text.lower()
-        
-        # Önce tam eşleşme ara
-        for alias, symbol in self.CRYPTO_ALIASES.items():
-            # Kelime sınırlarını kontrol et
-            pattern = r'\b' + re.escape(alias) + r'\b'
-            if re.search(pattern, text_lower):
-                return symbol
+    def _extract_order_fields(self, text: str, scan: _ScanResult, cmd: ParsedCommand,
+                              base_confidence: float = 1.0) -> None:
+        """
+        Sayıları emir alanlarına bağla ve cmd'yi doldur (alan başına güven field_confidence'ta).
+
+        Bağlama sırası:
+        1. Sayıya yapışık işaret: "10x", "%10", "100 dolar", "0.5 btc"
+        2. Önündeki alan kelimesi: "limit 65000", "stop 63000", "yüzde on"
+        3. Arkasındaki alan kelimesi: "10 kaldıraç", "65000 limit"
+        4. Kalan ilk sayı miktardır; "65000'den" / "at 65000" ise limit fiyatı
+        """
+        field_names = {m.value for m, _ in scan.fields}
+        if "price" in field_names:
+            cmd.order_type = OrderType.LIMIT
+        
+        spans: List[NumberSpan] = []
+        if scan.numbers or any(ch.isdigit() for ch in text):
+            spans = find_numbers(text, scan.language)
+        # Alan kelimesinin parçası olan sayı sözcükleri değer değildir ("bir daha")
+        spans = [sp for sp in spans if not any(m.start <= sp.start and sp.end <= m.end for m, _ in scan.fields)]
+        spans = sorted(spans + self._find_suffixed_percents(text, scan, spans), key=lambda s: s.start)
+        if not spans:
+            return
+        
+        values: Dict[str, Tuple[float, float]] = {}   # alan → (değer, skor)
+        free: List[NumberSpan] = []
+        
+        for span in spans:
+            slot = self._tight_slot(text, span, scan)
+            if slot and slot[0] not in values:
+                values[slot[0]] = (span.value, slot[1])
+            else:
+                free.append(span)
         
-        # Bulunamadıysa None döndür
+        markers = [(m, score) for m, score in scan.fields if m.value in self.NUMERIC_FIELDS]
+        for before in (True, False):
+            for span in list(free):
+                marker = self._adjacent_marker(text, span, markers, before)
+                if marker is None or marker[0].value in values:
+                    continue
+                values[marker[0].value] = (span.value, marker[1] * (1.0 if before else 0.9))
+                markers.remove(marker)
+                free.remove(span)
+        
+        for span in free:
+            if "price" not in values and (
+                self.PRICE_SUFFIX.match(text, span.end) or self.AT_PRICE_PATTERN.search(text[:span.start])
+            ):
+                values["price"] = (span.value, 0.8)
+            elif not {"amount", "quantity", "percent"} & values.keys():
+                values["amount"] = (span.value, 0.7)
+        
+        for name, (value, score) in values.items():
+            confidence = base_confidence * score
+            if name == "amount":
+                cmd.amount, cmd.amount_type = value, "usd"
+            elif name == "quantity":
+                cmd.amount, cmd.amount_type = value, "qty"
+                name = "amount"
+            elif name == "leverage":
+                cmd.leverage = int(round(value))
+                if cmd.leverage != value:
+                    confidence *= 0.5
+            elif name == "price":
+                cmd.price = value
+                cmd.order_type = OrderType.LIMIT
+            elif name == "stop_loss":
+                cmd.stop_loss = value
+            elif name == "take_profit":
+                cmd.take_profit = value
+            elif name == "percent":
+                cmd.balance_percent = value
+                # "bakiyenin" / "of balance" yoksa yüzdenin bakiyeye ait olduğu varsayılır
+                if "balance_ref" not in field_names:
+                    confidence *= 0.8
+                name = "balance_percent"
+            cmd.field_confidence[name] = confidence
+        
+        if cmd.order_type == OrderType.LIMIT and cmd.price is None:
+            cmd.field_confidence["price"] = 0.0
+    
+    def _tight_slot(self, text: str, span: NumberSpan, scan: _ScanResult) -> Optional[Tuple[str, float]]:
+        """Sayıya yapışık işarete göre alan: (alan adı, skor) veya None"""
+        if span.start > 0 and text[span.start - 1] == '%':
+            return "percent", 1.0
+        if self.LEVERAGE_SUFFIX.match(text, span.end):
+            return "leverage", 1.0
+        if self.CURRENCY_PATTERN.match(text, span.end) or text[:span.start].rstrip().endswith('$'):
+            return "amount", 1.0
+        # Sayının hemen ardından coin adı veya "adet": coin miktarı
+        for m in scan.symbol_matches:
+            if m.start >= span.end and not text[span.end:m.start].strip():
+                return "quantity", 1.0
+        for m, score in scan.fields:
+            if m.value == "quantity" and m.start >= span.end and not text[span.end:m.start].strip():
+                return "quantity", score
         return None
     
-    def _extract_amount(self, text: str) -> Optional[float]:
-        """Miktar bilgisini çıkar"""
-        text_lower = text.lower()
-        
-        # Önce yazılı sayıları çevir
-        text_converted = self._convert_word_numbers(text_lower)
-        
-        # Miktar kalıplarını dene
-        for pattern in self.AMOUNT_PATTERNS:
-            match = re.search(pattern, text_converted)
-            if match:
-                amount_str = match.group(1)
-                # Virgülü noktaya çevir
-                amount_str = amount_str.replace(',', '.')
-                try:
-                    amount = float(amount_str)
-                    
-                    # "k" veya "bin" için çarp
-                    if 'k' in text_lower or 'bin' in text_lower:
-                        # Eğer sayı zaten 1000+ değilse
-                        if amount < 1000:
-                            amount *= 1000
-                    
-                    return amount
-                except ValueError:
-                    continue
-        
+    def _adjacent_marker(self, text: str, span: NumberSpan, markers: List[Tuple[PhraseMatch, float]],
+                         before: bool) -> Optional[Tuple[PhraseMatch, float]]:
+        """Sayının hemen önündeki (before=True) veya arkasındaki alan kelimesi"""
+        for marker in markers:
+            m = marker[0]
+            if before and m.end <= span.start:
+                gap = (m.end, span.start)
+            elif not before and m.start >= span.end:
+                gap = (span.end, m.start)
+            else:
+                continue
+            if self.FIELD_GAP_PATTERN.fullmatch(text, *gap):
+                return marker
         return None
     
-    def _convert_word_numbers(self, text: str) -> str:
-        """Yazılı sayıları rakama çevir"""
-        result = text
-        
-        # Basit tek kelime sayıları
-        for word, num in self.NUMBER_WORDS.items():
-            result = re.sub(r'\b' + word + r'\b', str(num), result)
-        
-        # Bileşik sayılar (örn: "yüz elli" → "150")
-        # Bu daha karmaşık, basit versiyonu kullan
-        
+    def _find_suffixed_percents(self, text: str, scan: _ScanResult, spans: List[NumberSpan]) -> List[NumberSpan]:
+        """"yüzde onu" / "yüzde yirmisi" gibi ekli sayı sözcüklerini çöz"""
+        result = []
+        for m, _ in scan.fields:
+            if m.value != "percent":
+                continue
+            if any(m.end <= s.start and not text[m.end:s.start].strip() for s in spans):
+                continue
+            word = next(((start, end) for _, start, end in scan.tokens if start >= m.end), None)
+            if word is None or text[m.end:word[0]].strip():
+                continue
+            token = text[word[0]:word[1]]
+            for cut in range(1, min(self._PERCENT_SUFFIX_MAX, len(token) - 1) + 1):
+                value = parse_number(token[:-cut], scan.language)
+                if value is not None:
+                    result.append(NumberSpan(value, word[0], word[1], token))
+                    break
         return result
     
+    def _convert_word_numbers(self, text: str, numbers: Optional[List[NumberSpan]] = None) -> str:
+        """Yazılı sayıları rakama çevir ("yüz elli dolar" → "150 dolar")"""
+        return replace_numbers(text, numbers)
+    
     def format_command_summary(self, cmd: ParsedCommand) -> str:
         """Komut özetini insan okunabilir formatta döndür"""
-        if cmd.action == "buy":
-            return f"📈 ALIŞ: {cmd.symbol} - {cmd.amount or '?'} USD"
-        elif cmd.action == "sell":
-            return f"📉 SATIŞ: {cmd.symbol} - {cmd.amount or '?'} USD"
+        if cmd.action in ("buy", "sell"):
+            head = "📈 ALIŞ" if cmd.action == "buy" else "📉 SATIŞ"
+            if cmd.amount:
+                size = f"{cmd.amount} adet" if cmd.amount_type == "qty" else f"{cmd.amount} USD"
+            elif cmd.balance_percent:
+                size = f"bakiyenin %{cmd.balance_percent:g}"
+            else:
+                size = "? USD"
+            parts = [f"{head}: {cmd.symbol} - {size}"]
+            if cmd.leverage:
+                parts.append(f"{cmd.leverage}x")
+            if cmd.order_type == OrderType.LIMIT:
+                parts.append(f"LIMIT {cmd.price if cmd.price is not None else '?'}")
+            if cmd.stop_loss is not None:
+                parts.append(f"SL {cmd.stop_loss}")
+            if cmd.take_profit is not None:
+                parts.append(f"TP {cmd.take_profit}")
+            if cmd.inferred_fields:
+                labels = ", ".join(self.INFERRED_FIELD_LABELS.get(f, f) for f in cmd.inferred_fields)
+                parts.append(f"↺ önceki emirden: {labels}")
+            return " | ".join(parts)
         elif cmd.action == "close":
             symbol_str = cmd.symbol or "tüm pozisyonlar"
             return f"🔒 KAPAT: {symbol_str}"
@@ -331,17 +792,51 @@ class CommandValidator:
     
     MIN_AMOUNT = 1.0        # Minimum işlem tutarı (USD)
     MAX_AMOUNT = 100000.0   # Maksimum işlem tutarı (USD)
+    MAX_LEVERAGE = 125
+    
+    # Bu güvenin altındaki emirler her zaman onaya sunulur (needs_confirmation)
+    CONFIRM_CONFIDENCE = 0.85
     
-    VALID_SYMBOLS = [
+    # Whisper güveni bunun altındaysa (avg_logprob ≈ -0.5) emir onaya sunulur
+    ASR_CONFIRM_CONFIDENCE = 0.6
+    
+    # Borsa bağlı değilken kullanılan sabit liste
+    VALID_SYMBOLS = frozenset({
         'BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT', 'XRPUSDT',
         'DOGEUSDT', 'ADAUSDT', 'DOTUSDT', 'AVAXUSDT', 'LINKUSDT',
         'LTCUSDT', 'MATICUSDT',
-    ]
+    })
+    
+    @classmethod
+    def is_valid_symbol(cls, symbol: str, symbol_index: Optional[SymbolIndex] = None) -> bool:
+        """Sembol geçerli mi? (O(1) set araması)"""
+        if symbol_index is not None and len(symbol_index):
+            return symbol_index.contains(symbol)
+        return symbol in cls.VALID_SYMBOLS
     
     @classmethod
-    def validate(cls, cmd: ParsedCommand) -> Tuple[bool, List[str]]:
+    def needs_confirmation(cls, cmd: ParsedCommand) -> bool:
+        """
+        Emir, ayarlardan bağımsız olarak kullanıcı onayı gerektiriyor mu?
+        Sembol veya başka bir alan tahminse (fonetik eşleşme, önceki emirden
+        doldurma, düşük güven) evet.
+        """
+        if cmd.action not in ("buy", "sell"):
+            return False
+        if cmd.confidence < cls.CONFIRM_CONFIDENCE or cmd.inferred_fields:
+            return True
+        if cmd.asr_confidence < cls.ASR_CONFIRM_CONFIDENCE:
+            return True
+        # Sembol güveninin aksiyon güvenine oranı sembolün kaynağını verir
+        # (alias 1.0, sözlük 0.85, varsayılan 0.8, fonetik 0.6)
+        action = cmd.field_confidence.get("action") or 1.0
+        return cmd.field_confidence.get("symbol", action) / action < cls.CONFIRM_CONFIDENCE
+    
+    @classmethod
+    def validate(cls, cmd: ParsedCommand, symbol_index: Optional[SymbolIndex] = None) -> Tuple[bool, List[str]]:
         """
         Komutu doğrula.
+        symbol_index: Verilirse semboller bağlı borsanın marketlerine göre kontrol edilir.
         Returns: (is_valid, error_messages)
         """
         errors = []
@@ -352,23 +847,52 @@ class CommandValidator:
         # Alış/Satış için doğrulama
         if cmd.action in ("buy", "sell"):
             # Sembol kontrolü
-            if cmd.symbol and cmd.symbol not in cls.VALID_SYMBOLS:
+            if cmd.symbol and not cls.is_valid_symbol(cmd.symbol, symbol_index):
                 errors.append(f"Geçersiz sembol: {cmd.symbol}")
             
-            # Miktar kontrolü
+            # Miktar kontrolü (coin miktarı USD limitleriyle karşılaştırılamaz)
             if cmd.amount is not None:
-                if cmd.amount < cls.MIN_AMOUNT:
+                if cmd.amount_type == "qty":
+                    if cmd.amount <= 0:
+                        errors.append(f"Geçersiz miktar: {cmd.amount}")
+                elif cmd.amount < cls.MIN_AMOUNT:
                     errors.append(f"Miktar çok düşük: {cmd.amount} USD (min: {cls.MIN_AMOUNT})")
                 elif cmd.amount > cls.MAX_AMOUNT:
                     errors.append(f"Miktar çok yüksek: {cmd.amount} USD (max: {cls.MAX_AMOUNT})")
+            elif cmd.balance_percent is not None:
+                if not 0 < cmd.balance_percent <= 100:
+                    errors.append(f"Geçersiz bakiye yüzdesi: %{cmd.balance_percent:g}")
             else:
                 errors.append("Miktar belirtilmedi")
+            
+            if cmd.leverage is not None and not 1 <= cmd.leverage <= cls.MAX_LEVERAGE:
+                errors.append(f"Geçersiz kaldıraç: {cmd.leverage}x (1-{cls.MAX_LEVERAGE})")
+            
+            if cmd.order_type == OrderType.LIMIT and cmd.price is None:
+                errors.append("Limit fiyatı belirtilmedi")
+            
+            errors.extend(cls._validate_stops(cmd))
         
         # Güvenilirlik kontrolü
         if cmd.confidence < 0.5:
             errors.append("Komut belirsiz, lütfen tekrar deneyin")
         
         return len(errors) == 0, errors
+    
+    @staticmethod
+    def _validate_stops(cmd: ParsedCommand) -> List[str]:
+        """SL/TP yön kontrolü: alışta SL < fiyat < TP, satışta TP < fiyat < SL"""
+        errors = []
+        buy = cmd.action == "buy"
+        sl, tp = cmd.stop_loss, cmd.take_profit
+        if cmd.price is not None:
+            if sl is not None and (sl >= cmd.price if buy else sl <= cmd.price):
+                errors.append(f"Stop-loss ({sl}) limit fiyatın {'altında' if buy else 'üstünde'} olmalı")
+            if tp is not None and (tp <= cmd.price if buy else tp >= cmd.price):
+                errors.append(f"Take-profit ({tp}) limit fiyatın {'üstünde' if buy else 'altında'} olmalı")
+        elif sl is not None and tp is not None and (sl >= tp if buy else sl <= tp):
+            errors.append(f"Stop-loss ({sl}) ve take-profit ({tp}) emir yönüyle uyumsuz")
+        return errors
 
 
 # Test için örnek kullanım
@@ -385,6 +909,8 @@ if __name__ == "__main__":
         "Durum göster",
         "Al 500 dolar",  # Sembol yok
         "Bitcoin al",    # Miktar yok
+        "Al BTC 100 dolar 10x limit 65000 stop 63000",
+        "Bakiyenin yüzde onu ile ETH long, kar al 4000",
     ]
     
     print("=" * 60)
@@ -6,10 +6,101 @@ import ccxt
 from typing import Optional, Dict, Any, List
 from utils.logger import get_logger
 from database.db_manager import get_db
+from core.market_cache import get_market_cache, load_markets
+from core.exchange_registry import ExchangeRegistry, get_exchange_registry
 
 logger = get_logger(__name__)
 
 
+def exchange_config(exchange_name: str,
+                    api_key: Optional[str] = None,
+                    secret_key: Optional[str] = None,
+                    passphrase: Optional[str] = None) -> Dict[str, Any]:
+    """
+    ccxt constructor config for an exchange (shared by sync and async clients)
+    
+    Args:
+        exchange_name: Exchange name (binance/bybit/kucoin/mexc/okx)
+        api_key: API key
+        secret_key: Secret key
+        passphrase: Passphrase (for OKX, KuCoin)
+        
+    Returns:
+        dict: ccxt config
+    """
+    config = {
+        'enableRateLimit': True,
+        'timeout': 30000,
+    }
+    
+    # Keyless config → public-data client
+    if api_key:
+        config['apiKey'] = api_key
+    if secret_key:
+        config['secret'] = secret_key
+    
+    # Add passphrase if provided (OKX, KuCoin)
+    if passphrase:
+        config['password'] = passphrase
+    
+    # Exchange-specific configuration
+    if exchange_name == 'binance':
+        config['options'] = {
+            'defaultType': 'future',
+            'adjustForTimeDifference': True
+        }
+    elif exchange_name == 'bybit':
+        config['options'] = {
+            'defaultType': 'future'
+        }
+    elif exchange_name == 'okx':
+        config['options'] = {
+            'defaultType': 'swap'
+        }
+    
+    return config
+
+
+def balance_summary(balance: Dict[str, Any]) -> Dict[str, Any]:
+    """ccxt fetch_balance() → USDT total/free/used"""
+    return {
+        'total': balance.get('total', {}).get('USDT', 0.0),
+        'free': balance.get('free', {}).get('USDT', 0.0),
+        'used': balance.get('used', {}).get('USDT', 0.0),
+        'currency': 'USDT'
+    }
+
+
+def ticker_summary(ticker: Dict[str, Any]) -> Dict[str, Any]:
+    """ccxt fetch_ticker() → fields used by the app"""
+    return {
+        'symbol': ticker.get('symbol'),
+        'last': ticker.get('last'),
+        'bid': ticker.get('bid'),
+        'ask': ticker.get('ask'),
+        'high': ticker.get('high'),
+        'low': ticker.get('low'),
+        'volume': ticker.get('baseVolume'),
+        'timestamp': ticker.get('timestamp')
+    }
+
+
+def futures_symbols(markets: Dict[str, Dict[str, Any]]) -> List[str]:
+    """USDT futures/perpetual symbols, cleaned ("BTC/USDT")"""
+    symbols = []
+    for symbol, market in markets.items():
+        market_type = market.get('type', '').lower()
+        is_future = market.get('future', False)
+        is_swap = market.get('swap', False)
+        
+        if (market_type in ['future', 'swap'] or is_future or is_swap) and 'USDT' in symbol:
+            # Clean symbol
+            clean_symbol = symbol.replace(':USDT', '').replace('/USDT', '/USDT')
+            symbols.append(clean_symbol)
+    
+    return sorted(list(set(symbols)))
+
+
 class ExchangeManager:
     """
     Manages connections and operations with cryptocurrency exchanges
@@ -31,14 +122,16 @@ class ExchangeManager:
         'okx': ccxt.okx
     }
     
-    def __init__(self, db_manager=None):
+    def __init__(self, db_manager=None, registry: Optional[ExchangeRegistry] = None):
         """
         Initialize Exchange Manager
         
         Args:
             db_manager: Database manager instance
+            registry: Shared client registry (process-wide one if None)
         """
         self.db = db_manager or get_db()
+        self.registry = registry if registry is not None else get_exchange_registry()
         self.exchanges: Dict[str, ccxt.Exchange] = {}
         self.active_exchange: Optional[str] = None
         
@@ -70,53 +163,22 @@ class ExchangeManager:
                 logger.error(f"Unsupported exchange: {exchange_name}")
                 return False
             
-            # Get exchange class
-            exchange_class = self.SUPPORTED_EXCHANGES[exchange_name]
-            
-            # Configure exchange
-            config = {
-                'apiKey': api_key,
-                'secret': secret_key,
-                'enableRateLimit': True,
-                'timeout': 30000,
-            }
-            
-            # Add passphrase if provided (OKX, KuCoin)
-            if passphrase:
-                config['password'] = passphrase
-            
-            # Exchange-specific configuration
-            if exchange_name == 'binance':
-                config['options'] = {
-                    'defaultType': 'future',
-                    'adjustForTimeDifference': True
-                }
-            elif exchange_name == 'bybit':
-                config['options'] = {
-                    'defaultType': 'future'
-                }
-            elif exchange_name == 'okx':
-                config['options'] = {
-                    'defaultType': 'swap'
-                }
-            
-            # Create exchange instance
-            exchange = exchange_class(config)
-            
-            # Enable sandbox/testnet mode
-            if testnet:
-                try:
-                    exchange.set_sandbox_mode(True)
-                    logger.info(f"✅ {exchange_name} sandbox mode enabled")
-                except Exception as e:
-                    logger.warning(f"Could not enable sandbox mode: {e}")
+            # Shared client (session, time sync and markets reused across the app)
+            exchange = self.registry.acquire(exchange_name, api_key, secret_key, passphrase, sandbox=testnet)
             
             # Test connection
-            balance = exchange.fetch_balance()
+            try:
+                balance = exchange.fetch_balance()
+            except Exception:
+                self.registry.release(exchange)
+                raise
             logger.info(f"✅ Connected to {exchange_name}")
             
-            # Store exchange
+            # Store exchange (release the previous client for this exchange)
+            previous = self.exchanges.get(exchange_name)
             self.exchanges[exchange_name] = exchange
+            if previous is not None:
+                self.registry.release(previous)
             self.active_exchange = exchange_name
             
             # Update database
@@ -148,7 +210,7 @@ class ExchangeManager:
             exchange_name = exchange_name.lower()
             
             if exchange_name in self.exchanges:
-                del self.exchanges[exchange_name]
+                self.registry.release(self.exchanges.pop(exchange_name))
                 
                 if self.active_exchange == exchange_name:
                     self.active_exchange = None
@@ -219,19 +281,8 @@ class ExchangeManager:
                 logger.error("No exchange available")
                 return {}
             
-            balance = exchange.fetch_balance()
-            
             # Extract USDT balance and total
-            usdt_balance = balance.get('total', {}).get('USDT', 0.0)
-            free_balance = balance.get('free', {}).get('USDT', 0.0)
-            used_balance = balance.get('used', {}).get('USDT', 0.0)
-            
-            return {
-                'total': usdt_balance,
-                'free': free_balance,
-                'used': used_balance,
-                'currency': 'USDT'
-            }
+            return balance_summary(exchange.fetch_balance())
             
         except Exception as e:
             logger.error(f"Error fetching balance: {e}", exc_info=True)
@@ -254,18 +305,7 @@ class ExchangeManager:
                 logger.error("No exchange available")
                 return {}
             
-            ticker = exchange.fetch_ticker(symbol)
-            
-            return {
-                'symbol': ticker.get('symbol'),
-                'last': ticker.get('last'),
-                'bid': ticker.get('bid'),
-                'ask': ticker.get('ask'),
-                'high': ticker.get('high'),
-                'low': ticker.get('low'),
-                'volume': ticker.get('baseVolume'),
-                'timestamp': ticker.get('timestamp')
-            }
+            return ticker_summary(exchange.fetch_ticker(symbol))
             
         except Exception as e:
             logger.error(f"Error fetching ticker for {symbol}: {e}")
@@ -315,7 +355,7 @@ class ExchangeManager:
 
             logger.info(
                 "Order created on %s: %s %s %s @ %s",
-                self.active_exchange,
+                exchange_name or self.active_exchange,
                 side,
                 amount,
                 symbol,
@@ -324,7 +364,7 @@ class ExchangeManager:
             return order
 
         except Exception as e:
-            logger.error(f"Error creating order on {self.active_exchange}: {e}", exc_info=True)
+            logger.error(f"Error creating order on {exchange_name or self.active_exchange}: {e}", exc_info=True)
             raise
 
     
@@ -344,21 +384,8 @@ class ExchangeManager:
                 logger.error("No exchange available")
                 return []
             
-            markets = exchange.load_markets()
-            
             # Filter for futures/perpetual contracts with USDT
-            futures_symbols = []
-            for symbol, market in markets.items():
-                market_type = market.get('type', '').lower()
-                is_future = market.get('future', False)
-                is_swap = market.get('swap', False)
-                
-                if (market_type in ['future', 'swap'] or is_future or is_swap) and 'USDT' in symbol:
-                    # Clean symbol
-                    clean_symbol = symbol.replace(':USDT', '').replace('/USDT', '/USDT')
-                    futures_symbols.append(clean_symbol)
-            
-            return sorted(list(set(futures_symbols)))
+            return futures_symbols(load_markets(exchange))
             
         except Exception as e:
             logger.error(f"Error fetching markets: {e}", exc_info=True)
@@ -380,7 +407,7 @@ class ExchangeManager:
             if not exchange:
                 return False
             
-            markets = exchange.load_markets()
+            markets = load_markets(exchange)
             
             # Try different symbol formats
             symbol_formats = [
@@ -395,7 +422,8 @@ class ExchangeManager:
                 if sym_format in markets:
                     return True
             
-            return False
+            # Borsa id'si / base+quote indeksi ("BTCUSDT", "btc/usdt")
+            return get_market_cache(exchange).find(symbol) is not None
             
         except Exception as e:
             logger.error(f"Error validating symbol {symbol}: {e}")
@@ -417,7 +445,7 @@ class ExchangeManager:
             if not exchange:
                 return None
             
-            markets = exchange.load_markets()
+            markets = load_markets(exchange)
             
             # Try different formats
             symbol_formats = [
@@ -439,7 +467,7 @@ class ExchangeManager:
                 if test_symbol in markets:
                     return test_symbol
             
-            return None
+            return get_market_cache(exchange).find(symbol)
             
         except Exception as e:
             logger.error(f"Error normalizing symbol {symbol}: {e}")
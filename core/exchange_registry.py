@@ -0,0 +1,229 @@
+"""
+core/exchange_registry.py
+
+Süreç genelinde paylaşılan ccxt istemci kaydı.
+- Anahtar: (borsa, kimlik bilgisi parmak izi, sandbox); aynı anahtarlarla
+  istenen her istemci aynı ccxt örneğidir. HTTP oturumu (keep-alive), saat
+  farkı senkronu ve market yüklemesi örnek başına bir kez yapılır
+- Marketler core.market_cache'ten enjekte edilir (ağ isteği yok)
+- Referans sayımı: acquire() / release(); sayaç sıfıra inince istemci
+  idle_ttl boyunca bekletilir, böylece bağlantı testi → bağlan → sembol
+  değiştir zinciri aynı örneği kullanır
+- Parmak izi sha256'dır; anahtarlar kayıtta düz metin olarak tutulmaz
+- Her istemci borsanın ortak ağırlık bütçesine bağlanır (core.rate_limiter);
+  aynı borsaya giden farklı anahtarlı istemciler de aynı bütçeyi paylaşır
+- İstek süreleri ve zaman aşımı core.latency_monitor'a bağlanır; istemci
+  kapanana kadar arka plan prob'unda kalır
+
+Kullanım:
+    registry = get_exchange_registry()
+    exchange = registry.acquire("binance", api_key, secret_key, sandbox=True)
+    ...
+    registry.release(exchange)
+
+    with registry.client("binance", api_key, secret_key) as exchange:   # kısa süreli kullanım
+        exchange.fetch_balance()
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import ccxt
+
+from core.latency_monitor import get_latency_monitor, install as install_latency_monitor
+from core.market_cache import load_markets
+from core.rate_limiter import get_rate_limiter, install as install_rate_limiter
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ClientKey = Tuple[str, str, bool]
+
+
+def credentials_fingerprint(api_key: Optional[str] = None, secret_key: Optional[str] = None,
+                            passphrase: Optional[str] = None) -> str:
+    """Kimlik bilgilerinin kısa sha256 özeti (anahtarsız istemci → "public")"""
+    if not api_key and not secret_key:
+        return "public"
+    payload = "\x00".join(v or "" for v in (api_key, secret_key, passphrase))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def venue_name(exchange_name: str, sandbox: bool = True) -> str:
+    """Rate limiter / latency monitor anahtarı (testnet ayrı bir havuzdur)"""
+    return f"{exchange_name.lower()}-sandbox" if sandbox else exchange_name.lower()
+
+
+@dataclass
+class _Entry:
+    key: ClientKey
+    exchange: Any = None
+    refs: int = 0
+    idle_since: Optional[float] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ExchangeRegistry:
+    """
+    (borsa, parmak izi, sandbox) başına tek ccxt istemcisi.
+
+    idle_ttl: Referansı kalmayan istemcinin kapatılmadan önce bekletileceği süre (sn)
+    factory: (exchange_name, config) → ccxt örneği (testlerde değiştirilebilir)
+    """
+
+    def __init__(self, idle_ttl: float = 300.0, factory=None, load_market_data: bool = True):
+        self.idle_ttl = idle_ttl
+        self.factory = factory or (lambda name, config: getattr(ccxt, name)(config))
+        self.load_market_data = load_market_data
+        self.created = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[ClientKey, _Entry] = {}
+        self._keys_by_client: Dict[int, ClientKey] = {}
+
+    @staticmethod
+    def key(exchange_name: str, api_key: Optional[str] = None, secret_key: Optional[str] = None,
+            passphrase: Optional[str] = None, sandbox: bool = True) -> ClientKey:
+        return exchange_name.lower(), credentials_fingerprint(api_key, secret_key, passphrase), bool(sandbox)
+
+    def acquire(self, exchange_name: str, api_key: Optional[str] = None, secret_key: Optional[str] = None,
+                passphrase: Optional[str] = None, sandbox: bool = True):
+        """Paylaşılan istemciyi döndür (yoksa oluştur); her acquire bir release ister"""
+        key = self.key(exchange_name, api_key, secret_key, passphrase, sandbox)
+        with self._lock:
+            self._evict_idle()
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(key)
+            entry.refs += 1
+            entry.idle_since = None
+
+        # Oluşturma (ağ/disk) global kilit dışında; aynı anahtarı isteyenler bekler
+        with entry.lock:
+            if entry.exchange is not None:
+                self.reused += 1
+                return entry.exchange
+            try:
+                exchange = self._create(key[0], api_key, secret_key, passphrase, sandbox)
+            except Exception:
+                with self._lock:
+                    entry.refs -= 1
+                    if entry.refs <= 0 and self._entries.get(key) is entry:
+                        del self._entries[key]
+                raise
+            entry.exchange = exchange
+            with self._lock:
+                self._keys_by_client[id(exchange)] = key
+            return exchange
+
+    def release(self, exchange) -> None:
+        """acquire() ile alınan istemciyi bırak"""
+        if exchange is None:
+            return
+        with self._lock:
+            key = self._keys_by_client.get(id(exchange))
+            entry = self._entries.get(key) if key else None
+            if entry is not None and entry.refs > 0:
+                entry.refs -= 1
+                if entry.refs == 0:
+                    entry.idle_since = time.monotonic()
+            self._evict_idle()
+
+    @contextmanager
+    def client(self, exchange_name: str, api_key: Optional[str] = None, secret_key: Optional[str] = None,
+               passphrase: Optional[str] = None, sandbox: bool = True) -> Iterator[Any]:
+        """Kısa süreli kullanım: with registry.client(...) as exchange"""
+        exchange = self.acquire(exchange_name, api_key, secret_key, passphrase, sandbox)
+        try:
+            yield exchange
+        finally:
+            self.release(exchange)
+
+    def ref_count(self, exchange_name: str, api_key: Optional[str] = None, secret_key: Optional[str] = None,
+                  passphrase: Optional[str] = None, sandbox: bool = True) -> int:
+        entry = self._entries.get(self.key(exchange_name, api_key, secret_key, passphrase, sandbox))
+        return entry.refs if entry else 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close_all(self) -> None:
+        """Tüm istemcileri kapat (uygulama kapanışı)"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            self._keys_by_client.clear()
+        for entry in entries:
+            self._close(entry.exchange)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _create(self, exchange_name: str, api_key, secret_key, passphrase, sandbox: bool):
+        from core.exchange_manager import exchange_config
+
+        started = time.perf_counter()
+        exchange = self.factory(exchange_name, exchange_config(exchange_name, api_key, secret_key, passphrase))
+        if sandbox:
+            try:
+                exchange.set_sandbox_mode(True)
+            except Exception as e:
+                logger.warning(f"Could not enable sandbox mode for {exchange_name}: {e}")
+
+        limiter_name = venue_name(exchange_name, sandbox)
+        install_rate_limiter(exchange, get_rate_limiter(limiter_name, exchange.rateLimit))
+        install_latency_monitor(exchange, get_latency_monitor(), limiter_name)
+
+        if self.load_market_data:
+            load_markets(exchange)
+            # load_markets() atlandığı için saat farkı burada bir kez ölçülür
+            if api_key and (exchange.options or {}).get('adjustForTimeDifference'):
+                try:
+                    exchange.load_time_difference()
+                except Exception as e:
+                    logger.warning(f"Time sync failed for {exchange_name}: {e}")
+
+        get_latency_monitor().attach(limiter_name, exchange)
+        self.created += 1
+        logger.info(f"Exchange client created: {exchange_name} sandbox={sandbox} "
+                    f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+        return exchange
+
+    def _evict_idle(self) -> None:
+        """idle_ttl'i dolan referanssız istemcileri kapat (self._lock altında)"""
+        now = time.monotonic()
+        for key, entry in list(self._entries.items()):
+            if entry.refs == 0 and entry.idle_since is not None and now - entry.idle_since >= self.idle_ttl:
+                del self._entries[key]
+                if entry.exchange is not None:
+                    self._keys_by_client.pop(id(entry.exchange), None)
+                    self._close(entry.exchange)
+
+    @staticmethod
+    def _close(exchange) -> None:
+        get_latency_monitor().detach(exchange)
+        session = getattr(exchange, 'session', None)
+        if session is not None:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+
+# Singleton instance
+_registry_instance: Optional[ExchangeRegistry] = None
+
+
+def get_exchange_registry() -> ExchangeRegistry:
+    """Get singleton ExchangeRegistry instance"""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = ExchangeRegistry()
+    return _registry_instance
@@ -0,0 +1,329 @@
+"""
+core/intent_classifier.py
+
+Hafif niyet sınıflandırıcı (multinomial naive Bayes, sadece NumPy).
+- Özellikler: kelime unigram + bigram ve kelime içi karakter 3-gram'ları
+  (Türkçe ekler için: "pozisyonu" ↔ "pozisyon"), sabit boyuta hash'lenir
+- Eğitim verisi: voice_commands + command_keywords tabloları, CommandParser
+  anahtar kelimeleri ve data/corpus/intents.tsv
+- Tahmin: log-olasılık sütunlarının toplamı → softmax; birkaç mikro saniye
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_CORPUS_PATH = PROJECT_ROOT / "data" / "corpus" / "intents.tsv"
+DEFAULT_MODEL_PATH = PROJECT_ROOT / "data" / "models" / "intent_classifier.npz"
+
+# DB kategorileri → parser aksiyonları
+CATEGORY_TO_ACTION = {
+    "BUY": "buy",
+    "SELL": "sell",
+    "CLOSE": "close",
+    "STOP": "cancel",
+    "CANCEL": "cancel",
+    "STATUS": "status",
+    "BALANCE": "balance",
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_FOLD = str.maketrans({"ı": "i", "İ": "i", "ğ": "g", "ü": "u", "ş": "s", "ö": "o", "ç": "c"})
+
+
+def _words(text: str) -> List[str]:
+    # Rakamlar niyet taşımaz ("100 dolar" hem alışta hem satışta geçer)
+    return [w for w in _TOKEN_RE.findall(text.lower().translate(_FOLD)) if not w.isdigit()]
+
+
+def _word_features(word: str) -> List[str]:
+    padded = "#" + word + "#"
+    return ["w:" + word] + ["c:" + padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def extract_features(text: str) -> List[str]:
+    """Metinden özellik listesi çıkar"""
+    words = _words(text)
+    features = []
+    for w in words:
+        features.extend(_word_features(w))
+    features.extend("b:" + a + "_" + b for a, b in zip(words, words[1:]))
+    return features
+
+
+class IntentClassifier:
+    """
+    Multinomial naive Bayes niyet sınıflandırıcı.
+
+    Kullanım:
+        clf = IntentClassifier().fit(texts, labels)
+        clf.predict_proba("pozisyonu kapat")   # → [("close", 0.97), ("status", 0.02), ...]
+        clf.rank("para durumu", ["status", "balance"])
+    """
+
+    # Kelime → hash indeksleri önbelleği sınırı
+    CACHE_SIZE = 8192
+
+    def __init__(self, dim: int = 1 << 14, alpha: float = 0.3):
+        self.dim = dim
+        self.alpha = alpha
+        self.classes: List[str] = []
+        self._word_cache: Dict[str, List[int]] = {}
+        self._log_prior: Optional[np.ndarray] = None
+        self._log_prob: Optional[np.ndarray] = None   # (n_classes, dim)
+
+    @property
+    def is_trained(self) -> bool:
+        return self._log_prob is not None
+
+    def _hash(self, feature: str) -> int:
+        return zlib.crc32(feature.encode("utf-8")) % self.dim
+
+    def _indices(self, text: str) -> np.ndarray:
+        """extract_features() ile aynı özelliklerin hash indeksleri (kelime bazında önbellekli)"""
+        words = _words(text)
+        cache = self._word_cache
+        indices: List[int] = []
+        for w in words:
+            cached = cache.get(w)
+            if cached is None:
+                if len(cache) >= self.CACHE_SIZE:
+                    cache.clear()
+                cached = cache[w] = [self._hash(f) for f in _word_features(w)]
+            indices.extend(cached)
+        indices.extend(self._hash("b:" + a + "_" + b) for a, b in zip(words, words[1:]))
+        return np.array(indices, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Eğitim
+    # ------------------------------------------------------------------
+
+    def fit(self, texts: Sequence[str], labels: Sequence[str]) -> "IntentClassifier":
+        """Örneklerle eğit (önceki model tamamen değiştirilir)"""
+        if not texts:
+            raise ValueError("No training examples")
+
+        classes = sorted(set(labels))
+        class_index = {c: i for i, c in enumerate(classes)}
+        counts = np.zeros((len(classes), self.dim), dtype=np.float64)
+        doc_counts = np.zeros(len(classes), dtype=np.float64)
+
+        for text, label in zip(texts, labels):
+            row = class_index[label]
+            np.add.at(counts[row], self._indices(text), 1.0)
+            doc_counts[row] += 1
+
+        smoothed = counts + self.alpha
+        self._log_prob = np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))
+        self._log_prior = np.log(doc_counts / doc_counts.sum())
+        self.classes = classes
+        return self
+
+    # ------------------------------------------------------------------
+    # Tahmin
+    # ------------------------------------------------------------------
+
+    def predict_proba(self, text: str) -> List[Tuple[str, float]]:
+        """Tüm aksiyonları olasılığa göre sıralı döndür"""
+        if not self.is_trained:
+            return []
+        idx = self._indices(text)
+        scores = self._log_prior + (self._log_prob[:, idx].sum(axis=1) if idx.size else 0.0)
+        scores = np.exp(scores - scores.max())
+        probs = scores / scores.sum()
+        order = np.argsort(-probs)
+        return [(self.classes[i], float(probs[i])) for i in order]
+
+    def predict(self, text: str) -> Optional[str]:
+        """En olası aksiyon"""
+        ranked = self.predict_proba(text)
+        return ranked[0][0] if ranked else None
+
+    def rank(self, text: str, candidates: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Sadece verilen adaylar arasında sırala (olasılıklar adaylar içinde yeniden normalize edilir).
+        Model bilinmeyen adayları listenin sonuna 0 olasılıkla ekler.
+        """
+        ranked = self.predict_proba(text)
+        if candidates is None:
+            return ranked
+        candidates = list(candidates)
+        known = [(c, p) for c, p in ranked if c in candidates]
+        total = sum(p for _, p in known) or 1.0
+        result = [(c, p / total) for c, p in known]
+        result.extend((c, 0.0) for c in candidates if c not in self.classes)
+        return result
+
+    # ------------------------------------------------------------------
+    # Kalıcılık
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path = DEFAULT_MODEL_PATH) -> None:
+        if not self.is_trained:
+            raise ValueError("Classifier is not trained")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            classes=np.array(self.classes),
+            log_prior=self._log_prior,
+            log_prob=self._log_prob.astype(np.float32),
+            dim=self.dim,
+            alpha=self.alpha,
+        )
+        logger.info(f"Intent classifier saved: {path}")
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_MODEL_PATH) -> "IntentClassifier":
+        data = np.load(Path(path), allow_pickle=False)
+        clf = cls(dim=int(data["dim"]), alpha=float(data["alpha"]))
+        clf.classes = [str(c) for c in data["classes"]]
+        clf._log_prior = data["log_prior"]
+        clf._log_prob = data["log_prob"].astype(np.float64)
+        return clf
+
+
+# ----------------------------------------------------------------------
+# Eğitim verisi
+# ----------------------------------------------------------------------
+
+def load_corpus(path: Path = DEFAULT_CORPUS_PATH) -> List[Tuple[str, str]]:
+    """TSV corpus'u (metin, aksiyon) listesi olarak oku"""
+    path = Path(path)
+    if not path.exists():
+        logger.warning(f"Intent corpus not found: {path}")
+        return []
+    examples = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        text, _, label = line.partition("\t")
+        if text.strip() and label.strip():
+            examples.append((text.strip(), label.strip()))
+    return examples
+
+
+def load_db_examples(db_manager) -> List[Tuple[str, str]]:
+    """voice_commands ve command_keywords satırlarını (phrase, aksiyon) olarak oku"""
+    queries = (
+        "SELECT category, phrase FROM voice_commands WHERE is_active = 1",
+        "SELECT category, keyword AS phrase FROM command_keywords",
+    )
+    examples = []
+    for query in queries:
+        try:
+            rows = db_manager.fetch_all(query)
+        except Exception as e:
+            logger.debug(f"Intent training query failed: {e}")
+            continue
+        for row in rows:
+            action = CATEGORY_TO_ACTION.get((row.get("category") or "").upper())
+            if action and row.get("phrase"):
+                examples.append((row["phrase"], action))
+    return examples
+
+
+def load_parser_examples() -> List[Tuple[str, str]]:
+    """CommandParser anahtar kelime listelerini örnek olarak kullan"""
+    from core.command_parser import CommandParser
+
+    lists = {
+        "buy": CommandParser.BUY_KEYWORDS,
+        "sell": CommandParser.SELL_KEYWORDS,
+        "close": CommandParser.CLOSE_KEYWORDS,
+        "cancel": CommandParser.CANCEL_KEYWORDS,
+        "status": CommandParser.STATUS_KEYWORDS,
+        "balance": CommandParser.BALANCE_KEYWORDS,
+    }
+    return [(kw, action) for action, keywords in lists.items() for kw in keywords]
+
+
+def load_training_data(db_manager=None, corpus_path: Path = DEFAULT_CORPUS_PATH) -> Tuple[List[str], List[str]]:
+    """Tüm kaynaklardan eğitim verisi topla"""
+    examples = load_parser_examples() + load_corpus(corpus_path)
+    if db_manager is not None:
+        examples += load_db_examples(db_manager)
+    texts = [t for t, _ in examples]
+    labels = [l for _, l in examples]
+    return texts, labels
+
+
+def train_from_sources(db_manager=None, corpus_path: Path = DEFAULT_CORPUS_PATH,
+                       classifier: Optional[IntentClassifier] = None) -> IntentClassifier:
+    """Verilen (veya yeni) sınıflandırıcıyı DB + corpus ile eğit"""
+    texts, labels = load_training_data(db_manager, corpus_path)
+    classifier = classifier or IntentClassifier()
+    classifier.fit(texts, labels)
+    logger.info(f"Intent classifier trained on {len(texts)} examples ({len(classifier.classes)} intents)")
+    return classifier
+
+
+def load_or_train(db_manager=None, model_path: Path = DEFAULT_MODEL_PATH,
+                  corpus_path: Path = DEFAULT_CORPUS_PATH) -> IntentClassifier:
+    """
+    scripts/train_intent_classifier.py ile kaydedilen modeli yükle;
+    model yoksa veya okunamazsa DB + corpus ile eğit
+    """
+    model_path = Path(model_path)
+    if model_path.exists():
+        try:
+            classifier = IntentClassifier.load(model_path)
+            logger.info(f"Intent classifier loaded: {model_path} ({len(classifier.classes)} intents)")
+            return classifier
+        except Exception as e:
+            logger.warning(f"Saved intent classifier unreadable ({model_path}): {e}")
+    return train_from_sources(db_manager, corpus_path)
+
+
+def cross_validate(texts: Sequence[str], labels: Sequence[str], folds: int = 5,
+                   seed: int = 0, extra: Optional[Tuple[Sequence[str], Sequence[str]]] = None) -> Dict[str, object]:
+    """
+    k-katlı çapraz doğrulama.
+
+    extra: Her katta eğitime eklenen, test edilmeyen örnekler (örn. anahtar kelime listeleri)
+    Returns: {"accuracy": float, "per_class": {aksiyon: doğruluk}, "confusion": {(gerçek, tahmin): adet}}
+    """
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(texts))
+    fold_of = np.empty(len(texts), dtype=np.int64)
+    fold_of[order] = np.arange(len(texts)) % folds
+
+    extra_texts, extra_labels = extra if extra else ([], [])
+    correct = 0
+    per_class: Dict[str, List[int]] = {}
+    confusion: Dict[Tuple[str, str], int] = {}
+
+    for k in range(folds):
+        train_idx = np.where(fold_of != k)[0]
+        test_idx = np.where(fold_of == k)[0]
+        clf = IntentClassifier().fit(
+            [texts[i] for i in train_idx] + list(extra_texts),
+            [labels[i] for i in train_idx] + list(extra_labels),
+        )
+        for i in test_idx:
+            predicted = clf.predict(texts[i])
+            hit = predicted == labels[i]
+            correct += hit
+            stats = per_class.setdefault(labels[i], [0, 0])
+            stats[0] += hit
+            stats[1] += 1
+            if not hit:
+                key = (labels[i], predicted)
+                confusion[key] = confusion.get(key, 0) + 1
+
+    return {
+        "accuracy": correct / len(texts) if len(texts) else 0.0,
+        "per_class": {c: hits / total for c, (hits, total) in sorted(per_class.items())},
+        "confusion": confusion,
+    }
@@ -0,0 +1,398 @@
+"""
+core/latency_monitor.py
+
+Borsa başına gecikme (RTT) ve saat farkı izleme, uyarlanır zaman aşımı.
+- Her HTTP isteğinin süresi uç nokta sınıfına göre ölçülür (order / account
+  / market; core.rate_limiter.classify_request). Kuyruk beklemesi dahil
+  değildir, sadece ağ + borsa süresi
+- Arka plan prob'u bağlı her borsaya fetch_time() atar: RTT ve sunucu saat
+  farkı (offset = sunucu - yerel orta nokta). ccxt nonce'u timeDifference
+  kullanan borsalarda (binance, bybit) fark otomatik düzeltilir, diğerlerinde
+  max_skew_ms aşılırsa uyarı loglanır
+- Zaman aşımı: son `window` başarılı isteğin p99'u * timeout_multiplier,
+  [min_timeout_ms, max_timeout_ms] aralığında. Yeterli örnek yokken
+  default_timeout_ms. Bozulan borsa 30 sn donmak yerine birkaç sn'de düşer
+- Tekrar: sadece public okumalar (market sınıfı) zaman aşımı / erişilemezlik
+  hatasında en fazla max_retries kez tekrarlanır; yeni deneme deadline_ms'i
+  (timeout * (1 + max_retries)) aşacaksa yapılmaz. Emir ve private istekler
+  tekrarlanmaz
+- Metrikler (core.metrics): exchange.rtt_ms{exchange,endpoint},
+  exchange.clock_offset_ms, exchange.timeout_ms, exchange.timeouts, exchange.retries
+
+Kullanım:
+    monitor = get_latency_monitor()
+    install(exchange, monitor, "binance")       # ExchangeRegistry bunu her istemciye yapar
+    install_async(async_exchange, monitor, "binance")   # AsyncExchangeManager
+    monitor.start()
+    monitor.stats()["binance"]   # → {"rtt_p99_ms": {"order": 180.0, ...}, "clock_offset_ms": -12.5, "timeout_ms": 2000.0}
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional
+
+import ccxt
+
+from core.metrics import MetricsRegistry, get_metrics
+from core.rate_limiter import Lane, classify_request
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Gecikme kovaları (ms)
+RTT_BUCKETS = (5, 10, 25, 50, 75, 100, 150, 250, 500, 750, 1000, 2000, 5000, 10000, 30000)
+
+# Tekrar edilebilir geçici ağ hataları
+RETRYABLE_ERRORS = (ccxt.RequestTimeout, ccxt.ExchangeNotAvailable)
+
+# Tekrar için kalan bütçe en az bu kadar zaman aşımı olmalı; son deneme kalan
+# bütçeyle sınırlanır (zaman aşımından sonra kalan tam olarak bir timeout olamaz)
+MIN_RETRY_BUDGET = 0.5
+
+
+@dataclass
+class VenueLatency:
+    """Tek borsanın gecikme durumu"""
+    name: str
+    samples: Dict[Lane, Deque[float]] = field(default_factory=dict)
+    timeout_ms: Optional[float] = None
+    clock_offset_ms: Optional[float] = None
+    probe_rtt_ms: Optional[float] = None
+    probed_at: Optional[float] = None
+    consecutive_timeouts: int = 0
+    adjusted_at: float = 0.0
+
+
+class LatencyMonitor:
+    """
+    Borsa başına RTT örnekleri, saat farkı ve uyarlanır zaman aşımı.
+
+    interval: Prob aralığı (sn)
+    window: Yüzdelik için tutulan son başarılı istek sayısı (sınıf başına)
+    min_samples: Uyarlamanın başlaması için gereken örnek sayısı
+    """
+
+    def __init__(self, interval: float = 15.0, window: int = 200, min_samples: int = 20,
+                 default_timeout_ms: float = 30000.0, min_timeout_ms: float = 2000.0,
+                 max_timeout_ms: float = 30000.0, timeout_multiplier: float = 4.0,
+                 max_retries: int = 1, max_skew_ms: float = 1000.0,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.interval = interval
+        self.window = window
+        self.min_samples = min_samples
+        self.default_timeout_ms = default_timeout_ms
+        self.min_timeout_ms = min_timeout_ms
+        self.max_timeout_ms = max_timeout_ms
+        self.timeout_multiplier = timeout_multiplier
+        self.max_retries = max_retries
+        self.max_skew_ms = max_skew_ms
+        self.metrics = metrics or get_metrics()
+        self._venues: Dict[str, VenueLatency] = {}
+        self._clients: Dict[int, tuple] = {}          # id(exchange) → (name, exchange)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def configure(self, **settings) -> None:
+        """Ayarları güncelle (config'ten; bilinmeyen anahtarlar yok sayılır)"""
+        for key, value in settings.items():
+            if value is not None and hasattr(self, key) and not key.startswith("_"):
+                setattr(self, key, type(getattr(self, key))(value))
+        with self._lock:
+            for venue in self._venues.values():
+                venue.adjusted_at = 0.0
+
+    def venue(self, name: str) -> VenueLatency:
+        venue = self._venues.get(name)
+        if venue is None:
+            with self._lock:
+                venue = self._venues.setdefault(name, VenueLatency(name))
+        return venue
+
+    # ------------------------------------------------------------------
+    # Ölçüm
+    # ------------------------------------------------------------------
+
+    def observe(self, name: str, endpoint: Lane, rtt_ms: float) -> None:
+        """Başarılı isteğin süresi"""
+        venue = self.venue(name)
+        with self._lock:
+            samples = venue.samples.get(endpoint)
+            if samples is None:
+                samples = venue.samples[endpoint] = deque(maxlen=self.window)
+            samples.append(rtt_ms)
+            venue.consecutive_timeouts = 0
+        self.metrics.histogram("exchange.rtt_ms", buckets=RTT_BUCKETS, exchange=name,
+                               endpoint=endpoint.name.lower()).observe(rtt_ms)
+        # Yüzdelik saniyede en fazla bir kez yeniden hesaplanır
+        if time.monotonic() - venue.adjusted_at >= 1.0:
+            self._adjust(venue)
+
+    def record_timeout(self, name: str, endpoint: Lane) -> None:
+        venue = self.venue(name)
+        with self._lock:
+            venue.consecutive_timeouts += 1
+        self.metrics.counter("exchange.timeouts", exchange=name, endpoint=endpoint.name.lower()).inc()
+
+    def timeout_ms(self, name: str) -> float:
+        """İstek başına zaman aşımı (ccxt exchange.timeout)"""
+        venue = self.venue(name)
+        if venue.timeout_ms is None or time.monotonic() - venue.adjusted_at >= self.interval:
+            self._adjust(venue)
+        return venue.timeout_ms
+
+    def deadline_ms(self, name: str) -> float:
+        """Tekrarlar dahil toplam süre sınırı (tekrarlanabilir okumalar için)"""
+        return self.timeout_ms(name) * (1 + self.max_retries)
+
+    def percentile(self, name: str, q: float, endpoint: Optional[Lane] = None) -> Optional[float]:
+        """Son pencerede RTT yüzdeliği (ms; endpoint None → tüm sınıflar)"""
+        venue = self.venue(name)
+        with self._lock:
+            if endpoint is None:
+                values = [v for samples in venue.samples.values() for v in samples]
+            else:
+                values = list(venue.samples.get(endpoint, ()))
+        if not values:
+            return None
+        values.sort()
+        return values[min(len(values) - 1, max(0, int(round(len(values) * q / 100.0)) - 1))]
+
+    def _adjust(self, venue: VenueLatency) -> None:
+        """p99 * çarpan → zaman aşımı (en yavaş uç nokta sınıfına göre)"""
+        with self._lock:
+            endpoints = list(venue.samples)
+            count = sum(len(samples) for samples in venue.samples.values())
+        if count < self.min_samples:
+            timeout = self.default_timeout_ms
+        else:
+            p99 = max(self.percentile(venue.name, 99, endpoint) or 0.0 for endpoint in endpoints)
+            timeout = min(max(p99 * self.timeout_multiplier, self.min_timeout_ms), self.max_timeout_ms)
+        if timeout != venue.timeout_ms:
+            if venue.timeout_ms is not None:
+                logger.debug(f"Timeout for {venue.name}: {venue.timeout_ms:.0f} → {timeout:.0f} ms")
+            venue.timeout_ms = timeout
+            self.metrics.gauge("exchange.timeout_ms", exchange=venue.name).set(timeout)
+        venue.adjusted_at = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Prob
+    # ------------------------------------------------------------------
+
+    def attach(self, name: str, exchange) -> None:
+        """Arka plan prob'una istemci ekle"""
+        with self._lock:
+            self._clients[id(exchange)] = (name, exchange)
+        self._wake.set()
+
+    def detach(self, exchange) -> None:
+        with self._lock:
+            self._clients.pop(id(exchange), None)
+
+    def probe(self, name: str, exchange) -> Optional[float]:
+        """
+        fetch_time() ile RTT ve saat farkı ölç.
+        Returns: offset (ms; sunucu ileride → pozitif) veya None
+        """
+        if not (getattr(exchange, 'has', None) or {}).get('fetchTime'):
+            return None
+        before = exchange.milliseconds()
+        try:
+            server_time = exchange.fetch_time()
+        except Exception as e:
+            logger.warning(f"Latency probe failed for {name}: {e}")
+            return None
+        after = exchange.milliseconds()
+        if server_time is None:
+            return None
+
+        offset = server_time - (before + after) / 2
+        venue = self.venue(name)
+        venue.probe_rtt_ms = after - before
+        venue.clock_offset_ms = offset
+        venue.probed_at = time.monotonic()
+        self.metrics.gauge("exchange.clock_offset_ms", exchange=name).set(offset)
+
+        options = getattr(exchange, 'options', None)
+        if isinstance(options, dict) and 'timeDifference' in options:
+            # ccxt: nonce = milliseconds() - timeDifference
+            options['timeDifference'] = -offset
+        elif abs(offset) > self.max_skew_ms:
+            logger.warning(f"Clock skew on {name}: {offset:+.0f} ms; signed requests may be rejected")
+        return offset
+
+    def probe_all(self) -> None:
+        """Bağlı her borsayı bir kez probla (aynı borsanın birden çok istemcisi varsa birini)"""
+        with self._lock:
+            clients = {}
+            for name, exchange in self._clients.values():
+                clients.setdefault(name, exchange)
+        for name, exchange in clients.items():
+            self.probe(name, exchange)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="latency-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.probe_all()
+            except Exception as e:
+                logger.error(f"Latency probe loop error: {e}")
+            self._wake.wait(self.interval)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for name, venue in list(self._venues.items()):
+            with self._lock:
+                endpoints = sorted(venue.samples)
+            result[name] = {
+                "rtt_p50_ms": {lane.name.lower(): self.percentile(name, 50, lane) for lane in endpoints},
+                "rtt_p99_ms": {lane.name.lower(): self.percentile(name, 99, lane) for lane in endpoints},
+                "probe_rtt_ms": venue.probe_rtt_ms,
+                "clock_offset_ms": venue.clock_offset_ms,
+                "timeout_ms": self.timeout_ms(name),
+                "consecutive_timeouts": venue.consecutive_timeouts,
+            }
+        return result
+
+
+_local = threading.local()
+
+
+def install(exchange, monitor: LatencyMonitor, name: str) -> None:
+    """
+    ccxt (sync) istemcisinin HTTP isteklerini ölç ve zaman aşımını uyarla.
+    sign() uç nokta sınıfını, fetch() süreyi kaydeder; her istekten önce
+    exchange.timeout monitörün değerine çekilir.
+    """
+    if getattr(exchange, "_latency_monitor", None) is monitor:
+        return
+    sign = type(exchange).sign.__get__(exchange)
+    fetch = type(exchange).fetch.__get__(exchange)
+
+    def tracked_sign(path, api='public', method='GET', params={}, headers=None, body=None):
+        _local.endpoint = classify_request(api, method, path)
+        return sign(path, api, method, params, headers, body)
+
+    def tracked_fetch(url, method='GET', headers=None, body=None):
+        endpoint = getattr(_local, "endpoint", None)
+        _local.endpoint = None
+        if endpoint is None:
+            endpoint = Lane.MARKET if method.upper() == 'GET' else Lane.ORDER
+        retryable = endpoint == Lane.MARKET
+        first = time.monotonic()
+        attempt = 0
+
+        timeout = monitor.timeout_ms(name)
+        while True:
+            exchange.timeout = timeout
+            started = time.monotonic()
+            try:
+                response = fetch(url, method, headers, body)
+            except RETRYABLE_ERRORS as e:
+                if isinstance(e, ccxt.RequestTimeout):
+                    monitor.record_timeout(name, endpoint)
+                remaining_ms = monitor.deadline_ms(name) - (time.monotonic() - first) * 1000
+                attempt += 1
+                if (not retryable or attempt > monitor.max_retries
+                        or remaining_ms < monitor.timeout_ms(name) * MIN_RETRY_BUDGET):
+                    raise
+                timeout = min(monitor.timeout_ms(name), remaining_ms)
+                monitor.metrics.counter("exchange.retries", exchange=name).inc()
+                logger.warning(f"Retrying {method} {url.split('?')[0]} on {name} after {type(e).__name__}")
+                continue
+            monitor.observe(name, endpoint, (time.monotonic() - started) * 1000)
+            return response
+
+    exchange.sign = tracked_sign
+    exchange.fetch = tracked_fetch
+    exchange.timeout = monitor.timeout_ms(name)
+    exchange._latency_monitor = monitor
+
+
+def install_async(exchange, monitor: LatencyMonitor, name: str) -> None:
+    """
+    install() karşılığı, ccxt.async_support istemcileri için (aynı ölçüm,
+    zaman aşımı ve tekrar kuralları).
+    Arka plan prob'una eklenmez (probe() senkron fetch_time() çağırır); saat
+    farkı aynı borsanın senkron istemcisinin prob sonucundan imzalamadan önce
+    options['timeDifference']'a yazılır.
+    """
+    if getattr(exchange, "_latency_monitor", None) is monitor:
+        return
+    sign = type(exchange).sign.__get__(exchange)
+    fetch = type(exchange).fetch.__get__(exchange)
+
+    def tracked_sign(path, api='public', method='GET', params={}, headers=None, body=None):
+        offset = monitor.venue(name).clock_offset_ms
+        options = getattr(exchange, 'options', None)
+        if offset is not None and isinstance(options, dict) and 'timeDifference' in options:
+            options['timeDifference'] = -offset
+        # sign() ile fetch()'in ilk satırı arasında await yok; thread-local yeterli
+        _local.endpoint = classify_request(api, method, path)
+        return sign(path, api, method, params, headers, body)
+
+    async def tracked_fetch(url, method='GET', headers=None, body=None):
+        endpoint = getattr(_local, "endpoint", None)
+        _local.endpoint = None
+        if endpoint is None:
+            endpoint = Lane.MARKET if method.upper() == 'GET' else Lane.ORDER
+        retryable = endpoint == Lane.MARKET
+        first = time.monotonic()
+        attempt = 0
+
+        timeout = monitor.timeout_ms(name)
+        while True:
+            exchange.timeout = timeout
+            started = time.monotonic()
+            try:
+                response = await fetch(url, method, headers, body)
+            except RETRYABLE_ERRORS as e:
+                if isinstance(e, ccxt.RequestTimeout):
+                    monitor.record_timeout(name, endpoint)
+                remaining_ms = monitor.deadline_ms(name) - (time.monotonic() - first) * 1000
+                attempt += 1
+                if (not retryable or attempt > monitor.max_retries
+                        or remaining_ms < monitor.timeout_ms(name) * MIN_RETRY_BUDGET):
+                    raise
+                timeout = min(monitor.timeout_ms(name), remaining_ms)
+                monitor.metrics.counter("exchange.retries", exchange=name).inc()
+                logger.warning(f"Retrying {method} {url.split('?')[0]} on {name} after {type(e).__name__}")
+                continue
+            monitor.observe(name, endpoint, (time.monotonic() - started) * 1000)
+            return response
+
+    exchange.sign = tracked_sign
+    exchange.fetch = tracked_fetch
+    exchange.timeout = monitor.timeout_ms(name)
+    exchange._latency_monitor = monitor
+
+
+# Singleton instance
+_monitor_instance: Optional[LatencyMonitor] = None
+
+
+def get_latency_monitor() -> LatencyMonitor:
+    """Get singleton LatencyMonitor instance"""
+    global _monitor_instance
+    if _monitor_instance is None:
+        _monitor_instance = LatencyMonitor()
+    return _monitor_instance
@@ -0,0 +1,403 @@
+"""
+core/market_cache.py
+
+Borsa başına paylaşılan market metadata önbelleği.
+- Her yeni ccxt örneği load_markets() ile tüm market listesini (yüzlerce KB,
+  bazı borsalarda birkaç saniye) yeniden indirir; bu modül listeyi borsa
+  başına bir kez tutar ve exchange.set_markets() ile örneğe enjekte eder
+- Bellekte + diskte (data/cache/markets/<anahtar>.json) TTL ile saklanır;
+  soğuk başlangıç diskten okunur, süresi dolmuş veri hemen döner ve arka
+  planda yenilenir
+- Yenileme tam market listesini indirir (borsaların fark/koşullu istek desteği
+  yok; tasarruf TTL ve paylaşımdan gelir). Parmak izi farkı sadece yeniden
+  indekslemeyi değişen marketlerle sınırlar; hiçbir şey değişmediyse bağlı
+  örneklere set_markets tekrarlanmaz
+- Sembol araması, precision ve limitler base/quote'a göre indekslenir
+- add_listener() ile kaydedilen fonksiyonlar her diskten yüklemede ve değişen
+  yenilemede (anahtar, marketler) ile çağrılır (ör. sesli komut sembol sözlüğü)
+
+Kullanım:
+    markets = load_markets(exchange)              # exchange.load_markets() yerine
+    markets = await load_markets_async(exchange) # ccxt.async_support örnekleri
+    cache = get_market_cache(exchange)
+    cache.find("BTCUSDT")                         # → "BTC/USDT" / "BTC/USDT:USDT"
+    cache.precision("BTC/USDT:USDT"), cache.limits("BTC/USDT:USDT")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "markets"
+DEFAULT_TTL = 3600.0        # sn
+CACHE_FORMAT_VERSION = 1
+
+
+def cache_key(exchange) -> str:
+    """Borsa + market tipi + sandbox → önbellek anahtarı ("binance-future-sandbox")"""
+    options = getattr(exchange, "options", None) or {}
+    urls = getattr(exchange, "urls", None) or {}
+    sandbox = bool(options.get("sandboxMode") or urls.get("apiBackup"))
+    key = f"{exchange.id}-{options.get('defaultType') or 'default'}"
+    return key + "-sandbox" if sandbox else key
+
+
+def _fingerprint(market: Dict[str, Any]) -> str:
+    payload = json.dumps(market, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+class MarketCache:
+    """
+    Tek borsa için market metadata önbelleği (thread-safe).
+
+    key: cache_key(exchange) ("binance-future-sandbox"); disk dosyasının adı
+    wall_clock: TTL ve disk zaman damgaları için zaman kaynağı (testlerde değiştirilebilir)
+    """
+
+    def __init__(self, key: str, cache_dir: Path = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL,
+                 wall_clock: Callable[[], float] = time.time):
+        self.key = key
+        self.path = Path(cache_dir) / f"{key}.json"
+        self.ttl = ttl
+        self._clock = wall_clock
+        self._lock = threading.RLock()
+        self._refreshing = False
+        self._refresh_thread: Optional[threading.Thread] = None
+
+        self._markets: Dict[str, Dict[str, Any]] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._fetched_at = 0.0
+        self._version = 0           # Her değişiklikte artar; attach() gereksiz set_markets'i atlar
+
+        # İndeksler
+        self._by_id: Dict[str, List[str]] = {}          # "BTCUSDT" → ["BTC/USDT", "BTC/USDT:USDT"]
+        self._by_pair: Dict[Tuple[str, str], List[str]] = {}   # ("BTC", "USDT") → semboller
+        self._by_base: Dict[str, List[str]] = {}
+
+    # ------------------------------------------------------------------
+    # Durum
+    # ------------------------------------------------------------------
+
+    @property
+    def markets(self) -> Dict[str, Dict[str, Any]]:
+        return self._markets
+
+    @property
+    def age(self) -> float:
+        return self._clock() - self._fetched_at if self._fetched_at else float("inf")
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self._markets)
+
+    @property
+    def is_stale(self) -> bool:
+        return self.age > self.ttl
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    # ------------------------------------------------------------------
+    # Yükleme
+    # ------------------------------------------------------------------
+
+    def get(self, exchange=None, reload: bool = False, background: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Marketleri döndür; gerekiyorsa diskten oku veya borsadan indir.
+
+        reload: TTL'ye bakmadan borsadan yenile (bloklayarak)
+        background: Süresi dolmuş veri varken yenilemeyi arka planda yap
+        """
+        with self._lock:
+            if not self._markets:
+                self.load_from_disk()
+
+            if exchange is not None and (reload or not self._markets):
+                self.refresh(exchange)
+            elif exchange is not None and self.is_stale:
+                if background:
+                    self._refresh_in_background(exchange)
+                else:
+                    self.refresh(exchange)
+            return self._markets
+
+    def attach(self, exchange, reload: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Önbelleği ccxt örneğine enjekte et; sonraki load_markets() ağ kullanmaz."""
+        markets = self.get(exchange, reload=reload)
+        with self._lock:
+            if markets and getattr(exchange, "_market_cache_version", None) != self._version:
+                exchange.set_markets(list(markets.values()))
+                exchange._market_cache_version = self._version
+        return exchange.markets or markets
+
+    def refresh(self, exchange=None, loader: Optional[Callable[[], Any]] = None) -> Tuple[int, int, int]:
+        """
+        Market listesinin tamamını indir ve farkı uygula (indirme artımlı değildir;
+        fark sadece yeniden indekslenecek marketleri belirler).
+        Returns: (eklenen, çıkarılan, değişen)
+        """
+        loader = loader or exchange.fetch_markets
+        fetched = loader()
+        if isinstance(fetched, dict):
+            fetched = list(fetched.values())
+        return self.apply(fetched)
+
+    def apply(self, market_list: List[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """Yeni market listesini uygula; sadece değişen marketler yeniden indekslenir."""
+        incoming = {m["symbol"]: m for m in market_list if m and m.get("symbol")}
+        with self._lock:
+            removed = [s for s in self._markets if s not in incoming]
+            added, changed = [], []
+            for symbol, market in incoming.items():
+                fp = _fingerprint(market)
+                old_fp = self._fingerprints.get(symbol)
+                if old_fp is None:
+                    added.append(symbol)
+                elif old_fp != fp:
+                    changed.append(symbol)
+                else:
+                    continue
+                self._fingerprints[symbol] = fp
+
+            for symbol in removed + changed:
+                self._unindex(self._markets.pop(symbol))
+            for symbol in removed:
+                self._fingerprints.pop(symbol, None)
+            for symbol in added + changed:
+                self._markets[symbol] = incoming[symbol]
+                self._index(incoming[symbol])
+
+            self._fetched_at = self._clock()
+            if added or removed or changed:
+                self._version += 1
+            self._save_to_disk()
+
+        if added or removed or changed:
+            logger.info(f"Market cache {self.key}: +{len(added)} -{len(removed)} ~{len(changed)} "
+                        f"(total {len(self._markets)})")
+            _notify_listeners(self.key, dict(self._markets))
+        return len(added), len(removed), len(changed)
+
+    def _refresh_in_background(self, exchange) -> None:
+        if self._refreshing:
+            return
+        self._refreshing = True
+
+        def run():
+            try:
+                self.refresh(exchange)
+            except Exception as e:
+                logger.warning(f"Market cache {self.key} background refresh failed: {e}")
+            finally:
+                self._refreshing = False
+
+        self._refresh_thread = threading.Thread(target=run, name=f"market-cache-{self.key}", daemon=True)
+        self._refresh_thread.start()
+
+    def wait_for_refresh(self, timeout: Optional[float] = None) -> None:
+        """Arka plan yenilemesi bitene kadar bekle (testler / kapanış)"""
+        thread = self._refresh_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Disk
+    # ------------------------------------------------------------------
+
+    def load_from_disk(self) -> bool:
+        """Diskteki önbelleği yükle (süresi dolmuş olsa bile; tazeliği TTL belirler)"""
+        if not self.path.exists():
+            return False
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("version") != CACHE_FORMAT_VERSION:
+                return False
+            markets = payload.get("markets") or {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Market cache {self.path} unreadable: {e}")
+            return False
+
+        with self._lock:
+            self._markets, self._fingerprints = {}, {}
+            self._by_id, self._by_pair, self._by_base = {}, {}, {}
+            for symbol, market in markets.items():
+                self._markets[symbol] = market
+                self._fingerprints[symbol] = _fingerprint(market)
+                self._index(market)
+            self._fetched_at = float(payload.get("fetched_at", 0.0))
+            self._version += 1
+
+        logger.info(f"Market cache {self.key} loaded from disk: {len(markets)} markets "
+                    f"({self.age:.0f}s old)")
+        _notify_listeners(self.key, dict(self._markets))
+        return True
+
+    def _save_to_disk(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump({
+                    "version": CACHE_FORMAT_VERSION,
+                    "exchange": self.key,
+                    "fetched_at": self._fetched_at,
+                    "markets": self._markets,
+                }, f, default=str)
+            tmp.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Market cache {self.path} could not be saved: {e}")
+
+    # ------------------------------------------------------------------
+    # Sorgular
+    # ------------------------------------------------------------------
+
+    def market(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Sembol ("BTC/USDT:USDT", "BTC/USDT", "BTCUSDT") → market dict"""
+        found = self.find(symbol)
+        return self._markets.get(found) if found else None
+
+    def find(self, symbol: str, market_type: Optional[str] = None) -> Optional[str]:
+        """
+        Herhangi bir yazımı ccxt unified sembolüne çevir.
+        market_type: "swap" / "future" / "spot" verilirse o tip tercih edilir
+        """
+        if symbol in self._markets and (market_type is None or self._markets[symbol].get("type") == market_type):
+            return symbol
+
+        s = symbol.upper().split(":")[0]
+        if "/" in s:
+            base, _, quote = s.partition("/")
+            candidates = self._by_pair.get((base, quote), [])
+        else:
+            candidates = self._by_id.get(s, [])
+        if market_type is not None:
+            candidates = [c for c in candidates if self._markets[c].get("type") == market_type] or []
+        return candidates[0] if candidates else None
+
+    def symbols_for(self, base: str, quote: Optional[str] = None) -> List[str]:
+        """Base (+ quote) için tüm sembolleri döndür"""
+        if quote:
+            return list(self._by_pair.get((base.upper(), quote.upper()), []))
+        return list(self._by_base.get(base.upper(), []))
+
+    def precision(self, symbol: str) -> Dict[str, Any]:
+        market = self.market(symbol)
+        return dict(market.get("precision") or {}) if market else {}
+
+    def limits(self, symbol: str) -> Dict[str, Any]:
+        market = self.market(symbol)
+        return dict(market.get("limits") or {}) if market else {}
+
+    # ------------------------------------------------------------------
+    # İndeks
+    # ------------------------------------------------------------------
+
+    def _index_keys(self, market: Dict[str, Any]):
+        base = (market.get("base") or "").upper()
+        quote = (market.get("quote") or "").upper()
+        yield self._by_base, base
+        yield self._by_pair, (base, quote)
+        yield self._by_id, base + quote
+        market_id = str(market.get("id") or "").upper()
+        if market_id and market_id != base + quote:
+            yield self._by_id, market_id
+
+    def _index(self, market: Dict[str, Any]) -> None:
+        symbol = market["symbol"]
+        for table, key in self._index_keys(market):
+            bucket = table.setdefault(key, [])
+            if symbol not in bucket:
+                bucket.append(symbol)
+                # Spot önce (ccxt set_markets ile aynı öncelik), sonra alfabetik
+                bucket.sort(key=lambda s: (not self._markets.get(s, market).get("spot", False), s))
+
+    def _unindex(self, market: Dict[str, Any]) -> None:
+        symbol = market["symbol"]
+        for table, key in self._index_keys(market):
+            bucket = table.get(key)
+            if bucket and symbol in bucket:
+                bucket.remove(symbol)
+                if not bucket:
+                    del table[key]
+
+
+# Borsa anahtarı → önbellek
+_caches: Dict[str, MarketCache] = {}
+_caches_lock = threading.Lock()
+_settings = {"cache_dir": DEFAULT_CACHE_DIR, "ttl": DEFAULT_TTL}
+_listeners: List[Callable[[str, Dict[str, Dict[str, Any]]], None]] = []
+
+
+def add_listener(callback: Callable[[str, Dict[str, Dict[str, Any]]], None]) -> None:
+    """Market listesi yüklenince / değişince (anahtar, marketler) ile çağrılır (yükleyen thread'de)"""
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def remove_listener(callback) -> None:
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def _notify_listeners(key: str, markets: Dict[str, Dict[str, Any]]) -> None:
+    for callback in list(_listeners):
+        try:
+            callback(key, markets)
+        except Exception as e:
+            logger.error(f"Market cache listener failed for {key}: {e}")
+
+
+def configure(cache_dir: Optional[Path] = None, ttl: Optional[float] = None) -> None:
+    """Yeni oluşturulacak önbelleklerin disk dizini ve TTL'si"""
+    if cache_dir is not None:
+        _settings["cache_dir"] = Path(cache_dir)
+    if ttl is not None:
+        _settings["ttl"] = float(ttl)
+        with _caches_lock:
+            for cache in _caches.values():
+                cache.ttl = float(ttl)
+
+
+def get_market_cache(exchange_or_key) -> MarketCache:
+    """Borsa başına tek MarketCache (ccxt örneği veya anahtar string'i)"""
+    key = exchange_or_key if isinstance(exchange_or_key, str) else cache_key(exchange_or_key)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = MarketCache(key, cache_dir=_settings["cache_dir"], ttl=_settings["ttl"])
+            _caches[key] = cache
+        return cache
+
+
+def load_markets(exchange, reload: bool = False) -> Dict[str, Dict[str, Any]]:
+    """exchange.load_markets() yerine: paylaşılan önbellekten doldurur."""
+    return get_market_cache(exchange).attach(exchange, reload=reload)
+
+
+async def load_markets_async(exchange, reload: bool = False) -> Dict[str, Dict[str, Any]]:
+    """load_markets() karşılığı ccxt.async_support örnekleri için (event loop içinde)."""
+    cache = get_market_cache(exchange)
+    markets = cache.get()      # Sadece bellek / disk
+    if reload or not markets or cache.is_stale:
+        cache.apply(await exchange.fetch_markets())
+    # Önbellek artık taze; attach() ağ çağrısı yapmaz
+    return cache.attach(exchange)
+
+
+def clear_caches() -> None:
+    """Bellekteki tüm önbellekleri bırak (disk dosyaları kalır)"""
+    with _caches_lock:
+        _caches.clear()
@@ -0,0 +1,313 @@
+"""
+core/market_data_hub.py
+
+Tek upstream, çok abone market verisi.
+- (borsa, sembol) başına bir besleme: WebSocket akışı (core.market_stream),
+  art arda bağlanamazsa REST polling; abone sayısı arttıkça istek sayısı artmaz
+- Son durum bellekte MarketSnapshot olarak tutulur (zaman damgalı);
+  emir öncesi fiyat sorgusu ağ yerine bellek okumasıdır
+- İlk abone beslemeyi başlatır, son abone ayrılınca besleme durur
+
+Kullanım:
+    hub = get_market_data_hub()
+    sub = hub.subscribe("binance", "BTC/USDT:USDT", on_update=print)
+    hub.get_price("binance", "BTCUSDT", max_age=5.0)   # → 64250.2 veya None (bayat/yok)
+    hub.unsubscribe(sub)
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.market_stream import MarketStream, get_adapter, market_id
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class MarketSnapshot:
+    """(borsa, sembol) için son bilinen fiyat durumu"""
+    exchange: str
+    symbol: str                      # "BTCUSDT"
+    best_bid: Optional[float] = None
+    best_ask: Optional[float] = None
+    last: Optional[float] = None
+    volume: float = 0.0
+    change_24h: float = 0.0
+    high_24h: float = 0.0
+    low_24h: float = 0.0
+    source: str = ""                 # "stream" / "rest"
+    updated_at: float = field(default_factory=time.monotonic)
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def age(self) -> float:
+        """Son güncellemeden bu yana geçen süre (sn)"""
+        return time.monotonic() - self.updated_at
+
+    def is_stale(self, max_age: float) -> bool:
+        return self.age > max_age
+
+    @property
+    def mid(self) -> Optional[float]:
+        if self.best_bid and self.best_ask:
+            return (self.best_bid + self.best_ask) / 2
+        return self.last
+
+    def to_price_data(self) -> Dict[str, Any]:
+        """PriceUpdateThread.price_updated sözlüğü"""
+        return {
+            'best_bid': self.best_bid,
+            'best_ask': self.best_ask,
+            'current_price': self.last,
+            'volume': self.volume,
+            'change_24h': self.change_24h,
+            'high_24h': self.high_24h,
+            'low_24h': self.low_24h,
+        }
+
+
+@dataclass
+class Subscription:
+    """subscribe() dönüşü; unsubscribe() için anahtar"""
+    id: int
+    key: Tuple[str, str]
+    on_update: Callable[[Dict[str, Any]], None]
+    on_error: Optional[Callable[[str], None]] = None
+
+
+class _Feed(threading.Thread):
+    """Tek (borsa, sembol) için upstream: WebSocket, başarısızsa REST polling"""
+
+    STREAM_MAX_FAILURES = 3       # Art arda başarısız WebSocket bağlantısı → REST
+    REST_FALLBACK_SECONDS = 60    # REST polling süresi, sonra WebSocket tekrar denenir
+    REST_INTERVAL = 1.0
+    REST_ERROR_BACKOFF = 5.0
+
+    def __init__(self, hub: "MarketDataHub", exchange_name: str, symbol: str,
+                 rest_exchange=None, sandbox: bool = True, use_stream: bool = True):
+        super().__init__(name=f"market-feed-{exchange_name}-{market_id(symbol)}", daemon=True)
+        self.hub = hub
+        self.exchange_name = exchange_name
+        self.symbol = symbol if ':' in symbol or '/' not in symbol else f"{symbol}:USDT"
+        self.rest_exchange = rest_exchange
+        self.sandbox = sandbox
+        self.use_stream = use_stream
+        self.running = True
+        self.stream: Optional[MarketStream] = None
+        self._wake = threading.Event()
+
+    def stop(self) -> None:
+        self.running = False
+        self._wake.set()
+        if self.stream is not None:
+            self.stream.stop()
+
+    def run(self) -> None:
+        key = (self.exchange_name, market_id(self.symbol))
+        adapter = get_adapter(self.exchange_name) if self.use_stream else None
+        logger.info(f"Market feed started for {self.exchange_name} {self.symbol}")
+
+        while self.running:
+            if adapter is not None:
+                self.stream = MarketStream(
+                    adapter, self.symbol,
+                    lambda data: self.hub.publish(*key, data, source="stream"),
+                    sandbox=self.sandbox,
+                    url=self.hub.stream_urls.get(self.exchange_name),
+                )
+                if not self.running or self.stream.run(max_failures=self.STREAM_MAX_FAILURES):
+                    break
+                logger.warning(f"WebSocket feed unavailable, polling REST for {self.REST_FALLBACK_SECONDS}s")
+                self._poll_rest(key, self.REST_FALLBACK_SECONDS)
+            else:
+                self._poll_rest(key)
+
+        logger.info(f"Market feed stopped for {self.exchange_name} {self.symbol}")
+
+    def _rest_exchange(self):
+        if self.rest_exchange is None:
+            from core.exchange_manager import get_exchange_manager
+            self.rest_exchange = get_exchange_manager().get_exchange(self.exchange_name)
+        return self.rest_exchange
+
+    def _poll_rest(self, key: Tuple[str, str], duration: Optional[float] = None) -> None:
+        """REST polling (1 Hz); duration verilirse o kadar saniye sonra döner"""
+        ccxt_symbol = self.symbol if '/' in self.symbol else f"{self.symbol[:-4]}/USDT:USDT"
+        deadline = time.monotonic() + duration if duration else None
+        while self.running and (deadline is None or time.monotonic() < deadline):
+            try:
+                exchange = self._rest_exchange()
+                if exchange is None:
+                    raise RuntimeError(f"{self.exchange_name} not connected")
+
+                ticker = exchange.fetch_ticker(ccxt_symbol)
+                # Binance minimum 5
+                orderbook = exchange.fetch_order_book(ccxt_symbol, limit=5)
+
+                self.hub.publish(*key, {
+                    'best_bid': orderbook['bids'][0][0] if orderbook['bids'] else None,
+                    'best_ask': orderbook['asks'][0][0] if orderbook['asks'] else None,
+                    'current_price': ticker.get('last'),
+                    'volume': ticker.get('quoteVolume', 0.0),
+                    'change_24h': ticker.get('percentage', 0.0),
+                    'high_24h': ticker.get('high', 0.0),
+                    'low_24h': ticker.get('low', 0.0),
+                }, source="rest")
+                wait = self.REST_INTERVAL
+            except Exception as e:
+                logger.error(f"Price fetch error: {e}")
+                self.hub.publish_error(*key, str(e))
+                wait = self.REST_ERROR_BACKOFF
+            if self._wake.wait(wait):
+                return
+
+
+class MarketDataHub:
+    """
+    (borsa, sembol) başına tek besleme, çok abone.
+
+    use_stream: False ise sadece REST polling (testler / adaptörsüz kurulum)
+    stream_urls: Borsa → WebSocket URL'si (adaptör URL'sini ezer; yerel sahte borsa)
+    """
+
+    def __init__(self, use_stream: bool = True, stream_urls: Optional[Dict[str, str]] = None):
+        self.use_stream = use_stream
+        self.stream_urls: Dict[str, str] = {k.lower(): v for k, v in (stream_urls or {}).items()}
+        self._lock = threading.RLock()
+        self._snapshots: Dict[Tuple[str, str], MarketSnapshot] = {}
+        self._subscribers: Dict[Tuple[str, str], List[Subscription]] = {}
+        self._feeds: Dict[Tuple[str, str], _Feed] = {}
+        self._ids = itertools.count(1)
+
+    @staticmethod
+    def key(exchange_name: str, symbol: str) -> Tuple[str, str]:
+        return (exchange_name or '').lower(), market_id(symbol)
+
+    # ------------------------------------------------------------------
+    # Abonelik
+    # ------------------------------------------------------------------
+
+    def subscribe(self, exchange_name: str, symbol: str,
+                  on_update: Callable[[Dict[str, Any]], None],
+                  on_error: Optional[Callable[[str], None]] = None,
+                  rest_exchange=None, sandbox: bool = True) -> Subscription:
+        """
+        Abone ol; (borsa, sembol) için besleme yoksa başlatılır.
+        rest_exchange: REST yedeği için ccxt örneği (yoksa ExchangeManager'dan alınır)
+        """
+        key = self.key(exchange_name, symbol)
+        sub = Subscription(next(self._ids), key, on_update, on_error)
+        with self._lock:
+            self._subscribers.setdefault(key, []).append(sub)
+            feed = self._feeds.get(key)
+            if feed is None or not feed.running:
+                feed = _Feed(self, key[0], symbol, rest_exchange, sandbox, self.use_stream)
+                self._feeds[key] = feed
+                feed.start()
+            elif feed.rest_exchange is None and rest_exchange is not None:
+                feed.rest_exchange = rest_exchange
+            snapshot = self._snapshots.get(key)
+
+        # Yeni abone son bilinen fiyatı beklemeden alır
+        if snapshot is not None:
+            on_update(snapshot.to_price_data())
+        return sub
+
+    def unsubscribe(self, sub: Optional[Subscription]) -> None:
+        """Aboneliği bırak; son abone ise besleme durdurulur"""
+        if sub is None:
+            return
+        with self._lock:
+            subs = self._subscribers.get(sub.key, [])
+            subs[:] = [s for s in subs if s.id != sub.id]
+            if subs:
+                return
+            self._subscribers.pop(sub.key, None)
+            feed = self._feeds.pop(sub.key, None)
+        if feed is not None:
+            feed.stop()
+
+    def subscriber_count(self, exchange_name: str, symbol: str) -> int:
+        return len(self._subscribers.get(self.key(exchange_name, symbol), ()))
+
+    @property
+    def feed_count(self) -> int:
+        return len(self._feeds)
+
+    # ------------------------------------------------------------------
+    # Yayın
+    # ------------------------------------------------------------------
+
+    def publish(self, exchange_name: str, symbol: str, price_data: Dict[str, Any], source: str = "") -> None:
+        """Upstream'den gelen fiyatı sakla ve abonelere dağıt"""
+        key = self.key(exchange_name, symbol)
+        snapshot = MarketSnapshot(
+            exchange=key[0], symbol=key[1],
+            best_bid=price_data.get('best_bid'),
+            best_ask=price_data.get('best_ask'),
+            last=price_data.get('current_price'),
+            volume=price_data.get('volume') or 0.0,
+            change_24h=price_data.get('change_24h') or 0.0,
+            high_24h=price_data.get('high_24h') or 0.0,
+            low_24h=price_data.get('low_24h') or 0.0,
+            source=source,
+        )
+        with self._lock:
+            self._snapshots[key] = snapshot
+            subs = list(self._subscribers.get(key, ()))
+
+        data = snapshot.to_price_data()
+        for sub in subs:
+            try:
+                sub.on_update(data)
+            except Exception as e:
+                logger.error(f"Market data subscriber error: {e}")
+
+    def publish_error(self, exchange_name: str, symbol: str, message: str) -> None:
+        with self._lock:
+            subs = list(self._subscribers.get(self.key(exchange_name, symbol), ()))
+        for sub in subs:
+            if sub.on_error is not None:
+                sub.on_error(message)
+
+    # ------------------------------------------------------------------
+    # Sorgu (bellekten)
+    # ------------------------------------------------------------------
+
+    def latest(self, exchange_name: str, symbol: str) -> Optional[MarketSnapshot]:
+        """Son snapshot (yaşına bakmadan)"""
+        return self._snapshots.get(self.key(exchange_name, symbol))
+
+    def get_price(self, exchange_name: str, symbol: str, max_age: float = 5.0) -> Optional[float]:
+        """max_age saniyeden taze son fiyat; yoksa None (çağıran REST'e gider)"""
+        snapshot = self.latest(exchange_name, symbol)
+        if snapshot is None or snapshot.last is None or snapshot.is_stale(max_age):
+            return None
+        return snapshot.last
+
+    def stop_all(self) -> None:
+        """Tüm beslemeleri durdur (uygulama kapanışı)"""
+        with self._lock:
+            feeds = list(self._feeds.values())
+            self._feeds.clear()
+            self._subscribers.clear()
+        for feed in feeds:
+            feed.stop()
+
+
+# Singleton instance
+_hub_instance: Optional[MarketDataHub] = None
+
+
+def get_market_data_hub() -> MarketDataHub:
+    """Get singleton MarketDataHub instance"""
+    global _hub_instance
+    if _hub_instance is None:
+        _hub_instance = MarketDataHub()
+    return _hub_instance
@@ -0,0 +1,307 @@
+"""
+core/market_stream.py
+
+WebSocket ticker + en iyi alış/satış (book top) akışı.
+- 1 Hz REST polling (fetch_ticker + fetch_order_book) yerine borsanın push
+  akışı: saniyede iki REST isteği ve rate-limit bütçesi harcanmaz
+- Kopmada üstel bekleme ile yeniden bağlanır ve abonelikleri yeniler;
+  stale_timeout boyunca mesaj gelmezse bağlantı ölü sayılır
+- Çıktı PriceUpdateThread.price_updated ile aynı sözlüktür (price_payload)
+- Adaptörü olmayan borsalar veya art arda başarısız bağlantılar için
+  çağıran taraf REST polling'e geri döner
+
+Kullanım:
+    stream = MarketStream(get_adapter("binance"), "BTC/USDT:USDT", on_update=print)
+    stream.run(max_failures=3)      # stop() çağrılana veya hata limiti aşılana kadar bloklar
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import websocket
+    _HAS_WEBSOCKET = True
+except ImportError:
+    websocket = None
+    _HAS_WEBSOCKET = False
+
+
+def price_payload(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Akış durumunu PriceUpdateThread.price_updated sözlüğüne çevir"""
+    return {
+        'best_bid': state.get('best_bid'),
+        'best_ask': state.get('best_ask'),
+        'current_price': state.get('current_price'),
+        'volume': state.get('volume', 0.0),
+        'change_24h': state.get('change_24h', 0.0),
+        'high_24h': state.get('high_24h', 0.0),
+        'low_24h': state.get('low_24h', 0.0),
+    }
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def market_id(symbol: str) -> str:
+    """"BTC/USDT:USDT" / "BTC/USDT" / "BTCUSDT" → "BTCUSDT" """
+    return symbol.split(':')[0].replace('/', '').upper()
+
+
+class StreamAdapter:
+    """Borsaya özgü URL, abonelik ve mesaj çözümleme"""
+
+    name = ""
+    url = ""
+    sandbox_url = ""
+    heartbeat_interval: Optional[float] = None   # İstemci ping'i gerekiyorsa (sn)
+
+    def endpoint(self, sandbox: bool = False) -> str:
+        return self.sandbox_url if sandbox and self.sandbox_url else self.url
+
+    def subscribe_messages(self, symbol: str) -> List[str]:
+        raise NotImplementedError
+
+    def heartbeat_message(self) -> Optional[str]:
+        return None
+
+    def parse(self, message: Dict[str, Any], state: Dict[str, Any]) -> bool:
+        """Mesajı state'e uygula; fiyat alanı değiştiyse True"""
+        raise NotImplementedError
+
+
+class BinanceFuturesAdapter(StreamAdapter):
+    """Binance USDⓈ-M futures: <symbol>@ticker + <symbol>@bookTicker"""
+
+    name = "binance"
+    url = "wss://fstream.binance.com/stream"
+    sandbox_url = "wss://stream.binancefuture.com/stream"
+
+    def subscribe_messages(self, symbol: str) -> List[str]:
+        stream = market_id(symbol).lower()
+        return [json.dumps({
+            "method": "SUBSCRIBE",
+            "params": [f"{stream}@ticker", f"{stream}@bookTicker"],
+            "id": 1,
+        })]
+
+    def parse(self, message: Dict[str, Any], state: Dict[str, Any]) -> bool:
+        # Combined stream: {"stream": "...", "data": {...}}; abonelik yanıtı: {"result": null, "id": 1}
+        data = message.get('data', message)
+        event = data.get('e')
+        if event == '24hrTicker':
+            state.update({
+                'current_price': _float(data.get('c')),
+                'volume': _float(data.get('q')) or 0.0,
+                'change_24h': _float(data.get('P')) or 0.0,
+                'high_24h': _float(data.get('h')) or 0.0,
+                'low_24h': _float(data.get('l')) or 0.0,
+            })
+            return True
+        if event == 'bookTicker' or ('b' in data and 'a' in data and 'u' in data):
+            state['best_bid'] = _float(data.get('b'))
+            state['best_ask'] = _float(data.get('a'))
+            return True
+        return False
+
+
+class BybitLinearAdapter(StreamAdapter):
+    """Bybit v5 linear: tickers.<SYMBOL> (snapshot + delta; bid1/ask1 dahil)"""
+
+    name = "bybit"
+    url = "wss://stream.bybit.com/v5/public/linear"
+    sandbox_url = "wss://stream-testnet.bybit.com/v5/public/linear"
+    heartbeat_interval = 20.0
+
+    FIELDS = {
+        'lastPrice': 'current_price',
+        'bid1Price': 'best_bid',
+        'ask1Price': 'best_ask',
+        'turnover24h': 'volume',
+        'highPrice24h': 'high_24h',
+        'lowPrice24h': 'low_24h',
+    }
+
+    def subscribe_messages(self, symbol: str) -> List[str]:
+        return [json.dumps({"op": "subscribe", "args": [f"tickers.{market_id(symbol)}"]})]
+
+    def heartbeat_message(self) -> Optional[str]:
+        return json.dumps({"op": "ping"})
+
+    def parse(self, message: Dict[str, Any], state: Dict[str, Any]) -> bool:
+        if not str(message.get('topic', '')).startswith('tickers.'):
+            return False
+        data = message.get('data') or {}
+        updated = False
+        # Delta mesajlarında sadece değişen alanlar gelir
+        for key, field in self.FIELDS.items():
+            if key in data:
+                state[field] = _float(data[key])
+                updated = True
+        if 'price24hPcnt' in data:
+            pct = _float(data['price24hPcnt'])
+            state['change_24h'] = pct * 100 if pct is not None else 0.0
+            updated = True
+        return updated
+
+
+ADAPTERS = {
+    'binance': BinanceFuturesAdapter,
+    'bybit': BybitLinearAdapter,
+}
+
+
+def get_adapter(exchange_name: str) -> Optional[StreamAdapter]:
+    """Borsa için akış adaptörü (yoksa None → REST polling)"""
+    adapter_class = ADAPTERS.get((exchange_name or '').lower())
+    return adapter_class() if adapter_class else None
+
+
+class MarketStream:
+    """
+    Tek sembol için yeniden bağlanan WebSocket akışı.
+
+    on_update: price_payload sözlüğü ile çağrılır (en fazla min_interval'da bir)
+    url: Adaptör URL'sini ezmek için (testlerde yerel sunucu)
+    """
+
+    def __init__(self, adapter: StreamAdapter, symbol: str,
+                 on_update: Callable[[Dict[str, Any]], None],
+                 sandbox: bool = False, url: Optional[str] = None,
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0,
+                 stale_timeout: float = 10.0, min_interval: float = 0.1,
+                 connect: Optional[Callable[..., Any]] = None):
+        self.adapter = adapter
+        self.symbol = symbol
+        self.on_update = on_update
+        self.url = url or adapter.endpoint(sandbox)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.stale_timeout = stale_timeout
+        self.min_interval = min_interval
+        self._connect = connect or (websocket.create_connection if _HAS_WEBSOCKET else None)
+
+        self.state: Dict[str, Any] = {}
+        self.connected = False
+        self.connections = 0
+        self.messages = 0
+        self._ws = None
+        self._stop = threading.Event()
+        self._last_emit = 0.0
+        self._pending = False
+
+    @property
+    def available(self) -> bool:
+        return self._connect is not None
+
+    def stop(self) -> None:
+        """run() döngüsünü sonlandır (başka thread'den çağrılabilir)"""
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def run(self, max_failures: Optional[int] = None) -> bool:
+        """
+        stop() çağrılana kadar bağlan/oku/yeniden bağlan.
+        max_failures: Veri alınamadan art arda bu kadar bağlantı denemesi
+                      başarısız olursa False döner (çağıran REST'e geçer)
+        Returns: True = stop() ile bitti
+        """
+        if not self.available:
+            logger.warning("websocket-client not installed, market stream unavailable")
+            return False
+
+        failures = 0
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            received = self._session()
+            if self._stop.is_set():
+                break
+            if received:
+                failures, delay = 0, self.reconnect_delay
+            else:
+                failures += 1
+                if max_failures is not None and failures >= max_failures:
+                    logger.warning(f"Market stream {self.url} failed {failures} times, giving up")
+                    return False
+            logger.info(f"Market stream reconnecting in {delay:.1f}s")
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, self.max_reconnect_delay)
+        return True
+
+    def _session(self) -> bool:
+        """Tek bağlantı ömrü; en az bir fiyat güncellemesi alındıysa True"""
+        received = False
+        try:
+            self._ws = self._connect(self.url, timeout=self.stale_timeout)
+            self.connected = True
+            self.connections += 1
+            for message in self.adapter.subscribe_messages(self.symbol):
+                self._ws.send(message)
+            logger.info(f"Market stream connected: {self.url} ({self.symbol})")
+
+            last_heartbeat = time.monotonic()
+            while not self._stop.is_set():
+                raw = self._ws.recv()
+                if not raw:
+                    raise ConnectionError("stream closed")
+                self.messages += 1
+                if self._handle(raw):
+                    received = True
+
+                interval = self.adapter.heartbeat_interval
+                if interval and time.monotonic() - last_heartbeat >= interval:
+                    self._ws.send(self.adapter.heartbeat_message())
+                    last_heartbeat = time.monotonic()
+        except Exception as e:
+            if not self._stop.is_set():
+                logger.warning(f"Market stream error ({self.symbol}): {e}")
+        finally:
+            self.connected = False
+            if self._ws is not None:
+                try:
+                    self._ws.close()
+                except Exception:
+                    pass
+                self._ws = None
+            self._flush()
+        return received
+
+    def _handle(self, raw) -> bool:
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            return False
+        if not isinstance(message, dict) or not self.adapter.parse(message, self.state):
+            return False
+
+        self._pending = True
+        if time.monotonic() - self._last_emit >= self.min_interval:
+            self._flush()
+        return True
+
+    def _flush(self) -> None:
+        if self._pending and self.state.get('current_price') is not None:
+            self._pending = False
+            self._last_emit = time.monotonic()
+            self.on_update(price_payload(self.state))
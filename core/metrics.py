@@ -0,0 +1,175 @@
+"""
+core/metrics.py
+
+Süreç içi metrik yüzeyi (Prometheus benzeri, bağımlılıksız).
+- Counter: artan sayaç, Gauge: anlık değer, Histogram: kova sayımları
+  + yaklaşık yüzdelikler
+- Metrikler (isim, etiketler) ile bir kez oluşturulur; aynı çağrı aynı
+  nesneyi döndürür, bu yüzden sıcak yolda referans tutmak ucuzdur
+- snapshot() tüm metrikleri düz bir sözlük olarak döndürür
+  (log, UI paneli veya benchmark çıktısı için)
+
+Kullanım:
+    metrics = get_metrics()
+    metrics.counter("rate_limit.requests", exchange="binance", lane="order").inc()
+    metrics.histogram("rate_limit.queue_delay_ms", exchange="binance").observe(12.5)
+    metrics.snapshot()["rate_limit.requests{exchange=binance,lane=order}"]   # → 1
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+# Milisaniye cinsinden gecikmeler için varsayılan kovalar
+DEFAULT_BUCKETS: Tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def metric_key(name: str, labels: Dict[str, Any]) -> str:
+    """"name{a=1,b=2}" (etiketler isme göre sıralı)"""
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={labels[k]}" for k in sorted(labels)) + "}"
+
+
+class Counter:
+    """Sadece artan sayaç"""
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> float:
+        return self._value
+
+
+class Gauge:
+    """Anlık değer (son set edilen)"""
+
+    def __init__(self):
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> float:
+        return self._value
+
+
+class Histogram:
+    """
+    Sabit kovalı histogram.
+
+    buckets: Artan üst sınırlar; son kovanın üstü +Inf kovasına düşer
+    """
+
+    def __init__(self, buckets: Optional[Sequence[float]] = None):
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets or DEFAULT_BUCKETS))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        Yaklaşık yüzdelik (q: 0-100); değerin düştüğü kovanın üst sınırı.
+        +Inf kovası için gözlenen en büyük değer döner.
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, int(round(self.count * q / 100.0)))
+            seen = 0
+            for i, n in enumerate(self._counts):
+                seen += n
+                if seen >= rank:
+                    return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+            return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 3),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": round(self.max, 3),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self._counts)),
+        }
+
+
+class MetricsRegistry:
+    """(isim, etiketler) → metrik nesnesi"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, kind, name: str, labels: Dict[str, Any], *args):
+        key = metric_key(name, labels)
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = self._metrics[key] = kind(*args)
+        if not isinstance(metric, kind):
+            raise TypeError(f"Metric {key} is a {type(metric).__name__}, not a {kind.__name__}")
+        return metric
+
+    def counter(self, name: str, **labels) -> Counter:
+        return self._get(Counter, name, labels)
+
+    def gauge(self, name: str, **labels) -> Gauge:
+        return self._get(Gauge, name, labels)
+
+    def histogram(self, name: str, buckets: Optional[Iterable[float]] = None, **labels) -> Histogram:
+        return self._get(Histogram, name, labels, buckets)
+
+    def snapshot(self, prefix: str = "") -> Dict[str, Any]:
+        """Tüm metriklerin değerleri (prefix ile filtrelenebilir)"""
+        with self._lock:
+            items = list(self._metrics.items())
+        return {key: metric.snapshot() for key, metric in sorted(items) if key.startswith(prefix)}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+
+# Singleton instance
+_metrics_instance: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get singleton MetricsRegistry instance"""
+    global _metrics_instance
+    if _metrics_instance is None:
+        _metrics_instance = MetricsRegistry()
+    return _metrics_instance
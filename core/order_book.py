@@ -0,0 +1,578 @@
+"""
+core/order_book.py
+
+Yerel L2 emir defteri ve dolum (slippage) tahmini.
+- Her taraf fiyata göre sıralı dizi (bisect): seviye arama O(log n),
+  en iyi fiyat O(1), derinlik yürüyüşü sıralı okuma
+- Snapshot + diff güncellemeleri; update id ile sıra kontrolü. Boşluk veya
+  çapraz defter görülürse defter geçersiz sayılır ve yeniden senkronlanır
+  (REST snapshot veya akışa yeniden abone olma)
+- estimate_fill(side, notional): defteri yürüyerek beklenen ortalama fiyat
+  ve en iyi fiyata göre kaymayı döndürür; emir göndermeden önce defterin
+  kaldıramayacağı emirler yerelde reddedilir (RiskManager)
+
+Kullanım:
+    books = get_order_book_manager()
+    books.watch("binance", "BTC/USDT:USDT")                     # canlı defter (WebSocket)
+    estimate = books.estimate_fill("binance", "BTCUSDT", "buy", notional=50_000)
+    estimate.avg_price, estimate.slippage_pct, estimate.complete
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core.market_stream import BinanceFuturesAdapter, BybitLinearAdapter, MarketStream, market_id
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+Level = Sequence[Any]   # [price, size] (ccxt biçimi; string veya float)
+
+
+class OrderBookSequenceError(Exception):
+    """Diff güncellemesi defterin update id'sine uymuyor (kayıp mesaj) veya defter çapraz"""
+
+
+class BookSide:
+    """
+    Defterin bir tarafı: fiyata göre sıralı paralel diziler.
+
+    Alış tarafı için anahtar -fiyat tutulur; böylece iki tarafta da en iyi
+    seviye 0. indekstedir.
+    """
+
+    def __init__(self, descending: bool = False):
+        self._sign = -1.0 if descending else 1.0
+        self._keys: List[float] = []
+        self._sizes: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        """En iyiden kötüye (fiyat, miktar)"""
+        sign = self._sign
+        for key, size in zip(self._keys, self._sizes):
+            yield key * sign, size
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._sizes.clear()
+
+    def update(self, price: float, size: float) -> None:
+        """Seviyeyi yaz; size 0 ise seviyeyi sil"""
+        key = self._sign * price
+        i = bisect_left(self._keys, key)
+        exists = i < len(self._keys) and self._keys[i] == key
+        if size <= 0:
+            if exists:
+                del self._keys[i]
+                del self._sizes[i]
+        elif exists:
+            self._sizes[i] = size
+        else:
+            self._keys.insert(i, key)
+            self._sizes.insert(i, size)
+
+    def replace(self, levels: Iterable[Level]) -> None:
+        """Snapshot ile tarafı baştan kur"""
+        book = {}
+        for level in levels:
+            price, size = float(level[0]), float(level[1])
+            if size > 0:
+                book[self._sign * price] = size
+        self._keys = sorted(book)
+        self._sizes = [book[k] for k in self._keys]
+
+    def truncate(self, depth: int) -> None:
+        del self._keys[depth:]
+        del self._sizes[depth:]
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        if not self._keys:
+            return None
+        return self._keys[0] * self._sign, self._sizes[0]
+
+    def levels(self, depth: Optional[int] = None) -> List[List[float]]:
+        """ccxt biçiminde [[fiyat, miktar], ...]"""
+        n = len(self._keys) if depth is None else min(depth, len(self._keys))
+        return [[self._keys[i] * self._sign, self._sizes[i]] for i in range(n)]
+
+
+@dataclass
+class FillEstimate:
+    """Market emrin defteri yürüyerek tahmini dolumu"""
+    side: str
+    avg_price: Optional[float]       # Dolum yoksa None
+    filled_qty: float
+    filled_notional: float
+    best_price: Optional[float]      # Yürünen taraftaki en iyi fiyat
+    worst_price: Optional[float]     # Dokunulan son seviye
+    levels: int                      # Kullanılan seviye sayısı
+    complete: bool                   # Defter istenen miktarı karşılıyor mu
+
+    @property
+    def slippage_pct(self) -> Optional[float]:
+        """En iyi fiyata göre aleyhte kayma (%); alışta yukarı, satışta aşağı"""
+        if not self.avg_price or not self.best_price:
+            return None
+        if self.side == "buy":
+            return (self.avg_price / self.best_price - 1) * 100
+        return (1 - self.avg_price / self.best_price) * 100
+
+
+class OrderBook:
+    """
+    Tek sembol için L2 defter.
+
+    update_id: Son uygulanan güncellemenin id'si (snapshot yoksa None)
+    max_depth: Taraf başına tutulacak en fazla seviye
+    """
+
+    def __init__(self, symbol: str, max_depth: int = 1000):
+        self.symbol = symbol
+        self.max_depth = max_depth
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide()
+        self.update_id: Optional[int] = None
+        self.updated_at = 0.0
+        self._fresh = False          # Snapshot sonrası ilk diff henüz gelmedi
+
+    @property
+    def synced(self) -> bool:
+        return self.update_id is not None
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.updated_at
+
+    def clear(self) -> None:
+        self.bids.clear()
+        self.asks.clear()
+        self.update_id = None
+        self._fresh = False
+
+    def apply_snapshot(self, bids: Iterable[Level], asks: Iterable[Level], update_id: Optional[int] = None) -> None:
+        self.bids.replace(bids)
+        self.asks.replace(asks)
+        self.bids.truncate(self.max_depth)
+        self.asks.truncate(self.max_depth)
+        self.update_id = int(update_id) if update_id is not None else 0
+        self.updated_at = time.monotonic()
+        self._fresh = True
+
+    def apply_diff(self, bids: Iterable[Level], asks: Iterable[Level], final_id: int,
+                   first_id: Optional[int] = None, prev_id: Optional[int] = None) -> bool:
+        """
+        Diff güncellemesini uygula.
+
+        final_id: Güncellemenin son id'si (Binance u, Bybit u)
+        first_id: İlk id (Binance U); verilirse first_id == update_id + 1 beklenir
+        prev_id: Önceki güncellemenin son id'si (Binance futures pu); verilirse
+                 prev_id == update_id beklenir
+        Returns: False = snapshot'tan eski, atlandı
+        Raises: OrderBookSequenceError (boşluk / çapraz defter)
+        """
+        if self.update_id is None:
+            raise OrderBookSequenceError(f"{self.symbol}: no snapshot")
+        if final_id <= self.update_id:
+            return False
+
+        if self._fresh:
+            # Snapshot'ı kapsayan ilk diff: U <= snapshot id + 1
+            if first_id is not None and first_id > self.update_id + 1:
+                raise OrderBookSequenceError(
+                    f"{self.symbol}: gap after snapshot {self.update_id} (first update {first_id})")
+        elif prev_id is not None:
+            if prev_id != self.update_id:
+                raise OrderBookSequenceError(f"{self.symbol}: expected pu={self.update_id}, got {prev_id}")
+        elif first_id is not None and first_id != self.update_id + 1:
+            raise OrderBookSequenceError(f"{self.symbol}: expected U={self.update_id + 1}, got {first_id}")
+
+        for level in bids:
+            self.bids.update(float(level[0]), float(level[1]))
+        for level in asks:
+            self.asks.update(float(level[0]), float(level[1]))
+        if len(self.bids) > self.max_depth:
+            self.bids.truncate(self.max_depth)
+        if len(self.asks) > self.max_depth:
+            self.asks.truncate(self.max_depth)
+
+        self.update_id = int(final_id)
+        self.updated_at = time.monotonic()
+        self._fresh = False
+
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid and ask and bid[0] >= ask[0]:
+            raise OrderBookSequenceError(f"{self.symbol}: crossed book bid={bid[0]} ask={ask[0]}")
+        return True
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        best = self.bids.best()
+        return best[0] if best else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        best = self.asks.best()
+        return best[0] if best else None
+
+    @property
+    def mid(self) -> Optional[float]:
+        bid, ask = self.best_bid, self.best_ask
+        return (bid + ask) / 2 if bid and ask else None
+
+    def top(self, depth: int = 5) -> Dict[str, List[List[float]]]:
+        """ccxt fetch_order_book biçiminde ilk seviyeler"""
+        return {'bids': self.bids.levels(depth), 'asks': self.asks.levels(depth)}
+
+    def estimate_fill(self, side: str, notional: Optional[float] = None,
+                      amount: Optional[float] = None) -> FillEstimate:
+        """
+        Market emrin dolumunu tahmin et (alış → ask'ler, satış → bid'ler).
+
+        notional: Quote cinsinden tutar (USDT) veya
+        amount: Base cinsinden miktar (BTC); ikisinden biri verilmeli
+        """
+        if (notional is None) == (amount is None):
+            raise ValueError("estimate_fill needs exactly one of notional / amount")
+        if side not in ("buy", "sell"):
+            raise ValueError(f"invalid side: {side}")
+
+        levels = self.asks if side == "buy" else self.bids
+        best = levels.best()
+        target = notional if notional is not None else amount
+        filled_qty = filled_notional = 0.0
+        used = 0
+        worst = None
+        complete = target <= 0
+
+        for price, size in levels:
+            if complete:
+                break
+            if notional is not None:
+                take = min(size, (notional - filled_notional) / price)
+            else:
+                take = min(size, amount - filled_qty)
+            filled_qty += take
+            filled_notional += take * price
+            used += 1
+            worst = price
+            done = filled_notional if notional is not None else filled_qty
+            complete = done >= target * (1 - 1e-9)
+
+        return FillEstimate(
+            side=side,
+            avg_price=filled_notional / filled_qty if filled_qty > 0 else None,
+            filled_qty=filled_qty,
+            filled_notional=filled_notional,
+            best_price=best[0] if best else None,
+            worst_price=worst,
+            levels=used,
+            complete=complete,
+        )
+
+
+# ----------------------------------------------------------------------
+# Senkronizasyon
+# ----------------------------------------------------------------------
+
+@dataclass
+class DepthUpdate:
+    """Borsadan bağımsız derinlik mesajı"""
+    bids: List[Level]
+    asks: List[Level]
+    final_id: int
+    first_id: Optional[int] = None
+    prev_id: Optional[int] = None
+    snapshot: bool = False
+
+
+class OrderBookSync:
+    """
+    Defteri akıştan gelen snapshot/diff'lerle güncel tutar.
+
+    fetch_snapshot: REST snapshot'ı döndüren fonksiyon (ccxt fetch_order_book;
+        update id 'nonce' alanında). Binance gibi akışta snapshot göndermeyen
+        borsalar için gerekli; snapshot gelene kadar diff'ler tamponlanır.
+        None ise (Bybit) boşlukta OrderBookSequenceError yükseltilir ve akış
+        yeniden abone olarak yeni snapshot alır.
+    """
+
+    MAX_BUFFER = 1000
+    MIN_RESYNC_INTERVAL = 1.0    # REST snapshot istekleri arası en az süre (sn)
+
+    def __init__(self, symbol: str, fetch_snapshot: Optional[Callable[[], Dict[str, Any]]] = None,
+                 max_depth: int = 1000):
+        self.book = OrderBook(symbol, max_depth)
+        self.fetch_snapshot = fetch_snapshot
+        self.resyncs = 0
+        self.lock = threading.RLock()
+        self._buffer: List[DepthUpdate] = []
+        self._last_fetch = 0.0
+
+    @property
+    def synced(self) -> bool:
+        return self.book.synced
+
+    def on_update(self, update: DepthUpdate) -> bool:
+        """Mesajı uygula; defter güncel ve değiştiyse True"""
+        with self.lock:
+            if update.snapshot:
+                self._buffer.clear()
+                self.book.apply_snapshot(update.bids, update.asks, update.final_id)
+                return True
+
+            if not self.book.synced:
+                self._buffer.append(update)
+                del self._buffer[:-self.MAX_BUFFER]
+                return self._sync_from_rest()
+
+            try:
+                return self.book.apply_diff(update.bids, update.asks, update.final_id,
+                                            update.first_id, update.prev_id)
+            except OrderBookSequenceError as e:
+                self.resyncs += 1
+                logger.warning(f"Order book out of sync, resyncing: {e}")
+                self.book.clear()
+                if self.fetch_snapshot is None:
+                    raise
+                self._buffer = [update]
+                return self._sync_from_rest()
+
+    def _sync_from_rest(self) -> bool:
+        """REST snapshot al, tampondaki diff'leri üzerine uygula"""
+        if self.fetch_snapshot is None or time.monotonic() - self._last_fetch < self.MIN_RESYNC_INTERVAL:
+            return False
+        self._last_fetch = time.monotonic()
+        try:
+            snapshot = self.fetch_snapshot()
+            self.book.apply_snapshot(snapshot['bids'], snapshot['asks'], snapshot.get('nonce'))
+            buffered, self._buffer = self._buffer, []
+            for update in buffered:
+                self.book.apply_diff(update.bids, update.asks, update.final_id, update.first_id, update.prev_id)
+        except OrderBookSequenceError as e:
+            # Snapshot tampondan eski/yeni; sonraki diff'te tekrar denenir
+            logger.warning(f"Order book snapshot did not line up: {e}")
+            self.book.clear()
+            return False
+        except Exception as e:
+            logger.error(f"Order book snapshot fetch failed: {e}")
+            self.book.clear()
+            return False
+        return True
+
+    def estimate_fill(self, side: str, notional: Optional[float] = None,
+                      amount: Optional[float] = None) -> Optional[FillEstimate]:
+        with self.lock:
+            if not self.book.synced:
+                return None
+            return self.book.estimate_fill(side, notional, amount)
+
+
+# ----------------------------------------------------------------------
+# Derinlik akışı
+# ----------------------------------------------------------------------
+
+class BinanceDepthAdapter(BinanceFuturesAdapter):
+    """Binance USDⓈ-M <symbol>@depth@100ms (U/u/pu); snapshot REST'ten"""
+
+    def __init__(self, sync: OrderBookSync):
+        self.sync = sync
+
+    def subscribe_messages(self, symbol: str) -> List[str]:
+        return [json.dumps({
+            "method": "SUBSCRIBE",
+            "params": [f"{market_id(symbol).lower()}@depth@100ms"],
+            "id": 1,
+        })]
+
+    @staticmethod
+    def parse_depth(message: Dict[str, Any]) -> Optional[DepthUpdate]:
+        data = message.get('data', message)
+        if data.get('e') != 'depthUpdate':
+            return None
+        return DepthUpdate(bids=data.get('b', []), asks=data.get('a', []),
+                           final_id=int(data['u']), first_id=int(data['U']),
+                           prev_id=int(data['pu']) if 'pu' in data else None)
+
+    def parse(self, message: Dict[str, Any], state: Dict[str, Any]) -> bool:
+        return _apply_depth(self.sync, self.parse_depth(message), state)
+
+
+class BybitDepthAdapter(BybitLinearAdapter):
+    """Bybit v5 orderbook.<depth>.<SYMBOL> (snapshot + delta, u artan)"""
+
+    DEPTH = 50
+
+    def __init__(self, sync: OrderBookSync):
+        self.sync = sync
+
+    def subscribe_messages(self, symbol: str) -> List[str]:
+        return [json.dumps({"op": "subscribe", "args": [f"orderbook.{self.DEPTH}.{market_id(symbol)}"]})]
+
+    @staticmethod
+    def parse_depth(message: Dict[str, Any]) -> Optional[DepthUpdate]:
+        if not str(message.get('topic', '')).startswith('orderbook.'):
+            return None
+        data = message.get('data') or {}
+        # u=1 servis yeniden başlatıldığında gelen snapshot'tır; tip alanı zaten 'snapshot'
+        return DepthUpdate(bids=data.get('b', []), asks=data.get('a', []),
+                           final_id=int(data.get('u', 0)),
+                           snapshot=message.get('type') == 'snapshot')
+
+    def parse(self, message: Dict[str, Any], state: Dict[str, Any]) -> bool:
+        return _apply_depth(self.sync, self.parse_depth(message), state)
+
+
+def _apply_depth(sync: OrderBookSync, update: Optional[DepthUpdate], state: Dict[str, Any]) -> bool:
+    """Güncellemeyi deftere uygula; MarketStream için book top'u state'e yaz"""
+    if update is None or not sync.on_update(update):
+        return False
+    book = sync.book
+    state['best_bid'] = book.best_bid
+    state['best_ask'] = book.best_ask
+    state['current_price'] = book.mid
+    return True
+
+
+DEPTH_ADAPTERS = {
+    'binance': BinanceDepthAdapter,
+    'bybit': BybitDepthAdapter,
+}
+
+
+def ccxt_symbol(symbol: str) -> str:
+    """"BTCUSDT" → "BTC/USDT:USDT" (zaten ccxt biçimindeyse aynen)"""
+    if '/' in symbol:
+        return symbol if ':' in symbol else f"{symbol}:USDT"
+    return f"{symbol[:-4]}/USDT:USDT"
+
+
+class OrderBookStream(threading.Thread):
+    """Tek sembolün derinlik akışı; kopmada MarketStream yeniden bağlanır"""
+
+    def __init__(self, sync: OrderBookSync, adapter, symbol: str,
+                 sandbox: bool = True, url: Optional[str] = None, **stream_kwargs):
+        super().__init__(name=f"order-book-{market_id(symbol)}", daemon=True)
+        self.sync = sync
+        self.stream = MarketStream(adapter, symbol, lambda data: None,
+                                   sandbox=sandbox, url=url, **stream_kwargs)
+
+    def run(self) -> None:
+        self.stream.run()
+
+    def stop(self) -> None:
+        self.stream.stop()
+
+
+class OrderBookManager:
+    """
+    (borsa, sembol) başına yerel defter.
+
+    watch() ile izlenen semboller WebSocket diff'leriyle güncel tutulur;
+    izlenmeyen veya henüz senkron olmayan semboller için estimate_fill tek
+    seferlik REST snapshot kullanır.
+    """
+
+    def __init__(self, use_stream: bool = True, depth: int = 100):
+        self.use_stream = use_stream
+        self.depth = depth
+        self._lock = threading.Lock()
+        self._syncs: Dict[Tuple[str, str], OrderBookSync] = {}
+        self._streams: Dict[Tuple[str, str], OrderBookStream] = {}
+
+    @staticmethod
+    def key(exchange_name: str, symbol: str) -> Tuple[str, str]:
+        return (exchange_name or '').lower(), market_id(symbol)
+
+    @staticmethod
+    def _rest_exchange(exchange_name: str):
+        from core.exchange_manager import get_exchange_manager
+        return get_exchange_manager().get_exchange(exchange_name)
+
+    def watch(self, exchange_name: str, symbol: str, rest_exchange=None,
+              sandbox: bool = True) -> Optional[OrderBookSync]:
+        """Canlı defteri başlat (adaptörü olmayan borsada None)"""
+        key = self.key(exchange_name, symbol)
+        adapter_class = DEPTH_ADAPTERS.get(key[0])
+        if adapter_class is None or not self.use_stream:
+            return None
+
+        with self._lock:
+            sync = self._syncs.get(key)
+            if sync is not None:
+                return sync
+
+            fetch_snapshot = None
+            if adapter_class is BinanceDepthAdapter:
+                def fetch_snapshot():
+                    exchange = rest_exchange or self._rest_exchange(exchange_name)
+                    if exchange is None:
+                        raise RuntimeError(f"{exchange_name} not connected")
+                    return exchange.fetch_order_book(ccxt_symbol(symbol), limit=self.depth)
+
+            sync = OrderBookSync(key[1], fetch_snapshot, max_depth=self.depth)
+            stream = OrderBookStream(sync, adapter_class(sync), ccxt_symbol(symbol), sandbox=sandbox)
+            self._syncs[key] = sync
+            self._streams[key] = stream
+        stream.start()
+        logger.info(f"Order book stream started for {exchange_name} {symbol}")
+        return sync
+
+    def unwatch(self, exchange_name: str, symbol: str) -> None:
+        key = self.key(exchange_name, symbol)
+        with self._lock:
+            self._syncs.pop(key, None)
+            stream = self._streams.pop(key, None)
+        if stream is not None:
+            stream.stop()
+
+    def book(self, exchange_name: str, symbol: str) -> Optional[OrderBook]:
+        """Senkron canlı defter (yoksa None)"""
+        sync = self._syncs.get(self.key(exchange_name, symbol))
+        return sync.book if sync is not None and sync.synced else None
+
+    def estimate_fill(self, exchange_name: str, symbol: str, side: str,
+                      notional: Optional[float] = None, amount: Optional[float] = None,
+                      rest_exchange=None) -> Optional[FillEstimate]:
+        """Canlı defterden, yoksa REST snapshot'tan dolum tahmini (borsa yoksa None)"""
+        sync = self._syncs.get(self.key(exchange_name, symbol))
+        if sync is not None:
+            estimate = sync.estimate_fill(side, notional, amount)
+            if estimate is not None:
+                return estimate
+
+        exchange = rest_exchange or self._rest_exchange(exchange_name)
+        if exchange is None:
+            return None
+        snapshot = exchange.fetch_order_book(ccxt_symbol(symbol), limit=self.depth)
+        book = OrderBook(market_id(symbol), self.depth)
+        book.apply_snapshot(snapshot['bids'], snapshot['asks'], snapshot.get('nonce'))
+        return book.estimate_fill(side, notional, amount)
+
+    def stop_all(self) -> None:
+        with self._lock:
+            streams = list(self._streams.values())
+            self._streams.clear()
+            self._syncs.clear()
+        for stream in streams:
+            stream.stop()
+
+
+# Singleton instance
+_manager_instance: Optional[OrderBookManager] = None
+
+
+def get_order_book_manager() -> OrderBookManager:
+    """Get singleton OrderBookManager instance"""
+    global _manager_instance
+    if _manager_instance is None:
+        _manager_instance = OrderBookManager()
+    return _manager_instance
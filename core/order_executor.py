@@ -22,8 +22,13 @@ from utils.logger import get_logger
 from utils import validators
 from utils.config_manager import ConfigManager
 from database.db_manager import DatabaseManager
+from core.account_state import AccountState
 from core.exchange_manager import get_exchange_manager, ExchangeManager
+from core.market_data_hub import MarketDataHub, get_market_data_hub
+from core.order_book import FillEstimate, OrderBookManager, get_order_book_manager
+from core.order_router import InsufficientRoutingBalance, OrderRouter, RoutePlan, RoutingError
 from core.paper_trading_engine import PaperTradingEngine
+from core.rate_limiter import Lane, request_lane
 from core.risk_manager import RiskManager, RiskLimitError, OrderRiskContext
 
 
@@ -55,6 +60,10 @@ class OrderParams:
     amount_type:
         - "usd": amount = USDT cinsinden notional
         - "qty": amount = coin miktarı (BTC, ETH vs.)
+
+    stop_loss / take_profit:
+        Tetik fiyatları; gerçek emirde ccxt'nin birleşik 'stopLoss' / 'takeProfit'
+        parametrelerine çevrilir.
     """
     symbol: str
     side: OrderSide
@@ -65,9 +74,15 @@ class OrderParams:
     price: Optional[float] = None
     reduce_only: bool = False
     client_order_id: Optional[str] = None
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
     extra: Dict[str, Any] = field(default_factory=dict)
 
 
+# extra içindeki uygulama içi alanlar (borsaya gönderilmez)
+_INTERNAL_EXTRA_KEYS = ("source", "voice_command")
+
+
 @dataclass
 class OrderResult:
     """
@@ -103,6 +118,10 @@ class OrderExecutor:
         paper_trading_engine: Any = None,
         logger=None,
         risk_manager: Optional[RiskManager] = None,
+        market_data: Optional[MarketDataHub] = None,
+        order_books: Optional[OrderBookManager] = None,
+        account_state: Optional[AccountState] = None,
+        order_router: Optional[OrderRouter] = None,
     ) -> None:
         self.logger = logger or get_logger(__name__)
         self.db = db_manager
@@ -110,6 +129,10 @@ class OrderExecutor:
         self.exchange: ExchangeManager = exchange_manager or get_exchange_manager()
         self.paper_engine = paper_trading_engine
         self.risk_manager = risk_manager or RiskManager(db_manager=self.db, logger=self.logger)
+        self.market_data: MarketDataHub = market_data or get_market_data_hub()
+        self.order_books: OrderBookManager = order_books or get_order_book_manager()
+        self.account_state: AccountState = account_state or AccountState(self.exchange)
+        self._order_router: Optional[OrderRouter] = order_router
 
         # UI veya Preferences tarafından set edilecek flag
         self._paper_trading_enabled: bool = False
@@ -135,7 +158,9 @@ class OrderExecutor:
         if params.order_type != "market":
             raise OrderValidationError("execute_market_order sadece 'market' tipinde emirler için kullanılmalıdır.")
 
-        return self._execute_order_internal(params)
+        # Emir akışındaki ticker / bakiye / defter istekleri de emir şeridinden gider
+        with request_lane(Lane.ORDER):
+            return self._execute_order_internal(params)
 
     def execute_limit_order(self, params: OrderParams) -> OrderResult:
         """
@@ -150,7 +175,8 @@ class OrderExecutor:
         if params.price is None:
             raise OrderValidationError("Limit emir için price zorunludur.")
 
-        return self._execute_order_internal(params)
+        with request_lane(Lane.ORDER):
+            return self._execute_order_internal(params)
 
     def get_order_status(self, order_id: str) -> OrderResult:
         """
@@ -212,11 +238,13 @@ class OrderExecutor:
                     notional_usd=notional,
                     leverage=valid_params.leverage,
                     is_paper=self._paper_trading_enabled,
+                    fill_estimate=self._estimate_fill(valid_params, qty),
                 )
                 self.risk_manager.check_order_risk(risk_ctx)
 
-            # 4) Bakiye kontrolü
-            self.check_balance(required_margin)
+            # 4) Bakiye kontrolü (yönlendirilen emirde borsa bazında router yapar)
+            if not self._should_route(valid_params):
+                self.check_balance(required_margin)
 
             # 5) Emir gönderimi (paper / real)
             if self._paper_trading_enabled and self.paper_engine is not None:
@@ -290,8 +318,46 @@ class OrderExecutor:
         if params.amount_type not in ("usd", "qty"):
             raise OrderValidationError("amount_type sadece 'usd' veya 'qty' olabilir.")
 
+        # SL / TP
+        for name, trigger in (("Stop-loss", params.stop_loss), ("Take-profit", params.take_profit)):
+            if trigger is not None and trigger <= 0:
+                raise OrderValidationError(f"{name} pozitif olmalıdır.")
+        if params.stop_loss is not None and params.take_profit is not None:
+            if (params.stop_loss >= params.take_profit) if params.side == "buy" else (params.stop_loss <= params.take_profit):
+                raise OrderValidationError("Stop-loss / take-profit emir yönüyle uyumsuz.")
+
         return params
 
+    def amount_from_balance_percent(self, percent: float, leverage: int) -> float:
+        """
+        "Bakiyenin yüzde X'i" → USD notional.
+
+        Yüzde marj olarak yorumlanır: notional = serbest bakiye * yüzde / 100 * kaldıraç.
+        Paper modda paper_engine'in güncel serbest bakiyesi kullanılır; engine
+        yoksa config'teki trading.paper_balance.
+        """
+        if not 0 < percent <= 100:
+            raise OrderValidationError(f"Bakiye yüzdesi 0-100 arasında olmalıdır: {percent}")
+
+        if self._paper_trading_enabled:
+            if self.paper_engine is not None:
+                free_balance = float(self.paper_engine.free_balance)
+            else:
+                free_balance = float(self.config.get("trading.paper_balance", 0.0) or 0.0)
+        else:
+            max_age = float(self.config.get("trading.balance_max_age", 10.0) or 0.0)
+            balance_info = self.account_state.balance(max_age=max_age)
+            free_balance = balance_info.get("free") if isinstance(balance_info, dict) else None
+            if free_balance is None:
+                raise OrderExecutionError("Bakiye bilgisi alınamadı")
+
+        amount = free_balance * percent / 100.0 * max(1, leverage)
+        self.logger.debug(
+            "Balance percent → amount: percent=%s free=%s leverage=%s amount=%s",
+            percent, free_balance, leverage, amount,
+        )
+        return amount
+
     def calculate_position_size(
         self,
         amount: float,
@@ -336,7 +402,8 @@ class OrderExecutor:
         Gerekli marj için bakiye kontrolü.
 
         - Paper mod açıksa → gerçek borsa bakiyesini kontrol ETME.
-        - Gerçek modda → ExchangeManager.get_balance() üzerinden kontrol et.
+        - Gerçek modda → AccountState önbelleğinden kontrol et; görüntü
+          trading.balance_max_age'den eskiyse fetch_balance ile yenilenir.
         """
         if required_margin <= 0:
             raise OrderValidationError("Gerekli marj sıfır veya negatif olamaz.")
@@ -349,7 +416,8 @@ class OrderExecutor:
             )
             return
 
-        balance_info = self.exchange.get_balance()
+        max_age = float(self.config.get("trading.balance_max_age", 10.0) or 0.0)
+        balance_info = self.account_state.balance(max_age=max_age)
 
         if not isinstance(balance_info, dict):
             raise OrderExecutionError("Bakiye bilgisi geçersiz formatta")
@@ -384,6 +452,7 @@ class OrderExecutor:
     ) -> None:
         """
         Emir ve sonucu orders tablosuna yazar.
+        Yönlendirilen emirde her bacak kendi borsası ve emir id'siyle ayrı satırdır.
         """
         try:
             order_data = {
@@ -394,7 +463,7 @@ class OrderExecutor:
                 "type": params.order_type,
                 "quantity": qty,
                 "price": params.price,
-                "stop_price": None,
+                "stop_price": params.stop_loss,
                 "leverage": params.leverage,
                 "status": result.status or ("ERROR" if not result.success else "OK"),
                 "filled_quantity": result.filled_qty,
@@ -406,7 +475,23 @@ class OrderExecutor:
                 "voice_command": params.extra.get("voice_command"),
             }
 
-            order_id = self.db.insert_order(order_data)
+            legs = result.raw.get("legs") if result.raw else None
+            if legs:
+                order_ids = [
+                    self.db.insert_order({
+                        **order_data,
+                        "exchange": leg["exchange"],
+                        "exchange_order_id": str(leg["order_id"]) if leg["order_id"] is not None else None,
+                        "quantity": leg["amount"],
+                        "status": leg["status"] or ("ERROR" if leg["error"] else "OK"),
+                        "filled_quantity": leg["filled"],
+                        "average_fill_price": leg["achieved_price"],
+                    })
+                    for leg in legs
+                ]
+                order_id = ",".join(str(i) for i in order_ids)
+            else:
+                order_id = self.db.insert_order(order_data)
 
             # Sistem loguna da yazalım
             self.db.insert_system_log(
@@ -480,7 +565,12 @@ class OrderExecutor:
     ) -> OrderResult:
         """
         Gerçek exchange (CCXT / ExchangeManager) üzerinden emir çalıştırma.
+        trading.smart_routing açıksa market emirler OrderRouter ile bağlı
+        borsalar arasında yönlendirilir.
         """
+        if self._should_route(params):
+            return self._execute_routed_order(params, qty)
+
         try:
             order_type = params.order_type.lower()
             side = params.side.lower()
@@ -492,14 +582,21 @@ class OrderExecutor:
                 if price is None:
                     raise OrderValidationError("Limit emir için fiyat gerekli.")
 
-            raw_order = self.exchange.create_order(
-                symbol=params.symbol,
-                side=side,
-                order_type=order_type,
-                amount=qty,
-                price=price,
-                params=params.extra or {},
-            )
+            # Marj iyimser olarak düşülür; hata olursa geri verilir
+            reservation = self.account_state.reserve(required_margin)
+            try:
+                raw_order = self.exchange.create_order(
+                    symbol=params.symbol,
+                    side=side,
+                    order_type=order_type,
+                    amount=qty,
+                    price=price,
+                    params=self._exchange_params(params),
+                )
+            except Exception:
+                self.account_state.release(reservation)
+                raise
+            self.account_state.settle(reservation)
 
             order_id = raw_order.get("id") or raw_order.get("orderId")
             status = raw_order.get("status")
@@ -519,13 +616,129 @@ class OrderExecutor:
             self.logger.error("Real order execution failed: %s", e, exc_info=True)
             raise OrderExecutionError(str(e))
 
+    def _should_route(self, params: OrderParams) -> bool:
+        """
+        Akıllı yönlendirme sadece gerçek modda, pozisyon açan market emirlerde
+        ve birden fazla bağlı borsa varken devreye girer. Limit ve reduce-only
+        emirler pozisyonun/emrin bulunduğu aktif borsaya gider.
+        """
+        if self._paper_trading_enabled and self.paper_engine is not None:
+            return False
+        if params.order_type != "market" or params.reduce_only:
+            return False
+        if not self.config.get("trading.smart_routing", False):
+            return False
+        return len(getattr(self.exchange, "exchanges", None) or {}) > 1
+
+    @property
+    def order_router(self) -> OrderRouter:
+        """Config'ten kurulan router (ilk yönlendirmede oluşturulur)"""
+        if self._order_router is None:
+            self._order_router = OrderRouter(
+                self.exchange,
+                market_data=self.market_data,
+                account_state=self.account_state,
+                deadline_ms=float(self.config.get("trading.routing_deadline_ms", 150.0) or 150.0),
+                max_quote_age=float(self.config.get("trading.max_price_age", 5.0) or 5.0),
+                allow_split=bool(self.config.get("trading.routing_allow_split", True)),
+                fees=self.config.get("trading.routing_fees", {}) or {},
+                balance_max_age=float(self.config.get("trading.balance_max_age", 10.0) or 0.0),
+            )
+        return self._order_router
+
+    def _execute_routed_order(self, params: OrderParams, qty: float) -> OrderResult:
+        """
+        Emri OrderRouter ile bir veya birkaç borsaya gönderir; bacaklar tek
+        OrderResult'ta toplanır (raw["legs"] bacak ayrıntıları).
+        """
+        try:
+            plan: RoutePlan = self.order_router.execute(
+                params.symbol, params.side, qty, leverage=params.leverage,
+                params=self._exchange_params(params),
+            )
+        except InsufficientRoutingBalance as e:
+            raise InsufficientBalanceError(str(e))
+        except RoutingError as e:
+            raise OrderExecutionError(str(e))
+
+        filled_legs = plan.filled_legs
+        filled = sum(float(leg.order.get("filled") or leg.amount) for leg in filled_legs)
+        failed = [leg for leg in plan.legs if leg.error is not None]
+        statuses = {leg.order.get("status") for leg in filled_legs}
+        return OrderResult(
+            success=True,
+            order_id=",".join(str(leg.order.get("id")) for leg in filled_legs),
+            status=statuses.pop() if len(statuses) == 1 and not failed else "partial",
+            filled_qty=filled,
+            avg_price=plan.achieved_price,
+            error_message="; ".join(f"{leg.exchange}: {leg.error}" for leg in failed) or None,
+            raw={
+                "routed_to": ",".join(leg.exchange for leg in filled_legs),
+                "quoted_price": plan.quoted_price,
+                "routing_ms": plan.routing_ms,
+                "timed_out": plan.timed_out,
+                "legs": [
+                    {
+                        "exchange": leg.exchange,
+                        "symbol": leg.symbol,
+                        "amount": leg.amount,
+                        "quoted_price": leg.quoted_price,
+                        "achieved_price": leg.achieved_price,
+                        "order_id": leg.order.get("id") if leg.order else None,
+                        "status": leg.order.get("status") if leg.order else None,
+                        "filled": float(leg.order.get("filled") or leg.amount) if leg.order else 0.0,
+                        "error": leg.error,
+                    }
+                    for leg in plan.legs
+                ],
+            },
+        )
+
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _exchange_params(params: OrderParams) -> Dict[str, Any]:
+        """
+        ccxt create_order için borsa parametreleri.
+        SL/TP ccxt'nin birleşik formatına çevrilir: {'stopLoss': {'triggerPrice': ...}}
+        """
+        exchange_params = {k: v for k, v in (params.extra or {}).items() if k not in _INTERNAL_EXTRA_KEYS}
+        if params.stop_loss is not None:
+            exchange_params["stopLoss"] = {"triggerPrice": params.stop_loss}
+        if params.take_profit is not None:
+            exchange_params["takeProfit"] = {"triggerPrice": params.take_profit}
+        if params.reduce_only:
+            exchange_params.setdefault("reduceOnly", True)
+        return exchange_params
+
+    def _estimate_fill(self, params: OrderParams, qty: float) -> Optional[FillEstimate]:
+        """
+        Market emrin defter üzerindeki tahmini dolumu (RiskManager kontrolü için).
+
+        - Limit ve reduce-only emirlerde tahmin yapılmaz (pozisyon kapatma engellenmez)
+        - Yönlendirilen emirde yapılmaz: borsa(lar)ı router seçer, aktif borsanın
+          defteri emrin gideceği yeri temsil etmez
+        - Defter alınamazsa None döner; emir kayma kontrolü olmadan devam eder
+        """
+        if params.order_type != "market" or params.reduce_only or qty <= 0:
+            return None
+        if self._should_route(params):
+            return None
+        exchange_name = getattr(self.exchange, "active_exchange", None)
+        if not exchange_name:
+            return None
+        try:
+            return self.order_books.estimate_fill(exchange_name, params.symbol, params.side, amount=qty)
+        except Exception as e:
+            self.logger.warning("Order book estimate unavailable for %s: %s", params.symbol, e)
+            return None
+
     def _get_effective_price(self, params: OrderParams) -> float:
         """
         Margin hesabı için kullanılacak efektif fiyat:
 
-        - Market emir → exchange.get_ticker() fiyatı
+        - Market emir → market data hub'daki taze fiyat (bellek okuması),
+          yoksa / bayatsa exchange.get_ticker() fiyatı
         - Limit emir → params.price
         """
         if params.order_type == "limit":
@@ -533,6 +746,14 @@ class OrderExecutor:
                 raise OrderValidationError("Limit emir için fiyat gerekli.")
             return params.price
 
+        # Market emir → hub (ağ çağrısı yok)
+        exchange_name = getattr(self.exchange, "active_exchange", None)
+        if exchange_name:
+            max_age = float(self.config.get("trading.max_price_age", 5.0) or 5.0)
+            price = self.market_data.get_price(exchange_name, params.symbol, max_age=max_age)
+            if price is not None and price > 0:
+                return float(price)
+
         # Market emir → ticker
         ticker = self.exchange.get_ticker(params.symbol)
         # ticker yapısını bilmediğimiz için burada da genel bir yaklaşım:
@@ -0,0 +1,369 @@
+"""
+core/order_router.py
+
+Bağlı borsalar arasında akıllı emir yönlendirme (market emirler).
+- Her bağlı borsa için kotasyon: önce market data hub'daki taze bid/ask
+  (akış, ağ yok), yoksa fetch_ticker; REST istekleri eşzamanlı gider
+- Katı süre sınırı (deadline_ms): sınıra kadar gelmeyen borsalar bu
+  emirde yok sayılır, yönlendirme emre deadline'dan fazla gecikme eklemez
+- Sıralama ücret sonrası efektif fiyatla (alış: ask * (1 + taker),
+  satış: bid * (1 - taker)); her borsanın kapasitesi AccountState'teki
+  serbest bakiye * kaldıraç / fiyat
+- allow_split: en iyi borsanın bakiyesi yetmezse emir sıradaki borsalara
+  bölünür; kapalıysa tüm miktarı karşılayabilen en iyi borsa seçilir
+- Her bacak için kote edilen fiyat, gerçekleşen fiyat ve yönlendirme süresi
+  loglanır ve metriklere yazılır (order_router.routing_ms,
+  order_router.slippage_bps)
+
+Kullanım:
+    router = OrderRouter(exchange_manager, market_data=hub, account_state=state, deadline_ms=150)
+    plan = router.execute("BTC/USDT:USDT", "buy", 0.5, leverage=10)
+    plan.legs          # [RouteLeg(exchange="bybit", amount=0.5, quoted_price=..., achieved_price=...)]
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from ccxt.base.decimal_to_precision import TICK_SIZE
+
+from core.metrics import get_metrics
+from core.order_book import ccxt_symbol
+from core.rate_limiter import Lane, request_lane
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TAKER_FEE = 0.0005
+
+
+class RoutingError(Exception):
+    """Emir hiçbir borsaya yönlendirilemedi"""
+    pass
+
+
+class InsufficientRoutingBalance(RoutingError):
+    """Bağlı borsaların toplam bakiyesi emir için yetmiyor"""
+    pass
+
+
+@dataclass
+class VenueQuote:
+    """Bir borsanın yönlendirme anındaki fiyatı"""
+    exchange: str
+    symbol: str                        # Borsanın ccxt sembolü
+    bid: Optional[float]
+    ask: Optional[float]
+    fee: float = DEFAULT_TAKER_FEE
+    free_balance: Optional[float] = None
+    source: str = ""                   # "hub" / "rest"
+
+    def price(self, side: str) -> Optional[float]:
+        return self.ask if side == "buy" else self.bid
+
+    def effective_price(self, side: str) -> Optional[float]:
+        price = self.price(side)
+        if not price:
+            return None
+        return price * (1 + self.fee) if side == "buy" else price * (1 - self.fee)
+
+    def capacity(self, side: str, leverage: int) -> float:
+        """Bakiyenin karşılayabileceği en fazla miktar (bakiye bilinmiyorsa sınırsız)"""
+        price = self.price(side)
+        if self.free_balance is None or not price:
+            return float("inf")
+        return max(self.free_balance, 0.0) * max(leverage, 1) / price
+
+
+@dataclass
+class RouteLeg:
+    """Tek borsaya giden emir parçası"""
+    exchange: str
+    symbol: str
+    amount: float
+    quoted_price: float
+    effective_price: float
+    order: Optional[Dict[str, Any]] = None
+    achieved_price: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def slippage_bps(self) -> Optional[float]:
+        if self.achieved_price is None or not self.quoted_price:
+            return None
+        return (self.achieved_price - self.quoted_price) / self.quoted_price * 1e4
+
+
+@dataclass
+class RoutePlan:
+    """Yönlendirme kararı ve (execute sonrası) sonuçları"""
+    symbol: str
+    side: str
+    amount: float
+    legs: List[RouteLeg] = field(default_factory=list)
+    quotes: List[VenueQuote] = field(default_factory=list)
+    timed_out: List[str] = field(default_factory=list)
+    routing_ms: float = 0.0
+
+    @property
+    def filled_legs(self) -> List[RouteLeg]:
+        return [leg for leg in self.legs if leg.order is not None]
+
+    @property
+    def quoted_price(self) -> Optional[float]:
+        return _weighted(self.legs, "quoted_price")
+
+    @property
+    def achieved_price(self) -> Optional[float]:
+        return _weighted([leg for leg in self.filled_legs if leg.achieved_price], "achieved_price")
+
+
+def _weighted(legs: List[RouteLeg], attr: str) -> Optional[float]:
+    total = sum(leg.amount for leg in legs)
+    if not total:
+        return None
+    return sum(getattr(leg, attr) * leg.amount for leg in legs) / total
+
+
+class OrderRouter:
+    """
+    Market emirleri için borsa seçimi / bölme.
+
+    exchange_manager: Bağlı ccxt istemcileri (exchanges sözlüğü)
+    deadline_ms: Kotasyon toplama için süre sınırı
+    max_quote_age: Hub fiyatının kullanılabileceği en fazla yaş (sn)
+    fees: Borsa → taker ücreti (yoksa market['taker'], o da yoksa DEFAULT_TAKER_FEE)
+    min_leg_notional: Bundan küçük parçalar açılmaz (USDT)
+    """
+
+    def __init__(self, exchange_manager, market_data=None, account_state=None,
+                 deadline_ms: float = 150.0, max_quote_age: float = 2.0, allow_split: bool = True,
+                 fees: Optional[Dict[str, float]] = None, min_leg_notional: float = 5.0,
+                 balance_max_age: float = 10.0, max_workers: int = 8):
+        self.exchange_manager = exchange_manager
+        self.market_data = market_data
+        self.account_state = account_state
+        self.deadline_ms = deadline_ms
+        self.max_quote_age = max_quote_age
+        self.allow_split = allow_split
+        self.fees = {k.lower(): v for k, v in (fees or {}).items()}
+        self.min_leg_notional = min_leg_notional
+        self.balance_max_age = balance_max_age
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="order-router")
+
+        metrics = get_metrics()
+        self._routing_ms = metrics.histogram("order_router.routing_ms")
+        self._timeouts = metrics.counter("order_router.quote_timeouts")
+
+    def venues(self) -> List[str]:
+        return list(getattr(self.exchange_manager, 'exchanges', None) or {})
+
+    # ------------------------------------------------------------------
+    # Kotasyon
+    # ------------------------------------------------------------------
+
+    def _venue_symbol(self, venue: str, symbol: str) -> Optional[str]:
+        return self.exchange_manager.normalize_symbol(ccxt_symbol(symbol), exchange_name=venue)
+
+    def _fee(self, venue: str, exchange, symbol: str) -> float:
+        if venue in self.fees:
+            return self.fees[venue]
+        market = (getattr(exchange, 'markets', None) or {}).get(symbol) or {}
+        taker = market.get('taker')
+        return float(taker) if taker is not None else DEFAULT_TAKER_FEE
+
+    def _hub_quote(self, venue: str, symbol: str) -> Optional[Tuple[float, float]]:
+        if self.market_data is None:
+            return None
+        snapshot = self.market_data.latest(venue, symbol)
+        if snapshot is None or snapshot.is_stale(self.max_quote_age) or not (snapshot.best_bid and snapshot.best_ask):
+            return None
+        return snapshot.best_bid, snapshot.best_ask
+
+    @staticmethod
+    def _fetch_top(exchange, symbol: str) -> Tuple[Optional[float], Optional[float]]:
+        with request_lane(Lane.ORDER):
+            ticker = exchange.fetch_ticker(symbol)
+        last = ticker.get('last')
+        return ticker.get('bid') or last, ticker.get('ask') or last
+
+    def _balance_fresh(self, venue: str) -> bool:
+        snapshot = self.account_state.snapshot(venue) if self.account_state is not None else None
+        return snapshot is not None and snapshot.age <= self.balance_max_age
+
+    def collect_quotes(self, symbol: str, deadline: float) -> Tuple[List[VenueQuote], List[str]]:
+        """
+        Tüm bağlı borsaların fiyatı (+ bakiye) deadline'a (monotonic) kadar.
+        Returns: (kotasyonlar, süresi dolan borsalar)
+        """
+        quotes: Dict[str, VenueQuote] = {}
+        pending = {}
+        for venue in self.venues():
+            exchange = self.exchange_manager.get_exchange(venue)
+            venue_symbol = self._venue_symbol(venue, symbol) if exchange is not None else None
+            if venue_symbol is None:
+                continue
+            quote = VenueQuote(venue, venue_symbol, None, None, fee=self._fee(venue, exchange, venue_symbol))
+            quotes[venue] = quote
+
+            top = self._hub_quote(venue, venue_symbol)
+            if top is not None:
+                quote.bid, quote.ask = top
+                quote.source = "hub"
+            else:
+                pending[self._pool.submit(self._fetch_top, exchange, venue_symbol)] = (venue, "quote")
+            if self.account_state is not None and not self._balance_fresh(venue):
+                pending[self._pool.submit(self.account_state.refresh, venue)] = (venue, "balance")
+
+        done, not_done = wait(pending, timeout=max(deadline - time.monotonic(), 0.0))
+        timed_out = sorted({pending[f][0] for f in not_done if pending[f][1] == "quote"})
+        for future in done:
+            venue, kind = pending[future]
+            if kind != "quote":
+                continue
+            try:
+                quotes[venue].bid, quotes[venue].ask = future.result()
+                quotes[venue].source = "rest"
+            except Exception as e:
+                logger.warning(f"Quote from {venue} failed: {e}")
+
+        if self.account_state is not None:
+            # Yenileme yetişmediyse eldeki (eski) görüntü kullanılır; hiç yoksa sınırsız sayılır
+            for venue, quote in quotes.items():
+                balance = self.account_state.asset('USDT', venue)
+                quote.free_balance = balance.free if balance is not None else None
+        if timed_out:
+            self._timeouts.inc(len(timed_out))
+        return list(quotes.values()), timed_out
+
+    # ------------------------------------------------------------------
+    # Karar
+    # ------------------------------------------------------------------
+
+    def plan(self, symbol: str, side: str, amount: float, leverage: int = 1,
+             deadline_ms: Optional[float] = None) -> RoutePlan:
+        """Borsa(lar)ı seç; emir göndermez"""
+        side = side.lower()
+        started = time.monotonic()
+        deadline = started + (self.deadline_ms if deadline_ms is None else deadline_ms) / 1000.0
+        quotes, timed_out = self.collect_quotes(symbol, deadline)
+        plan = RoutePlan(symbol, side, amount, quotes=quotes, timed_out=timed_out)
+
+        ranked = sorted((q for q in quotes if q.effective_price(side)),
+                        key=lambda q: q.effective_price(side), reverse=(side == "sell"))
+        if not ranked:
+            raise RoutingError(f"No venue quoted {symbol} within {(deadline - started) * 1000:.0f} ms")
+
+        if self.allow_split:
+            remaining = amount
+            for quote in ranked:
+                take = self._amount(quote, min(remaining, quote.capacity(side, leverage)))
+                if take <= 0 or (take < remaining and take * quote.price(side) < self.min_leg_notional):
+                    continue
+                plan.legs.append(self._leg(quote, side, take))
+                remaining -= take
+                if remaining <= amount * 1e-9:
+                    break
+        else:
+            best = next((q for q in ranked if q.capacity(side, leverage) >= amount), None)
+            if best is not None:
+                plan.legs.append(self._leg(best, side, amount))
+
+        routed = sum(leg.amount for leg in plan.legs)
+        if not plan.legs or routed < amount * (1 - 1e-6) - self._min_step(plan.legs):
+            raise InsufficientRoutingBalance(
+                f"Connected venues can cover {routed:g} of {amount:g} {symbol} "
+                f"(free: {', '.join(f'{q.exchange}={q.free_balance}' for q in ranked)})")
+
+        plan.routing_ms = (time.monotonic() - started) * 1000
+        self._routing_ms.observe(plan.routing_ms)
+        return plan
+
+    def _amount(self, quote: VenueQuote, amount: float) -> float:
+        """Miktarı borsanın hassasiyetine aşağı yuvarla"""
+        exchange = self.exchange_manager.get_exchange(quote.exchange)
+        if amount == float("inf") or amount <= 0:
+            return max(amount, 0.0)
+        try:
+            return float(exchange.amount_to_precision(quote.symbol, amount))
+        except Exception:
+            return amount
+
+    def _min_step(self, legs: List[RouteLeg]) -> float:
+        """Yuvarlama payı: bacakların en büyük miktar adımı"""
+        step = 0.0
+        for leg in legs:
+            exchange = self.exchange_manager.get_exchange(leg.exchange)
+            market = (getattr(exchange, 'markets', None) or {}).get(leg.symbol) or {}
+            precision = (market.get('precision') or {}).get('amount')
+            if precision is None:
+                continue
+            if getattr(exchange, 'precisionMode', TICK_SIZE) != TICK_SIZE:
+                precision = 10 ** -float(precision)       # DECIMAL_PLACES / SIGNIFICANT_DIGITS
+            step = max(step, float(precision))
+        return step
+
+    @staticmethod
+    def _leg(quote: VenueQuote, side: str, amount: float) -> RouteLeg:
+        return RouteLeg(quote.exchange, quote.symbol, amount, quote.price(side), quote.effective_price(side))
+
+    # ------------------------------------------------------------------
+    # Gönderim
+    # ------------------------------------------------------------------
+
+    def execute(self, symbol: str, side: str, amount: float, leverage: int = 1,
+                params: Optional[Dict[str, Any]] = None, deadline_ms: Optional[float] = None) -> RoutePlan:
+        """
+        Planla ve bacakları eşzamanlı gönder.
+        Raises: RoutingError (plan yapılamazsa veya hiçbir bacak gönderilemezse)
+        """
+        plan = self.plan(symbol, side, amount, leverage, deadline_ms)
+        futures = [self._pool.submit(self._send_leg, leg, plan.side, leverage, params or {}) for leg in plan.legs]
+        wait(futures)
+
+        for leg in plan.legs:
+            if leg.error is not None:
+                logger.error(f"Routed {plan.side} {leg.amount:g} {leg.symbol} on {leg.exchange} failed: {leg.error}")
+                continue
+            slippage = leg.slippage_bps
+            if slippage is not None:
+                get_metrics().histogram("order_router.slippage_bps", buckets=(1, 2, 5, 10, 25, 50, 100),
+                                        exchange=leg.exchange).observe(abs(slippage))
+            logger.info(
+                f"Routed {plan.side} {leg.amount:g} {leg.symbol} → {leg.exchange}: "
+                f"quoted {leg.quoted_price} achieved {leg.achieved_price} "
+                f"({'n/a' if slippage is None else f'{slippage:+.1f} bps'}), routing {plan.routing_ms:.1f} ms"
+                + (f", timed out: {', '.join(plan.timed_out)}" if plan.timed_out else "")
+            )
+
+        if not plan.filled_legs:
+            raise RoutingError("; ".join(f"{leg.exchange}: {leg.error}" for leg in plan.legs))
+        return plan
+
+    def _send_leg(self, leg: RouteLeg, side: str, leverage: int, params: Dict[str, Any]) -> None:
+        reservation = None
+        if self.account_state is not None:
+            reservation = self.account_state.reserve(leg.amount * leg.quoted_price / max(leverage, 1),
+                                                     exchange_name=leg.exchange)
+        try:
+            with request_lane(Lane.ORDER):
+                order = self.exchange_manager.create_order(
+                    symbol=leg.symbol, side=side, order_type="market", amount=leg.amount,
+                    params=dict(params), exchange_name=leg.exchange,
+                )
+        except Exception as e:
+            leg.error = str(e)
+            if reservation is not None:
+                self.account_state.release(reservation)
+            return
+        if reservation is not None:
+            self.account_state.settle(reservation)
+        leg.order = order
+        achieved = order.get('average') or order.get('price')
+        leg.achieved_price = float(achieved) if achieved else None
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
@@ -18,13 +18,21 @@ class PaperTradingEngine:
 
     - Gerçek borsaya emir göndermez.
     - Emirleri anında tamamen dolmuş kabul eder (market/limit fark etmiyor).
-    - Şimdilik internal pozisyon/bakiye takibi yapmıyor, sadece OrderResult üretmek için
-      ccxt benzeri bir order dict'i döndürüyor.
+    - Bakiyeyi marj olarak takip eder: açan emir notional / kaldıraç kadar marj
+      kilitler, reduce-only emir aynı oranda serbest bırakır (PnL ve komisyon yok).
+    - OrderResult üretmek için ccxt benzeri bir order dict'i döndürür.
     """
 
-    def __init__(self, logger=None) -> None:
+    def __init__(self, logger=None, initial_balance: float = 0.0) -> None:
         self.logger = logger or get_logger(__name__)
         self._order_counter: int = 0
+        self.balance: float = float(initial_balance)
+        self.used_margin: float = 0.0
+
+    @property
+    def free_balance(self) -> float:
+        """Kullanılabilir (kilitli marj düşülmüş) paper bakiye"""
+        return max(0.0, self.balance - self.used_margin)
 
     # ------------------------------------------------------------------
     # Public API
@@ -50,6 +58,11 @@ class PaperTradingEngine:
         order_type = getattr(params, "order_type", None)
 
         notional = qty * price
+        margin = notional / max(1, getattr(params, "leverage", 1) or 1)
+        if getattr(params, "reduce_only", False):
+            self.used_margin = max(0.0, self.used_margin - margin)
+        else:
+            self.used_margin += margin
 
         order = {
             "id": order_id,
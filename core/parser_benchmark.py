@@ -0,0 +1,173 @@
+"""
+core/parser_benchmark.py
+
+CommandParser + CommandValidator için etiketli corpus değerlendirmesi.
+- Corpus: data/corpus/parser_benchmark_v<N>.tsv (scripts/generate_parser_corpus.py üretir)
+- Rapor: parses/sec, p50/p99 gecikme, alan bazlı doğruluk (aksiyon, sembol,
+  miktar, kaldıraç, fiyat, SL/TP), validator uyumu, dil/kaynak kırılımı
+- scripts/bench_command_parser.py --corpus ve regresyon testleri kullanır
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from core.command_parser import CommandParser, CommandValidator, ParsedCommand
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CORPUS_VERSION = 1
+DEFAULT_CORPUS_PATH = PROJECT_ROOT / "data" / "corpus" / f"parser_benchmark_v{CORPUS_VERSION}.tsv"
+
+CORPUS_COLUMNS = (
+    "text", "language", "action", "symbol", "amount", "leverage",
+    "price", "stop_loss", "take_profit", "valid", "source",
+)
+
+# Sadece alış/satış satırlarında ölçülen alanlar
+ORDER_FIELDS = ("symbol", "amount", "leverage", "price", "stop_loss", "take_profit")
+
+
+@dataclass
+class CorpusRow:
+    """Tek etiketli transcript"""
+    text: str
+    language: str
+    action: Optional[str]
+    symbol: Optional[str] = None
+    amount: Optional[float] = None
+    leverage: Optional[int] = None
+    price: Optional[float] = None
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    valid: bool = False
+    source: str = "template"
+
+
+def _optional(value: str, cast=str):
+    return cast(value) if value else None
+
+
+def load_corpus(path: Path = DEFAULT_CORPUS_PATH) -> List[CorpusRow]:
+    """TSV corpus'u yükle ('#' ile başlayan satırlar yorum, ilk satır başlık)"""
+    rows = []
+    header = None
+    with Path(path).open(encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            if header is None:
+                header = fields
+                continue
+            record = dict(zip(header, fields))
+            rows.append(CorpusRow(
+                text=record["text"],
+                language=record["language"],
+                action=_optional(record["action"]),
+                symbol=_optional(record["symbol"]),
+                amount=_optional(record["amount"], float),
+                leverage=_optional(record["leverage"], int),
+                price=_optional(record["price"], float),
+                stop_loss=_optional(record["stop_loss"], float),
+                take_profit=_optional(record["take_profit"], float),
+                valid=record["valid"] == "1",
+                source=record["source"],
+            ))
+    return rows
+
+
+def _field_matches(expected, actual) -> bool:
+    if expected is None or actual is None:
+        return expected is None and actual is None
+    if isinstance(expected, float):
+        return abs(float(actual) - expected) < 1e-6
+    return expected == actual
+
+
+def _percentile(sorted_values: Sequence[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class _Tally:
+    """doğru / toplam sayacı"""
+
+    def __init__(self):
+        self.correct = 0
+        self.total = 0
+
+    def add(self, ok: bool) -> None:
+        self.correct += ok
+        self.total += 1
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.total if self.total else 0.0
+
+
+def evaluate(rows: Sequence[CorpusRow], parser: Optional[CommandParser] = None,
+             use_language: bool = True, repeat: int = 1, max_errors: int = 20) -> Dict:
+    """
+    Corpus üzerinde parser + validator'ı çalıştır.
+
+    use_language: True ise satırın dili parse'a verilir (Whisper'ın algıladığı dil gibi)
+    repeat: Gecikme ölçümü için tekrar sayısı (doğruluk ilk geçişten)
+    Returns: {"rows", "parses_per_sec", "p50_us", "p99_us", "accuracy": {...},
+              "by_language": {...}, "by_source": {...}, "errors": [...]}
+    """
+    parser = parser or CommandParser()
+    fields = {name: _Tally() for name in ("action",) + ORDER_FIELDS + ("valid",)}
+    by_language: Dict[str, _Tally] = {}
+    by_source: Dict[str, _Tally] = {}
+    errors = []
+    latencies_ns = []
+
+    for rnd in range(repeat):
+        for row in rows:
+            language = row.language if use_language else None
+            started = time.perf_counter_ns()
+            cmd: Optional[ParsedCommand] = parser.parse(row.text, language=language)
+            latencies_ns.append(time.perf_counter_ns() - started)
+            if rnd:
+                continue
+
+            action = cmd.action if cmd else None
+            wrong = []
+            fields["action"].add(action == row.action)
+            if action != row.action:
+                wrong.append("action")
+
+            if row.action in ("buy", "sell"):
+                for name in ORDER_FIELDS:
+                    ok = _field_matches(getattr(row, name), getattr(cmd, name) if cmd else None)
+                    fields[name].add(ok)
+                    if not ok:
+                        wrong.append(name)
+
+            valid, _ = CommandValidator.validate(cmd)
+            fields["valid"].add(valid == row.valid)
+
+            by_language.setdefault(row.language, _Tally()).add(not wrong)
+            by_source.setdefault(row.source, _Tally()).add(not wrong)
+            if wrong and len(errors) < max_errors:
+                errors.append((row.text, wrong, cmd))
+
+    latencies_ns.sort()
+    total_s = sum(latencies_ns) / 1e9
+    return {
+        "rows": len(rows),
+        "parses_per_sec": len(latencies_ns) / total_s if total_s else 0.0,
+        "p50_us": _percentile(latencies_ns, 50) / 1e3,
+        "p99_us": _percentile(latencies_ns, 99) / 1e3,
+        "accuracy": {name: tally.accuracy for name, tally in fields.items()},
+        "by_language": {k: v.accuracy for k, v in sorted(by_language.items())},
+        "by_source": {k: v.accuracy for k, v in sorted(by_source.items())},
+        "errors": errors,
+    }
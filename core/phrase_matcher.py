@@ -0,0 +1,303 @@
+"""
+core/phrase_matcher.py
+
+Token seviyesinde phrase eşleştirici (trie tabanlı).
+- Anahtar kelimeler bir kez derlenir, metin tek geçişte taranır
+- Kelime sınırı semantiği: 'al' sadece tam 'al' token'ında eşleşir, 'almak' içinde değil
+- Çakışmalarda en soldaki, sonra en uzun eşleşme kazanır (leftmost-longest)
+- ASR hatalarına karşı karakter trie'si üzerinde sınırlı Levenshtein araması (CharTrie)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Harf/rakam dizileri tek token; noktalama ve kesme işareti ayırıcıdır ("btc'yi" → btc, yi)
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Trie düğümünde payload listesini tutan anahtar (token'lar asla boş string değildir)
+_PAYLOAD = ""
+
+# remove() için "herhangi bir değer" işareti
+_ANY = object()
+
+# 3 veya daha fazla tekrar eden harf ("allll" → "al")
+_REPEAT_RE = re.compile(r"(\w)\1{2,}")
+
+
+@dataclass(frozen=True)
+class PhraseMatch:
+    """Metinde bulunan bir phrase eşleşmesi"""
+    kind: str            # "action", "symbol", "number", ...
+    value: Any           # "buy", "BTCUSDT", 100, ...
+    phrase: str          # Eşleşen kayıtlı phrase
+    start: int           # Karakter başlangıcı (metin içinde)
+    end: int             # Karakter sonu (hariç)
+    token_start: int     # Token indeksi
+    token_end: int       # Token indeksi (hariç)
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """Metni (token, start, end) listesine böl"""
+    return [(m.group(0), m.start(), m.end()) for m in _TOKEN_RE.finditer(text)]
+
+
+class TokenTrie:
+    """
+    Token dizileri üzerinde trie.
+
+    Aynı phrase birden fazla (kind, value) taşıyabilir; örn. bir kelime hem
+    sayı hem sembol olarak kayıtlı olabilir. Eşleşmede phrase'in tüm
+    payload'ları döndürülür.
+    """
+
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def split(phrase: str) -> List[str]:
+        """Phrase'i token listesine böl"""
+        return _TOKEN_RE.findall(phrase)
+
+    def add(self, phrase: str, kind: str, value: Any) -> None:
+        """Phrase ekle (aynı kind+value tekrar eklenirse yok sayılır)"""
+        tokens = self.split(phrase)
+        if not tokens:
+            return
+
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+
+        payloads = node.setdefault(_PAYLOAD, [])
+        entry = (kind, value, phrase)
+        if any(p[0] == kind and p[1] == value for p in payloads):
+            return
+        payloads.append(entry)
+        self._size += 1
+
+    def remove(self, phrase: str, kind: Optional[str] = None, value: Any = _ANY) -> bool:
+        """
+        Phrase'i sil. kind / value verilirse sadece eşleşen payload'lar silinir.
+        Silindiyse True.
+        """
+        tokens = self.split(phrase)
+        if not tokens:
+            return False
+
+        path = [self._root]
+        node = self._root
+        for token in tokens:
+            node = node.get(token)
+            if node is None:
+                return False
+            path.append(node)
+
+        payloads = node.get(_PAYLOAD)
+        if not payloads:
+            return False
+
+        kept = [
+            p for p in payloads
+            if (kind is not None and p[0] != kind) or (value is not _ANY and p[1] != value)
+        ]
+        removed = len(payloads) - len(kept)
+        if not removed:
+            return False
+        self._size -= removed
+
+        if kept:
+            node[_PAYLOAD] = kept
+            return True
+        del node[_PAYLOAD]
+
+        # Boş kalan dalları buda
+        for i in range(len(tokens), 0, -1):
+            if path[i]:
+                break
+            del path[i - 1][tokens[i - 1]]
+        return True
+
+    def contains(self, phrase: str) -> bool:
+        """Phrase kayıtlı mı?"""
+        node = self._root
+        for token in self.split(phrase):
+            node = node.get(token)
+            if node is None:
+                return False
+        return _PAYLOAD in node
+
+    def iter_matches(self, text: str, tokens: Optional[List[Tuple[str, int, int]]] = None) -> Iterator[PhraseMatch]:
+        """
+        Metni tek geçişte tara, çakışmayan leftmost-longest eşleşmeleri üret.
+
+        tokens: Önceden tokenize edilmiş metin (tekrar tokenize etmemek için)
+        """
+        if tokens is None:
+            tokens = tokenize(text)
+
+        root = self._root
+        n = len(tokens)
+        i = 0
+        while i < n:
+            node = root.get(tokens[i][0])
+            if node is None:
+                i += 1
+                continue
+
+            best_end = -1
+            best_payloads = None
+            j = i
+            while node is not None:
+                j += 1
+                payloads = node.get(_PAYLOAD)
+                if payloads:
+                    best_end = j
+                    best_payloads = payloads
+                if j >= n:
+                    break
+                node = node.get(tokens[j][0])
+
+            if best_payloads is None:
+                i += 1
+                continue
+
+            start = tokens[i][1]
+            end = tokens[best_end - 1][2]
+            for kind, value, phrase in best_payloads:
+                yield PhraseMatch(kind, value, phrase, start, end, i, best_end)
+            i = best_end
+
+    def find_all(self, text: str) -> List[PhraseMatch]:
+        """Tüm eşleşmeleri liste olarak döndür"""
+        return list(self.iter_matches(text))
+
+
+def collapse_repeats(word: str) -> str:
+    """3+ kez tekrar eden harfleri teke indir (çift harfler korunur: "elli")"""
+    return _REPEAT_RE.sub(r"\1", word)
+
+
+def max_edit_distance(length: int) -> int:
+    """Kelime uzunluğuna göre izin verilen düzeltme: ≤3 → 0, 4-6 → 1, 7+ → 2"""
+    if length <= 3:
+        return 0
+    if length <= 6:
+        return 1
+    return 2
+
+
+class CharTrie:
+    """
+    Karakter trie'si üzerinde Levenshtein araması.
+
+    Trie dalları DP satırıyla birlikte yürünür; satırdaki minimum mesafe sınırı
+    aşınca dal budanır. Kelime dağarcığı sabit olduğundan bir token'ın maliyeti
+    sabittir, metin uzunluğuna göre toplam maliyet doğrusaldır.
+    """
+
+    # Düzeltme önbelleği sınırı (sözcük dağarcığı sabit, transcript kelimeleri çok tekrar eder)
+    CACHE_SIZE = 4096
+
+    def __init__(self, words=()):
+        self._root: Dict[str, Any] = {}
+        self._words = set()
+        self._cache: Dict[str, Optional[Tuple[str, float]]] = {}
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def add(self, word: str) -> None:
+        if not word or word in self._words:
+            return
+        node = self._root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[_PAYLOAD] = word
+        self._words.add(word)
+        self._cache.clear()
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[str, int]]:
+        """max_distance içindeki tüm kelimeleri (kelime, mesafe) olarak döndür"""
+        results: List[Tuple[str, int]] = []
+        n = len(word)
+        first_row = list(range(n + 1))
+        stack = [(child, ch, first_row) for ch, child in self._root.items() if ch != _PAYLOAD]
+
+        while stack:
+            node, ch, prev = stack.pop()
+
+            # Bir sonraki DP satırı: ekleme / silme / değiştirme
+            row = [prev[0] + 1]
+            for i in range(n):
+                cost = prev[i] + (word[i] != ch)
+                insert = row[i] + 1
+                delete = prev[i + 1] + 1
+                if insert < cost:
+                    cost = insert
+                if delete < cost:
+                    cost = delete
+                row.append(cost)
+
+            found = node.get(_PAYLOAD)
+            if found is not None and row[n] <= max_distance:
+                results.append((found, row[n]))
+
+            if min(row) <= max_distance:
+                for next_ch, child in node.items():
+                    if next_ch != _PAYLOAD:
+                        stack.append((child, next_ch, row))
+
+        return results
+
+    def correct(self, word: str) -> Optional[Tuple[str, float]]:
+        """
+        Kelimeyi en yakın sözcüğe düzelt.
+
+        Returns: (düzeltilmiş kelime, skor) veya None. Skor 1 - mesafe / uzunluk
+            (doğru harflerin oranı); sadece harf tekrarı düzeltildiyse 0.95.
+        """
+        if word in self._cache:
+            return self._cache[word]
+        if len(self._cache) >= self.CACHE_SIZE:
+            self._cache.clear()
+        result = self._cache[word] = self._correct(word)
+        return result
+
+    def _correct(self, word: str) -> Optional[Tuple[str, float]]:
+        collapsed = collapse_repeats(word)
+        if collapsed in self._words:
+            return collapsed, (1.0 if collapsed == word else 0.95)
+
+        limit = max_edit_distance(len(collapsed))
+        if limit == 0:
+            return None
+
+        best = None
+        for candidate, distance in self.search(collapsed, limit):
+            # Kısa sözcükler (≤3) hiç, 4-6 harfliler en fazla 1 düzeltme alır
+            if distance > max_edit_distance(len(candidate)):
+                continue
+            rank = (distance, abs(len(candidate) - len(collapsed)), candidate)
+            if best is None or rank < best[0]:
+                best = (rank, candidate, distance)
+
+        if best is None:
+            return None
+        _, candidate, distance = best
+        score = 1.0 - distance / max(len(candidate), len(collapsed))
+        if collapsed != word:
+            score *= 0.95
+        return candidate, score
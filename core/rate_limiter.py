@@ -0,0 +1,333 @@
+"""
+core/rate_limiter.py
+
+Borsa başına ağırlık (weight) bütçeli, öncelik şeritli istek zamanlayıcısı.
+- ccxt'nin örnek başına throttle'ı yerine borsa başına tek token bucket:
+  aynı borsaya giden tüm istemciler (emir, bakiye, fiyat polling, bağlantı
+  testi) aynı bütçeyi harcar
+- Maliyet ccxt'nin endpoint ağırlığıdır (calculate_rate_limiter_cost);
+  dolum hızı 1000 / exchange.rateLimit birim/sn (ccxt'nin kendi temposu)
+- Şeritler: ORDER (emir/iptal, private yazma) > ACCOUNT (private okuma)
+  > MARKET (public veri). Üst şeritte bekleyen varken alt şerit geçemez
+- Alt şeritler bütçenin bir kısmını emirlere bırakır (reserve); bütçe
+  sıkışıkken tahmini bekleme max_wait'i aşarsa istek beklemeden düşürülür
+  (RequestShed; ccxt.RateLimitExceeded alt sınıfı, mevcut NetworkError
+  yakalayıcıları çalışır). ORDER şeridi asla düşürülmez
+- Borsa 429/418 döndürürse bütçe Retry-After kadar eksiye çekilir
+- Metrikler (core.metrics): rate_limit.budget_used, rate_limit.queue_depth,
+  rate_limit.queue_delay_ms, rate_limit.requests, rate_limit.shed
+
+Kullanım:
+    scheduler = get_rate_limiter("binance", rate_limit_ms=50)
+    install(exchange, scheduler)          # ExchangeRegistry bunu her istemciye yapar
+
+    with request_lane(Lane.ORDER):        # emir akışındaki ticker/bakiye okumaları da öncelikli
+        exchange.fetch_ticker("BTC/USDT:USDT")
+
+    install_async(async_exchange, scheduler)   # ccxt.async_support istemcisi aynı kovayı paylaşır
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Dict, Iterator, Optional
+
+import ccxt
+
+from core.metrics import MetricsRegistry, get_metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Lane(IntEnum):
+    """Öncelik şeritleri (küçük değer = yüksek öncelik)"""
+    ORDER = 0
+    ACCOUNT = 1
+    MARKET = 2
+
+
+# Şeridin dokunamayacağı bütçe payı (kapasitenin oranı)
+DEFAULT_RESERVES: Dict[Lane, float] = {Lane.ORDER: 0.0, Lane.ACCOUNT: 0.1, Lane.MARKET: 0.3}
+# Bu süreden uzun bekleyecek istek düşürülür (sn; None = hiç düşürme)
+DEFAULT_MAX_WAIT: Dict[Lane, Optional[float]] = {Lane.ORDER: None, Lane.ACCOUNT: 5.0, Lane.MARKET: 1.0}
+DEFAULT_BURST_SECONDS = 5.0
+
+
+class RequestShed(ccxt.RateLimitExceeded):
+    """Bütçe sıkışıkken düşük öncelikli istek düşürüldü"""
+    pass
+
+
+def classify_request(api: Any, method: str, path: str) -> Lane:
+    """
+    ccxt fetch2 argümanlarından şerit tahmini.
+    private yazma (emir, iptal, kaldıraç) → ORDER, private okuma → ACCOUNT, public → MARKET
+    """
+    api_name = "/".join(api) if isinstance(api, (list, tuple)) else str(api)
+    if "private" not in api_name.lower():
+        return Lane.MARKET
+    return Lane.ACCOUNT if method.upper() == "GET" else Lane.ORDER
+
+
+# Thread ve asyncio task başına ayrı (task oluşturulurken kopyalanır)
+_lane: ContextVar[Optional[Lane]] = ContextVar("request_lane", default=None)
+
+
+@contextmanager
+def request_lane(lane: Lane) -> Iterator[None]:
+    """Bu thread'deki / coroutine'deki isteklerin şeridini zorla (örn. emir akışındaki ticker okuması)"""
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane() -> Optional[Lane]:
+    return _lane.get()
+
+
+class _Ticket:
+    __slots__ = ("cost",)
+
+    def __init__(self, cost: float):
+        self.cost = cost
+
+
+class RateLimitScheduler:
+    """
+    Tek borsa için token bucket + öncelik kuyrukları.
+
+    refill_rate: Saniyede eklenen ağırlık birimi
+    capacity: Biriktirilebilecek en fazla birim (patlama payı)
+    """
+
+    def __init__(self, name: str, refill_rate: float, capacity: float,
+                 reserves: Optional[Dict[Lane, float]] = None,
+                 max_wait: Optional[Dict[Lane, Optional[float]]] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.name = name
+        self.refill_rate = float(refill_rate)
+        self.capacity = float(capacity)
+        self.reserves = {**DEFAULT_RESERVES, **(reserves or {})}
+        self.max_wait = {**DEFAULT_MAX_WAIT, **(max_wait or {})}
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._queues: Dict[Lane, deque] = {lane: deque() for lane in Lane}
+
+        metrics = metrics or get_metrics()
+        self._budget_used = metrics.gauge("rate_limit.budget_used", exchange=name)
+        self._queue_depth = metrics.gauge("rate_limit.queue_depth", exchange=name)
+        self._delay = {lane: metrics.histogram("rate_limit.queue_delay_ms", exchange=name, lane=lane.name.lower())
+                       for lane in Lane}
+        self._requests = {lane: metrics.counter("rate_limit.requests", exchange=name, lane=lane.name.lower())
+                          for lane in Lane}
+        self._shed = {lane: metrics.counter("rate_limit.shed", exchange=name, lane=lane.name.lower())
+                      for lane in Lane}
+
+    @property
+    def budget_used(self) -> float:
+        """Harcanmış bütçe oranı (0 = tam dolu, 1 = boş, >1 = ceza)"""
+        with self._cond:
+            self._refill()
+            return self._used()
+
+    def acquire(self, cost: float = 1.0, lane: Lane = Lane.MARKET) -> float:
+        """
+        Bütçeden cost birim al; gerekirse sırası gelene kadar bekle.
+
+        Returns: Kuyrukta beklenen süre (sn)
+        Raises: RequestShed (tahmini bekleme şeridin max_wait'ini aşarsa)
+        """
+        cost = min(max(float(cost), 0.0), self.capacity)
+        floor = self.reserves.get(lane, 0.0) * self.capacity
+        max_wait = self.max_wait.get(lane)
+        started = time.monotonic()
+        ticket = _Ticket(cost)
+
+        with self._cond:
+            self._queues[lane].append(ticket)
+            try:
+                while True:
+                    self._refill()
+                    ahead = self._cost_ahead(ticket, lane)
+                    if ahead == 0.0 and self.tokens - cost >= floor:
+                        self.tokens -= cost
+                        break
+                    needed = ahead + cost + floor - self.tokens
+                    wait = max(needed / self.refill_rate, 0.001)
+                    if max_wait is not None and time.monotonic() - started + wait > max_wait:
+                        self._shed[lane].inc()
+                        raise RequestShed(
+                            f"{self.name}: {lane.name.lower()} request shed "
+                            f"(budget {self._used():.0%} used, est. wait {wait:.2f}s)")
+                    self._queue_depth.set(self._depth())
+                    self._cond.wait(wait)
+            finally:
+                self._queues[lane].remove(ticket)
+                self._queue_depth.set(self._depth())
+                self._budget_used.set(self._used())
+                self._cond.notify_all()
+
+        waited = time.monotonic() - started
+        self._requests[lane].inc()
+        self._delay[lane].observe(waited * 1000)
+        return waited
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Borsa limit aşımı bildirdi: bütçeyi seconds kadar eksiye çek.
+        Aynı anda gelen birden çok 429 cezayı katlamaz (en uzun olan geçerli)
+        """
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.refill_rate)
+            self._budget_used.set(self._used())
+        logger.warning(f"Rate limit hit on {self.name}; pausing requests for {seconds:.1f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            self._refill()
+            return {
+                "budget_used": round(self._used(), 3),
+                "queued": {lane.name.lower(): len(q) for lane, q in self._queues.items()},
+                "requests": {lane.name.lower(): int(c.value) for lane, c in self._requests.items()},
+                "shed": {lane.name.lower(): int(c.value) for lane, c in self._shed.items()},
+                "p95_delay_ms": {lane.name.lower(): h.percentile(95) for lane, h in self._delay.items()},
+            }
+
+    # ------------------------------------------------------------------
+    # Internal helpers (self._cond altında)
+    # ------------------------------------------------------------------
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    def _cost_ahead(self, ticket: _Ticket, lane: Lane) -> float:
+        """Bu istekten önce bütçe alacak isteklerin toplam maliyeti"""
+        ahead = 0.0
+        for other in Lane:
+            if other > lane:
+                break
+            for queued in self._queues[other]:
+                if queued is ticket:
+                    break
+                ahead += queued.cost
+        return ahead
+
+    def _depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def _used(self) -> float:
+        return 1.0 - self.tokens / self.capacity
+
+
+def install(exchange, scheduler: RateLimitScheduler) -> None:
+    """
+    ccxt (sync) istemcisinin isteklerini zamanlayıcıdan geçir.
+    ccxt'nin kendi throttle'ı kapatılır; sıralama artık borsa genelindedir.
+    """
+    if getattr(exchange, "_rate_limiter", None) is scheduler:
+        return
+    fetch2 = type(exchange).fetch2.__get__(exchange)
+
+    def scheduled_fetch2(path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+        cost = exchange.calculate_rate_limiter_cost(api, method, path, params, config)
+        lane = current_lane()
+        scheduler.acquire(cost, classify_request(api, method, path) if lane is None else lane)
+        try:
+            return fetch2(path, api, method, params, headers, body, config)
+        except ccxt.DDoSProtection:
+            scheduler.penalize(_retry_after(exchange))
+            raise
+
+    exchange.throttle = lambda cost=None: None
+    exchange.fetch2 = scheduled_fetch2
+    exchange._rate_limiter = scheduler
+
+
+def install_async(exchange, scheduler: RateLimitScheduler) -> None:
+    """
+    install() karşılığı, ccxt.async_support istemcileri için.
+    Kova senkron istemcilerle ortaktır; acquire() thread kilidiyle beklediği
+    için event loop'u tutmasın diye executor'da çalışır.
+    """
+    if getattr(exchange, "_rate_limiter", None) is scheduler:
+        return
+    fetch2 = type(exchange).fetch2.__get__(exchange)
+
+    async def scheduled_fetch2(path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+        cost = exchange.calculate_rate_limiter_cost(api, method, path, params, config)
+        lane = current_lane()
+        await asyncio.get_running_loop().run_in_executor(
+            None, scheduler.acquire, cost, classify_request(api, method, path) if lane is None else lane)
+        try:
+            return await fetch2(path, api, method, params, headers, body, config)
+        except ccxt.DDoSProtection:
+            scheduler.penalize(_retry_after(exchange))
+            raise
+
+    async def no_throttle(cost=None):
+        return None
+
+    exchange.throttle = no_throttle
+    exchange.fetch2 = scheduled_fetch2
+    exchange._rate_limiter = scheduler
+
+
+def _retry_after(exchange, default: float = 1.0) -> float:
+    headers = getattr(exchange, "last_response_headers", None) or {}
+    try:
+        return max(float(headers.get("Retry-After") or headers.get("retry-after") or default), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+_schedulers: Dict[str, RateLimitScheduler] = {}
+_schedulers_lock = threading.Lock()
+_settings: Dict[str, Any] = {"burst_seconds": DEFAULT_BURST_SECONDS, "reserves": {}, "max_wait": {}}
+
+
+def configure(burst_seconds: Optional[float] = None, reserves: Optional[Dict[str, float]] = None,
+              max_wait: Optional[Dict[str, Optional[float]]] = None) -> None:
+    """Yeni oluşturulacak zamanlayıcıların ayarları (şerit adları: order/account/market)"""
+    if burst_seconds is not None:
+        _settings["burst_seconds"] = float(burst_seconds)
+    if reserves is not None:
+        _settings["reserves"] = {Lane[k.upper()]: float(v) for k, v in reserves.items()}
+    if max_wait is not None:
+        _settings["max_wait"] = {Lane[k.upper()]: (None if v is None else float(v)) for k, v in max_wait.items()}
+
+
+def get_rate_limiter(name: str, rate_limit_ms: float = 50.0) -> RateLimitScheduler:
+    """
+    Borsa başına tek zamanlayıcı.
+    name: "binance" veya "binance-sandbox" (testnet ayrı bir limit havuzudur)
+    rate_limit_ms: ccxt exchange.rateLimit (1 ağırlık biriminin süresi)
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(name)
+        if scheduler is None:
+            refill_rate = 1000.0 / max(float(rate_limit_ms), 1.0)
+            scheduler = RateLimitScheduler(
+                name, refill_rate, capacity=refill_rate * _settings["burst_seconds"],
+                reserves=_settings["reserves"], max_wait=_settings["max_wait"],
+            )
+            _schedulers[name] = scheduler
+        return scheduler
+
+
+def clear_rate_limiters() -> None:
+    """Tüm zamanlayıcıları unut (testler)"""
+    with _schedulers_lock:
+        _schedulers.clear()
@@ -5,6 +5,8 @@ Basit risk yönetim katmanı.
 - Ayarlar `settings` tablosundan okunur (DatabaseManager.get_setting)
 - Limitler sadece AYARLANMIŞSA uygulanır (yoksa o kural pasif kalır)
 - İhlalde hem log yazar hem RiskLimitError fırlatır
+- Market emirlerde defter tahmini (FillEstimate) verilirse: defterin
+  karşılayamadığı emir her zaman, kayma limiti ayarlıysa aşan emir reddedilir
 """
 
 from __future__ import annotations
@@ -14,6 +16,7 @@ from typing import Optional, Dict, Any
 
 from utils.logger import get_logger
 from database.db_manager import DatabaseManager
+from core.order_book import FillEstimate
 
 
 @dataclass
@@ -24,6 +27,7 @@ class OrderRiskContext:
     notional_usd: float
     leverage: int
     is_paper: bool
+    fill_estimate: Optional[FillEstimate] = None   # Market emir için defter yürüyüşü
 
 
 class RiskLimitError(Exception):
@@ -90,6 +94,36 @@ class RiskManager:
             )
             raise RiskLimitError(msg)
 
+        # 3) Defter derinliği / kayma (market emir tahmini varsa)
+        estimate = ctx.fill_estimate
+        if estimate is not None:
+            context = {
+                "symbol": ctx.symbol,
+                "side": ctx.side,
+                "notional_usd": ctx.notional_usd,
+                "avg_price": estimate.avg_price,
+                "best_price": estimate.best_price,
+                "slippage_pct": estimate.slippage_pct,
+                "levels": estimate.levels,
+                "is_paper": ctx.is_paper,
+            }
+            if not estimate.complete:
+                self._log_risk_event(level="RISK", message="Order exceeds order book depth", context=context)
+                raise RiskLimitError(
+                    f"Emir defter derinliğini aşıyor: {ctx.notional_usd:.2f} USDT istendi, "
+                    f"defterde {estimate.filled_notional:.2f} USDT var"
+                )
+
+            max_slippage = self._get_float_setting("risk.max_slippage_pct")
+            slippage = estimate.slippage_pct
+            if max_slippage is not None and slippage is not None and slippage > max_slippage:
+                context["limit_pct"] = max_slippage
+                self._log_risk_event(level="RISK", message="Max slippage exceeded", context=context)
+                raise RiskLimitError(
+                    f"Tahmini kayma limiti aşıyor: slippage=%{slippage:.3f} "
+                    f"(ort. {estimate.avg_price:.6g}), limit=%{max_slippage:.3f}"
+                )
+
         # İleride: günlük kayıp limiti, max açık pozisyon sayısı vb. buraya eklenebilir.
 
     # ------------------------------------------------------------------
@@ -0,0 +1,387 @@
+"""
+core/spoken_numbers.py
+
+Türkçe/İngilizce konuşulan sayıları tek geçişte rakama çevirir.
+- Bileşik sayılar: "yüz elli" → 150, "iki bin beş yüz" → 2500, "one hundred and fifty" → 150
+- Ondalık: "bir virgül beş" → 1.5, "one point two five" → 1.25, "iki buçuk" → 2.5, "bin buçuk" → 1500
+- Rakamlar: "1,5" / "2.5" → ondalık, "1.500" / "1,000" → binlik ayırıcı, "2.5k" → 2500, "5 bin" → 5000
+- Her sayı, metindeki karakter aralığıyla (span) birlikte döner
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+# Küçük sayılar (< 100)
+SMALL_WORDS: Dict[str, int] = {
+    # Türkçe
+    'sıfır': 0, 'bir': 1, 'iki': 2, 'üç': 3, 'dört': 4, 'beş': 5,
+    'altı': 6, 'yedi': 7, 'sekiz': 8, 'dokuz': 9,
+    'on': 10, 'yirmi': 20, 'otuz': 30, 'kırk': 40, 'elli': 50,
+    'altmış': 60, 'yetmiş': 70, 'seksen': 80, 'doksan': 90,
+    # İngilizce
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
+    'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14, 'fifteen': 15,
+    'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+    'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+}
+
+HUNDRED_WORDS = {'yüz', 'hundred'}
+
+# Büyük çarpanlar
+SCALE_WORDS: Dict[str, int] = {
+    'bin': 1_000, 'thousand': 1_000, 'k': 1_000,
+    'milyon': 1_000_000, 'million': 1_000_000,
+    'milyar': 1_000_000_000, 'billion': 1_000_000_000,
+}
+
+DECIMAL_WORDS = {'virgül', 'nokta', 'point'}
+HALF_WORDS = {'buçuk'}
+
+# Sayı içinde yok sayılan bağlaçlar ("one hundred and fifty", "a thousand")
+_FILLER_WORDS = {'and'}
+_ARTICLE_WORDS = {'a'}
+
+# Dile özgü sözcükler ('k' ve rakamlar her dilde geçerli).
+# Dil verilince diğer dilin sözcükleri sayı sayılmaz: İngilizce "on" ≠ Türkçe "on" (10)
+LANGUAGE_WORDS: Dict[str, frozenset] = {
+    'tr': frozenset({
+        'sıfır', 'bir', 'iki', 'üç', 'dört', 'beş', 'altı', 'yedi', 'sekiz', 'dokuz',
+        'on', 'yirmi', 'otuz', 'kırk', 'elli', 'altmış', 'yetmiş', 'seksen', 'doksan',
+        'yüz', 'bin', 'milyon', 'milyar', 'virgül', 'nokta', 'buçuk',
+    }),
+    'en': frozenset({
+        'zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
+        'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen',
+        'eighteen', 'nineteen', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy',
+        'eighty', 'ninety', 'hundred', 'thousand', 'million', 'billion', 'point', 'and', 'a',
+    }),
+}
+
+# Parser'ın ı → i normalizasyonundan geçmiş metinle de çalışsın
+_FOLD = str.maketrans({'ı': 'i', 'İ': 'i'})
+
+
+def _fold(word: str) -> str:
+    return word.lower().translate(_FOLD)
+
+
+@dataclass(frozen=True)
+class _Lexicon:
+    """Bir dilin (veya tüm dillerin) sayı sözlüğü"""
+    small: Dict[str, int]
+    hundred: frozenset
+    scale: Dict[str, int]
+    decimal: frozenset
+    half: frozenset
+    filler: frozenset
+    article: frozenset
+
+
+def _make_lexicon(words: Optional[frozenset] = None) -> _Lexicon:
+    def keep(w: str) -> bool:
+        return words is None or w in words or w == 'k'
+
+    return _Lexicon(
+        small={_fold(k): v for k, v in SMALL_WORDS.items() if keep(k)},
+        hundred=frozenset(_fold(w) for w in HUNDRED_WORDS if keep(w)),
+        scale={_fold(k): v for k, v in SCALE_WORDS.items() if keep(k)},
+        decimal=frozenset(_fold(w) for w in DECIMAL_WORDS if keep(w)),
+        half=frozenset(_fold(w) for w in HALF_WORDS if keep(w)),
+        filler=frozenset(w for w in _FILLER_WORDS if keep(w)),
+        article=frozenset(w for w in _ARTICLE_WORDS if keep(w)),
+    )
+
+
+# None → tüm diller (dil bilinmiyorsa)
+_LEXICONS: Dict[Optional[str], _Lexicon] = {None: _make_lexicon()}
+_LEXICONS.update({lang: _make_lexicon(words) for lang, words in LANGUAGE_WORDS.items()})
+
+# Tüm sayı sözcükleri (parser'ın kelime taraması için)
+NUMBER_VOCABULARY = frozenset(
+    set(SMALL_WORDS) | HUNDRED_WORDS | (set(SCALE_WORDS) - {'k'}) | DECIMAL_WORDS | HALF_WORDS
+)
+
+
+def number_vocabulary(language: Optional[str] = None) -> frozenset:
+    """Dilin sayı sözcükleri (None veya bilinmeyen dil → tümü)"""
+    words = LANGUAGE_WORDS.get(language)
+    if words is None:
+        return NUMBER_VOCABULARY
+    return frozenset(w for w in NUMBER_VOCABULARY if w in words)
+
+_TOKEN_RE = re.compile(r"(?P<num>\d+(?:[.,]\d+)*(?:k\b)?)|(?P<word>[^\W\d_]+)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class NumberSpan:
+    """Metinde bulunan bir sayı"""
+    value: float
+    start: int      # Karakter başlangıcı
+    end: int        # Karakter sonu (hariç)
+    text: str       # Kaynak metin parçası
+
+
+def parse_digits(token: str) -> Optional[float]:
+    """
+    Rakamlı token'ı çevir.
+
+    Tek ayırıcı + tam 3 hane → binlik ayırıcı ("1.500", "1,000"), aksi halde ondalık
+    ("1,5", "2.5", "0.125"). İki ayırıcı türü birlikteyse sondaki ondalıktır
+    ("1.234,5", "1,234.5"). Sondaki 'k' bin ile çarpar ("2.5k").
+    """
+    s = token.lower()
+    multiplier = 1
+    if s.endswith('k'):
+        s, multiplier = s[:-1], 1_000
+
+    dots, commas = s.count('.'), s.count(',')
+    if dots and commas:
+        decimal_sep = '.' if s.rfind('.') > s.rfind(',') else ','
+        group_sep = ',' if decimal_sep == '.' else '.'
+        s = s.replace(group_sep, '').replace(decimal_sep, '.')
+    elif dots + commas > 1:
+        # "1.000.000" → binlik gruplar
+        s = s.replace('.', '').replace(',', '')
+    elif dots + commas == 1:
+        sep = '.' if dots else ','
+        integer, fraction = s.split(sep)
+        if len(fraction) == 3 and integer.lstrip('0'):
+            s = integer + fraction
+        else:
+            s = integer + '.' + fraction
+
+    try:
+        return float(s) * multiplier
+    except ValueError:
+        return None
+
+
+class _NumberBuilder:
+    """Tek bir bileşik sayıyı token token kuran durum makinesi"""
+
+    def __init__(self):
+        self.total = 0.0
+        self.current = 0.0
+        self.last_scale: Optional[int] = None
+        self.started = False
+        self.sealed = False          # Ondalık/buçuk sonrası: küçük sayı eklenemez
+        self.digit_group = False     # Mevcut grup rakamla yazıldı ("5 bin")
+        self.start = -1
+        self.end = -1
+
+    @property
+    def value(self) -> float:
+        return self.total + self.current
+
+    def _mark(self, start: int, end: int) -> None:
+        if not self.started:
+            self.start = start
+            self.started = True
+        self.end = end
+
+    def add_small(self, v: int, start: int, end: int) -> bool:
+        if self.sealed or self.digit_group:
+            return False
+        place = 10 if v < 10 else 100
+        if self.current % place != 0:
+            return False
+        self.current += v
+        self._mark(start, end)
+        return True
+
+    def add_hundred(self, start: int, end: int) -> bool:
+        # "iki yüz", İngilizce "fifteen hundred" → 1500
+        if self.sealed or self.digit_group or self.current >= 100:
+            return False
+        self.current = (self.current or 1) * 100
+        self._mark(start, end)
+        return True
+
+    def add_scale(self, scale: int, start: int, end: int) -> bool:
+        if self.last_scale is not None and scale >= self.last_scale:
+            return False
+        self.total += (self.current or 1) * scale
+        self.current = 0.0
+        self.last_scale = scale
+        self.sealed = False
+        self.digit_group = False
+        self._mark(start, end)
+        return True
+
+    def add_digits(self, v: float, start: int, end: int) -> bool:
+        if self.started:
+            # Rakam sadece bir çarpandan sonra gelebilir ("iki bin 500")
+            if self.current or self.last_scale is None or v >= self.last_scale:
+                return False
+        self.current = v
+        self.digit_group = True
+        self._mark(start, end)
+        return True
+
+    def add_fraction(self, fraction: float, end: int) -> None:
+        self.current += fraction
+        self.sealed = True
+        self.end = end
+
+    def add_half(self, end: int) -> bool:
+        if self.sealed:
+            return False
+        if self.current == 0 and self.last_scale:
+            self.total += self.last_scale / 2   # "bin buçuk" → 1500
+        else:
+            self.current += 0.5
+        self.sealed = True
+        self.end = end
+        return True
+
+
+def _fraction_from_words(tokens: List[Tuple[str, str, int, int]], i: int,
+                         lex: _Lexicon) -> Tuple[Optional[float], int, int]:
+    """
+    Ondalık sözcüğünden sonraki kısmı oku.
+    Tek tek rakamlar birleştirilir ("point two five" → .25), bileşik sayı olduğu gibi alınır
+    ("virgül yirmi beş" → .25). Returns: (kesir, son token indeksi + 1, karakter sonu)
+    """
+    digits = []
+    compound = _NumberBuilder()
+    all_single = True
+    j = i
+    end = -1
+    while j < len(tokens):
+        kind, word, s, e = tokens[j]
+        if kind == 'num':
+            if digits or compound.started or not word.isdigit():
+                break
+            return float('0.' + word), j + 1, e
+        v = lex.small.get(word)
+        if v is None:
+            break
+        if v >= 10:
+            all_single = False
+        if not compound.add_small(v, s, e) and not all_single:
+            break
+        digits.append(str(v))
+        end = e
+        j += 1
+
+    if not digits:
+        return None, i, -1
+    if all_single:
+        return float('0.' + ''.join(digits)), j, end
+    return float('0.' + str(int(compound.value))), j, end
+
+
+def _tokenize(text: str) -> List[Tuple[str, str, int, int]]:
+    tokens = []
+    for m in _TOKEN_RE.finditer(text):
+        kind = 'num' if m.group('num') else 'word'
+        tokens.append((kind, _fold(m.group(0)) if kind == 'word' else m.group(0).lower(), m.start(), m.end()))
+    return tokens
+
+
+def find_numbers(text: str, language: Optional[str] = None) -> List[NumberSpan]:
+    """
+    Metindeki tüm sayıları (değer + span) soldan sağa döndür.
+    language: "tr" / "en" → sadece o dilin sayı sözcükleri; None → tüm diller
+    """
+    lex = _LEXICONS.get(language, _LEXICONS[None])
+    tokens = _tokenize(text)
+    spans: List[NumberSpan] = []
+    builder = _NumberBuilder()
+
+    def flush():
+        nonlocal builder
+        if builder.started:
+            spans.append(NumberSpan(builder.value, builder.start, builder.end, text[builder.start:builder.end]))
+        builder = _NumberBuilder()
+
+    i = 0
+    n = len(tokens)
+    while i < n:
+        kind, word, start, end = tokens[i]
+
+        if kind == 'num':
+            value = parse_digits(word)
+            if value is None:
+                flush()
+            elif not builder.add_digits(value, start, end):
+                flush()
+                builder.add_digits(value, start, end)
+            i += 1
+            continue
+
+        if word in lex.small:
+            if not builder.add_small(lex.small[word], start, end):
+                flush()
+                builder.add_small(lex.small[word], start, end)
+        elif word in lex.hundred:
+            if not builder.add_hundred(start, end):
+                flush()
+                builder.add_hundred(start, end)
+        elif word in lex.scale and (word != 'k' or builder.digit_group):
+            if not builder.add_scale(lex.scale[word], start, end):
+                flush()
+                builder.add_scale(lex.scale[word], start, end)
+        elif word in lex.decimal and not builder.sealed and builder.current == builder.current // 1:
+            fraction, j, frac_end = _fraction_from_words(tokens, i + 1, lex)
+            if fraction is None:
+                flush()
+            else:
+                builder._mark(start, end)   # "point five" → 0.5
+                builder.add_fraction(fraction, frac_end)
+                i = j
+                continue
+        elif word in lex.half and builder.started:
+            if not builder.add_half(end):
+                flush()
+        elif word in lex.filler and builder.started and i + 1 < n and (
+                tokens[i + 1][1] in lex.small or tokens[i + 1][1] in lex.article):
+            pass
+        elif word in lex.article and i + 1 < n and (
+                tokens[i + 1][1] in lex.hundred or tokens[i + 1][1] in lex.scale):
+            # "a hundred" / "a thousand" → 1 × çarpan
+            if not builder.started:
+                builder._mark(start, end)
+        elif word in lex.article and i + 1 < n and tokens[i + 1][1] == 'half' and builder.started:
+            # "one and a half"
+            builder.add_half(tokens[i + 1][3])
+            i += 2
+            continue
+        else:
+            flush()
+        i += 1
+
+    flush()
+    return spans
+
+
+def parse_number(text: str, language: Optional[str] = None) -> Optional[float]:
+    """Metin tek bir sayıysa değerini döndür ("iki bin beş yüz" → 2500.0)"""
+    spans = find_numbers(text, language)
+    if len(spans) != 1:
+        return None
+    span = spans[0]
+    if text[:span.start].strip() or text[span.end:].strip():
+        return None
+    return span.value
+
+
+def replace_numbers(text: str, spans: Optional[List[NumberSpan]] = None) -> str:
+    """Sayı span'lerini rakamlarla değiştir ("yüz elli dolar" → "150 dolar")"""
+    if spans is None:
+        spans = find_numbers(text)
+    parts = []
+    pos = 0
+    for span in spans:
+        parts.append(text[pos:span.start])
+        value = span.value
+        parts.append(str(int(value)) if value == int(value) else repr(value))
+        pos = span.end
+    parts.append(text[pos:])
+    return ''.join(parts)
@@ -0,0 +1,353 @@
+"""
+core/symbol_index.py
+
+Borsa marketlerinden oluşturulan sembol sözlüğü.
+- Anahtarlar: normalize edilmiş base asset ("btc"), konuşma isimleri ("bitcoin")
+  ve Türkçe'ye duyarlı fonetik anahtar ("solona" → "sln" → SOLUSDT)
+- Tüm aramalar dict/set erişimi (binlerce markette de O(1))
+- Market listesi değişince sadece eklenen/çıkan semboller güncellenir
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Türkçe karakterler → ASCII yakın karşılıkları
+_TR_MAP = str.maketrans({
+    'ı': 'i', 'İ': 'i', 'ş': 's', 'ç': 'c', 'ğ': '', 'ö': 'o', 'ü': 'u',
+    'â': 'a', 'î': 'i', 'û': 'u',
+})
+
+# Aynı sesi veren yazımlar (sıralı uygulanır)
+_DIGRAPHS = (
+    ('ph', 'f'), ('th', 't'), ('ck', 'k'), ('sh', 's'),
+    ('ch', 'c'), ('dg', 'c'), ('gh', 'g'), ('kh', 'k'),
+)
+
+_LETTER_MAP = str.maketrans({
+    'q': 'k', 'x': 'ks', 'w': 'v', 'z': 's', 'j': 'c', 'y': 'i',
+})
+
+_HARD_C_RE = re.compile(r'c(?=[aou])')
+_VOWEL_RE = re.compile(r'[aeiou]')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]')
+
+# Bu kelimeler sembol olarak çözülmez (birim / dolgu kelimeleri)
+IGNORED_WORDS = frozenset({
+    'dolar', 'dollar', 'usd', 'usdt', 'tl', 'lira', 'euro', 'eur',
+    'coin', 'token', 'kadar', 'tane', 'adet', 'lutfen', 'please',
+})
+
+# Günlük dilde geçen TR/EN kelimeler; borsada aynı isimli market olsa da
+# ("bana" → BAN, "the" → THE, "me" → ME, "high" → HIGH) sembol olarak çözülmez
+FUNCTION_WORDS = frozenset({
+    # Türkçe (normalize_word biçiminde: ş → s, ı → i)
+    'ben', 'bana', 'beni', 'sen', 'sana', 'seni', 'biz', 'bize', 'bu', 'bunu', 'buna', 'su', 'sunu',
+    'o', 'onu', 'ona', 've', 'ile', 'icin', 'de', 'da', 'ki', 'mi', 'ne', 'bir', 'biraz', 'hepsi',
+    'hepsini', 'tum', 'tumu', 'simdi', 'daha', 'sonra', 'once', 'gibi', 'cok', 'az', 'alt', 'ust',
+    'yuksek', 'dusuk', 'kalan', 'kalani', 'hemen', 'tamam', 'evet', 'hayir',
+    # English
+    'the', 'a', 'an', 'me', 'my', 'mine', 'i', 'you', 'your', 'we', 'us', 'it', 'its', 'this', 'that',
+    'some', 'any', 'all', 'rest', 'more', 'less', 'for', 'to', 'of', 'in', 'on', 'at', 'by', 'with',
+    'and', 'or', 'is', 'are', 'be', 'do', 'now', 'then', 'high', 'low', 'up', 'down', 'top', 'max',
+    'min', 'half', 'just', 'get', 'go', 'ok', 'okay', 'yes', 'no',
+})
+
+# Fonetik eşleşme için minimum kelime uzunluğu (kısa kelimelerde çakışma çok)
+MIN_PHONETIC_LENGTH = 5
+
+# Borsa marketlerine ek olarak tanınan yaygın konuşma isimleri (base → isimler)
+DEFAULT_SPOKEN_NAMES: Dict[str, Tuple[str, ...]] = {
+    'TRX': ('tron',),
+    'TON': ('toncoin',),
+    'SHIB': ('shiba', 'şiba'),
+    'PEPE': ('pepe',),
+    'NEAR': ('near',),
+    'ARB': ('arbitrum',),
+    'OP': ('optimism',),
+    'APT': ('aptos',),
+    'FIL': ('filecoin',),
+    'ATOM': ('cosmos',),
+    'UNI': ('uniswap',),
+    'SUI': ('sui',),
+}
+
+
+def normalize_word(word: str) -> str:
+    """Küçük harf, Türkçe karakterleri sadeleştir, harf/rakam dışını at"""
+    return _NON_ALNUM_RE.sub('', word.lower().translate(_TR_MAP))
+
+
+def _spelling(word: str) -> str:
+    """Sesli harfleri düşürmeden önceki fonetik yazım"""
+    w = normalize_word(word)
+    w = _HARD_C_RE.sub('k', w)  # cardano → kardano
+    for old, new in _DIGRAPHS:
+        w = w.replace(old, new)
+    return w.translate(_LETTER_MAP)
+
+
+def _collapse(word: str) -> str:
+    """Ardışık tekrar eden harfleri teke indir"""
+    out = []
+    for ch in word:
+        if not out or out[-1] != ch:
+            out.append(ch)
+    return ''.join(out)
+
+
+def phonetic_key(word: str) -> str:
+    """
+    Türkçe'ye duyarlı fonetik anahtar.
+    "ethereum"/"eterium" → "etrm", "solana"/"solona" → "sln", "chainlink"/"çeynlink" → "cnlnk"
+    """
+    w = _collapse(_spelling(word))
+    if not w:
+        return ''
+    return _collapse(w[0] + _VOWEL_RE.sub('', w[1:]))
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein mesafesi (kısa kelimeler için)"""
+    if a == b:
+        return 0
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+@dataclass(frozen=True)
+class SymbolEntry:
+    """Indekslenmiş tek market"""
+    symbol: str   # "BTCUSDT"
+    base: str     # "BTC"
+    quote: str    # "USDT"
+
+
+class SymbolIndex:
+    """
+    Borsa marketlerinden sembol çözümleyici.
+
+    Kullanım:
+        index = SymbolIndex()
+        index.update_markets(exchange_manager.get_markets())
+        index.resolve("solona")   # → "SOLUSDT"
+        index.contains("BTCUSDT") # → True
+    """
+
+    def __init__(self, quote: str = "USDT", spoken_names: Optional[Dict[str, Iterable[str]]] = None):
+        self.quote = quote.upper()
+        self._lock = threading.RLock()
+
+        self._entries: Dict[str, SymbolEntry] = {}
+        self._symbols: Set[str] = set()
+
+        # base → konuşma isimleri (market olmasa da saklanır, market gelince indekslenir)
+        self._spoken: Dict[str, Set[str]] = {}
+
+        # Anahtar → sembol kümeleri
+        self._by_name: Dict[str, Set[str]] = {}
+        self._by_phonetic: Dict[str, Set[str]] = {}
+
+        self.add_spoken_names(DEFAULT_SPOKEN_NAMES if spoken_names is None else spoken_names)
+
+    # ------------------------------------------------------------------
+    # Sorgular
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def contains(self, symbol: str) -> bool:
+        """Sembol borsada var mı? (O(1))"""
+        return symbol in self._symbols
+
+    @property
+    def symbols(self) -> Set[str]:
+        """İndekslenmiş sembollerin kopyası"""
+        with self._lock:
+            return set(self._symbols)
+
+    def resolve(self, word: str) -> Optional[str]:
+        """
+        Tek bir kelimeyi sembole çöz.
+        Önce tam isim (base / konuşma ismi), sonra fonetik anahtar denenir.
+        """
+        match = self.match(word)
+        return match[0] if match else None
+
+    def match(self, word: str) -> Optional[Tuple[str, str]]:
+        """
+        resolve() + eşleşme türü: (sembol, "exact" / "phonetic").
+        Fonetik eşleşme tahmindir; çağıran güveni düşürmelidir.
+        """
+        key = normalize_word(word)
+        if len(key) < 2 or key in IGNORED_WORDS or key in FUNCTION_WORDS:
+            return None
+
+        with self._lock:
+            exact = self._by_name.get(key)
+            if exact:
+                symbol = self._pick(key, exact)
+                return (symbol, "exact") if symbol else None
+
+            if len(key) < MIN_PHONETIC_LENGTH:
+                return None
+
+            candidates = self._by_phonetic.get(phonetic_key(key))
+            if not candidates:
+                return None
+            symbol = self._pick(key, candidates, max_distance=max(1, len(key) // 3))
+            return (symbol, "phonetic") if symbol else None
+
+    def _pick(self, key: str, candidates: Set[str], max_distance: Optional[int] = None) -> Optional[str]:
+        """Birden fazla aday varsa yazımı en yakın olanı seç"""
+        if len(candidates) == 1 and max_distance is None:
+            return next(iter(candidates))
+
+        spelled = _spelling(key)
+        best, best_dist = None, None
+        for symbol in sorted(candidates):
+            for name in self._names_for(self._entries[symbol].base):
+                dist = _edit_distance(spelled, _spelling(name))
+                if best_dist is None or dist < best_dist:
+                    best, best_dist = symbol, dist
+
+        if max_distance is not None and (best_dist is None or best_dist > max_distance):
+            return None
+        return best
+
+    def _names_for(self, base: str) -> List[str]:
+        return [base.lower()] + sorted(self._spoken.get(base, ()))
+
+    # ------------------------------------------------------------------
+    # Güncelleme
+    # ------------------------------------------------------------------
+
+    def add_spoken_names(self, names: Dict[str, Any]) -> None:
+        """
+        Konuşma isimleri ekle.
+
+        names: {"BTC": ["bitcoin", ...]} veya parser alias formatı {"bitcoin": "BTCUSDT"}
+        """
+        with self._lock:
+            for key, value in names.items():
+                if isinstance(value, str):
+                    base, alias_list = self._split_symbol(value)[0], [key]
+                else:
+                    base, alias_list = key.upper(), list(value)
+                if not base:
+                    continue
+
+                for alias in alias_list:
+                    name = normalize_word(alias)
+                    if not name or name in self._spoken.get(base, ()):
+                        continue
+                    self._spoken.setdefault(base, set()).add(name)
+
+                    entry = self._entries.get(base + self.quote)
+                    if entry:
+                        self._index_name(name, entry.symbol)
+
+    def update_markets(self, markets: Any) -> Tuple[int, int]:
+        """
+        Market listesini uygula; sadece farkı indeksler.
+
+        markets: ExchangeManager.get_markets() listesi ("BTC/USDT"),
+                 ccxt load_markets() dict'i veya "BTCUSDT" stringleri
+        Returns: (eklenen, çıkarılan)
+        """
+        new_entries = {}
+        for entry in self._iter_entries(markets):
+            new_entries[entry.symbol] = entry
+
+        with self._lock:
+            removed = self._symbols - new_entries.keys()
+            added = new_entries.keys() - self._symbols
+
+            for symbol in removed:
+                self._unindex(self._entries.pop(symbol))
+            for symbol in added:
+                entry = new_entries[symbol]
+                self._entries[symbol] = entry
+                self._index(entry)
+
+            self._symbols = set(self._entries)
+
+        if added or removed:
+            logger.info(f"Symbol index updated: +{len(added)} -{len(removed)} (total {len(self._symbols)})")
+        return len(added), len(removed)
+
+    def clear(self) -> None:
+        """Tüm marketleri kaldır (konuşma isimleri korunur)"""
+        self.update_markets([])
+
+    # ------------------------------------------------------------------
+    # İç yardımcılar
+    # ------------------------------------------------------------------
+
+    def _iter_entries(self, markets: Any) -> Iterable[SymbolEntry]:
+        if isinstance(markets, dict):
+            for symbol, market in markets.items():
+                base = (market or {}).get('base') if isinstance(market, dict) else None
+                quote = (market or {}).get('quote') if isinstance(market, dict) else None
+                if base and quote:
+                    if quote.upper() == self.quote:
+                        yield SymbolEntry(base.upper() + self.quote, base.upper(), self.quote)
+                    continue
+                entry = self._parse_symbol(symbol)
+                if entry:
+                    yield entry
+            return
+
+        for symbol in markets or ():
+            entry = self._parse_symbol(symbol)
+            if entry:
+                yield entry
+
+    def _split_symbol(self, symbol: str) -> Tuple[str, str]:
+        """"BTC/USDT:USDT" / "BTC/USDT" / "BTCUSDT" → ("BTC", "USDT")"""
+        s = symbol.upper().split(':')[0]
+        if '/' in s:
+            base, _, quote = s.partition('/')
+            return base, quote
+        if s.endswith(self.quote) and len(s) > len(self.quote):
+            return s[:-len(self.quote)], self.quote
+        return '', ''
+
+    def _parse_symbol(self, symbol: str) -> Optional[SymbolEntry]:
+        base, quote = self._split_symbol(symbol)
+        if not base or quote != self.quote:
+            return None
+        return SymbolEntry(base + quote, base, quote)
+
+    def _index_name(self, name: str, symbol: str) -> None:
+        self._by_name.setdefault(name, set()).add(symbol)
+        self._by_phonetic.setdefault(phonetic_key(name), set()).add(symbol)
+
+    def _index(self, entry: SymbolEntry) -> None:
+        for name in self._names_for(entry.base):
+            self._index_name(normalize_word(name), entry.symbol)
+
+    def _unindex(self, entry: SymbolEntry) -> None:
+        for name in self._names_for(entry.base):
+            name = normalize_word(name)
+            for table, key in ((self._by_name, name), (self._by_phonetic, phonetic_key(name))):
+                bucket = table.get(key)
+                if bucket is None:
+                    continue
+                bucket.discard(entry.symbol)
+                if not bucket:
+                    del table[key]
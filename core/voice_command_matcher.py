@@ -0,0 +1,249 @@
+"""
+core/voice_command_matcher.py
+
+voice_commands + command_keywords tabloları üzerinde indeksli komut eşleştirici.
+- Tüm phrase'ler tek bir token trie'sinde; eşleşme maliyeti phrase sayısından bağımsız
+- En uzun phrase kazanır ("satın al" > "al"), eşitlikte voice_commands önceliklidir
+- table_versions sayacı (trigger'larla artar) değişince sadece eklenen/silinen/değişen
+  satırlar trie'ye uygulanır; komut penceresindeki düzenlemeler anında geçerli olur
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.phrase_matcher import TokenTrie, tokenize
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+VOICE_COMMANDS = "voice_commands"
+COMMAND_KEYWORDS = "command_keywords"
+
+# Aynı uzunlukta eşleşmede öncelik (kullanıcı komutları önce)
+_SOURCE_PRIORITY = {VOICE_COMMANDS: 0, COMMAND_KEYWORDS: 1}
+
+# Değişiklik sayacı (database/schema.sql ile aynı; eski DB'ler için burada da oluşturulur)
+CHANGE_TRACKING_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+] + [
+    f"INSERT OR IGNORE INTO table_versions (table_name, version) VALUES ('{table}', 0)"
+    for table in (VOICE_COMMANDS, COMMAND_KEYWORDS)
+] + [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+        AFTER {event} ON {table}
+    BEGIN
+        UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+    END
+    """
+    for table in (VOICE_COMMANDS, COMMAND_KEYWORDS)
+    for event in ("INSERT", "UPDATE", "DELETE")
+]
+
+_PUNCT_RE = re.compile(r'[.,!?;:\'"()]+')
+_TR_ASCII = str.maketrans({"ı": "i", "ğ": "g", "ü": "u", "ş": "s", "ö": "o", "ç": "c"})
+
+
+def normalize_phrase(text: str) -> str:
+    """Karşılaştırma için metni normalize eder (küçük harf, noktalama temizleme, TR → ASCII)."""
+    if not text:
+        return ""
+    text = _PUNCT_RE.sub('', text.strip().lower())
+    return text.translate(_TR_ASCII).strip()
+
+
+@dataclass(frozen=True)
+class VoiceCommandMatch:
+    """Transcript içinde bulunan komut"""
+    category: str      # "BUY", "SELL", "STOP", "CLOSE", ...
+    phrase: str        # DB'deki orijinal phrase
+    source: str        # "voice_commands" veya "command_keywords"
+    row_id: int
+    start: int         # Normalize edilmiş metinde karakter aralığı
+    end: int
+
+
+class VoiceCommandMatcher:
+    """
+    DB'deki sesli komutlar için indeksli, kendini güncelleyen eşleştirici.
+
+    Kullanım:
+        matcher = VoiceCommandMatcher(db)
+        matcher.refresh(force=True)
+        match = matcher.match("bitcoin satın al")   # → VoiceCommandMatch(category="BUY", ...)
+    """
+
+    def __init__(self, db_manager, check_interval: float = 1.0,
+                 on_change: Optional[Callable[[], None]] = None):
+        """
+        db_manager: DatabaseManager
+        check_interval: match() sırasında sürüm sayacını en fazla bu sıklıkta (sn) kontrol et
+        on_change: İndeks değişince (refresh veya match() sırasındaki otomatik yenileme)
+            çağrılır; ör. niyet sınıflandırıcıyı yeni phrase'lerle yeniden eğitmek için
+        """
+        self.db = db_manager
+        self.check_interval = check_interval
+        self.on_change = on_change
+
+        self._lock = threading.RLock()
+        self._trie = TokenTrie()
+        # (kaynak, id) → (kategori, orijinal phrase, normalize phrase)
+        self._rows: Dict[Tuple[str, int], Tuple[str, str, str]] = {}
+        self._versions: Dict[str, Optional[int]] = {VOICE_COMMANDS: None, COMMAND_KEYWORDS: None}
+        self._last_check = 0.0
+        self._has_tracking = True
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # ------------------------------------------------------------------
+    # DB senkronizasyonu
+    # ------------------------------------------------------------------
+
+    def ensure_change_tracking(self) -> bool:
+        """table_versions tablosu ve trigger'ları oluştur (yoksa)."""
+        try:
+            for sql in CHANGE_TRACKING_SQL:
+                self.db.execute(sql)
+            self._has_tracking = True
+            return True
+        except Exception as e:
+            logger.warning(f"Voice command change tracking unavailable: {e}")
+            self._has_tracking = False
+            return False
+
+    def _read_versions(self) -> Optional[Dict[str, int]]:
+        if not self._has_tracking:
+            return None
+        try:
+            rows = self.db.fetch_all("SELECT table_name, version FROM table_versions")
+        except Exception:
+            self._has_tracking = False
+            return None
+        versions = {row["table_name"]: row["version"] for row in rows}
+        return {table: versions.get(table, 0) for table in self._versions}
+
+    def _load_rows(self, table: str) -> Dict[Tuple[str, int], Tuple[str, str, str]]:
+        if table == VOICE_COMMANDS:
+            query = "SELECT id, category, phrase FROM voice_commands WHERE is_active = 1"
+        else:
+            query = "SELECT id, category, keyword AS phrase FROM command_keywords"
+
+        try:
+            rows = self.db.fetch_all(query)
+        except Exception as e:
+            logger.debug(f"Could not load {table}: {e}")
+            return {}
+
+        result = {}
+        for row in rows:
+            phrase = row.get("phrase")
+            norm = normalize_phrase(phrase or "")
+            if not norm:
+                continue
+            category = (row.get("category") or "OTHER").upper()
+            result[(table, row["id"])] = (category, phrase, norm)
+        return result
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Değişen tabloları yeniden oku ve trie'ye sadece farkı uygula.
+        Returns: Trie değiştiyse True
+        """
+        with self._lock:
+            versions = self._read_versions()
+            if versions is None:
+                # Sayaç yoksa her refresh'te tam karşılaştırma yap
+                changed_tables = list(self._versions)
+            else:
+                changed_tables = [
+                    table for table, version in versions.items()
+                    if force or self._versions[table] != version
+                ]
+            if not changed_tables:
+                return False
+
+            added = removed = 0
+            for table in changed_tables:
+                new_rows = self._load_rows(table)
+                old_keys = {key for key in self._rows if key[0] == table}
+
+                for key in old_keys:
+                    if new_rows.get(key) != self._rows[key]:
+                        _, _, norm = self._rows.pop(key)
+                        self._trie.remove(norm, kind=table, value=key[1])
+                        removed += 1
+
+                for key, row in new_rows.items():
+                    if key not in self._rows:
+                        self._rows[key] = row
+                        self._trie.add(row[2], table, key[1])
+                        added += 1
+
+                if versions is not None:
+                    self._versions[table] = versions[table]
+
+            self._last_check = time.monotonic()
+
+        if added or removed:
+            logger.info(f"Voice command index updated: +{added} -{removed} (total {len(self._rows)})")
+            if self.on_change is not None:
+                try:
+                    self.on_change()
+                except Exception as e:
+                    logger.error(f"Voice command change handler failed: {e}")
+        return bool(added or removed)
+
+    def _maybe_refresh(self) -> None:
+        if time.monotonic() - self._last_check >= self.check_interval:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Voice command refresh failed: {e}")
+            self._last_check = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Eşleştirme
+    # ------------------------------------------------------------------
+
+    def match(self, transcript: str) -> Optional[VoiceCommandMatch]:
+        """Transcript'teki en uzun komut phrase'ini bul (yoksa None)."""
+        if not transcript:
+            return None
+
+        self._maybe_refresh()
+
+        text = normalize_phrase(transcript)
+        best = None
+        best_rank = None
+        with self._lock:
+            for m in self._trie.iter_matches(text, tokenize(text)):
+                rank = (-(m.token_end - m.token_start), _SOURCE_PRIORITY.get(m.kind, 9), m.token_start)
+                if best_rank is None or rank < best_rank:
+                    best, best_rank = m, rank
+
+            if best is None:
+                return None
+            category, phrase, _ = self._rows[(best.kind, best.value)]
+
+        return VoiceCommandMatch(category, phrase, best.kind, best.value, best.start, best.end)
+
+    def phrases(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """İndeksteki phrase'leri döndür (kategori filtresi opsiyonel)."""
+        with self._lock:
+            return [
+                {"source": key[0], "id": key[1], "category": cat, "phrase": phrase}
+                for key, (cat, phrase, _) in self._rows.items()
+                if category is None or cat == category.upper()
+            ]
@@ -79,6 +79,7 @@ class VoiceListener(QThread):
     Sinyaller:
         - wake_word_detected: Wake word algılandı
         - command_received: Komut metni alındı (aktif modda)
+        - command_transcribed: Komut metni + TranscriptionResult (güven, segmentler)
         - mode_changed: Mod değişti (idle/passive/active/processing)
         - error_occurred: Hata oluştu
         - audio_level: Ses seviyesi (0-100, UI için)
@@ -93,6 +94,7 @@ class VoiceListener(QThread):
     # Sinyaller
     wake_word_detected = pyqtSignal()           # Wake word algılandı
     command_received = pyqtSignal(str)          # Komut metni
+    command_transcribed = pyqtSignal(str, object)  # Komut metni + TranscriptionResult
     mode_changed = pyqtSignal(str)              # Mod değişikliği
     error_occurred = pyqtSignal(str)            # Hata
     audio_level = pyqtSignal(int)               # Ses seviyesi (0-100)
@@ -168,6 +170,9 @@ class VoiceListener(QThread):
         self._set_mode(ListenerMode.ACTIVE)
         self._active_mode_start = time.time()
         
+        # Model idle nedeniyle boşaltıldıysa komut gelmeden yüklemeye başla
+        self.whisper_engine.prefetch_model()
+        
         # TTS ile bildir
         if self.tts_engine:
             self.tts_engine.speak_message('wake_detected')
@@ -329,9 +334,16 @@ class VoiceListener(QThread):
             # Transcribe
             self._set_mode(ListenerMode.PROCESSING)
             
-            text = self.whisper_engine.transcribe_ndarray(
+            result = self.whisper_engine.transcribe_detailed(
                 audio, sample_rate=self.settings.sample_rate
             )
+            text = result.text
+            
+            if result.rejected:
+                logger.info(
+                    f"[Active] Transcript reddedildi ({result.reject_reason}), "
+                    f"güven={result.confidence:.2f}"
+                )
             
             if text and text.strip():
                 text = text.strip()
@@ -342,6 +354,7 @@ class VoiceListener(QThread):
                 
                 if command:
                     # Komut alındı, emit et ve pasif moda dön
+                    self.command_transcribed.emit(command, result)
                     self.command_received.emit(command)
                     self.transcript_ready.emit(command)  # Eski API
                     
@@ -0,0 +1,231 @@
+"""
+core/watchlist.py
+
+Çok sembollü izleme listesi.
+- Aralık başına tek toplu fetch_tickers([...]) isteği (sembol başına thread +
+  ccxt istemcisi yerine); borsa toplu sorguyu desteklemiyorsa sembol başına
+  fetch_ticker'a düşer
+- Anlık görüntü NumPy tablosunda (satır = sembol, sütun = alan) tutulur;
+  her güncelleme sadece değişen hücrelerin maskesini döndürür, UI sadece
+  onları yeniden çizer
+- Canlı beslemesi olmayan semboller market data hub'a yayınlanır (emir öncesi fiyat)
+- connect/disconnect verilirse ccxt istemcisi arka plan thread'inde alınır ve
+  bırakılır (registry.acquire market yüklemesi GUI thread'ini bloklamaz)
+
+Kullanım:
+    watchlist = Watchlist(exchange, ["BTC/USDT", "ETH/USDT"], on_change=callback, exchange_name="binance")
+    watchlist.start()                 # arka plan thread'i
+    changed = watchlist.poll_once()   # veya elle (n_symbols x n_columns bool)
+
+    watchlist = Watchlist(None, symbols, connect=lambda: registry.acquire("binance"),
+                          disconnect=registry.release, exchange_name="binance")
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from core.market_stream import market_id
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class WatchlistTable:
+    """
+    NumPy tabanlı anlık görüntü tablosu.
+
+    values: (n_symbols, n_columns) float64, bilinmeyen = NaN
+    """
+
+    COLUMNS = ("last", "bid", "ask", "change_24h", "quote_volume")
+    # ccxt ticker alanları (COLUMNS sırasıyla)
+    TICKER_FIELDS = ("last", "bid", "ask", "percentage", "quoteVolume")
+
+    def __init__(self, symbols: Iterable[str] = ()):
+        self.symbols: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.values = np.empty((0, len(self.COLUMNS)))
+        self.set_symbols(symbols)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def set_symbols(self, symbols: Iterable[str]) -> None:
+        """Sembol listesini değiştir; kalan sembollerin değerleri korunur"""
+        symbols = list(dict.fromkeys(symbols))
+        values = np.full((len(symbols), len(self.COLUMNS)), np.nan)
+        for i, symbol in enumerate(symbols):
+            old = self._rows.get(market_id(symbol))
+            if old is not None:
+                values[i] = self.values[old]
+        self.symbols = symbols
+        self._rows = {market_id(s): i for i, s in enumerate(symbols)}
+        self.values = values
+
+    def row(self, symbol: str) -> Optional[int]:
+        return self._rows.get(market_id(symbol))
+
+    def get(self, symbol: str, column: str) -> Optional[float]:
+        row = self.row(symbol)
+        if row is None:
+            return None
+        value = self.values[row, self.COLUMNS.index(column)]
+        return None if np.isnan(value) else float(value)
+
+    def apply(self, tickers: Dict[str, Dict[str, Any]]) -> np.ndarray:
+        """
+        fetch_tickers() sonucunu uygula.
+        Returns: değişen hücrelerin bool maskesi (n_symbols x n_columns)
+        """
+        rows, data = [], []
+        for symbol, ticker in tickers.items():
+            row = self._rows.get(market_id(ticker.get('symbol') or symbol))
+            if row is None:
+                continue
+            rows.append(row)
+            data.append([_to_float(ticker.get(f)) for f in self.TICKER_FIELDS])
+
+        changed = np.zeros(self.values.shape, dtype=bool)
+        if not rows:
+            return changed
+
+        idx = np.asarray(rows)
+        new = np.asarray(data, dtype=np.float64)
+        old = self.values[idx]
+        # NaN → NaN değişiklik sayılmaz
+        changed[idx] = ~((new == old) | (np.isnan(new) & np.isnan(old)))
+        self.values[idx] = new
+        return changed
+
+
+class Watchlist:
+    """
+    Toplu ticker polling'i yapan izleme listesi.
+
+    exchange: ccxt örneği (marketler yüklenmiş olmalı; core.market_cache.load_markets);
+        connect verilirse None olabilir
+    on_change: (table, changed_mask) ile çağrılır; sadece değişiklik varsa
+    hub: Verilirse güncellenen semboller MarketDataHub'a yayınlanır
+    connect: İstemciyi döndürür; arka plan thread'inde ilk poll'dan önce çağrılır
+        (hata olursa bir sonraki aralıkta tekrar denenir)
+    disconnect: connect ile alınan istemciyi thread sonlanırken bırakır
+    """
+
+    def __init__(self, exchange, symbols: Iterable[str], interval: float = 2.0,
+                 on_change: Optional[Callable[[WatchlistTable, np.ndarray], None]] = None,
+                 hub=None, exchange_name: Optional[str] = None,
+                 connect: Optional[Callable[[], Any]] = None,
+                 disconnect: Optional[Callable[[Any], None]] = None):
+        self.exchange = exchange
+        self.interval = interval
+        self.on_change = on_change
+        self.hub = hub
+        self.connect = connect
+        self.disconnect = disconnect
+        self.exchange_name = exchange_name or getattr(exchange, 'id', '')
+        self.table = WatchlistTable(symbols)
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def symbols(self) -> List[str]:
+        return self.table.symbols
+
+    def set_symbols(self, symbols: Iterable[str]) -> None:
+        with self._lock:
+            self.table.set_symbols(symbols)
+
+    def _fetch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        has = getattr(self.exchange, 'has', None) or {}
+        if has.get('fetchTickers', True):
+            self.requests += 1
+            return self.exchange.fetch_tickers(symbols)
+
+        tickers = {}
+        for symbol in symbols:
+            self.requests += 1
+            tickers[symbol] = self.exchange.fetch_ticker(symbol)
+        return tickers
+
+    def poll_once(self) -> np.ndarray:
+        """Tek toplu istek; değişen hücre maskesini döndürür"""
+        symbols = list(self.table.symbols)
+        if not symbols:
+            return np.zeros((0, len(WatchlistTable.COLUMNS)), dtype=bool)
+
+        tickers = self._fetch(symbols)
+        with self._lock:
+            changed = self.table.apply(tickers)
+
+        if changed.any():
+            if self.hub is not None:
+                self._publish(np.flatnonzero(changed.any(axis=1)))
+            if self.on_change is not None:
+                self.on_change(self.table, changed)
+        return changed
+
+    def _publish(self, rows: np.ndarray) -> None:
+        values = self.table.values
+        for row in rows:
+            # Canlı beslemesi olan sembolün daha taze verisi var; üzerine yazma
+            if self.hub.subscriber_count(self.exchange_name, self.table.symbols[row]):
+                continue
+            last, bid, ask, change, volume = (None if np.isnan(v) else float(v) for v in values[row])
+            self.hub.publish(self.exchange_name, self.table.symbols[row], {
+                'best_bid': bid,
+                'best_ask': ask,
+                'current_price': last,
+                'volume': volume or 0.0,
+                'change_24h': change or 0.0,
+            }, source="watchlist")
+
+    # ------------------------------------------------------------------
+    # Arka plan
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="watchlist", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        logger.info(f"Watchlist started: {len(self.table)} symbols every {self.interval}s")
+        try:
+            while not self._stop.is_set():
+                try:
+                    if self.exchange is None and self.connect is not None:
+                        self.exchange = self.connect()
+                    self.poll_once()
+                except Exception as e:
+                    logger.error(f"Watchlist fetch error: {e}")
+                self._stop.wait(self.interval)
+        finally:
+            # connect ile alınan istemci aynı thread'de bırakılır (stop join'i zaman aşımına uğrasa da)
+            if self.connect is not None and self.disconnect is not None and self.exchange is not None:
+                exchange, self.exchange = self.exchange, None
+                try:
+                    self.disconnect(exchange)
+                except Exception as e:
+                    logger.error(f"Watchlist exchange release failed: {e}")
+        logger.info("Watchlist stopped")
@@ -1,24 +1,158 @@
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Tuple, List
+import gc
+import math
+import os
+import re
 import threading
+import time
 
 import numpy as np
 
+# psutil OPSİYONEL (RSS ölçümü için; yoksa /proc fallback)
+try:
+    import psutil
+    _HAS_PSUTIL = True
+except ImportError:
+    psutil = None
+    _HAS_PSUTIL = False
+
+
+# Whisper'ın sessizlik / müzik üzerinde sık uydurduğu kalıplar.
+# Karşılaştırma normalize edilmiş metin üzerinde (küçük harf, noktalama yok) yapılır.
+DEFAULT_HALLUCINATION_PHRASES = [
+    "altyazı m.k.",
+    "abone olmayı unutmayın",
+    "izlediğiniz için teşekkürler",
+    "izlediğiniz için teşekkür ederim",
+    "altyazılar",
+    "thanks for watching",
+    "thank you for watching",
+    "subtitles by",
+]
+
 
 class WhisperSettings:
     """
     Ses / model ayarları.
     Preferences dialog + ConfigManager ile doldurulacak.
+
+    Reddetme politikası (segment bazında):
+    - no_speech_prob > max_no_speech_prob VE avg_logprob < min_avg_logprob → sessizlik
+    - avg_logprob < min_avg_logprob - 0.5 → çok düşük güven
+    - compression_ratio > max_compression_ratio → tekrar eden / uydurma çıktı
+    - hallucination_phrases listesindeki kalıplar → bilinen uydurmalar
+    Kalan segmentlerin güveni min_confidence altındaysa tüm sonuç reddedilir.
+
+    idle_unload_minutes: Bu kadar dakika ses aktivitesi olmazsa model bellekten
+    boşaltılır (0 = kapalı). Sonraki kullanımda / prefetch_model() ile yeniden yüklenir.
+
+    language: Sabit dil ("tr") veya None → otomatik algılama.
+    languages: Otomatik algılamada izin verilen diller (örn. ["tr", "en"]); algılanan
+    dil bu listede değilse listedeki en olası dil seçilir. Boşsa Whisper serbestçe algılar.
     """
     def __init__(
         self,
         model_size: str = "tiny",   # "tiny", "base", "small", ...
         use_gpu: bool = True,       # Kullanıcı GPU kullan seçmiş mi?
-        language: str = "tr",
+        language: Optional[str] = "tr",
+        max_no_speech_prob: float = 0.6,
+        min_avg_logprob: float = -1.0,
+        max_compression_ratio: float = 2.4,
+        min_confidence: float = 0.0,
+        hallucination_phrases: Optional[List[str]] = None,
+        idle_unload_minutes: float = 0.0,
+        languages: Optional[List[str]] = None,
     ):
         self.model_size = model_size
         self.use_gpu = use_gpu
-        self.language = language
+        self.language = language or None
+        self.languages = [lang.lower() for lang in (languages or [])]
+        self.max_no_speech_prob = max_no_speech_prob
+        self.min_avg_logprob = min_avg_logprob
+        self.max_compression_ratio = max_compression_ratio
+        self.min_confidence = min_confidence
+        if hallucination_phrases is None:
+            hallucination_phrases = DEFAULT_HALLUCINATION_PHRASES
+        self.hallucination_phrases = [
+            _normalize_for_match(p) for p in hallucination_phrases if p
+        ]
+        self.idle_unload_minutes = idle_unload_minutes
+
+
+@dataclass
+class TranscriptSegment:
+    """Tek bir Whisper segmenti + güven bilgileri."""
+    text: str
+    start: float = 0.0
+    end: float = 0.0
+    avg_logprob: float = 0.0
+    no_speech_prob: float = 0.0
+    compression_ratio: float = 1.0
+    rejected: bool = False
+    reject_reason: Optional[str] = None
+
+    @property
+    def confidence(self) -> float:
+        """avg_logprob'dan türetilen 0-1 arası güven (token olasılıklarının geometrik ortalaması)."""
+        return max(0.0, min(1.0, math.exp(self.avg_logprob)))
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.end - self.start)
+
+
+@dataclass
+class TranscriptionResult:
+    """
+    transcribe_detailed() çıktısı.
+    text: sadece kabul edilen segmentlerin birleşimi (reddedildiyse boş).
+    """
+    text: str = ""
+    segments: List[TranscriptSegment] = field(default_factory=list)
+    confidence: float = 0.0
+    language: Optional[str] = None
+    language_probability: Optional[float] = None
+    language_detected: bool = False
+    rejected: bool = False
+    reject_reason: Optional[str] = None
+
+    @property
+    def detected_language(self) -> Optional[str]:
+        """
+        Parser'a verilecek dil: sadece otomatik algılandıysa. Sabit dil
+        (settings.language) konuşulan dili göstermez; o durumda None → karma grammar.
+        """
+        return self.language if self.language_detected else None
+
+    @property
+    def accepted_segments(self) -> List[TranscriptSegment]:
+        return [s for s in self.segments if not s.rejected]
+
+
+def get_process_rss_mb() -> Optional[float]:
+    """Prosesin resident bellek kullanımı (MB). Ölçülemezse None."""
+    if _HAS_PSUTIL:
+        try:
+            return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+        except Exception:
+            pass
+    try:
+        # Linux: /proc/self/statm → ikinci alan resident sayfa sayısı
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except Exception:
+        return None
+
+
+def _normalize_for_match(text: str) -> str:
+    """Halüsinasyon karşılaştırması için: küçük harf, ı→i, noktalama yok, tek boşluk."""
+    text = (text or "").replace("I", "ı").replace("İ", "i").lower()
+    text = text.replace("ı", "i")
+    text = re.sub(r"[^\w\s]", "", text)
+    return " ".join(text.split())
 
 
 # Global preloaded model - QApplication'dan ÖNCE yüklenir
@@ -106,6 +240,8 @@ class WhisperEngine:
     - GPU/CPU cihazını otomatik seçer
     - GPU compute type'ı karta göre otomatik belirler
     - Numpy audio buffer alıp transcript üretir
+    - Boşta kalınca (idle_unload_minutes) modeli boşaltır, prefetch_model() ile
+      arka planda yeniden yükler
     """
 
     def __init__(
@@ -134,6 +270,15 @@ class WhisperEngine:
         self._device: Optional[str] = None
         self._compute_type: Optional[str] = None
 
+        # Idle unload durumu
+        self._last_activity = time.monotonic()
+        self._active_calls = 0
+        self._load_count = 0
+        self._last_load_seconds: Optional[float] = None
+        self._reload_thread: Optional[threading.Thread] = None
+        self._idle_thread: Optional[threading.Thread] = None
+        self._idle_stop = threading.Event()
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -141,10 +286,19 @@ class WhisperEngine:
     def transcribe_ndarray(self, audio: np.ndarray, sample_rate: int) -> str:
         """
         Mono float32 numpy array + sample_rate alır, transcript döndürür.
+        Reddetme politikasına takılan çıktılar için boş string döner.
         Not: Blocking çalışır; bu yüzden genelde ayrı thread içinde çağırılmalı.
         """
+        return self.transcribe_detailed(audio, sample_rate).text
+
+    def transcribe_detailed(self, audio: np.ndarray, sample_rate: int) -> TranscriptionResult:
+        """
+        transcribe_ndarray ile aynı girdiyi alır; segment bazında zamanlama,
+        avg_logprob / no_speech_prob / compression_ratio ve toplam güveni döndürür.
+        Düşük güvenli, sessizlik veya bilinen halüsinasyon segmentleri elenir.
+        """
         if audio is None or audio.size == 0:
-            return ""
+            return TranscriptionResult(rejected=True, reject_reason="empty_audio")
 
         # Stereo geldiyse mono'ya çevir
         if audio.ndim > 1:
@@ -154,29 +308,152 @@ class WhisperEngine:
         if audio.dtype != np.float32:
             audio = audio.astype(np.float32)
 
-        model = self._get_or_load_model()
+        self._mark_activity()
+        with self._model_lock:
+            self._active_calls += 1
+        try:
+            model = self._get_or_load_model()
+            segments, language, probability, detected = self._decode(model, audio)
+        finally:
+            with self._model_lock:
+                self._active_calls -= 1
+            self._mark_activity()
 
-        segments, info = model.transcribe(
-            audio=audio,
-            language=self.settings.language,
-            beam_size=5,
+        result = TranscriptionResult(
+            language=language,
+            language_probability=probability,
+            language_detected=detected,
         )
-
-        texts: List[str] = []
         for segment in segments:
-            if segment.text:
-                texts.append(segment.text.strip())
+            text = (segment.text or "").strip()
+            if not text:
+                continue
+            seg = TranscriptSegment(
+                text=text,
+                start=float(getattr(segment, "start", 0.0) or 0.0),
+                end=float(getattr(segment, "end", 0.0) or 0.0),
+                avg_logprob=float(getattr(segment, "avg_logprob", 0.0) or 0.0),
+                no_speech_prob=float(getattr(segment, "no_speech_prob", 0.0) or 0.0),
+                compression_ratio=float(getattr(segment, "compression_ratio", 1.0) or 1.0),
+            )
+            seg.reject_reason = self._segment_reject_reason(seg)
+            seg.rejected = seg.reject_reason is not None
+            result.segments.append(seg)
+
+        self._apply_rejection_policy(result)
+        return result
+
+    def _decode(self, model, audio: np.ndarray):
+        """
+        Sesi çöz; (segmentler, dil, dil olasılığı, algılandı mı) döndürür.
+        - settings.language sabitse veya settings.languages tek dilse o dille çözülür
+        - aksi halde transcribe(language=None): faster-whisper dili transcribe() çağrısında
+          algılar (info.language / language_probability / all_language_probs), segmentler
+          ise lazy üretilir. Algılanan dil izinli değilse henüz decode edilmemiş segmentler
+          atılır ve en olası izinli dille yeniden çözülür.
+        """
+        allowed = self.settings.languages
+        forced = self.settings.language or (allowed[0] if len(allowed) == 1 else None)
+        if forced:
+            segments, info = model.transcribe(audio=audio, language=forced, beam_size=5)
+            return list(segments), forced, getattr(info, "language_probability", None), False
 
-        return " ".join(texts).strip()
+        segments, info = model.transcribe(audio=audio, language=None, beam_size=5)
+        language = getattr(info, "language", None)
+        probability = getattr(info, "language_probability", None)
+        if allowed and language not in allowed:
+            probs = dict(getattr(info, "all_language_probs", None) or [])
+            language = max(allowed, key=lambda lang: probs.get(lang, 0.0))
+            probability = probs.get(language)
+            segments, info = model.transcribe(audio=audio, language=language, beam_size=5)
+        # Decode burada tamamlanır
+        return list(segments), language, probability, True
 
     def get_device_info(self) -> dict:
-        """Mevcut cihaz bilgisini döndürür."""
+        """Mevcut cihaz bilgisini + bellek / idle diagnostiklerini döndürür."""
+        rss_mb = get_process_rss_mb()
         return {
             "device": self._device,
             "compute_type": self._compute_type,
             "model_size": self.settings.model_size,
             "gpu_enabled": self.settings.use_gpu,
+            "model_loaded": self.is_model_loaded,
+            "reloading": self.is_reloading,
+            "idle_seconds": round(self.idle_seconds, 1),
+            "idle_unload_minutes": self.settings.idle_unload_minutes,
+            "load_count": self._load_count,
+            "last_load_seconds": self._last_load_seconds,
+            "resident_memory_mb": round(rss_mb, 1) if rss_mb is not None else None,
         }
+
+    @property
+    def is_model_loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def is_reloading(self) -> bool:
+        return self._reload_thread is not None and self._reload_thread.is_alive()
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self._last_activity
+
+    def prefetch_model(self) -> None:
+        """
+        Model boşaltılmışsa arka planda yüklemeye başlar (non-blocking).
+        Sesli emir butonu / wake word tetiklenince çağrılır; böylece ilk transcribe
+        beklemeden çalışır.
+        """
+        self._mark_activity()
+        if self._model is not None or self.is_reloading:
+            return
+
+        print("[WhisperEngine] Model arka planda yükleniyor (prefetch)...")
+        self._reload_thread = threading.Thread(
+            target=self._background_load,
+            name="WhisperModelPrefetch",
+            daemon=True,
+        )
+        self._reload_thread.start()
+
+    def unload_model(self) -> bool:
+        """
+        Modeli bellekten boşaltır. Transcribe sürerken boşaltılmaz.
+        Returns: Model boşaltıldıysa True.
+        """
+        global _PRELOADED_WHISPER_MODEL
+
+        with self._model_lock:
+            if self._model is None or self._active_calls > 0:
+                return False
+
+            rss_before = get_process_rss_mb()
+            # Preload referansı da bırakılmalı, yoksa model bellekte kalır
+            if _PRELOADED_WHISPER_MODEL is self._model:
+                _PRELOADED_WHISPER_MODEL = None
+            self._model = None
+
+        gc.collect()
+        if self._device == "cuda":
+            try:
+                import torch
+                torch.cuda.empty_cache()
+            except Exception:
+                pass
+
+        rss_after = get_process_rss_mb()
+        if rss_before is not None and rss_after is not None:
+            print(
+                f"[WhisperEngine] Model boşaltıldı (idle). "
+                f"RSS: {rss_before:.0f} MB → {rss_after:.0f} MB"
+            )
+        else:
+            print("[WhisperEngine] Model boşaltıldı (idle).")
+        return True
+
+    def shutdown(self) -> None:
+        """Idle izleme thread'ini durdurur."""
+        self._idle_stop.set()
     
     def preload_model(self):
         """
@@ -189,6 +466,86 @@ class WhisperEngine:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _mark_activity(self) -> None:
+        self._last_activity = time.monotonic()
+
+    def _background_load(self) -> None:
+        try:
+            self._get_or_load_model()
+        except Exception as e:
+            print(f"[WhisperEngine] Arka plan yükleme başarısız: {e}")
+
+    def _ensure_idle_monitor(self) -> None:
+        """idle_unload_minutes > 0 ise idle izleme thread'ini (bir kez) başlatır."""
+        if self.settings.idle_unload_minutes <= 0:
+            return
+        if self._idle_thread is not None and self._idle_thread.is_alive():
+            return
+
+        self._idle_stop.clear()
+        self._idle_thread = threading.Thread(
+            target=self._idle_monitor_loop,
+            name="WhisperIdleMonitor",
+            daemon=True,
+        )
+        self._idle_thread.start()
+
+    def _idle_monitor_loop(self) -> None:
+        limit = self.settings.idle_unload_minutes * 60.0
+        check_interval = max(1.0, min(30.0, limit / 4))
+
+        while not self._idle_stop.wait(check_interval):
+            if self._model is not None and self.idle_seconds >= limit:
+                self.unload_model()
+
+    def _segment_reject_reason(self, seg: TranscriptSegment) -> Optional[str]:
+        """Segment reddedilecekse sebebini, kabul ediliyorsa None döndürür."""
+        s = self.settings
+
+        if seg.no_speech_prob > s.max_no_speech_prob and seg.avg_logprob < s.min_avg_logprob:
+            return "no_speech"
+
+        # Sessizlik olmasa da çok düşük log-olasılık → güvenilmez
+        if seg.avg_logprob < s.min_avg_logprob - 0.5:
+            return "low_logprob"
+
+        if seg.compression_ratio > s.max_compression_ratio:
+            return "high_compression_ratio"
+
+        norm = _normalize_for_match(seg.text)
+        for phrase in s.hallucination_phrases:
+            if phrase and phrase in norm:
+                return "hallucination"
+
+        return None
+
+    def _apply_rejection_policy(self, result: TranscriptionResult) -> None:
+        """Kabul edilen segmentlerden metin + süre ağırlıklı güven hesaplar, eşik altını reddeder."""
+        accepted = result.accepted_segments
+
+        if not accepted:
+            result.text = ""
+            result.confidence = 0.0
+            result.rejected = True
+            reasons = {s.reject_reason for s in result.segments if s.reject_reason}
+            result.reject_reason = ",".join(sorted(reasons)) if reasons else "no_segments"
+        else:
+            weights = [max(s.duration, 0.01) for s in accepted]
+            total = sum(weights)
+            result.confidence = sum(s.confidence * w for s, w in zip(accepted, weights)) / total
+            result.text = " ".join(s.text for s in accepted).strip()
+
+            if result.confidence < self.settings.min_confidence:
+                result.rejected = True
+                result.reject_reason = "low_confidence"
+                result.text = ""
+
+        if result.rejected and result.segments:
+            dropped = " | ".join(s.text for s in result.segments)
+            print(
+                f"[WhisperEngine] Transcript reddedildi ({result.reject_reason}): '{dropped}'"
+            )
+
     def _get_or_load_model(self):
         """
         Modeli döndürür - önceden yüklenmişse onu kullanır.
@@ -205,37 +562,68 @@ class WhisperEngine:
                 self._model = _PRELOADED_WHISPER_MODEL
                 self._device = _PRELOADED_DEVICE
                 self._compute_type = _PRELOADED_COMPUTE_TYPE
+                self._ensure_idle_monitor()
                 return self._model
 
-            # Yoksa yeni yükle (fallback - normalde buraya düşmemeli)
-            print("[WhisperEngine] UYARI: Önceden yüklenmiş model yok, yeniden yükleniyor...")
-            
-            try:
-                from faster_whisper import WhisperModel
-            except Exception as e:
-                raise RuntimeError(
-                    "Whisper motoru (faster-whisper) yüklenemedi. "
-                    "Lütfen 'pip install faster-whisper' komutunu çalıştırın.\n\n"
-                    f"Teknik detay: {e}"
-                ) from e
+            if self._load_count == 0:
+                # Fallback - normalde buraya düşmemeli
+                print("[WhisperEngine] UYARI: Önceden yüklenmiş model yok, yeniden yükleniyor...")
 
-            device, compute_type = self._detect_device()
-            self._device = device
-            self._compute_type = compute_type
+            # İlk yüklemede cihaz seçilir; idle sonrası yeniden yüklemede aynı cihaz kullanılır
+            if self._device is None or self._compute_type is None:
+                self._device, self._compute_type = self._detect_device()
 
             print(f"[WhisperEngine] Model yükleniyor: {self.settings.model_size}")
-            print(f"[WhisperEngine] Device: {device}, Compute Type: {compute_type}")
+            print(f"[WhisperEngine] Device: {self._device}, Compute Type: {self._compute_type}")
 
-            self._model = WhisperModel(
-                self.settings.model_size,
-                device=device,
-                compute_type=compute_type,
-                download_root=str(self.models_dir),
-            )
-            
-            print("[WhisperEngine] Model başarıyla yüklendi!")
+            started = time.perf_counter()
+            self._model = self._create_model(self._device, self._compute_type)
+            self._last_load_seconds = round(time.perf_counter() - started, 3)
+            self._load_count += 1
+            self._mark_activity()
+            self._ensure_idle_monitor()
+
+            print(f"[WhisperEngine] Model başarıyla yüklendi! ({self._last_load_seconds:.2f}s)")
             return self._model
 
+    def _create_model(self, device: str, compute_type: str):
+        """
+        WhisperModel oluşturur. Model dosyaları daha önce indirildiyse önce
+        local_files_only ile dener (ağ kontrolü yok → hızlı yeniden yükleme;
+        dosyalar OS page cache'te sıcak kalır).
+        """
+        try:
+            from faster_whisper import WhisperModel
+        except Exception as e:
+            raise RuntimeError(
+                "Whisper motoru (faster-whisper) yüklenemedi. "
+                "Lütfen 'pip install faster-whisper' komutunu çalıştırın.\n\n"
+                f"Teknik detay: {e}"
+            ) from e
+
+        # 1) data/whisper_models, 2) HF varsayılan cache (preload buradan yükler), 3) indir
+        attempts = [
+            {"download_root": str(self.models_dir), "local_files_only": True},
+            {"local_files_only": True},
+        ]
+        for kwargs in attempts:
+            try:
+                return WhisperModel(
+                    self.settings.model_size,
+                    device=device,
+                    compute_type=compute_type,
+                    **kwargs,
+                )
+            except Exception:
+                continue
+
+        return WhisperModel(
+            self.settings.model_size,
+            device=device,
+            compute_type=compute_type,
+            download_root=str(self.models_dir),
+        )
+
     def _detect_device(self) -> Tuple[str, str]:
         """
         Cihaz ve compute type seçimi:
@@ -216,3 +216,49 @@ CREATE TRIGGER IF NOT EXISTS update_orders_timestamp
 BEGIN
     UPDATE orders SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
 END;
+
+-- Sesli komut tablolarının değişiklik sayacı (matcher sadece değişince yeniden indeksler)
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO table_versions (table_name, version) VALUES
+    ('voice_commands', 0),
+    ('command_keywords', 0);
+
+CREATE TRIGGER IF NOT EXISTS voice_commands_version_insert
+    AFTER INSERT ON voice_commands
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'voice_commands';
+END;
+
+CREATE TRIGGER IF NOT EXISTS voice_commands_version_update
+    AFTER UPDATE ON voice_commands
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'voice_commands';
+END;
+
+CREATE TRIGGER IF NOT EXISTS voice_commands_version_delete
+    AFTER DELETE ON voice_commands
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'voice_commands';
+END;
+
+CREATE TRIGGER IF NOT EXISTS command_keywords_version_insert
+    AFTER INSERT ON command_keywords
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'command_keywords';
+END;
+
+CREATE TRIGGER IF NOT EXISTS command_keywords_version_update
+    AFTER UPDATE ON command_keywords
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'command_keywords';
+END;
+
+CREATE TRIGGER IF NOT EXISTS command_keywords_version_delete
+    AFTER DELETE ON command_keywords
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'command_keywords';
+END;
@@ -3,6 +3,7 @@ Whisper Voice Trader - Main Entry Point
 """
 import sys
 from pathlib import Path
+from typing import Optional
 
 # =======================================================
 # KRITIK: Whisper modelini QApplication'dan ÖNCE yükle
@@ -36,14 +37,28 @@ sys.path.insert(0, str(Path(__file__).parent))
 from ui.generated.ui_main_window import Ui_MainWindow
 from database.db_manager import get_db
 from utils.logger import get_logger
-from core.exchange_manager import get_exchange_manager
+from core.account_state import get_account_state
+from core.exchange_manager import get_exchange_manager, futures_symbols
+from core.exchange_registry import get_exchange_registry
 from core.order_executor import OrderExecutor, OrderParams, OrderResult
+from core.paper_trading_engine import PaperTradingEngine
 from utils.config_manager import ConfigManager
 from ui.generated.ui_command_keywords_dialog import Ui_CommandKeywordsDialog  
 from core.whisper_engine import WhisperEngine, WhisperSettings
 from core.voice_listener import VoiceListener, ListenerSettings
 from core.tts_engine import TTSEngine, get_tts_engine
 from core.command_parser import CommandParser, CommandValidator
+from core.command_context import CommandContext
+from core.command_deduplicator import CommandDeduplicator
+from core.symbol_index import SymbolIndex
+from core.market_cache import add_listener as add_market_listener, configure as configure_market_cache, load_markets
+from core.rate_limiter import configure as configure_rate_limiter
+from core.latency_monitor import get_latency_monitor
+from core.market_data_hub import get_market_data_hub
+from core.order_book import get_order_book_manager
+from core.voice_command_matcher import VoiceCommandMatcher, normalize_phrase
+from core.intent_classifier import load_or_train, train_from_sources
+from ui.controllers.watchlist_panel import WatchlistPanel
 
 
 
@@ -58,19 +73,43 @@ class MainWindow(QMainWindow):
         self.db = get_db()
         self.exchange_manager = get_exchange_manager()  # Exchange Manager instance
         self.config = ConfigManager()
+        configure_market_cache(ttl=self.config.get('exchange.market_cache_ttl', 3600))
+        configure_rate_limiter(
+            burst_seconds=self.config.get('exchange.rate_limit_burst_seconds', 5.0),
+            max_wait=self.config.get('exchange.rate_limit_max_wait', {}),
+        )
+        # Borsa RTT / saat farkı prob'u; zaman aşımları gözlenen gecikmeye göre
+        get_latency_monitor().configure(
+            interval=self.config.get('exchange.latency_probe_interval', 15.0),
+            min_timeout_ms=self.config.get('exchange.min_timeout_ms', 2000.0),
+            max_timeout_ms=self.config.get('exchange.max_timeout_ms', 30000.0),
+            timeout_multiplier=self.config.get('exchange.timeout_multiplier', 4.0),
+            max_retries=self.config.get('exchange.max_retries', 1),
+        )
+        get_latency_monitor().start()
+        # Bakiye önbelleği (emir öncesi kontrol bellekten; arka planda yenilenir)
+        self.account_state = get_account_state(self.exchange_manager)
+        self.account_state.refresh_interval = self.config.get('trading.balance_refresh_interval', 30.0)
+        self.account_state.start()
         self.order_executor = OrderExecutor(
         db_manager=self.db,
         config_manager=self.config,
         exchange_manager=self.exchange_manager,
-        paper_trading_engine=None,
+        paper_trading_engine=PaperTradingEngine(
+            initial_balance=self.config.get('trading.paper_balance', 10000.0)),
+        account_state=self.account_state,
     )
 
         self.price_updater_thread = None  
         self.current_exchange = None  
+        self.order_book_key = None
         self.symbol_change_timer = None 
+        self.voice_command_matcher = VoiceCommandMatcher(self.db)
+        self.intent_classifier = load_or_train(self.db)
         self.ensure_voice_commands_table()
         self.load_voice_commands()
-        self.voice_commands = []
+        # Sonraki phrase değişikliklerinde (komut penceresi, DB'den düzenleme) yeniden eğit
+        self.voice_command_matcher.on_change = self.retrain_intent_classifier
         logger.info("MainWindow initialized")
         self.apply_dark_theme()
         self.setWindowTitle("Whisper Voice Trader - v1.0.0")
@@ -82,12 +121,20 @@ class MainWindow(QMainWindow):
         # Model boyutunu ayarlardan oku
         model_size = self.config.get('whisper.model_size', 'tiny')
         use_gpu = self.config.get('whisper.use_gpu', True)
-        language = self.config.get('app.language', 'tr')
+        # whisper.language: "auto" → whisper.languages içinden otomatik algılama
+        language = self.config.get('whisper.language', self.config.get('app.language', 'tr'))
+        if language == 'auto':
+            language = None
         
         voice_settings = WhisperSettings(
             model_size=model_size,
             use_gpu=use_gpu,
             language=language,
+            max_no_speech_prob=self.config.get('whisper.max_no_speech_prob', 0.6),
+            min_avg_logprob=self.config.get('whisper.min_avg_logprob', -1.0),
+            min_confidence=self.config.get('whisper.min_transcript_confidence', 0.3),
+            idle_unload_minutes=self.config.get('whisper.idle_unload_minutes', 30),
+            languages=self.config.get('whisper.languages', ["tr", "en"]),
         )
         self.whisper_engine = WhisperEngine(voice_settings)
         self.voice_listener: VoiceListener = None
@@ -108,12 +155,32 @@ class MainWindow(QMainWindow):
         # Onay bekleme süresi (command handler'da kullanılacak)
         self.confirmation_timeout = self.config.get('tts.confirmation_timeout', 10)
         
-        # Command Parser başlat
-        self.command_parser = CommandParser(default_symbol="BTCUSDT")
+        # Command Parser başlat (sembol sözlüğü borsaya bağlanınca doldurulur)
+        self.symbol_index = SymbolIndex(quote="USDT")
+        # Aktif borsanın her market yüklemesi (disk, bağlantı, arka plan yenileme) sözlüğü günceller
+        add_market_listener(self.on_markets_loaded)
+        self.command_parser = CommandParser(
+            default_symbol="BTCUSDT",
+            symbol_index=self.symbol_index,
+            intent_classifier=self.intent_classifier,
+        )
+        
+        # Takip komutları için oturum bağlamı (son onaylanan emir)
+        self.command_context = CommandContext(
+            timeout=self.config.get('trading.voice_context_timeout', 60.0)
+        )
+        # Aynı komutun kısa sürede tekrar gelmesi (çift kayıt / tekrar) bastırılır
+        self.command_deduplicator = CommandDeduplicator(
+            window=self.config.get('trading.voice_dedupe_window', 3.0)
+        )
 
         if hasattr(self.ui, 'comboSymbol'):
             self.ui.comboSymbol.currentIndexChanged.connect(self.on_symbol_changed)
 
+        # Çok sembollü izleme listesi (tek toplu fetch_tickers isteği)
+        self.watchlist_panel = WatchlistPanel(self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.watchlist_panel)
+
     def ensure_voice_commands_table(self):
         """Sesli komut eşleşmeleri için tabloyu oluşturur (yoksa)."""
         try:
@@ -129,89 +196,40 @@ class MainWindow(QMainWindow):
                 )
                 """
             )
+            self.voice_command_matcher.ensure_change_tracking()
             logger.info("voice_commands table ensured")
         except Exception as e:
             logger.error(f"Failed to ensure voice_commands table: {e}")
     @staticmethod
     def normalize_text(text: str) -> str:
         """Karşılaştırma için metni normalize eder (küçük harf, TR karakter düzeltme, noktalama temizleme)."""
-        if not text:
-            return ""
-        text = text.strip().lower()
-
-        # Noktalama işaretlerini temizle
-        import re
-        text = re.sub(r'[.,!?;:\'"()]+', '', text)
-
-        # Türkçe karakter basitleştirme
-        replacements = {
-            "ı": "i",
-            "ğ": "g",
-            "ü": "u",
-            "ş": "s",
-            "ö": "o",
-            "ç": "c",
-        }
-        for src, dst in replacements.items():
-            text = text.replace(src, dst)
-
-        return text.strip()
+        return normalize_phrase(text)
     
     def load_voice_commands(self):
-        """Aktif sesli komutları DB'den okuyup RAM'e cache eder."""
+        """Aktif sesli komutları ve anahtar kelimeleri DB'den okuyup indekse yükler."""
         try:
-            rows = self.db.execute(
-                "SELECT category, phrase, language "
-                "FROM voice_commands WHERE is_active = 1"
-            ).fetchall()
-
-            self.voice_commands = []
-            for row in rows:
-                category = row[0]
-                phrase = row[1]
-                language = row[2] if len(row) > 2 else "tr"
-
-                if not phrase:
-                    continue
-
-                self.voice_commands.append(
-                    {
-                        "category": category,
-                        "phrase": phrase,
-                        "language": language or "tr",
-                        "norm_phrase": self.normalize_text(phrase),
-                    }
-                )
-
-            logger.info(f"Loaded {len(self.voice_commands)} voice commands")
-
+            self.voice_command_matcher.refresh(force=True)
+            logger.info(f"Loaded {len(self.voice_command_matcher)} voice commands")
         except Exception as e:
             logger.error(f"Failed to load voice commands: {e}")
-            self.voice_commands = []
+
+    def retrain_intent_classifier(self):
+        """Niyet sınıflandırıcıyı güncel phrase'lerle yerinde yeniden eğit (birkaç ms)."""
+        try:
+            train_from_sources(self.db, classifier=self.intent_classifier)
+        except Exception as e:
+            logger.error(f"Failed to train intent classifier: {e}")
 
     def match_voice_command(self, transcript: str):
         """
         Whisper'dan gelen transcript içinde tanımlı komutlardan biri geçiyorsa
         category + orijinal phrase'i döndürür, yoksa (None, None).
+        En uzun eşleşen phrase kazanır; DB değişiklikleri otomatik yansır.
         """
-        if not transcript:
-            return None, None
-
-        if not self.voice_commands:
+        match = self.voice_command_matcher.match(transcript)
+        if match is None:
             return None, None
-
-        norm_text = self.normalize_text(transcript)
-
-        for cmd in self.voice_commands:
-            key = cmd.get("norm_phrase")
-            if not key:
-                continue
-
-            if key in norm_text:
-                # İlk eşleşen komutu döndürüyoruz
-                return cmd.get("category"), cmd.get("phrase")
-
-        return None, None
+        return match.category, match.phrase
 
 
 
@@ -240,6 +258,8 @@ class MainWindow(QMainWindow):
 
             # Symbol list
             symbols = data.get('symbols', [])
+            if is_connected and symbols:
+                self.symbol_index.update_markets(symbols)
             if hasattr(self.ui, 'comboSymbol') and symbols:
                 self.ui.comboSymbol.clear()
                 self.ui.comboSymbol.addItems(symbols)
@@ -270,42 +290,27 @@ class MainWindow(QMainWindow):
                 try:
                     keys = self.db.load_api_keys(exchange_name, decrypt=True)
                     if keys:
-                        import ccxt
-                        exchange_class = getattr(ccxt, exchange_name)
-                        
-                        config = {
-                            'apiKey': keys['api_key'],
-                            'secret': keys['secret_key'],
-                            'enableRateLimit': True,
-                        }
-                        if exchange_name == 'binance':
-                            config['options'] = {'defaultType': 'future'}
-                        exchange = exchange_class(config)
-                        try:
-                            exchange.set_sandbox_mode(True)
-                        except:
-                            pass
-                        balance = exchange.fetch_balance()
+                        # Shared client: reused by the price updater and later connections
+                        with get_exchange_registry().client(
+                            exchange_name, keys['api_key'], keys['secret_key'], keys.get('passphrase')
+                        ) as exchange:
+                            balance = exchange.fetch_balance()
+                            # Paylaşılan önbellek: soğuk başlangıçta diskten okunur
+                            markets = load_markets(exchange)
+                        self.symbol_index.update_markets(markets)
                         usdt_balance = balance.get('total', {}).get('USDT', 0.0)
                         if hasattr(self.ui, 'lblBalance'):
                             self.ui.lblBalance.setText(f"${usdt_balance:,.2f}")
                             self.ui.lblBalance.setStyleSheet("color: #FFC107; font-size: 18px; font-weight: bold;")
-                        markets = exchange.load_markets()
-                        futures_symbols = []
-                        for symbol, market in markets.items():
-                            if market.get('type') in ['future', 'swap'] or market.get('future') or market.get('swap'):
-                                if 'USDT' in symbol:
-                                    clean_symbol = symbol.replace(':USDT', '')
-                                    futures_symbols.append(clean_symbol)
-                        futures_symbols = sorted(list(set(futures_symbols)))
-                        if hasattr(self.ui, 'comboSymbol') and futures_symbols:
+                        symbols = futures_symbols(markets)
+                        if hasattr(self.ui, 'comboSymbol') and symbols:
                             self.ui.comboSymbol.blockSignals(True)
                             self.ui.comboSymbol.clear()
-                            self.ui.comboSymbol.addItems(futures_symbols)
-                            logger.info(f"Loaded {len(futures_symbols)} symbols on startup")
+                            self.ui.comboSymbol.addItems(symbols)
+                            logger.info(f"Loaded {len(symbols)} symbols on startup")
                             self.ui.comboSymbol.blockSignals(False)
-                            if futures_symbols:
-                                self.start_price_updater(futures_symbols[0])
+                            if symbols:
+                                self.start_price_updater(symbols[0])
                 except Exception as e:
                     logger.error(f"Failed to load exchange data: {e}")
             else:
@@ -316,6 +321,11 @@ class MainWindow(QMainWindow):
                     self.ui.lblBalance.setText("$0.00")
         except Exception as e:
             logger.error(f"Failed to load connection status: {e}")
+    def on_markets_loaded(self, cache_key: str, markets):
+        """Market önbelleği yüklendi/değişti: aktif borsanınsa sembol sözlüğünü güncelle (her thread'den)"""
+        if self.current_exchange and cache_key.split("-")[0] == self.current_exchange:
+            self.symbol_index.update_markets(markets)
+
     def setup_table_headers(self):
         """Configure table headers to stretch across full width"""
         from PyQt5.QtWidgets import QHeaderView
@@ -501,9 +511,38 @@ class MainWindow(QMainWindow):
             
             logger.info(f"Price updater started for {symbol}")
             
+            self.start_watchlist()
+            self.watch_order_book(symbol)
+            
         except Exception as e:
             logger.error(f"Failed to start price updater: {e}")
 
+    def watch_order_book(self, symbol):
+        """Keep a live local order book for the traded symbol (slippage checks before orders)"""
+        books = get_order_book_manager()
+        previous = self.order_book_key
+        if previous == (self.current_exchange, symbol):
+            return
+        if previous:
+            books.unwatch(*previous)
+        books.watch(self.current_exchange, symbol)
+        self.order_book_key = (self.current_exchange, symbol)
+
+    def start_watchlist(self):
+        """Start the watchlist for the current exchange (no-op if already running for it)"""
+        try:
+            watchlist = self.watchlist_panel.watchlist
+            if watchlist is not None and watchlist.exchange_name == self.current_exchange:
+                return
+            
+            self.watchlist_panel.start(
+                self.current_exchange,
+                self.config.get('ui.watchlist_symbols', []),
+                interval=self.config.get('ui.watchlist_interval', 2.0),
+            )
+        except Exception as e:
+            logger.error(f"Failed to start watchlist: {e}")
+
     def on_price_updated(self, price_data):
         """Update UI with new prices"""
 
@@ -622,6 +661,19 @@ class MainWindow(QMainWindow):
             self.price_updater_thread = None
             logger.info("Price updater stopped")
         
+        self.watchlist_panel.stop()
+        
+        # Paylaşılan market verisi beslemeleri
+        get_market_data_hub().stop_all()
+        get_order_book_manager().stop_all()
+        self.account_state.stop(timeout=2.0)
+        get_latency_monitor().stop(timeout=2.0)
+        get_exchange_registry().close_all()
+        
+        if getattr(self, "whisper_engine", None) is not None:
+            logger.info(f"Whisper diagnostics: {self.whisper_engine.get_device_info()}")
+            self.whisper_engine.shutdown()
+        
         event.accept()
 
     def open_preferences(self):
@@ -669,18 +721,12 @@ class MainWindow(QMainWindow):
 
             language = "tr"  # Şimdilik sabit; ileride comboLanguage ile ilişkilendirilebilir
 
-            # SQL string içinde tek tırnak sorun çıkarmasın diye kaçır
-            safe_phrase = phrase.replace("'", "''")
-            safe_category = category.replace("'", "''")
-            safe_language = language.replace("'", "''")
-
-            sql = (
-                "INSERT INTO voice_commands (category, phrase, language, is_active) "
-                f"VALUES ('{safe_category}', '{safe_phrase}', '{safe_language}', 1)"
-            )
-
             try:
-                self.db.execute(sql)
+                self.db.execute(
+                    "INSERT INTO voice_commands (category, phrase, language, is_active) "
+                    "VALUES (?, ?, ?, 1)",
+                    (category, phrase, language),
+                )
                 logger.info(f"Voice command added: [{category}] {phrase}")
                 QMessageBox.information(self, "Komut kaydedildi", f"\"{phrase}\" komutu kaydedildi.")
                 self.load_voice_commands()
@@ -705,6 +751,9 @@ class MainWindow(QMainWindow):
                 )
                 return
             
+            # Model idle nedeniyle boşaltıldıysa kayıt başlarken arka planda yükle
+            self.whisper_engine.prefetch_model()
+            
             # Zaten bir dinleyici çalışıyorsa tekrar başlatma
             if hasattr(self, "voice_listener") and self.voice_listener is not None:
                 if self.voice_listener.isRunning():
@@ -741,8 +790,8 @@ class MainWindow(QMainWindow):
             self.voice_listener.transcript_ready.connect(
                 self.on_voice_transcript_ready
             )
-            self.voice_listener.command_received.connect(
-                self.on_voice_command_received
+            self.voice_listener.command_transcribed.connect(
+                self.on_voice_command_transcribed
             )
             self.voice_listener.error_occurred.connect(
                 self.on_voice_error
@@ -857,7 +906,17 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"on_voice_mode_changed error: {e}")
     
-    def on_voice_command_received(self, command_text: str):
+    def on_voice_command_transcribed(self, command_text: str, result):
+        """VoiceListener'dan gelen komut + TranscriptionResult; ASR güvenini parser'a aktarır."""
+        confidence = getattr(result, "confidence", 1.0)
+        # Sabit whisper.language parser dilini belirlemez (karma grammar); sadece algılanan dil
+        language = getattr(result, "detected_language", None)
+        logger.info(f"Voice command transcript confidence: {confidence:.2f} "
+                    f"(language: {getattr(result, 'language', None)}, detected: {language})")
+        self.on_voice_command_received(command_text, asr_confidence=confidence, language=language)
+
+    def on_voice_command_received(self, command_text: str, asr_confidence: float = 1.0,
+                                  language: Optional[str] = None):
         """
         Wake word sisteminden gelen komutu işle.
         CommandParser ile parse edip trading işlemi yap.
@@ -866,7 +925,10 @@ class MainWindow(QMainWindow):
         
         try:
             # CommandParser ile parse et
-            parsed = self.command_parser.parse(command_text)
+            parsed = self.command_parser.parse(
+                command_text, asr_confidence=asr_confidence, context=self.command_context,
+                language=language,
+            )
             
             if not parsed:
                 self.tts_engine.speak_message('not_understood')
@@ -877,8 +939,12 @@ class MainWindow(QMainWindow):
                 )
                 return
             
+            # Tekrar eden komut: doğrulama, onay, borsa ve DB işi yapılmaz
+            if self.command_deduplicator.is_duplicate(parsed):
+                return
+            
             # Komutu doğrula
-            is_valid, errors = CommandValidator.validate(parsed)
+            is_valid, errors = CommandValidator.validate(parsed, symbol_index=self.symbol_index)
             
             if not is_valid:
                 error_text = ", ".join(errors)
@@ -895,23 +961,26 @@ class MainWindow(QMainWindow):
             logger.info(f"Parsed command: {summary}")
             
             if parsed.action in ("buy", "sell"):
-                # Trading işlemi - onay iste
-                reply = QMessageBox.question(
-                    self,
-                    "Emir Onayı",
-                    f"{summary}\n\nBu emri onaylıyor musunuz?",
-                    QMessageBox.Yes | QMessageBox.No,
-                    QMessageBox.No
-                )
+                # Trading işlemi - onay iste (tahmin edilen alan varsa ayar kapalı olsa da)
+                uncertain = CommandValidator.needs_confirmation(parsed)
+                reply = QMessageBox.Yes
+                if uncertain or self.config.get('ui.confirmation_dialogs', True):
+                    warning = ""
+                    if uncertain:
+                        warning = "\n\n⚠ Bazı alanlar tahmin edildi, lütfen sembol ve miktarı kontrol edin."
+                    reply = QMessageBox.question(
+                        self,
+                        "Emir Onayı",
+                        f"{summary}{warning}\n\nBu emri onaylıyor musunuz?",
+                        QMessageBox.Yes | QMessageBox.No,
+                        QMessageBox.No
+                    )
                 
                 if reply == QMessageBox.Yes:
                     self.tts_engine.speak_message('command_received')
-                    # TODO: Order executor'a gönder
-                    # self.execute_voice_order(parsed)
-                    QMessageBox.information(
-                        self, "Emir",
-                        f"Emir alındı:\n{summary}\n\n(Paper Trading aktif)"
-                    )
+                    # Takip komutları ("aynısından 50 dolar daha") bu emri temel alır
+                    self.command_context.remember(parsed)
+                    self.execute_voice_order(parsed)
                 else:
                     self.tts_engine.speak_message('cancelled')
                     
@@ -945,6 +1014,72 @@ class MainWindow(QMainWindow):
                 f"Komut işlenirken hata oluştu:\n{e}"
             )
 
+    def execute_voice_order(self, parsed) -> Optional[OrderResult]:
+        """
+        Tek cümlede ayrıştırılmış emri (miktar/kaldıraç/limit/SL/TP) OrderExecutor'a gönderir.
+        Kaldıraç söylenmediyse UI slider'ı, o da yoksa config varsayılanı kullanılır.
+        """
+        try:
+            leverage = parsed.leverage
+            if not leverage and hasattr(self.ui, "sliderLeverage"):
+                leverage = int(self.ui.sliderLeverage.value())
+            if not leverage or leverage < 1:
+                leverage = int(self.config.get('trading.default_leverage', 10))
+
+            amount, amount_type = parsed.amount, parsed.amount_type
+            if not amount and parsed.balance_percent:
+                amount = self.order_executor.amount_from_balance_percent(parsed.balance_percent, leverage)
+                amount_type = "usd"
+
+            params = OrderParams(
+                symbol=parsed.symbol,
+                side=parsed.side.value,
+                amount=amount,
+                amount_type=amount_type,
+                leverage=leverage,
+                order_type=parsed.order_type.value,
+                price=parsed.price,
+                stop_loss=parsed.stop_loss,
+                take_profit=parsed.take_profit,
+                extra={"source": "voice", "voice_command": parsed.raw_text},
+            )
+
+            logger.info(
+                "Voice Order -> symbol=%s, side=%s, order_type=%s, amount=%s %s, price=%s, leverage=%s, sl=%s, tp=%s",
+                params.symbol, params.side, params.order_type, params.amount, params.amount_type,
+                params.price, params.leverage, params.stop_loss, params.take_profit,
+            )
+
+            if params.order_type == "limit":
+                result = self.order_executor.execute_limit_order(params)
+            else:
+                result = self.order_executor.execute_market_order(params)
+
+            if result.success:
+                QMessageBox.information(
+                    self,
+                    "Emir Başarılı",
+                    f"Emir başarıyla gönderildi!\n\n"
+                    f"Order ID: {result.order_id}\n"
+                    f"Durum: {result.status}\n"
+                    f"Gerçekleşen miktar: {result.filled_qty}\n"
+                    f"Ortalama fiyat: {result.avg_price}",
+                )
+            else:
+                self.tts_engine.speak_message('error')
+                QMessageBox.critical(
+                    self,
+                    "Emir Hatası",
+                    f"Emir başarısız.\n\nHata: {result.error_message}",
+                )
+            return result
+
+        except Exception as e:
+            logger.error("execute_voice_order failed: %s", e, exc_info=True)
+            self.tts_engine.speak_message('error')
+            QMessageBox.critical(self, "Hata", f"Sesli emir gönderilemedi:\n{e}")
+            return None
+
     def on_voice_error(self, message: str):
         logger.error(f"VoiceListener error: {message}")
         QMessageBox.critical(
@@ -1163,6 +1298,7 @@ class MainWindow(QMainWindow):
             
             # Get symbols
             futures_symbols = self.exchange_manager.get_markets(exchange_name)
+            self.symbol_index.update_markets(futures_symbols)
             
             progress.close()
             
@@ -1438,6 +1574,7 @@ class MainWindow(QMainWindow):
 
             # 3. Clear current exchange
             self.current_exchange = None
+            self.symbol_index.clear()
 
             # 4. Reset UI - Connection Status
             if hasattr(self.ui, 'lblConnectionStatus'):
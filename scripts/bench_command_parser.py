@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+CommandParser Micro-Benchmark
+Saniyedeki parse sayısını ve gürültülü transcript'lerde aksiyon doğruluğunu ölçer.
+
+Kullanım:
+    python scripts/bench_command_parser.py [--seconds 2.0]
+    python scripts/bench_command_parser.py --noisy [--variants 20] [--seed 42]
+    python scripts/bench_command_parser.py --language tr   # sadece Türkçe grammar
+    python scripts/bench_command_parser.py --corpus [data/corpus/parser_benchmark_v1.tsv] [--repeat 5]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.command_parser import CommandParser  # noqa: E402
+from core.parser_benchmark import DEFAULT_CORPUS_PATH, evaluate, load_corpus  # noqa: E402
+from generate_parser_corpus import add_asr_noise  # noqa: E402
+
+
+# (metin, beklenen aksiyon)
+PHRASES = [
+    ("Al BTC 100 dolar", "buy"),
+    ("Bitcoin sat 50 dolar", "sell"),
+    ("Ethereum al 200 USD", "buy"),
+    ("Sat ETH 75 dolar", "sell"),
+    ("Pozisyonu kapat", "close"),
+    ("Bakiye ne kadar", "balance"),
+    ("Durum göster", "status"),
+    ("Al 500 dolar", "buy"),
+    ("Bitcoin al", "buy"),
+    ("solana long 5 bin dolar", "buy"),
+    ("emri iptal et", "cancel"),
+    ("doge short yirmi dolar", "sell"),
+    ("bakiyeyi almak istiyorum", None),
+    ("avax satın al 250 usdt", "buy"),
+]
+
+
+def run_benchmark(seconds: float = 2.0, phrases=None, parser=None, language=None) -> float:
+    """Verilen süre boyunca parse çalıştırır, parses/sec döndürür."""
+    parser = parser or CommandParser()
+    texts = [p[0] for p in (phrases or PHRASES)]
+
+    # Isınma
+    for text in texts:
+        parser.parse(text, language=language)
+
+    count = 0
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for text in texts:
+            parser.parse(text, language=language)
+        count += len(texts)
+    elapsed = time.perf_counter() - started
+
+    return count / elapsed
+
+
+def action_accuracy(parser: CommandParser, phrases, language=None) -> float:
+    """Beklenen aksiyonun bulunma oranı"""
+    correct = 0
+    for text, expected in phrases:
+        cmd = parser.parse(text, language=language)
+        action = cmd.action if cmd else None
+        correct += action == expected
+    return correct / len(phrases)
+
+
+def report_corpus(path: Path, repeat: int, use_language: bool, show_errors: int) -> None:
+    """Etiketli corpus üzerinde hız + alan bazlı doğruluk raporu"""
+    rows = load_corpus(path)
+    print(f"Corpus: {path} ({len(rows)} rows, grammar: {'per-row language' if use_language else 'mixed'})")
+
+    for label, parser in (("exact", CommandParser(fuzzy=False)), ("fuzzy", CommandParser(fuzzy=True))):
+        report = evaluate(rows, parser, use_language=use_language, repeat=repeat, max_errors=show_errors)
+        print(f"\n[{label}] {report['parses_per_sec']:,.0f} parses/sec  "
+              f"p50: {report['p50_us']:.1f} µs  p99: {report['p99_us']:.1f} µs")
+        print("  " + "  ".join(f"{name}: {acc:.1%}" for name, acc in report["accuracy"].items()))
+        print("  language: " + "  ".join(f"{k}: {v:.1%}" for k, v in report["by_language"].items()))
+        print("  source:   " + "  ".join(f"{k}: {v:.1%}" for k, v in report["by_source"].items()))
+        for text, wrong, cmd in report["errors"]:
+            got = f"{cmd.action} {cmd.symbol} {cmd.amount}" if cmd else "None"
+            print(f"    ✗ {text!r} [{', '.join(wrong)}] → {got}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="CommandParser micro-benchmark")
+    arg_parser.add_argument("--seconds", type=float, default=2.0)
+    arg_parser.add_argument("--noisy", action="store_true", help="Gürültülü transcript doğruluğu")
+    arg_parser.add_argument("--variants", type=int, default=20, help="Her cümle için gürültülü varyant")
+    arg_parser.add_argument("--seed", type=int, default=42)
+    arg_parser.add_argument("--language", type=str, default=None, help="Grammar dili (tr/en); boş = karma")
+    arg_parser.add_argument("--corpus", nargs="?", const=str(DEFAULT_CORPUS_PATH), default=None,
+                            help="Etiketli corpus raporu (varsayılan: data/corpus/parser_benchmark_v1.tsv)")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Corpus gecikme ölçümü tekrarı")
+    arg_parser.add_argument("--mixed", action="store_true", help="Corpus satır dilini yok say (karma grammar)")
+    arg_parser.add_argument("--errors", type=int, default=0, help="Gösterilecek hatalı satır sayısı")
+    args = arg_parser.parse_args()
+
+    if args.corpus:
+        report_corpus(Path(args.corpus), args.repeat, not args.mixed, args.errors)
+        return
+
+    if not args.noisy:
+        rate = run_benchmark(args.seconds, language=args.language)
+        print(f"Phrases: {len(PHRASES)} (grammar: {args.language or 'mixed'})")
+        print(f"Parses/sec: {rate:,.0f}")
+        print(f"Mean latency: {1e6 / rate:.1f} µs/parse")
+        return
+
+    rng = random.Random(args.seed)
+    noisy = [
+        (add_asr_noise(text, rng), expected)
+        for text, expected in PHRASES if expected
+        for _ in range(args.variants)
+    ]
+
+    print(f"Noisy phrases: {len(noisy)} (seed={args.seed})")
+    for label, parser in (("exact", CommandParser(fuzzy=False)), ("fuzzy", CommandParser(fuzzy=True))):
+        # İlk geçiş: düzeltme önbelleği boşken gecikme
+        started = time.perf_counter()
+        acc = action_accuracy(parser, noisy, args.language)
+        cold_us = (time.perf_counter() - started) / len(noisy) * 1e6
+
+        clean = action_accuracy(parser, PHRASES, args.language)
+        rate = run_benchmark(args.seconds, noisy, parser, args.language)
+        print(f"[{label}] clean acc: {clean:.1%}  noisy acc: {acc:.1%}  "
+              f"cold: {cold_us:.1f} µs/parse  warm: {rate:,.0f} parses/sec ({1e6 / rate:.1f} µs/parse)")
+
+
+if __name__ == "__main__":
+    main()
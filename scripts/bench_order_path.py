@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Order Path Benchmark
+Gerçek emir yolu (OrderExecutor → ExchangeManager → ccxt → HTTP) yerel sahte
+borsaya (tests/mock_http_exchange.py) karşı: emir başına gecikme (p50/p95/max),
+verim (emir/sn), emir başına istek sayısı ve hata oranı.
+
+Senaryolar aynı sunucu ayarlarıyla art arda koşar:
+- fresh:  her emirde fetch_balance (trading.balance_max_age = 0)
+- cached: bakiye AccountState önbelleğinden (trading.balance_max_age = 10)
+
+Ağ yoktur; gecikme, jitter, hata oranı ve sunucu ağırlık limiti
+parametrelerle verilir. ccxt ayrıştırma ve imzalama kodu gerçektir.
+
+Kullanım:
+    python scripts/bench_order_path.py [--orders 50] [--threads 1] [--latency 0.05] [--jitter 0.01]
+                                       [--error-rate 0.0] [--weight-limit N] [--client-rate-limit-ms 1]
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import market_cache  # noqa: E402
+from core.account_state import AccountState  # noqa: E402
+from core.exchange_manager import ExchangeManager  # noqa: E402
+from core.exchange_registry import ExchangeRegistry  # noqa: E402
+from core.market_data_hub import MarketDataHub  # noqa: E402
+from core.order_executor import OrderExecutor, OrderParams  # noqa: E402
+from core.rate_limiter import clear_rate_limiters  # noqa: E402
+from database.db_manager import DatabaseManager  # noqa: E402
+from tests.mock_http_exchange import MockBinanceServer  # noqa: E402
+from utils.config_manager import ConfigManager  # noqa: E402
+
+
+def run_scenario(name: str, args, workdir: Path, balance_max_age: float):
+    server_args = dict(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                       weight_limit=args.weight_limit, balance=1e9)
+    with MockBinanceServer(**server_args) as server:
+        clear_rate_limiters()
+        market_cache.clear_caches()
+        exchange_class = server.exchange_class(asynchronous=False, rate_limit_ms=args.client_rate_limit_ms)
+        registry = ExchangeRegistry(factory=lambda exchange_name, config: exchange_class(config))
+
+        db = DatabaseManager(str(workdir / f"{name}.db"))
+        db.initialize()
+        config = ConfigManager(str(workdir / f"{name}.json"))
+        config.set("trading.balance_max_age", balance_max_age)
+
+        manager = ExchangeManager(db_manager=db, registry=registry)
+        if not manager.connect_exchange("binance", "bench-key", "bench-secret"):
+            raise SystemExit("Could not connect to the mock exchange")
+        executor = OrderExecutor(db_manager=db, config_manager=config, exchange_manager=manager,
+                                 account_state=AccountState(manager), market_data=MarketDataHub(use_stream=False))
+
+        server.requests.clear()
+        latencies, failures = [], 0
+        lock = threading.Lock()
+        per_thread = args.orders // args.threads
+
+        def worker():
+            nonlocal failures
+            for _ in range(per_thread):
+                params = OrderParams(symbol="BTC/USDT:USDT", side="buy", amount=0.001, amount_type="qty", leverage=1)
+                started = time.perf_counter()
+                result = executor.execute_market_order(params)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    failures += 0 if result.success else 1
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - started
+
+        paths = Counter(server.paths())
+        registry.close_all()
+        db.disconnect()
+
+    n = len(latencies)
+    latencies_ms = sorted(x * 1000 for x in latencies)
+    return {
+        "name": name,
+        "orders": n,
+        "p50": statistics.median(latencies_ms),
+        "p95": latencies_ms[max(0, int(round(n * 0.95)) - 1)],
+        "max": latencies_ms[-1],
+        "throughput": n / wall,
+        "req_per_order": sum(paths.values()) / n,
+        "balance_per_order": paths["/fapi/v2/account"] / n,
+        "failures": failures,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Order path benchmark against the offline mock exchange")
+    arg_parser.add_argument("--orders", type=int, default=50)
+    arg_parser.add_argument("--threads", type=int, default=1, help="Eşzamanlı emir gönderen thread sayısı")
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="Sunucu gecikmesi (sn)")
+    arg_parser.add_argument("--jitter", type=float, default=0.01, help="Ek rastgele gecikme üst sınırı (sn)")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="Rastgele 503 oranı (0-1)")
+    arg_parser.add_argument("--weight-limit", type=int, default=None, help="Sunucu dakikalık ağırlık limiti")
+    arg_parser.add_argument("--client-rate-limit-ms", type=float, default=1.0,
+                            help="ccxt rateLimit (istemci bütçesi 1000/rateLimit birim/sn)")
+    args = arg_parser.parse_args()
+    args.threads = max(1, min(args.threads, args.orders))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        market_cache.configure(cache_dir=workdir / "markets")
+        results = [
+            run_scenario("fresh", args, workdir, balance_max_age=0.0),
+            run_scenario("cached", args, workdir, balance_max_age=10.0),
+        ]
+
+    print(f"Mock venue: latency {args.latency * 1000:.0f} ms (+0-{args.jitter * 1000:.0f} ms), "
+          f"error rate {args.error_rate:.0%}, threads {args.threads}")
+    print(f"{'scenario':>8} | {'orders':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} "
+          f"{'orders/s':>8} {'req/order':>9} {'bal/order':>9} {'failed':>6}")
+    for r in results:
+        print(f"{r['name']:>8} | {r['orders']:>6} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['max']:>8.1f} "
+              f"{r['throughput']:>8.1f} {r['req_per_order']:>9.2f} {r['balance_per_order']:>9.2f} {r['failures']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Watchlist Benchmark
+Sembol başına REST polling (eski PriceUpdateThread modeli: her saniye
+fetch_ticker + fetch_order_book) ile toplu fetch_tickers + NumPy tablo
+karşılaştırması: istek sayısı, CPU süresi ve yeniden çizilen hücre sayısı.
+
+Borsa yanıtları simüle edilir ama ccxt'nin gerçek parse_ticker /
+parse_order_book kodundan geçer; CPU ölçümü istemci tarafı işi kapsar.
+
+Kullanım:
+    python scripts/bench_watchlist.py [--sizes 10 50 200] [--ticks 30] [--interval 2.0] [--change 0.3]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import ccxt  # noqa: E402
+
+from core.watchlist import Watchlist  # noqa: E402
+
+
+class SimulatedVenue:
+    """Binance USDⓈ-M yanıt biçiminde N sembol; her tick'te bir kısmı değişir"""
+
+    def __init__(self, size: int, change_ratio: float, seed: int = 7):
+        self.rng = random.Random(seed)
+        self.change_ratio = change_ratio
+        self.parser = ccxt.binance({'options': {'defaultType': 'future'}})
+        self.raw = {}
+        for i in range(size):
+            market_id = f"C{i:03d}USDT"
+            price = self.rng.uniform(0.05, 60000)
+            self.raw[f"C{i:03d}/USDT:USDT"] = {
+                "symbol": market_id, "lastPrice": f"{price:.4f}", "priceChangePercent": "1.10",
+                "highPrice": f"{price * 1.02:.4f}", "lowPrice": f"{price * 0.98:.4f}",
+                "volume": "1000", "quoteVolume": f"{price * 1000:.2f}",
+                "openTime": 0, "closeTime": 0, "count": 1,
+            }
+        self.requests = 0
+
+    def tick(self) -> None:
+        for raw in self.raw.values():
+            if self.rng.random() < self.change_ratio:
+                price = float(raw["lastPrice"]) * (1 + self.rng.uniform(-0.001, 0.001))
+                raw["lastPrice"] = f"{price:.4f}"
+
+    # Sembol başına model
+    def fetch_ticker(self, symbol):
+        self.requests += 1
+        return self.parser.parse_ticker(self.raw[symbol])
+
+    def fetch_order_book(self, symbol, limit=5):
+        self.requests += 1
+        price = float(self.raw[symbol]["lastPrice"])
+        return self.parser.parse_order_book({
+            "bids": [[str(price * (1 - 1e-4 * k)), "1.0"] for k in range(1, limit + 1)],
+            "asks": [[str(price * (1 + 1e-4 * k)), "1.0"] for k in range(1, limit + 1)],
+        }, symbol)
+
+    # Toplu model
+    has = {'fetchTickers': True}
+
+    def fetch_tickers(self, symbols):
+        self.requests += 1
+        return {s: self.parser.parse_ticker(self.raw[s]) for s in symbols}
+
+
+def run_legacy(size: int, ticks: int, change: float):
+    """Sembol başına ticker + order book (her sembol için ayrı thread/istemci)"""
+    venue = SimulatedVenue(size, change)
+    symbols = list(venue.raw)
+    started = time.process_time()
+    for _ in range(ticks):
+        venue.tick()
+        for symbol in symbols:
+            ticker = venue.fetch_ticker(symbol)
+            book = venue.fetch_order_book(symbol)
+            {
+                'best_bid': book['bids'][0][0], 'best_ask': book['asks'][0][0],
+                'current_price': ticker.get('last'), 'volume': ticker.get('quoteVolume'),
+                'change_24h': ticker.get('percentage'),
+            }
+    cpu = time.process_time() - started
+    # Her hücre her tick'te yeniden çizilir
+    return venue.requests / ticks, cpu / ticks, size * 5
+
+
+def run_batched(size: int, ticks: int, change: float):
+    """Tek fetch_tickers + NumPy tablo; sadece değişen hücreler"""
+    venue = SimulatedVenue(size, change)
+    watchlist = Watchlist(venue, list(venue.raw))
+    watchlist.poll_once()
+    redrawn = 0
+    started = time.process_time()
+    for _ in range(ticks):
+        venue.tick()
+        redrawn += int(watchlist.poll_once().sum())
+    cpu = time.process_time() - started
+    return venue.requests / (ticks + 1), cpu / ticks, redrawn / ticks
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Watchlist benchmark")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    arg_parser.add_argument("--ticks", type=int, default=30)
+    arg_parser.add_argument("--interval", type=float, default=2.0, help="Watchlist polling aralığı (sn)")
+    arg_parser.add_argument("--change", type=float, default=0.3, help="Tick başına değişen sembol oranı")
+    args = arg_parser.parse_args()
+
+    print(f"Legacy: 1 Hz, fetch_ticker + fetch_order_book per symbol | "
+          f"Watchlist: fetch_tickers every {args.interval}s")
+    print(f"{'symbols':>8} | {'legacy req/min':>14} {'cpu ms/tick':>11} {'cells/tick':>10} | "
+          f"{'batched req/min':>15} {'cpu ms/tick':>11} {'cells/tick':>10}")
+    for size in args.sizes:
+        l_req, l_cpu, l_cells = run_legacy(size, args.ticks, args.change)
+        b_req, b_cpu, b_cells = run_batched(size, args.ticks, args.change)
+        print(f"{size:>8} | {l_req * 60:>14,.0f} {l_cpu * 1e3:>11.2f} {l_cells:>10,.0f} | "
+              f"{b_req * 60 / args.interval:>15,.0f} {b_cpu * 1e3:>11.2f} {b_cells:>10,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+CommandParser benchmark corpus üretici.
+
+Etiketler şablondan gelir (parser çıktısından DEĞİL); böylece corpus parser
+değişikliklerinin doğruluğunu ölçebilir. Aynı --seed ile aynı dosya üretilir.
+
+Kaynaklar (source sütunu):
+- template: TR/EN şablonlardan temiz cümleler
+- noisy:    template cümlelerine Whisper tarzı yazım hatası eklenmiş varyantlar
+- asr:      Whisper çıktısı biçiminde elle yazılmış cümleler (noktalama, büyük harf, ekler)
+- negative: komut olmayan konuşmalar
+
+Kullanım:
+    python scripts/generate_parser_corpus.py [--seed 7] [--output data/corpus/parser_benchmark_v1.tsv]
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.parser_benchmark import CORPUS_COLUMNS, CORPUS_VERSION, DEFAULT_CORPUS_PATH  # noqa: E402
+
+
+# Konuşma ismi → sembol
+SPOKEN_SYMBOLS = {
+    "tr": [
+        ("bitcoin", "BTCUSDT"), ("btc", "BTCUSDT"), ("bitkoyn", "BTCUSDT"),
+        ("ethereum", "ETHUSDT"), ("eth", "ETHUSDT"), ("eter", "ETHUSDT"),
+        ("solana", "SOLUSDT"), ("sol", "SOLUSDT"), ("bnb", "BNBUSDT"),
+        ("xrp", "XRPUSDT"), ("ripple", "XRPUSDT"), ("doge", "DOGEUSDT"),
+        ("ada", "ADAUSDT"), ("cardano", "ADAUSDT"), ("avax", "AVAXUSDT"),
+        ("link", "LINKUSDT"), ("litecoin", "LTCUSDT"), ("polkadot", "DOTUSDT"),
+    ],
+    "en": [
+        ("bitcoin", "BTCUSDT"), ("btc", "BTCUSDT"), ("ethereum", "ETHUSDT"),
+        ("eth", "ETHUSDT"), ("solana", "SOLUSDT"), ("bnb", "BNBUSDT"),
+        ("ripple", "XRPUSDT"), ("dogecoin", "DOGEUSDT"), ("cardano", "ADAUSDT"),
+        ("avalanche", "AVAXUSDT"), ("chainlink", "LINKUSDT"), ("litecoin", "LTCUSDT"),
+    ],
+}
+
+AMOUNTS = [5, 10, 15, 20, 25, 40, 50, 75, 100, 120, 150, 200, 250, 300, 500, 750, 1000, 1500, 2000, 2500, 5000]
+
+TR_ONES = ["", "bir", "iki", "üç", "dört", "beş", "altı", "yedi", "sekiz", "dokuz"]
+TR_TENS = ["", "on", "yirmi", "otuz", "kırk", "elli", "altmış", "yetmiş", "seksen", "doksan"]
+EN_SMALL = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+            "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen",
+            "eighteen", "nineteen"]
+EN_TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+
+
+def tr_words(n: int) -> str:
+    """Türkçe okunuş (n < 1 000 000)"""
+    parts = []
+    thousands, n = divmod(n, 1000)
+    if thousands:
+        parts += ([tr_words(thousands)] if thousands > 1 else []) + ["bin"]
+    hundreds, n = divmod(n, 100)
+    if hundreds:
+        parts += ([TR_ONES[hundreds]] if hundreds > 1 else []) + ["yüz"]
+    tens, ones = divmod(n, 10)
+    parts += [w for w in (TR_TENS[tens], TR_ONES[ones]) if w]
+    return " ".join(parts)
+
+
+def en_words(n: int) -> str:
+    """İngilizce okunuş (n < 1 000 000)"""
+    parts = []
+    thousands, n = divmod(n, 1000)
+    if thousands:
+        parts += [en_words(thousands), "thousand"]
+    hundreds, n = divmod(n, 100)
+    if hundreds:
+        parts += [EN_SMALL[hundreds], "hundred"]
+    if n >= 20:
+        tens, ones = divmod(n, 10)
+        parts += [EN_TENS[tens]] + ([EN_SMALL[ones]] if ones else [])
+    elif n:
+        parts.append(EN_SMALL[n])
+    return " ".join(parts)
+
+
+def spoken_amount(n: int, language: str, rng: random.Random) -> str:
+    style = rng.random()
+    if style < 0.55:
+        return str(n)
+    if style < 0.65 and n >= 1000 and n % 1000 == 0:
+        return f"{n // 1000} bin" if language == "tr" else f"{n // 1000}k"
+    return tr_words(n) if language == "tr" else en_words(n)
+
+
+def _row(text, language, action, source, symbol=None, amount=None, leverage=None,
+         price=None, stop_loss=None, take_profit=None, valid=None):
+    if valid is None:
+        valid = action is not None and (action not in ("buy", "sell") or (
+            amount is not None and 1 <= amount <= 100000))
+    return {
+        "text": text, "language": language, "action": action, "symbol": symbol,
+        "amount": amount, "leverage": leverage, "price": price,
+        "stop_loss": stop_loss, "take_profit": take_profit, "valid": valid, "source": source,
+    }
+
+
+def order_rows(language: str, rng: random.Random, count: int):
+    """Alış/satış şablonları (opsiyonel kaldıraç, limit, SL/TP)"""
+    if language == "tr":
+        verbs = {"buy": ["al", "satın al", "long", "alalım"], "sell": ["sat", "short", "satalım", "açığa sat"]}
+        currency = ["dolar", "usdt", "dolar", "usd"]
+        layouts = [
+            "{sym} {verb} {amt} {cur}", "{verb} {sym} {amt} {cur}", "{amt} {cur} {sym} {verb}",
+            "{sym} {amt} {cur} {verb}", "{verb} {amt} {cur} {sym}",
+        ]
+        # "10 kaldıraç 63700 limit" gibi sonek biçimleri konuşmada da belirsiz; kullanılmaz
+        leverage_forms = ["{n}x", "{n} kat", "kaldıraç {n}"]
+        limit_forms = ["limit {p}", "limit fiyat {p}"]
+        stop_forms = ["stop {p}", "zarar durdur {p}"]
+        tp_forms = ["kar al {p}", "hedef {p}", "tp {p}"]
+    else:
+        verbs = {"buy": ["buy", "long", "go long"], "sell": ["sell", "short", "go short"]}
+        currency = ["dollars", "usdt", "usd", "dollars"]
+        layouts = [
+            "{verb} {sym} {amt} {cur}", "{verb} {amt} {cur} of {sym}", "{sym} {verb} {amt} {cur}",
+            "{verb} {amt} {cur} {sym}",
+        ]
+        leverage_forms = ["{n}x", "{n}x leverage", "leverage {n}"]
+        limit_forms = ["limit {p}", "limit price {p}", "at {p}"]
+        stop_forms = ["stop {p}", "stop loss {p}", "stop loss at {p}"]
+        tp_forms = ["take profit {p}", "tp {p}", "target {p}"]
+
+    prices = {"BTCUSDT": 65000, "ETHUSDT": 3200, "SOLUSDT": 150, "BNBUSDT": 580, "XRPUSDT": 1,
+              "DOGEUSDT": 1, "ADAUSDT": 1, "AVAXUSDT": 35, "LINKUSDT": 18, "LTCUSDT": 85, "DOTUSDT": 7}
+
+    rows = []
+    for _ in range(count):
+        action = rng.choice(["buy", "sell"])
+        verb = rng.choice(verbs[action])
+        spoken, symbol = rng.choice(SPOKEN_SYMBOLS[language])
+        amount = rng.choice(AMOUNTS)
+        text = rng.choice(layouts).format(
+            sym=spoken, verb=verb, amt=spoken_amount(amount, language, rng), cur=rng.choice(currency))
+        labels = {"symbol": symbol, "amount": float(amount)}
+
+        extras = []
+        if rng.random() < 0.3:
+            labels["leverage"] = rng.choice([2, 3, 5, 10, 20, 25])
+            extras.append(rng.choice(leverage_forms).format(n=labels["leverage"]))
+        base = prices.get(symbol, 0)
+        if base >= 10 and rng.random() < 0.25:
+            labels["price"] = float(round(base * rng.choice([0.97, 0.98, 0.99])))
+            extras.append(rng.choice(limit_forms).format(p=int(labels["price"])))
+        if base >= 10 and rng.random() < 0.2:
+            ref = labels.get("price", base)
+            below, above = float(round(ref * 0.95)), float(round(ref * 1.08))
+            labels["stop_loss"] = below if action == "buy" else above
+            extras.append(rng.choice(stop_forms).format(p=int(labels["stop_loss"])))
+            if rng.random() < 0.5:
+                labels["take_profit"] = above if action == "buy" else below
+                extras.append(rng.choice(tp_forms).format(p=int(labels["take_profit"])))
+        if extras:
+            text = text + " " + " ".join(extras)
+        rows.append(_row(text, language, action, "template", **labels))
+    return rows
+
+
+# Komut + dil → örnek cümleler
+SIMPLE_COMMANDS = {
+    "tr": {
+        "close": ["pozisyonu kapat", "pozisyon kapat", "kapat", "{sym} pozisyonunu kapat", "{sym} kapat",
+                  "kapatalım", "pozisyondan çık", "hepsini kapat"],
+        "cancel": ["emri iptal et", "iptal", "vazgeç", "emri iptal", "order iptal", "{sym} emrini iptal et"],
+        "status": ["durum", "durum göster", "pozisyonlar", "açık pozisyon", "ne var", "pozisyonları göster"],
+        "balance": ["bakiye", "bakiye ne kadar", "cüzdan", "sermaye ne kadar", "hesap bakiyesi",
+                    "bakiyemi söyle"],
+    },
+    "en": {
+        "close": ["close", "close position", "close {sym}", "close the {sym} position", "close it"],
+        "cancel": ["cancel", "cancel the order", "cancel my order", "cancel {sym} order"],
+        "status": ["status", "show status", "what is the status"],
+        "balance": ["balance", "show balance", "what is my balance", "check balance"],
+    },
+}
+
+NEGATIVES = {
+    "tr": ["merhaba nasılsın", "bugün hava çok güzel", "bakiyeyi almak istiyorum", "teşekkürler",
+           "bir dakika bekle", "ne diyorsun sen", "müzik aç değil", "haberleri oku"],
+    "en": ["hello there", "thank you very much", "what time is it", "never mind",
+           "how are you doing today", "play some music"],
+}
+
+# Whisper çıktısı biçiminde elle yazılmış cümleler
+ASR_STYLE = [
+    ("Al, BTC, 100 dolar.", "tr", "buy", "BTCUSDT", 100.0),
+    ("Bitcoin sat. 50 dolar.", "tr", "sell", "BTCUSDT", 50.0),
+    ("Ethereum al 200 USD.", "tr", "buy", "ETHUSDT", 200.0),
+    ("Solana'dan 75 dolar al.", "tr", "buy", "SOLUSDT", 75.0),
+    ("Bitcoin'i sat, 250 dolar.", "tr", "sell", "BTCUSDT", 250.0),
+    ("Pozisyonu kapat.", "tr", "close", None, None),
+    ("Emri iptal et!", "tr", "cancel", None, None),
+    ("Bakiye ne kadar?", "tr", "balance", None, None),
+    ("Durumu göster.", "tr", "status", None, None),
+    ("ETH, short, yirmi dolar.", "tr", "sell", "ETHUSDT", 20.0),
+    ("Doge al yüz elli dolar", "tr", "buy", "DOGEUSDT", 150.0),
+    ("BTC al 1.500 dolar", "tr", "buy", "BTCUSDT", 1500.0),
+    ("Al BTC 2,5 bin dolar", "tr", "buy", "BTCUSDT", 2500.0),
+    ("Avax satın al iki yüz elli USDT.", "tr", "buy", "AVAXUSDT", 250.0),
+    ("Buy Bitcoin, 100 dollars.", "en", "buy", "BTCUSDT", 100.0),
+    ("Sell ETH. Fifty dollars.", "en", "sell", "ETHUSDT", 50.0),
+    ("Close the position.", "en", "close", None, None),
+    ("Cancel the order, please.", "en", "cancel", None, None),
+    ("What's my balance?", "en", "balance", None, None),
+    ("Buy Solana, one hundred and fifty dollars.", "en", "buy", "SOLUSDT", 150.0),
+    ("Short Bitcoin 2,000 dollars.", "en", "sell", "BTCUSDT", 2000.0),
+    ("Buy $500 of Ethereum.", "en", "buy", "ETHUSDT", 500.0),
+]
+
+
+def add_asr_noise(text: str, rng: random.Random) -> str:
+    """Whisper'da sık görülen hatalardan birini rastgele bir harfli kelimeye uygula"""
+    words = text.split()
+    candidates = [i for i, w in enumerate(words) if w.isalpha()]
+    if not candidates:
+        return text
+    i = rng.choice(candidates)
+    word = words[i]
+    kind = rng.choice(["repeat", "substitute", "delete", "voice"])
+
+    if kind == "repeat" or len(word) < 4:
+        # "al" → "allll"
+        word = word + word[-1] * rng.randint(2, 4)
+    elif kind == "substitute":
+        pos = rng.randrange(1, len(word))
+        word = word[:pos] + rng.choice("aeiouklmnrst") + word[pos + 1:]
+    elif kind == "delete":
+        pos = rng.randrange(1, len(word))
+        word = word[:pos] + word[pos + 1:]
+    else:
+        # Son ünsüzün yumuşaması: "kapat" → "kapad"
+        word = word[:-1] + {"t": "d", "k": "g", "p": "b", "ç": "c"}.get(word[-1], word[-1])
+
+    words[i] = word
+    return " ".join(words)
+
+
+def generate(seed: int = 7, orders_per_language=None, noisy_ratio: float = 1.0):
+    rng = random.Random(seed)
+    orders_per_language = orders_per_language or {"tr": 900, "en": 450}
+    rows = []
+
+    for language, count in orders_per_language.items():
+        rows += order_rows(language, rng, count)
+        for action, phrases in SIMPLE_COMMANDS[language].items():
+            for phrase in phrases:
+                if "{sym}" not in phrase:
+                    rows.append(_row(phrase, language, action, "template"))
+                    continue
+                for spoken, symbol in SPOKEN_SYMBOLS[language]:
+                    rows.append(_row(phrase.format(sym=spoken), language, action, "template",
+                                     symbol=symbol if action == "close" else None))
+        for phrase in NEGATIVES[language]:
+            rows.append(_row(phrase, language, None, "negative"))
+
+    for text, language, action, symbol, amount in ASR_STYLE:
+        rows.append(_row(text, language, action, "asr", symbol=symbol, amount=amount))
+
+    # Aynı cümle birden fazla üretildiyse ilkini tut
+    seen = set()
+    rows = [r for r in rows if not (r["text"] in seen or seen.add(r["text"]))]
+
+    clean = [r for r in rows if r["source"] == "template"]
+    for row in rng.sample(clean, int(len(clean) * noisy_ratio)):
+        noisy = dict(row, text=add_asr_noise(row["text"], rng), source="noisy")
+        rows.append(noisy)
+
+    return rows
+
+
+def format_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Generate the CommandParser benchmark corpus")
+    arg_parser.add_argument("--seed", type=int, default=7)
+    arg_parser.add_argument("--output", type=str, default=str(DEFAULT_CORPUS_PATH))
+    args = arg_parser.parse_args()
+
+    rows = generate(args.seed)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8") as f:
+        f.write(f"# CommandParser benchmark corpus, version {CORPUS_VERSION}\n")
+        f.write(f"# generated by scripts/generate_parser_corpus.py --seed {args.seed}\n")
+        f.write("\t".join(CORPUS_COLUMNS) + "\n")
+        for row in rows:
+            f.write("\t".join(format_value(row[c]) for c in CORPUS_COLUMNS) + "\n")
+
+    by_source = {}
+    for row in rows:
+        by_source[row["source"]] = by_source.get(row["source"], 0) + 1
+    print(f"Wrote {len(rows)} rows to {output}: {by_source}")
+
+
+if __name__ == "__main__":
+    main()
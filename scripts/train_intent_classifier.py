@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Niyet sınıflandırıcıyı yeniden eğitir ve offline doğruluk raporu basar.
+
+Eğitim verisi: CommandParser anahtar kelimeleri + data/corpus/intents.tsv
+(+ --db verilirse voice_commands / command_keywords tabloları)
+
+Kullanım:
+    python scripts/train_intent_classifier.py [--db data/database/trading.db] [--folds 5] [--no-save]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.intent_classifier import (  # noqa: E402
+    DEFAULT_CORPUS_PATH,
+    DEFAULT_MODEL_PATH,
+    cross_validate,
+    load_corpus,
+    load_db_examples,
+    load_parser_examples,
+    train_from_sources,
+)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Intent classifier training")
+    arg_parser.add_argument("--db", type=str, default=None, help="SQLite DB yolu (voice_commands)")
+    arg_parser.add_argument("--corpus", type=str, default=str(DEFAULT_CORPUS_PATH))
+    arg_parser.add_argument("--folds", type=int, default=5)
+    arg_parser.add_argument("--output", type=str, default=str(DEFAULT_MODEL_PATH))
+    arg_parser.add_argument("--no-save", action="store_true")
+    args = arg_parser.parse_args()
+
+    db = None
+    if args.db:
+        from database.db_manager import DatabaseManager
+        db = DatabaseManager(args.db)
+
+    corpus = load_corpus(Path(args.corpus))
+    extra = load_parser_examples() + (load_db_examples(db) if db else [])
+
+    print("=" * 60)
+    print("Intent Classifier")
+    print("=" * 60)
+    print(f"Corpus examples: {len(corpus)}")
+    print(f"Extra examples (keywords/DB): {len(extra)}")
+
+    # Çapraz doğrulama sadece corpus üzerinde; anahtar kelimeler her katta eğitime eklenir
+    texts = [t for t, _ in corpus]
+    labels = [l for _, l in corpus]
+    report = cross_validate(
+        texts, labels, folds=args.folds,
+        extra=([t for t, _ in extra], [l for _, l in extra]),
+    )
+
+    print(f"\n{args.folds}-fold accuracy: {report['accuracy']:.1%}")
+    for action, acc in report["per_class"].items():
+        print(f"  {action:<8} {acc:.1%}")
+    if report["confusion"]:
+        print("\nConfusions (true → predicted):")
+        for (true, pred), count in sorted(report["confusion"].items(), key=lambda x: -x[1]):
+            print(f"  {true} → {pred}: {count}")
+
+    # Tüm veriyle eğit
+    clf = train_from_sources(db, Path(args.corpus))
+
+    started = time.perf_counter()
+    n = 2000
+    for _ in range(n):
+        clf.predict_proba("pozisyonu kapat ve durum göster")
+    print(f"\nScoring latency: {(time.perf_counter() - started) / n * 1e6:.1f} µs/utterance")
+
+    if not args.no_save:
+        clf.save(Path(args.output))
+        print(f"Model saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
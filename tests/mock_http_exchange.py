@@ -0,0 +1,392 @@
+"""
+In-process mock of the Binance USDⓈ-M REST and WebSocket API.
+
+Serves just enough of the real response formats for ccxt (sync and
+async_support) to parse markets, tickers, order books, balances and orders,
+so ExchangeManager, OrderExecutor and the market data feeds can be exercised
+offline. Run one server per venue to simulate several exchanges.
+
+- Latency: every request sleeps `latency` (+ uniform `jitter`) seconds and is
+  recorded with its start/end time, so tests can tell serial calls from
+  concurrent ones
+- Orders: market orders fill at the current price, limit orders rest until
+  cancelled unless they cross. Margin (notional / leverage) is taken from the
+  available balance; -2019 "Margin is insufficient" when it runs out
+- Error injection: inject_error() for targeted failures, error_rate for
+  random 503s (seeded)
+- Rate limits: weight_limit per weight_window seconds; over the limit the
+  server answers 429 with Retry-After like Binance does
+- Record / replay: record=True keeps every exchange in `session`
+  (save_session / load_session as JSONL); replay=session serves those
+  responses instead of the simulator. With upstream=<url> requests are
+  forwarded to a real exchange, so sessions can be captured from a testnet
+- Streams: stream=True also starts a WebSocket server (ws_url); set_price()
+  pushes bookTicker and 24hrTicker events to subscribed clients
+
+    with MockBinanceServer(latency=0.2) as server:
+        exchange_class = server.exchange_class()   # ccxt.async_support.binance pointed at the server
+        sync_class = server.exchange_class(asynchronous=False)
+"""
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import ccxt
+import ccxt.async_support as ccxt_async
+
+from tests.ws_replay_server import ReplayServer
+
+PRICES = {"BTCUSDT": "64250.20", "ETHUSDT": "3201.55"}
+
+# Request weights (Binance USDⓈ-M); anything else costs 1
+WEIGHTS = {"/fapi/v1/exchangeInfo": 1, "/fapi/v2/account": 5, "/fapi/v1/depth": 5, "/fapi/v1/openOrders": 1}
+
+# Query parameters that differ between otherwise identical signed requests
+VOLATILE_PARAMS = {"timestamp", "signature", "recvWindow", "newClientOrderId"}
+
+
+def _market(symbol: str, base: str) -> Dict:
+    return {
+        "symbol": symbol, "pair": symbol, "contractType": "PERPETUAL",
+        "deliveryDate": 4133404800000, "onboardDate": 1569398400000, "status": "TRADING",
+        "baseAsset": base, "quoteAsset": "USDT", "marginAsset": "USDT",
+        "pricePrecision": 2, "quantityPrecision": 3, "baseAssetPrecision": 8, "quotePrecision": 8,
+        "underlyingType": "COIN", "triggerProtect": "0.0500",
+        "filters": [
+            {"filterType": "PRICE_FILTER", "minPrice": "0.10", "maxPrice": "1000000", "tickSize": "0.10"},
+            {"filterType": "LOT_SIZE", "minQty": "0.001", "maxQty": "1000", "stepSize": "0.001"},
+            {"filterType": "MARKET_LOT_SIZE", "minQty": "0.001", "maxQty": "120", "stepSize": "0.001"},
+            {"filterType": "MIN_NOTIONAL", "notional": "5"},
+        ],
+        "orderTypes": ["LIMIT", "MARKET"], "timeInForce": ["GTC", "IOC", "FOK", "GTX"],
+    }
+
+
+def _error(status: int, code: int, msg: str) -> Tuple[int, Dict, Dict]:
+    return status, {"code": code, "msg": msg}, {}
+
+
+def load_session(path) -> List[Dict]:
+    """Recorded request/response pairs, one JSON object per line"""
+    return [json.loads(line) for line in Path(path).read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+class MockBinanceServer:
+    """Threaded HTTP server; `requests` holds (method, path, started, finished)"""
+
+    def __init__(self, latency: float = 0.0, balance: float = 1000.0, prices: Optional[Dict[str, str]] = None,
+                 jitter: float = 0.0, error_rate: float = 0.0, weight_limit: Optional[int] = None,
+                 weight_window: float = 60.0, record: bool = False, replay: Optional[List[Dict]] = None,
+                 upstream: Optional[str] = None, stream: bool = False, seed: int = 7):
+        self.latency = latency
+        self.jitter = jitter
+        self.balance = balance
+        self.prices = dict(prices or PRICES)
+        self.error_rate = error_rate
+        self.weight_limit = weight_limit
+        self.weight_window = weight_window
+        self.record = record
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.requests: List[tuple] = []
+        self.orders: List[Dict] = []
+        self.session: List[Dict] = []
+        self.leverage: Dict[str, int] = {}
+        self.used_margin = 0.0
+        self._faults: List[Dict] = []
+        self._weights: deque = deque()
+        self._replay: Dict[Tuple[str, str], deque] = {}
+        for entry in replay or []:
+            self._replay.setdefault((entry["method"], entry["path"]), deque()).append(entry)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self.stream = ReplayServer([]) if stream else None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def ws_url(self) -> Optional[str]:
+        return self.stream.url if self.stream is not None else None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        if self.stream is not None:
+            self.stream.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        if self.stream is not None:
+            self.stream.__exit__(*exc)
+        self._server.shutdown()
+        self._server.server_close()
+
+    def paths(self, prefix: str = "") -> List[str]:
+        return [path for _, path, _, _ in self.requests if path.startswith(prefix)]
+
+    def exchange_class(self, asynchronous: bool = True, rate_limit_ms: Optional[float] = None):
+        """ccxt binance subclass (async_support or sync) whose API and sandbox URLs point at this server"""
+        base_url = self.base_url
+        base = ccxt_async.binance if asynchronous else ccxt.binance
+
+        class MockBinance(base):
+            def __init__(self, config={}):
+                super().__init__(config)
+                self.options['fetchMarkets'] = ['linear']
+                if rate_limit_ms is not None:
+                    self.rateLimit = rate_limit_ms
+                for urls in (self.urls['api'], self.urls['test']):
+                    for name, url in urls.items():
+                        if isinstance(url, str):
+                            urls[name] = base_url + urlparse(url).path
+
+        return MockBinance
+
+    # ------------------------------------------------------------------
+    # Test controls
+    # ------------------------------------------------------------------
+
+    def set_price(self, symbol: str, price: float) -> None:
+        """Move the mark price; subscribed WebSocket clients get ticker events"""
+        self.prices[symbol] = f"{price:.2f}"
+        if self.stream is None:
+            return
+        now = int(time.time() * 1000)
+        last = self.prices[symbol]
+        stream = symbol.lower()
+        book = {"e": "bookTicker", "u": now, "s": symbol, "b": f"{price - 0.1:.2f}", "B": "5.000",
+                "a": last, "A": "5.000", "T": now, "E": now}
+        ticker = {"e": "24hrTicker", "E": now, "s": symbol, "c": last, "P": "1.20", "h": last, "l": last,
+                  "v": "1000", "q": "64000000"}
+        self.stream.broadcast(json.dumps({"stream": f"{stream}@bookTicker", "data": book}), match=f"{stream}@")
+        self.stream.broadcast(json.dumps({"stream": f"{stream}@ticker", "data": ticker}), match=f"{stream}@")
+
+    def inject_error(self, path: str, status: int = 500, code: int = -1000, msg: str = "Injected error",
+                     times: int = 1, method: Optional[str] = None) -> None:
+        """Fail the next `times` requests to `path` (optionally only for one HTTP method)"""
+        with self._lock:
+            self._faults.append({"path": path, "method": method, "status": status,
+                                 "code": code, "msg": msg, "times": times})
+
+    def save_session(self, path) -> None:
+        Path(path).write_text("".join(json.dumps(e) + "\n" for e in self.session), encoding="utf-8")
+
+    # ------------------------------------------------------------------
+    # Simulator
+    # ------------------------------------------------------------------
+
+    @property
+    def available(self) -> float:
+        return self.balance - self.used_margin
+
+    def _respond(self, method: str, path: str, query: Dict[str, str]) -> Tuple[int, Any, Dict]:
+        if path in ("/fapi/v1/time", "/api/v3/time"):
+            return 200, {"serverTime": int(time.time() * 1000)}, {}
+        if path == "/fapi/v1/exchangeInfo":
+            return 200, {"timezone": "UTC", "serverTime": int(time.time() * 1000),
+                         "symbols": [_market(s, s[:-4]) for s in self.prices]}, {}
+        if path == "/fapi/v2/account":
+            return 200, self._account(), {}
+        if path == "/fapi/v1/ticker/24hr":
+            if "symbol" in query:
+                return 200, self._ticker(query["symbol"]), {}
+            return 200, [self._ticker(s) for s in self.prices], {}
+        if path == "/fapi/v1/depth":
+            return 200, self._depth(query["symbol"], int(query.get("limit", 20))), {}
+        if path == "/fapi/v1/leverage" and method == "POST":
+            self.leverage[query["symbol"]] = int(query["leverage"])
+            return 200, {"symbol": query["symbol"], "leverage": int(query["leverage"]),
+                         "maxNotionalValue": "1000000"}, {}
+        if path == "/fapi/v1/order":
+            if method == "POST":
+                return self._place(query)
+            order = self._find(query)
+            if order is None:
+                return _error(400, -2013, "Order does not exist.")
+            if method == "DELETE":
+                if order["status"] != "NEW":
+                    return _error(400, -2011, "Unknown order sent.")
+                order["status"] = "CANCELED"
+                self.used_margin -= order["_margin"]
+            return 200, self._public(order), {}
+        if path == "/fapi/v1/openOrders":
+            return 200, [self._public(o) for o in self.orders if o["status"] == "NEW"
+                         and o["symbol"] == query.get("symbol", o["symbol"])], {}
+        return _error(404, -1, "not found")
+
+    def _account(self) -> Dict:
+        balance, available, used = (f"{v:.2f}" for v in (self.balance, self.available, self.used_margin))
+        return {"assets": [{"asset": "USDT", "walletBalance": balance, "marginBalance": balance,
+                            "availableBalance": available, "initialMargin": used,
+                            "crossWalletBalance": balance, "unrealizedProfit": "0", "crossUnPnl": "0"}],
+                "positions": []}
+
+    def _ticker(self, symbol: str) -> Dict:
+        last = self.prices.get(symbol, "1.0")
+        return {"symbol": symbol, "lastPrice": last, "priceChangePercent": "1.20",
+                "highPrice": last, "lowPrice": last, "volume": "1000", "quoteVolume": "64000000",
+                "openTime": 0, "closeTime": int(time.time() * 1000), "count": 10}
+
+    def _depth(self, symbol: str, limit: int) -> Dict:
+        price = float(self.prices.get(symbol, "1.0"))
+        levels = range(min(limit, 20))
+        return {"lastUpdateId": int(time.time() * 1000), "E": 0, "T": 0,
+                "bids": [[f"{price - 0.1 * (i + 1):.2f}", f"{0.5 * (i + 1):.3f}"] for i in levels],
+                "asks": [[f"{price + 0.1 * i:.2f}", f"{0.5 * (i + 1):.3f}"] for i in levels]}
+
+    def _place(self, query: Dict[str, str]) -> Tuple[int, Any, Dict]:
+        symbol, side, order_type = query["symbol"], query["side"], query["type"]
+        if symbol not in self.prices:
+            return _error(400, -1121, "Invalid symbol.")
+        qty = float(query["quantity"])
+        mark = float(self.prices[symbol])
+        limit = float(query.get("price") or 0)
+        crosses = order_type == "MARKET" or (limit >= mark if side == "BUY" else limit <= mark)
+        fill_price = mark if order_type == "MARKET" else limit
+        margin = qty * fill_price / self.leverage.get(symbol, 1)
+        if query.get("reduceOnly") != "true" and margin > self.available:
+            return _error(400, -2019, "Margin is insufficient.")
+        self.used_margin += margin
+
+        order = {"orderId": 1000 + len(self.orders), "symbol": symbol,
+                 "status": "FILLED" if crosses else "NEW",
+                 "clientOrderId": query.get("newClientOrderId", "mock"), "price": query.get("price", "0"),
+                 "avgPrice": f"{fill_price:.2f}" if crosses else "0", "origQty": query["quantity"],
+                 "executedQty": query["quantity"] if crosses else "0",
+                 "cumQuote": f"{qty * fill_price:.2f}" if crosses else "0",
+                 "timeInForce": query.get("timeInForce", "GTC"), "type": order_type, "side": side,
+                 "reduceOnly": query.get("reduceOnly") == "true", "positionSide": "BOTH",
+                 "updateTime": int(time.time() * 1000), "_margin": margin}
+        self.orders.append(order)
+        return 200, self._public(order), {}
+
+    def _find(self, query: Dict[str, str]) -> Optional[Dict]:
+        for order in self.orders:
+            if str(order["orderId"]) == query.get("orderId") or order["clientOrderId"] == query.get("origClientOrderId"):
+                return order
+        return None
+
+    @staticmethod
+    def _public(order: Dict) -> Dict:
+        return {k: v for k, v in order.items() if not k.startswith("_")}
+
+    # ------------------------------------------------------------------
+    # Request pipeline: faults → rate limit → replay / upstream / simulator
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, method: str, path: str, query: Dict[str, str], raw: Tuple[str, str, Dict]):
+        with self._lock:
+            fault = self._take_fault(method, path)
+            if fault is not None:
+                return _error(fault["status"], fault["code"], fault["msg"])
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return _error(503, -1001, "Internal error; unable to process your request. Please try again.")
+
+            limited = self._charge(path, query)
+            if limited is not None:
+                return limited
+            headers = {"X-MBX-USED-WEIGHT-1M": str(self._used_weight())}
+
+            replay = self._replay.get((method, path))
+            if replay:
+                entry = replay.popleft() if len(replay) > 1 else replay[0]
+                return entry["status"], entry["body"], headers
+            if self.upstream is None:
+                status, body, extra = self._respond(method, path, query)
+                return status, body, {**headers, **extra}
+        return self._forward(method, path, *raw)
+
+    def _take_fault(self, method: str, path: str) -> Optional[Dict]:
+        for fault in self._faults:
+            if fault["path"] == path and fault["method"] in (None, method):
+                fault["times"] -= 1
+                if fault["times"] <= 0:
+                    self._faults.remove(fault)
+                return fault
+        return None
+
+    def _charge(self, path: str, query: Dict[str, str]):
+        weight = WEIGHTS.get(path, 1)
+        if path == "/fapi/v1/ticker/24hr" and "symbol" not in query:
+            weight = 40
+        now = time.monotonic()
+        while self._weights and now - self._weights[0][0] >= self.weight_window:
+            self._weights.popleft()
+        if self.weight_limit is not None and self._used_weight() + weight > self.weight_limit:
+            retry_after = max(1, int(self.weight_window - (now - self._weights[0][0]) + 0.999))
+            status, body, _ = _error(429, -1003, "Too many requests; current limit is exceeded.")
+            return status, body, {"Retry-After": str(retry_after), "X-MBX-USED-WEIGHT-1M": str(self._used_weight())}
+        self._weights.append((now, weight))
+        return None
+
+    def _used_weight(self) -> int:
+        return sum(w for _, w in self._weights)
+
+    def _forward(self, method: str, path: str, raw_query: str, body: str, headers: Dict[str, str]):
+        """Send the request to the real exchange (signature stays valid: same path and query)"""
+        url = self.upstream + path + (f"?{raw_query}" if raw_query else "")
+        forwarded = {k: v for k, v in headers.items() if k.lower() in ("x-mbx-apikey", "content-type")}
+        request = urllib.request.Request(url, data=body.encode() if body else None, method=method, headers=forwarded)
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read() or b"null"), {}
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read() or b"null"), {}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _handle(self, method: str):
+                started = time.monotonic()
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode() if length else ""
+                query = {k: v[0] for k, v in parse_qs(url.query + "&" + body).items()}
+                delay = server.latency + (server._rng.uniform(0, server.jitter) if server.jitter else 0.0)
+                if delay:
+                    time.sleep(delay)
+                status, payload, headers = server._dispatch(method, url.path, query,
+                                                            (url.query, body, dict(self.headers)))
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+                with server._lock:
+                    server.requests.append((method, url.path, started, time.monotonic()))
+                    if server.record:
+                        server.session.append({
+                            "method": method, "path": url.path, "status": status, "body": payload,
+                            "query": {k: v for k, v in query.items() if k not in VOLATILE_PARAMS},
+                        })
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_DELETE(self):
+                self._handle("DELETE")
+
+        return Handler
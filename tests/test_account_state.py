@@ -0,0 +1,168 @@
+"""
+Test suite for the balance cache and order-path reservations
+"""
+import time
+
+import pytest
+
+from core.account_state import AccountState
+from core.order_executor import InsufficientBalanceError, OrderExecutor, OrderParams
+from utils.config_manager import ConfigManager
+
+
+class FakeExchange:
+    """ccxt-like client with a mutable USDT balance"""
+
+    def __init__(self, free=1000.0, used=0.0):
+        self.free = free
+        self.used = used
+        self.fetches = 0
+        self.orders = []
+        self.fail_orders = False
+
+    def fetch_balance(self):
+        self.fetches += 1
+        return {'free': {'USDT': self.free, 'BTC': 0.5},
+                'used': {'USDT': self.used},
+                'total': {'USDT': self.free + self.used, 'BTC': 0.5}}
+
+
+class FakeManager:
+    """ExchangeManager stand-in that places orders on FakeExchange"""
+
+    active_exchange = "binance"
+
+    def __init__(self, exchange):
+        self.exchange = exchange
+        self.exchanges = {"binance": exchange}
+
+    def get_exchange(self, name=None):
+        return self.exchanges.get(name or self.active_exchange)
+
+    def validate_symbol(self, symbol):
+        return True
+
+    def normalize_symbol(self, symbol):
+        return symbol
+
+    def get_balance(self):
+        raise AssertionError("order path should read the account cache")
+
+    def create_order(self, symbol, side, order_type, amount, price=None, params=None):
+        if self.exchange.fail_orders:
+            raise RuntimeError("rejected")
+        self.exchange.orders.append((symbol, side, amount))
+        return {"id": str(len(self.exchange.orders)), "status": "closed", "filled": amount, "average": 100.0}
+
+
+@pytest.fixture
+def exchange():
+    return FakeExchange()
+
+
+@pytest.fixture
+def state(exchange):
+    return AccountState(FakeManager(exchange))
+
+
+class TestAccountState:
+    """Test snapshot caching and reservation bookkeeping"""
+
+    def test_balance_served_from_memory_within_max_age(self, state, exchange):
+        """Test only the first or a stale read goes to the exchange"""
+        assert state.balance(max_age=10.0) == {'total': 1000.0, 'free': 1000.0, 'used': 0.0, 'currency': 'USDT'}
+        state.balance(max_age=10.0)
+        assert exchange.fetches == 1
+
+        state.snapshot().as_of -= 20
+        state.balance(max_age=10.0)
+        assert exchange.fetches == 2
+        assert state.asset("BTC").total == 0.5
+
+    def test_reservation_released_on_error(self, state):
+        """Test a failed order gives the reserved margin back"""
+        state.refresh()
+        rid = state.reserve(300.0)
+        assert state.balance()['free'] == 700.0
+        assert state.balance()['used'] == 300.0
+        state.release(rid)
+        assert state.balance()['free'] == 1000.0
+
+    def test_settled_reservation_kept_until_newer_snapshot(self, state, exchange):
+        """Test an accepted order stays debited until a snapshot taken after it arrives"""
+        state.refresh()
+        rid = state.reserve(300.0)
+        state.settle(rid)
+        assert state.balance()['free'] == 700.0
+
+        # Exchange now reports the margin as used; the reservation is dropped
+        exchange.free, exchange.used = 700.0, 300.0
+        time.sleep(0.001)
+        state.refresh()
+        assert state.balance() == {'total': 1000.0, 'free': 700.0, 'used': 300.0, 'currency': 'USDT'}
+
+    def test_unsettled_reservation_survives_refresh(self, state):
+        """Test an order still in flight is not credited back by a refresh"""
+        state.refresh()
+        state.reserve(250.0)
+        state.refresh()
+        assert state.balance()['free'] == 750.0
+
+    def test_refresh_failure_returns_empty(self):
+        """Test an unavailable exchange yields {} like ExchangeManager.get_balance"""
+        class NoExchange:
+            active_exchange = "binance"
+
+            def get_exchange(self, name=None):
+                return None
+
+        assert AccountState(NoExchange()).balance(max_age=1.0) == {}
+
+
+class TestOrderExecutor:
+    """Test the order path uses the cache"""
+
+    @pytest.fixture
+    def executor(self, state, exchange, tmp_path):
+        config = ConfigManager(str(tmp_path / "settings.json"))
+        executor = OrderExecutor(db_manager=None, config_manager=config,
+                                 exchange_manager=FakeManager(exchange), account_state=state)
+        executor.record_order = lambda *args, **kwargs: None
+        return executor
+
+    def test_back_to_back_orders_use_one_balance_fetch(self, executor, exchange):
+        """Test consecutive orders check balance from memory and cannot overspend"""
+        params = OrderParams(symbol="BTC/USDT:USDT", side="buy", amount=400.0, amount_type="usd",
+                             leverage=1, order_type="limit", price=100.0)
+        assert executor.execute_limit_order(params).success
+        assert executor.execute_limit_order(params).success
+        third = executor.execute_limit_order(params)
+
+        assert not third.success and "Yetersiz bakiye" in third.error_message
+        assert exchange.fetches == 1
+        assert len(exchange.orders) == 2
+
+    def test_rejected_order_releases_margin(self, executor, exchange, state):
+        """Test margin reserved for a rejected order is available again"""
+        exchange.fail_orders = True
+        params = OrderParams(symbol="BTC/USDT:USDT", side="buy", amount=800.0, amount_type="usd",
+                             leverage=1, order_type="limit", price=100.0)
+        assert not executor.execute_limit_order(params).success
+        assert state.balance()['free'] == 1000.0
+        with pytest.raises(InsufficientBalanceError):
+            executor.check_balance(1500.0)
+
+    def test_paper_balance_percent_uses_engine_balance(self, executor, exchange):
+        """Test paper-mode balance percentages follow the paper engine, config only without one"""
+        from core.paper_trading_engine import PaperTradingEngine
+
+        executor.set_paper_trading(True)
+        executor.config.set("trading.paper_balance", 5000.0)
+        assert executor.amount_from_balance_percent(10, leverage=1) == pytest.approx(500.0)
+
+        executor.paper_engine = PaperTradingEngine(initial_balance=2000.0)
+        params = OrderParams(symbol="BTC/USDT:USDT", side="buy", amount=1000.0, amount_type="usd",
+                             leverage=2, order_type="limit", price=100.0)
+        assert executor.execute_limit_order(params).success
+        assert executor.amount_from_balance_percent(10, leverage=1) == pytest.approx(150.0)
+        assert exchange.fetches == 0 and exchange.orders == []
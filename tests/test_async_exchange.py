@@ -0,0 +1,138 @@
+"""
+Test suite for the asyncio exchange backend (in-process mock HTTP exchange)
+"""
+import pytest
+
+from core import market_cache
+from core.async_exchange import AsyncExchangeManager
+from core.latency_monitor import get_latency_monitor
+from core.rate_limiter import clear_rate_limiters, get_rate_limiter
+from tests.mock_http_exchange import MockBinanceServer
+
+LATENCY = 0.1
+
+
+@pytest.fixture
+def server():
+    with MockBinanceServer(latency=LATENCY) as server:
+        yield server
+
+
+@pytest.fixture
+def manager(server, tmp_path):
+    market_cache.configure(cache_dir=tmp_path)
+    market_cache.clear_caches()
+    clear_rate_limiters()
+    exchange_class = server.exchange_class()
+    manager = AsyncExchangeManager({'binance': exchange_class, 'bybit': exchange_class})
+    yield manager
+    manager.close()
+    market_cache.clear_caches()
+    market_cache.configure(cache_dir=market_cache.DEFAULT_CACHE_DIR)
+    clear_rate_limiters()
+
+
+def overlapping(requests):
+    """True if every request started before the first one finished"""
+    first_end = min(end for _, _, _, end in requests)
+    return all(start < first_end for _, _, start, _ in requests)
+
+
+class TestFacade:
+    """Test the Future-returning API"""
+
+    def test_connect_balance_markets(self, manager, server):
+        """Test results match the synchronous ExchangeManager formats"""
+        assert manager.connect_exchange("Binance", "key", "secret").result(5) is True
+        assert manager.active_exchange == "binance"
+        assert manager.get_balance().result(5) == {'total': 1000.0, 'free': 1000.0, 'used': 0.0, 'currency': 'USDT'}
+        assert manager.get_markets().result(5) == ["BTC/USDT", "ETH/USDT"]
+        assert manager.get_ticker("BTC/USDT:USDT").result(5)['last'] == 64250.2
+
+    def test_create_order(self, manager, server):
+        """Test market orders reach the exchange without a price"""
+        manager.connect_exchange("binance", "key", "secret").result(5)
+        order = manager.create_order("BTC/USDT:USDT", "BUY", "market", 0.01, price=64000.0).result(5)
+        assert order['status'] == "closed"
+        assert server.orders[0]['type'] == "MARKET"
+        assert server.orders[0]['origQty'] == "0.01"
+
+    def test_errors(self, manager):
+        """Test unknown exchanges fail to connect and orders without a client raise"""
+        assert manager.connect_exchange("kraken", "key", "secret").result(5) is False
+        assert manager.get_balance().result(5) == {}
+        with pytest.raises(RuntimeError):
+            manager.create_order("BTC/USDT:USDT", "buy", "market", 0.01).result(5)
+
+
+class TestConcurrency:
+    """Test independent requests overlap instead of running serially"""
+
+    def test_connect_many_runs_concurrently(self, manager, server):
+        """Test two exchange connections overlap instead of running back to back"""
+        results = manager.connect_many([
+            {"exchange_name": "binance", "api_key": "k", "secret_key": "s"},
+            {"exchange_name": "bybit", "api_key": "k", "secret_key": "s"},
+        ]).result(5)
+
+        assert results == {"binance": True, "bybit": True}
+        assert overlapping([r for r in server.requests if r[1] == "/fapi/v1/exchangeInfo"])
+        assert len(server.paths("/fapi/v2/account")) == 2
+
+    def test_order_context_fetches_balance_and_ticker_together(self, manager, server):
+        """Test balance and ticker for one order are fetched concurrently"""
+        manager.connect_exchange("binance", "k", "s").result(5)
+        manager.get_markets().result(5)
+        server.requests.clear()
+
+        balance, ticker = manager.get_order_context("BTC/USDT:USDT").result(5)
+        assert balance['free'] == 1000.0
+        assert ticker['last'] == 64250.2
+        assert sorted(server.paths()) == ["/fapi/v1/ticker/24hr", "/fapi/v2/account"]
+        assert overlapping(server.requests)
+
+    def test_calls_from_many_threads(self, manager, server):
+        """Test futures submitted from several threads all complete on the one loop
+
+        Calls to the same client are still spaced by the shared rate limiter.
+        """
+        import threading
+
+        manager.connect_exchange("binance", "k", "s").result(5)
+        results = []
+
+        def worker():
+            results.append(manager.get_balance().result(5)['total'])
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+
+        assert results == [1000.0] * 4
+        assert server.paths().count("/fapi/v2/account") == 5
+
+
+class TestSharedLimits:
+    """Test async clients share the per-exchange scheduler and latency monitor with sync clients"""
+
+    def test_requests_use_the_shared_scheduler(self, manager, server):
+        """Test connect and reads are charged to the venue scheduler by lane"""
+        before = get_rate_limiter("binance-sandbox").stats()["requests"]     # metrics are process-wide
+        manager.connect_exchange("binance", "k", "s").result(5)
+        manager.get_markets().result(5)
+        manager.get_order_context("BTC/USDT:USDT").result(5)
+
+        after = get_rate_limiter("binance-sandbox").stats()["requests"]
+        charged = {lane: after[lane] - before[lane] for lane in after}
+        assert charged["market"] >= 1           # exchangeInfo while connecting
+        assert charged["account"] == 1          # connection test balance
+        assert charged["order"] == 2            # order-context balance + ticker
+
+    def test_clients_use_the_latency_monitor(self, manager, server):
+        """Test async clients get the venue's adaptive timeout instead of ccxt's fixed 30 s"""
+        manager.connect_exchange("binance", "k", "s").result(5)
+        exchange = manager.get_exchange()
+        assert exchange._latency_monitor is get_latency_monitor()
+        assert exchange.timeout == get_latency_monitor().timeout_ms("binance-sandbox")
@@ -0,0 +1,91 @@
+"""
+Test suite for follow-up command context
+"""
+import pytest
+
+from core.command_context import CommandContext
+from core.command_parser import CommandParser
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def parser():
+    """Create parser with default symbol"""
+    return CommandParser(default_symbol="BTCUSDT")
+
+
+@pytest.fixture
+def context(parser):
+    """Context primed with a confirmed BTC buy order"""
+    ctx = CommandContext(timeout=60.0, clock=FakeClock())
+    ctx.remember(parser.parse("btc al 100 dolar 10x"))
+    return ctx
+
+
+class TestFollowUpCommands:
+    """Test missing fields are filled from the previous order"""
+
+    def test_same_again_with_new_amount(self, parser, context):
+        """Test 'aynısından 50 dolar daha' keeps side, symbol and leverage"""
+        cmd = parser.parse("aynısından 50 dolar daha", context=context)
+        assert (cmd.action, cmd.symbol, cmd.amount, cmd.leverage) == ("buy", "BTCUSDT", 50.0, 10)
+        assert cmd.inferred_fields == ["action", "symbol", "leverage"]
+
+    def test_new_symbol(self, parser, context):
+        """Test 'şimdi ETH 5x' reuses side and USD amount"""
+        cmd = parser.parse("şimdi ETH 5x", context=context)
+        assert (cmd.action, cmd.symbol, cmd.amount, cmd.leverage) == ("buy", "ETHUSDT", 100.0, 5)
+        assert "symbol" not in cmd.inferred_fields
+
+    @pytest.mark.parametrize("text", ["eth", "şimdi eth", "daha", "more", "same again"])
+    def test_bare_follow_up_is_not_an_order(self, parser, context, text):
+        """Test a follow-up needs a new order field besides the symbol"""
+        assert parser.parse(text, context=context) is None
+
+    def test_coin_quantity_not_carried_to_other_symbol(self, parser, context):
+        """Test '0.5 btc' is not reused as 0.5 ETH, while a USD amount is"""
+        context.remember(parser.parse("0.5 btc al"))
+        eth = parser.parse("eth al", context=context)
+        assert eth.amount is None and "amount" not in eth.inferred_fields
+
+        btc = parser.parse("aynısından 5x", context=context)
+        assert (btc.symbol, btc.amount, btc.amount_type) == ("BTCUSDT", 0.5, "qty")
+
+    def test_explicit_side_wins(self, parser, context):
+        """Test a spoken action overrides the previous side"""
+        cmd = parser.parse("aynısını sat", context=context)
+        assert (cmd.action, cmd.symbol, cmd.amount) == ("sell", "BTCUSDT", 100.0)
+        assert "action" not in cmd.inferred_fields
+
+    def test_inferred_fields_in_summary(self, parser, context):
+        """Test the confirmation summary lists inferred fields"""
+        cmd = parser.parse("şimdi eth 20 dolar", context=context)
+        assert "önceki emirden: yön, kaldıraç" in parser.format_command_summary(cmd)
+
+    def test_without_context(self, parser):
+        """Test follow-ups are not understood without context"""
+        assert parser.parse("aynısından 50 dolar daha") is None
+
+
+class TestContextLifetime:
+    """Test timeout and what is remembered"""
+
+    def test_expires(self, parser, context):
+        """Test context is forgotten after the timeout"""
+        context._clock.now = 61.0
+        assert context.last_order() is None
+        assert parser.parse("şimdi eth 20 dolar", context=context) is None
+
+    def test_non_orders_ignored(self, parser, context):
+        """Test queries do not replace the remembered order"""
+        context.remember(parser.parse("bakiye"))
+        assert context.last_order().symbol == "BTCUSDT"
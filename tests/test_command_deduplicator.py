@@ -0,0 +1,70 @@
+"""
+Test suite for duplicate voice command suppression
+"""
+import pytest
+
+from core.command_deduplicator import CommandDeduplicator
+from core.command_parser import CommandParser
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def parser():
+    """Create parser with default symbol"""
+    return CommandParser(default_symbol="BTCUSDT")
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def dedup(clock):
+    """Deduplicator with a 3 second window"""
+    return CommandDeduplicator(window=3.0, clock=clock)
+
+
+class TestCommandDeduplicator:
+    """Test suppression window"""
+
+    def test_same_command_suppressed(self, parser, dedup, clock):
+        """Test differently worded transcripts of the same order are duplicates"""
+        assert not dedup.is_duplicate(parser.parse("al BTC 100 dolar"))
+        clock.now = 1.5
+        assert dedup.is_duplicate(parser.parse("BTC al, 100 dolar."))
+        assert dedup.suppressed == 1
+
+    def test_window_expires(self, parser, dedup, clock):
+        """Test the same command is accepted again after the window"""
+        assert not dedup.is_duplicate(parser.parse("al BTC 100 dolar"))
+        clock.now = 3.5
+        assert not dedup.is_duplicate(parser.parse("al BTC 100 dolar"))
+
+    def test_different_fields_not_duplicate(self, parser, dedup):
+        """Test a changed amount, side or leverage is a new command"""
+        assert not dedup.is_duplicate(parser.parse("al BTC 100 dolar"))
+        assert not dedup.is_duplicate(parser.parse("al BTC 200 dolar"))
+        assert not dedup.is_duplicate(parser.parse("sat BTC 100 dolar"))
+        assert not dedup.is_duplicate(parser.parse("al BTC 100 dolar 10x"))
+
+    def test_disabled_window(self, parser, clock):
+        """Test window 0 never suppresses"""
+        dedup = CommandDeduplicator(window=0, clock=clock)
+        cmd = parser.parse("pozisyonu kapat")
+        assert not dedup.is_duplicate(cmd)
+        assert not dedup.is_duplicate(cmd)
+
+    def test_unparsed_ignored(self, dedup):
+        """Test None commands are not tracked"""
+        assert not dedup.is_duplicate(None)
+        assert not dedup.is_duplicate(None)
@@ -0,0 +1,243 @@
+"""
+Test suite for CommandParser and the token trie matcher
+"""
+import pytest
+
+from core.command_parser import CommandParser, CommandValidator
+from core.phrase_matcher import TokenTrie
+from core.whisper_engine import TranscriptionResult
+
+
+@pytest.fixture
+def parser():
+    """Create parser with default symbol"""
+    return CommandParser(default_symbol="BTCUSDT")
+
+
+class TestTokenTrie:
+    """Test token-level phrase matching"""
+
+    def test_word_boundaries(self):
+        """Test keywords only match whole tokens"""
+        trie = TokenTrie()
+        trie.add("al", "action", "buy")
+        assert trie.find_all("bakiyeyi almak") == []
+        assert [m.value for m in trie.find_all("btc al")] == ["buy"]
+
+    def test_leftmost_longest(self):
+        """Test longest phrase wins at the same start position"""
+        trie = TokenTrie()
+        trie.add("pozisyon", "action", "status")
+        trie.add("pozisyon kapat", "action", "close")
+        matches = trie.find_all("pozisyon kapat lütfen")
+
+        assert len(matches) == 1
+        assert matches[0].value == "close"
+        assert (matches[0].start, matches[0].end) == (0, len("pozisyon kapat"))
+
+    def test_add_and_remove(self):
+        """Test phrases can be removed and empty branches pruned"""
+        trie = TokenTrie()
+        trie.add("emri iptal et", "action", "cancel")
+        trie.add("iptal", "action", "cancel")
+        assert len(trie) == 2
+
+        assert trie.remove("emri iptal et") is True
+        assert trie.contains("emri iptal et") is False
+        assert trie.contains("iptal") is True
+        assert trie.remove("emri iptal et") is False
+        assert len(trie) == 1
+
+
+class TestCommandParser:
+    """Test action, symbol and amount extraction"""
+
+    @pytest.mark.parametrize("text,action,symbol,amount", [
+        ("Al BTC 100 dolar", "buy", "BTCUSDT", 100.0),
+        ("Bitcoin sat 50 dolar", "sell", "BTCUSDT", 50.0),
+        ("Ethereum al 200 USD", "buy", "ETHUSDT", 200.0),
+        ("avax satın al 250 usdt", "buy", "AVAXUSDT", 250.0),
+        ("doge short yirmi dolar", "sell", "DOGEUSDT", 20.0),
+        ("Pozisyonu kapat", "close", None, None),
+        ("Emri iptal et", "cancel", None, None),
+        ("Bakiye ne kadar", "balance", None, None),
+    ])
+    def test_parse(self, parser, text, action, symbol, amount):
+        """Test common Turkish/English commands"""
+        cmd = parser.parse(text)
+        assert cmd.action == action
+        if action in ("buy", "sell"):
+            assert cmd.symbol == symbol
+            assert cmd.amount == amount
+
+    def test_no_substring_false_positive(self, parser):
+        """Test 'al' inside 'almak' does not trigger a buy"""
+        assert parser.parse("bakiyeyi almak istiyorum") is None
+        assert parser.parse("bakiye almak istiyorum").action == "balance"
+
+    def test_dotless_i_keywords_match(self, parser):
+        """Test keywords containing 'ı' match after normalization"""
+        cmd = parser.parse("eth açığa sat 40 dolar")
+        assert cmd.action == "sell"
+        assert cmd.symbol == "ETHUSDT"
+
+    def test_symbol_inside_word_ignored(self, parser):
+        """Test aliases do not match inside longer words"""
+        cmd = parser.parse("bitmeyen al 10 dolar")
+        assert cmd.symbol == "BTCUSDT"
+        assert cmd.confidence < 1.0  # varsayılan sembol kullanıldı
+
+    def test_action_priority(self, parser):
+        """Test close beats buy when both keywords are present"""
+        cmd = parser.parse("btc pozisyonu kapat al")
+        assert cmd.action == "close"
+        assert cmd.symbol == "BTCUSDT"
+
+    def test_unknown_command(self, parser):
+        """Test unrecognized text returns None"""
+        assert parser.parse("merhaba dünya") is None
+        assert parser.parse("") is None
+
+
+class TestFuzzyMatching:
+    """Test edit-distance tolerant action detection"""
+
+    @pytest.mark.parametrize("text,action", [
+        ("satın allll btc 100 dolar", "buy"),
+        ("pozisyonu kapad", "close"),
+        ("iptall et", "cancel"),
+        ("ballance", "balance"),
+    ])
+    def test_asr_errors_recovered(self, parser, text, action):
+        """Test common ASR misspellings still resolve the action"""
+        assert parser.parse(text).action == action
+
+    def test_score_lowers_confidence(self, parser):
+        """Test fuzzy matches carry a score below exact matches"""
+        exact = parser.parse("pozisyonu kapat")
+        fuzzy = parser.parse("pozisyonu kapad")
+        assert exact.confidence == pytest.approx(1.0)
+        assert 0.5 < fuzzy.confidence < 1.0
+
+    def test_short_keywords_not_fuzzed(self, parser):
+        """Test keywords of three letters or fewer need an exact match"""
+        assert parser.parse("sab") is None
+        assert parser.parse("ak") is None
+
+    def test_fuzzy_can_be_disabled(self):
+        """Test exact-only mode"""
+        assert CommandParser(fuzzy=False).parse("pozisyonu kapad") is None
+
+    def test_exact_beats_fuzzy(self, parser):
+        """Test an exact keyword wins over a higher priority fuzzy one"""
+        cmd = parser.parse("btc al kapad")
+        assert cmd.action == "buy"
+
+
+class TestCharTrie:
+    """Test Levenshtein search over the character trie"""
+
+    def test_search_within_distance(self):
+        """Test only words within the edit budget are returned"""
+        from core.phrase_matcher import CharTrie
+
+        trie = CharTrie(["kapat", "iptal", "bakiye"])
+        assert trie.search("kapad", 1) == [("kapat", 1)]
+        assert trie.search("kpd", 1) == []
+        assert trie.correct("allll") is None
+        assert trie.correct("kapat") == ("kapat", 1.0)
+
+
+class TestOrderGrammar:
+    """Test leverage, limit, SL/TP and balance percent in one utterance"""
+
+    def test_full_order(self, parser):
+        """Test every field of a single-breath order"""
+        cmd = parser.parse("al BTC 100 dolar 10x limit 65000 stop 63000 kar al 70000")
+        assert cmd.action == "buy"
+        assert (cmd.symbol, cmd.amount, cmd.amount_type) == ("BTCUSDT", 100.0, "usd")
+        assert cmd.leverage == 10
+        assert cmd.order_type.value == "limit"
+        assert (cmd.price, cmd.stop_loss, cmd.take_profit) == (65000.0, 63000.0, 70000.0)
+        assert all(cmd.field_confidence[f] == 1.0 for f in ("amount", "leverage", "price", "stop_loss"))
+
+    @pytest.mark.parametrize("text,percent", [
+        ("bakiyenin yüzde onu ile eth al", 10.0),
+        ("eth al bakiyenin yüzde yirmisi", 20.0),
+        ("buy eth with 15 percent of my balance", 15.0),
+        ("sol al %5 bakiyenin", 5.0),
+    ])
+    def test_balance_percent(self, parser, text, percent):
+        """Test percent of balance replaces the amount"""
+        cmd = parser.parse(text)
+        assert cmd.balance_percent == percent
+        assert cmd.amount is None
+        assert cmd.confidence == pytest.approx(1.0)
+
+    def test_quantity_vs_usd(self, parser):
+        """Test a number followed by a coin name is a coin quantity"""
+        cmd = parser.parse("0.5 btc sat limit 70 bin")
+        assert (cmd.amount, cmd.amount_type, cmd.price) == (0.5, "qty", 70000.0)
+
+    def test_postfix_markers(self, parser):
+        """Test Turkish word order with the marker after the number"""
+        cmd = parser.parse("eth long yirmi kat 500 dolar 3000 stop")
+        assert (cmd.leverage, cmd.amount, cmd.stop_loss) == (20, 500.0, 3000.0)
+        assert cmd.field_confidence["stop_loss"] < 1.0
+
+    def test_take_profit_phrase_not_buy(self, parser):
+        """Test 'kar al' inside a sell order does not flip the action"""
+        cmd = parser.parse("btc sat 100 dolar kar al 60000")
+        assert cmd.action == "sell"
+        assert cmd.take_profit == 60000.0
+
+    def test_limit_without_price(self, parser):
+        """Test a limit order without price is flagged"""
+        cmd = parser.parse("btc sat 50 dolar limit")
+        assert cmd.price is None
+        assert cmd.field_confidence["price"] == 0.0
+        is_valid, errors = CommandValidator.validate(cmd)
+        assert not is_valid
+        assert "Limit fiyatı belirtilmedi" in errors
+
+    def test_stops_on_wrong_side_rejected(self, parser):
+        """Test a buy with stop-loss above the limit price is invalid"""
+        cmd = parser.parse("btc al 100 dolar limit 65000 stop 66000")
+        is_valid, errors = CommandValidator.validate(cmd)
+        assert not is_valid
+        assert any("Stop-loss" in e for e in errors)
+
+
+class TestLanguageGrammars:
+    """Test per-language grammars selected by the detected language"""
+
+    def test_english_on_is_not_ten(self, parser):
+        """Test English 'on' is not read as Turkish 'on' (10)"""
+        assert parser.parse("buy btc on binance").amount == 10.0
+        assert parser.parse("buy btc on binance", language="en").amount is None
+
+    def test_english_sat_is_not_sell(self, parser):
+        """Test English 'sat' does not trigger the Turkish sell keyword"""
+        assert parser.parse("I sat down").action == "sell"
+        assert parser.parse("I sat down", language="en") is None
+
+    def test_shared_terms_in_both(self, parser):
+        """Test shared trading terms and coin names work in either grammar"""
+        for language in ("tr", "en"):
+            cmd = parser.parse("eth long 100 usdt 5x stop 3000", language=language)
+            assert (cmd.action, cmd.symbol, cmd.leverage, cmd.stop_loss) == ("buy", "ETHUSDT", 5, 3000.0)
+
+    def test_english_commands_under_default_config(self, parser):
+        """Test English commands parse when Whisper is forced to Turkish (no detected language)"""
+        language = TranscriptionResult(text="close position", language="tr").detected_language
+        assert language is None
+        assert parser.parse("close position", language=language).action == "close"
+        assert parser.parse("balance", language=language).action == "balance"
+        cmd = parser.parse("eth sell 50 dolar", language=language)
+        assert (cmd.action, cmd.symbol, cmd.amount) == ("sell", "ETHUSDT", 50.0)
+        assert parser.parse("bitcoin buy 100 dolar", language=language).symbol == "BTCUSDT"
+
+    def test_unsupported_language_uses_mixed(self, parser):
+        """Test unknown languages fall back to the mixed grammar"""
+        assert parser.parse("bakiye", language="de").action == "balance"
+        assert parser.parse("sell eth one hundred dollars", language="en-US").amount == 100.0
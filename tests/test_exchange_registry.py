@@ -0,0 +1,133 @@
+"""
+Test suite for the shared exchange client registry
+"""
+import threading
+import time
+
+import ccxt
+import pytest
+
+from core import market_cache
+from core.exchange_manager import ExchangeManager
+from core.exchange_registry import ExchangeRegistry, credentials_fingerprint
+from tests.test_market_cache import MARKETS
+
+
+class OfflineBinance(ccxt.binance):
+    """ccxt binance that never touches the network"""
+
+    market_fetches = 0
+    time_syncs = 0
+
+    def fetch_markets(self, params={}):
+        OfflineBinance.market_fetches += 1
+        time.sleep(0.05)
+        return list(MARKETS)
+
+    def load_time_difference(self, params={}):
+        OfflineBinance.time_syncs += 1
+        return 0
+
+    def fetch_balance(self, params={}):
+        return {'total': {'USDT': 100.0}, 'free': {'USDT': 80.0}, 'used': {'USDT': 20.0}}
+
+
+@pytest.fixture
+def registry(tmp_path):
+    market_cache.configure(cache_dir=tmp_path)
+    market_cache.clear_caches()
+    OfflineBinance.market_fetches = OfflineBinance.time_syncs = 0
+    registry = ExchangeRegistry(factory=lambda name, config: OfflineBinance(config))
+    yield registry
+    registry.close_all()
+    market_cache.clear_caches()
+    market_cache.configure(cache_dir=market_cache.DEFAULT_CACHE_DIR)
+
+
+class TestRegistry:
+    """Test sharing and reference counting"""
+
+    def test_same_credentials_share_one_client(self, registry):
+        """Test markets and time sync are set up once per client"""
+        first = registry.acquire("binance", "key", "secret")
+        second = registry.acquire("Binance", "key", "secret")
+        assert first is second
+        assert registry.ref_count("binance", "key", "secret") == 2
+        assert (registry.created, registry.reused) == (1, 1)
+        assert OfflineBinance.market_fetches == 1
+        assert OfflineBinance.time_syncs == 1
+        assert "BTC/USDT:USDT" in first.markets
+
+    def test_key_separates_credentials_and_sandbox(self, registry):
+        """Test different keys or sandbox flags get separate clients sharing one market cache"""
+        a = registry.acquire("binance", "key", "secret")
+        b = registry.acquire("binance", "other", "secret")
+        c = registry.acquire("binance", "key", "secret", sandbox=False)
+        public = registry.acquire("binance")
+        assert len({id(a), id(b), id(c), id(public)}) == 4
+        assert public.apiKey == ""
+        # Sandbox clients share one cache entry, live ones another
+        assert OfflineBinance.market_fetches == 2
+
+    def test_release_keeps_client_until_idle_ttl(self, registry):
+        """Test a released client is reused within idle_ttl and dropped after it"""
+        with registry.client("binance", "key", "secret") as exchange:
+            pass
+        assert registry.ref_count("binance", "key", "secret") == 0
+        assert registry.acquire("binance", "key", "secret") is exchange
+        registry.release(exchange)
+
+        registry.idle_ttl = 0
+        registry.release(exchange)          # extra release is ignored
+        assert len(registry) == 0
+        assert registry.acquire("binance", "key", "secret") is not exchange
+
+    def test_concurrent_acquire_creates_once(self, registry):
+        """Test threads racing on a new key wait for a single client"""
+        clients = []
+        threads = [threading.Thread(target=lambda: clients.append(registry.acquire("binance", "k", "s")))
+                   for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        assert len({id(c) for c in clients}) == 1
+        assert registry.created == 1
+        assert registry.ref_count("binance", "k", "s") == 5
+
+    def test_failed_creation_is_not_cached(self, tmp_path):
+        """Test a client that fails to build leaves no entry behind"""
+        def factory(name, config):
+            raise ccxt.NetworkError("down")
+
+        registry = ExchangeRegistry(factory=factory)
+        with pytest.raises(ccxt.NetworkError):
+            registry.acquire("binance", "key", "secret")
+        assert len(registry) == 0
+
+    def test_fingerprint_hides_secrets(self):
+        """Test the registry key never contains the raw credentials"""
+        fingerprint = credentials_fingerprint("key", "secret")
+        assert "secret" not in fingerprint and len(fingerprint) == 16
+        assert credentials_fingerprint() == "public"
+        assert fingerprint != credentials_fingerprint("key", "secret", "pass")
+
+
+class TestExchangeManager:
+    """Test ExchangeManager connects through the registry"""
+
+    class DB:
+        def update_exchange_status(self, name, is_connected):
+            pass
+
+    def test_connect_and_disconnect_use_registry(self, registry):
+        """Test reconnecting reuses the client and disconnect releases it"""
+        manager = ExchangeManager(db_manager=self.DB(), registry=registry)
+        assert manager.connect_exchange("binance", "key", "secret")
+        assert manager.connect_exchange("binance", "key", "secret")
+        assert registry.created == 1
+        assert registry.ref_count("binance", "key", "secret") == 1
+        assert manager.get_balance() == {'total': 100.0, 'free': 80.0, 'used': 20.0, 'currency': 'USDT'}
+
+        manager.disconnect_exchange("binance")
+        assert registry.ref_count("binance", "key", "secret") == 0
@@ -0,0 +1,100 @@
+"""
+Test suite for the naive Bayes intent classifier
+"""
+import os
+import tempfile
+
+import pytest
+
+from core.command_parser import CommandParser
+from core.intent_classifier import (
+    IntentClassifier,
+    load_corpus,
+    load_db_examples,
+    load_or_train,
+    train_from_sources,
+)
+from database.db_manager import DatabaseManager
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    """Train classifier on keywords + bundled corpus"""
+    return train_from_sources()
+
+
+class TestIntentClassifier:
+    """Test ranking and probabilities"""
+
+    def test_ranked_probabilities(self, classifier):
+        """Test all intents are ranked and probabilities sum to one"""
+        ranked = classifier.predict_proba("pozisyonu kapat")
+        assert ranked[0][0] == "close"
+        assert {a for a, _ in ranked} == {"buy", "sell", "close", "cancel", "status", "balance"}
+        assert sum(p for _, p in ranked) == pytest.approx(1.0)
+        assert [p for _, p in ranked] == sorted((p for _, p in ranked), reverse=True)
+
+    def test_rank_restricted_to_candidates(self, classifier):
+        """Test rank renormalizes over the given candidates"""
+        ranked = classifier.rank("cüzdan durumu nedir", ["status", "balance"])
+        assert ranked[0][0] == "balance"
+        assert sum(p for _, p in ranked) == pytest.approx(1.0)
+
+    def test_untrained_returns_empty(self):
+        """Test untrained classifier returns no ranking"""
+        assert IntentClassifier().predict_proba("al") == []
+
+    def test_save_and_load(self, classifier, tmp_path):
+        """Test model round-trips through npz"""
+        path = tmp_path / "intent.npz"
+        classifier.save(path)
+        loaded = IntentClassifier.load(path)
+        assert loaded.predict_proba("bakiye ne kadar")[0][0] == "balance"
+        assert loaded.predict_proba("bakiye ne kadar")[0][1] == pytest.approx(
+            classifier.predict_proba("bakiye ne kadar")[0][1], rel=1e-4)
+
+    def test_saved_model_preferred(self, classifier, tmp_path):
+        """Test a saved model is loaded instead of retraining, with training as the fallback"""
+        path = tmp_path / "intent.npz"
+        classifier.save(path)
+        loaded = load_or_train(model_path=path, corpus_path=tmp_path / "missing.tsv")
+        assert dict(loaded.predict_proba("cüzdan durumu nedir")) == pytest.approx(
+            dict(classifier.predict_proba("cüzdan durumu nedir")), rel=1e-4)
+
+        path.write_bytes(b"not a model")
+        fallback = load_or_train(model_path=path)
+        assert fallback.is_trained
+        assert load_or_train(model_path=tmp_path / "none.npz").is_trained
+
+    def test_corpus_bundled(self):
+        """Test bundled corpus covers every action"""
+        labels = {label for _, label in load_corpus()}
+        assert labels == {"buy", "sell", "close", "cancel", "status", "balance"}
+
+
+class TestTrainingSources:
+    """Test DB rows feed the classifier"""
+
+    def test_db_categories_mapped(self):
+        """Test voice_commands categories map to parser actions"""
+        db = DatabaseManager(os.path.join(tempfile.mkdtemp(), "test.db"))
+        db.initialize()
+        examples = load_db_examples(db)
+        db.disconnect()
+
+        assert ("satin al", "buy") in examples
+        assert ("durdur", "cancel") in examples
+
+
+class TestParserDisambiguation:
+    """Test parser uses the classifier when several actions match"""
+
+    def test_classifier_overrides_fixed_priority(self, classifier):
+        """Test 'cüzdan göster' is balance, not status"""
+        assert CommandParser().parse("cüzdan göster").action == "status"
+        assert CommandParser(intent_classifier=classifier).parse("cüzdan göster").action == "balance"
+
+    def test_single_candidate_unchanged(self, classifier):
+        """Test classifier is not consulted for a single keyword match"""
+        cmd = CommandParser(intent_classifier=classifier).parse("btc al 100 dolar")
+        assert cmd.action == "buy"
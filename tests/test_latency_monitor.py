@@ -0,0 +1,179 @@
+"""
+Test suite for the exchange latency / clock-skew monitor
+"""
+import asyncio
+import threading
+import time
+
+import ccxt
+import pytest
+
+from core.latency_monitor import LatencyMonitor, install, install_async
+from core.metrics import MetricsRegistry
+from core.rate_limiter import Lane
+from tests.mock_http_exchange import MockBinanceServer
+
+
+def make_monitor(**kwargs):
+    kwargs.setdefault("min_samples", 3)
+    return LatencyMonitor(metrics=MetricsRegistry(), **kwargs)
+
+
+@pytest.fixture
+def server():
+    with MockBinanceServer(latency=0.01) as server:
+        yield server
+
+
+@pytest.fixture
+def exchange(server):
+    return server.exchange_class(asynchronous=False)({"apiKey": "key", "secret": "secret"})
+
+
+class TestAdaptiveTimeout:
+    """Test timeout derivation from observed round-trip times"""
+
+    def test_timeout_follows_p99(self):
+        """Test the default applies until enough samples, then p99 * multiplier within bounds"""
+        monitor = make_monitor(min_timeout_ms=100.0, max_timeout_ms=1000.0, timeout_multiplier=4.0)
+        assert monitor.timeout_ms("venue") == 30000.0
+
+        for rtt in (20.0, 30.0, 40.0):
+            monitor.observe("venue", Lane.MARKET, rtt)
+        monitor.venue("venue").adjusted_at = 0.0
+        assert monitor.timeout_ms("venue") == 160.0
+
+        monitor.observe("venue", Lane.ORDER, 900.0)
+        monitor.venue("venue").adjusted_at = 0.0
+        assert monitor.timeout_ms("venue") == 1000.0    # slowest endpoint class, capped
+        assert monitor.deadline_ms("venue") == 2000.0
+
+
+class TestInstall:
+    """Test the ccxt integration against the mock venue"""
+
+    def test_requests_are_measured_per_endpoint_class(self, exchange):
+        """Test public and private requests land in separate RTT histograms"""
+        monitor = make_monitor()
+        install(exchange, monitor, "mock")
+        exchange.fapiPublicGetTime()
+        exchange.fapiPrivateV2GetAccount()
+
+        stats = monitor.stats()["mock"]
+        assert set(stats["rtt_p99_ms"]) == {"account", "market"}
+        assert stats["rtt_p99_ms"]["market"] >= 10.0
+        snapshot = monitor.metrics.snapshot("exchange.rtt_ms")
+        assert snapshot["exchange.rtt_ms{endpoint=account,exchange=mock}"]["count"] == 1
+
+    def test_degraded_venue_fails_fast(self, exchange, server):
+        """Test a stalled venue times out at the adapted timeout, not the 30 s default"""
+        monitor = make_monitor(min_timeout_ms=200.0)
+        install(exchange, monitor, "mock")
+        for _ in range(3):
+            exchange.fapiPublicGetTime()
+        monitor.venue("mock").adjusted_at = 0.0
+
+        server.latency = 2.0
+        started = time.monotonic()
+        with pytest.raises(ccxt.RequestTimeout):
+            exchange.fapiPrivateV2GetAccount()
+        assert time.monotonic() - started < 1.0
+        assert monitor.venue("mock").consecutive_timeouts == 1
+
+    def test_public_reads_are_retried(self, exchange, server):
+        """Test a transient 503 on a public read is retried, private requests are not"""
+        monitor = make_monitor()
+        install(exchange, monitor, "mock")
+        server.inject_error("/fapi/v1/time", status=503, code=-1001, msg="Internal error")
+        assert exchange.fapiPublicGetTime()["serverTime"]
+        assert monitor.metrics.counter("exchange.retries", exchange="mock").value == 1
+
+        server.inject_error("/fapi/v2/account", status=503, code=-1001, msg="Internal error")
+        with pytest.raises(ccxt.ExchangeNotAvailable):
+            exchange.fapiPrivateV2GetAccount()
+
+    def test_timed_out_public_read_is_retried(self, exchange, server):
+        """Test a public read that times out is retried within the deadline and succeeds"""
+        monitor = make_monitor(default_timeout_ms=200.0, min_timeout_ms=200.0)
+        install(exchange, monitor, "mock")
+        server.latency = 0.5
+        recover = threading.Timer(0.1, lambda: setattr(server, "latency", 0.01))
+        recover.start()
+
+        started = time.monotonic()
+        assert exchange.fapiPublicGetTime()["serverTime"]
+        recover.join()
+        assert time.monotonic() - started < monitor.deadline_ms("mock") / 1000
+        assert monitor.metrics.counter("exchange.retries", exchange="mock").value == 1
+        assert monitor.venue("mock").consecutive_timeouts == 0
+
+
+class TestInstallAsync:
+    """Test the ccxt.async_support integration against the mock venue"""
+
+    @staticmethod
+    def run(server, monitor, calls):
+        """Run calls(exchange) on an instrumented async client"""
+        async def main():
+            exchange = server.exchange_class()({"apiKey": "key", "secret": "secret"})
+            install_async(exchange, monitor, "mock")
+            try:
+                return await calls(exchange)
+            finally:
+                await exchange.close()
+        return asyncio.run(main())
+
+    def test_requests_are_measured_per_endpoint_class(self, server):
+        """Test concurrent async requests keep their own endpoint class"""
+        monitor = make_monitor()
+
+        async def calls(exchange):
+            await asyncio.gather(exchange.fapiPublicGetTime(), exchange.fapiPrivateV2GetAccount())
+
+        self.run(server, monitor, calls)
+        snapshot = monitor.metrics.snapshot("exchange.rtt_ms")
+        assert snapshot["exchange.rtt_ms{endpoint=account,exchange=mock}"]["count"] == 1
+        assert snapshot["exchange.rtt_ms{endpoint=market,exchange=mock}"]["count"] == 1
+
+    def test_degraded_venue_fails_fast(self, server):
+        """Test a stalled venue times out at the adapted timeout on async clients too"""
+        monitor = make_monitor(min_timeout_ms=200.0)
+
+        async def calls(exchange):
+            for _ in range(3):
+                await exchange.fapiPublicGetTime()
+            monitor.venue("mock").adjusted_at = 0.0
+            server.latency = 2.0
+            started = time.monotonic()
+            with pytest.raises(ccxt.RequestTimeout):
+                await exchange.fapiPrivateV2GetAccount()
+            return time.monotonic() - started
+
+        assert self.run(server, monitor, calls) < 1.0
+        assert monitor.venue("mock").consecutive_timeouts == 1
+
+    def test_probed_offset_is_applied_before_signing(self, server):
+        """Test the clock offset probed on the venue reaches the async client's nonce"""
+        monitor = make_monitor()
+        monitor.venue("mock").clock_offset_ms = 5000.0
+
+        async def calls(exchange):
+            await exchange.fapiPrivateV2GetAccount()
+            return exchange.options["timeDifference"]
+
+        assert self.run(server, monitor, calls) == -5000.0
+
+
+class TestProbe:
+    """Test clock offset measurement"""
+
+    def test_probe_corrects_time_difference(self, exchange):
+        """Test a local clock running 5 s behind is measured and fed into ccxt's nonce"""
+        monitor = make_monitor()
+        install(exchange, monitor, "mock")
+        exchange.milliseconds = lambda: int(time.time() * 1000) - 5000
+
+        offset = monitor.probe("mock", exchange)
+        assert offset == pytest.approx(5000, abs=200)
+        assert exchange.options["timeDifference"] == pytest.approx(-5000, abs=200)
+        assert abs(exchange.nonce() - time.time() * 1000) < 200
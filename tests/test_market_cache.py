@@ -0,0 +1,163 @@
+"""
+Test suite for the shared market metadata cache
+"""
+import ccxt
+import pytest
+
+from core.market_cache import MarketCache, cache_key
+
+
+def make_market(base, quote="USDT", swap=False, min_amount=0.001):
+    """Minimal ccxt fetch_markets() entry"""
+    symbol = f"{base}/{quote}:{quote}" if swap else f"{base}/{quote}"
+    return {
+        "id": base + quote, "symbol": symbol, "base": base, "quote": quote,
+        "settle": quote if swap else None, "baseId": base, "quoteId": quote,
+        "type": "swap" if swap else "spot", "spot": not swap, "swap": swap,
+        "future": False, "option": False, "margin": False, "contract": swap,
+        "linear": True if swap else None, "inverse": False if swap else None,
+        "active": True, "precision": {"amount": 0.001, "price": 0.1},
+        "limits": {"amount": {"min": min_amount, "max": None}},
+    }
+
+
+MARKETS = [make_market("BTC"), make_market("BTC", swap=True), make_market("ETH", swap=True)]
+
+
+class FakeClock:
+    """Manually advanced wall clock"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def exchange():
+    """Offline ccxt instance whose fetch_markets counts calls"""
+    ex = ccxt.binance({"options": {"defaultType": "future"}})
+    ex.fetch_calls = 0
+    ex.market_list = list(MARKETS)
+
+    def fetch_markets(params={}):
+        ex.fetch_calls += 1
+        return list(ex.market_list)
+
+    ex.fetch_markets = fetch_markets
+    return ex
+
+
+def make_cache(tmp_path, clock, ttl=60.0):
+    return MarketCache("binance-future", cache_dir=tmp_path, ttl=ttl, wall_clock=clock)
+
+
+class TestMarketCache:
+    """Test loading, persistence and TTL refresh"""
+
+    def test_attach_fetches_once(self, tmp_path, clock, exchange):
+        """Test markets are downloaded once and injected into every instance"""
+        cache = make_cache(tmp_path, clock)
+        cache.attach(exchange)
+        other = ccxt.binance({"options": {"defaultType": "future"}})
+        other.fetch_markets = exchange.fetch_markets
+        markets = cache.attach(other)
+
+        assert exchange.fetch_calls == 1
+        assert "BTC/USDT:USDT" in markets
+        assert other.load_markets() is other.markets
+
+    def test_cold_start_reads_disk(self, tmp_path, clock, exchange):
+        """Test a new process uses the persisted markets without a download"""
+        make_cache(tmp_path, clock).get(exchange)
+        restarted = make_cache(tmp_path, clock)
+        assert len(restarted.get(exchange)) == 3
+        assert exchange.fetch_calls == 1
+
+    def test_stale_refresh_applies_diff(self, tmp_path, clock, exchange):
+        """Test only added, removed and changed markets are reported"""
+        cache = make_cache(tmp_path, clock)
+        cache.get(exchange)
+        exchange.market_list = [make_market("BTC"), make_market("BTC", swap=True, min_amount=0.01),
+                                make_market("SOL", swap=True)]
+        clock.now += 120
+
+        cache.get(exchange)
+        cache.wait_for_refresh(5)
+        assert exchange.fetch_calls == 2
+        assert cache.limits("BTC/USDT:USDT")["amount"]["min"] == 0.01
+        assert cache.find("ETHUSDT") is None
+        assert cache.refresh(exchange) == (0, 0, 0)
+
+    def test_stale_returns_cached_immediately(self, tmp_path, clock, exchange):
+        """Test non-blocking mode still serves the stale copy"""
+        cache = make_cache(tmp_path, clock)
+        cache.get(exchange)
+        clock.now += 120
+        assert "ETH/USDT:USDT" in cache.get(exchange)
+        cache.wait_for_refresh(5)
+
+
+class TestMarketLookup:
+    """Test base/quote indexes"""
+
+    @pytest.fixture
+    def cache(self, tmp_path, clock):
+        cache = make_cache(tmp_path, clock)
+        cache.apply(MARKETS)
+        return cache
+
+    def test_find_any_spelling(self, cache):
+        """Test exchange id, unified and lowercase symbols resolve"""
+        assert cache.find("BTCUSDT") == "BTC/USDT"
+        assert cache.find("btc/usdt") == "BTC/USDT"
+        assert cache.find("BTC/USDT:USDT") == "BTC/USDT:USDT"
+        assert cache.find("BTCUSDT", market_type="swap") == "BTC/USDT:USDT"
+        assert cache.find("DOGEUSDT") is None
+
+    def test_symbols_for_base(self, cache):
+        """Test base and base/quote indexes"""
+        assert cache.symbols_for("btc") == ["BTC/USDT", "BTC/USDT:USDT"]
+        assert cache.symbols_for("ETH", "USDT") == ["ETH/USDT:USDT"]
+        assert cache.precision("ETHUSDT") == {"amount": 0.001, "price": 0.1}
+
+
+def test_cache_key_includes_sandbox():
+    """Test testnet markets are cached separately"""
+    ex = ccxt.binance({"options": {"defaultType": "future"}})
+    assert cache_key(ex) == "binance-future"
+    ex.set_sandbox_mode(True)
+    assert cache_key(ex) == "binance-future-sandbox"
+
+
+class TestListeners:
+    """Test market loads are pushed to registered listeners"""
+
+    def test_disk_load_and_changed_refresh_notify(self, tmp_path, clock, exchange):
+        """Test listeners hear about disk loads and real changes, not unchanged refreshes"""
+        from core import market_cache
+
+        seen = []
+        listener = lambda key, markets: seen.append((key, sorted(markets)))
+        market_cache.add_listener(listener)
+        try:
+            make_cache(tmp_path, clock).attach(exchange)
+            assert seen == [("binance-future", sorted(m["symbol"] for m in MARKETS))]
+
+            cold = make_cache(tmp_path, clock)
+            cold.get()
+            assert len(seen) == 2
+
+            cold.refresh(exchange)
+            assert len(seen) == 2
+            exchange.market_list.append(make_market("SOL", swap=True))
+            cold.refresh(exchange)
+            assert "SOL/USDT:USDT" in seen[-1][1]
+        finally:
+            market_cache.remove_listener(listener)
@@ -0,0 +1,110 @@
+"""
+Test suite for the market data hub (single upstream, fan-out)
+"""
+import threading
+import time
+
+import pytest
+
+from core.market_data_hub import MarketDataHub
+from core.order_executor import OrderExecutor, OrderParams
+from utils.config_manager import ConfigManager
+
+
+class FakeRestExchange:
+    """ccxt stand-in counting REST calls"""
+
+    def __init__(self, price=64250.2):
+        self.price = price
+        self.ticker_calls = 0
+        self.lock = threading.Lock()
+
+    def fetch_ticker(self, symbol):
+        with self.lock:
+            self.ticker_calls += 1
+        return {"last": self.price, "quoteVolume": 1e9, "percentage": 1.3, "high": 65000.0, "low": 63000.0}
+
+    def fetch_order_book(self, symbol, limit=5):
+        return {"bids": [[self.price - 0.1, 1.0]], "asks": [[self.price, 1.0]]}
+
+
+def wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def hub():
+    """REST-only hub, feeds stopped after the test"""
+    hub = MarketDataHub(use_stream=False)
+    yield hub
+    hub.stop_all()
+
+
+class TestFanOut:
+    """Test one upstream per (exchange, symbol)"""
+
+    def test_single_feed_many_subscribers(self, hub):
+        """Test two subscribers share one poller and both receive updates"""
+        rest = FakeRestExchange()
+        first, second = [], []
+        hub.subscribe("binance", "BTC/USDT:USDT", first.append, rest_exchange=rest)
+        hub.subscribe("Binance", "BTCUSDT", second.append, rest_exchange=FakeRestExchange())
+
+        assert wait_for(lambda: first and second)
+        assert hub.feed_count == 1
+        assert hub.subscriber_count("binance", "BTC/USDT") == 2
+        assert first[0]["current_price"] == 64250.2
+        assert set(first[0]) == {"best_bid", "best_ask", "current_price", "volume",
+                                 "change_24h", "high_24h", "low_24h"}
+
+    def test_last_unsubscribe_stops_feed(self, hub):
+        """Test the feed stops once nobody listens"""
+        rest = FakeRestExchange()
+        a = hub.subscribe("binance", "BTCUSDT", lambda d: None, rest_exchange=rest)
+        b = hub.subscribe("binance", "BTCUSDT", lambda d: None)
+        hub.unsubscribe(a)
+        assert hub.feed_count == 1
+        hub.unsubscribe(b)
+        assert hub.feed_count == 0
+
+    def test_late_subscriber_gets_snapshot(self, hub):
+        """Test a new subscriber receives the cached snapshot immediately"""
+        hub.publish("binance", "ETHUSDT", {"current_price": 3200.0, "best_bid": 3199.9}, source="stream")
+        received = []
+        hub.subscribe("binance", "ETH/USDT:USDT", received.append, rest_exchange=FakeRestExchange(3200.0))
+        assert received[0]["current_price"] == 3200.0
+
+
+class TestSnapshotReads:
+    """Test memory reads and staleness"""
+
+    def test_get_price_respects_max_age(self, hub):
+        """Test stale snapshots are not used"""
+        hub.publish("binance", "BTCUSDT", {"current_price": 64000.0})
+        assert hub.get_price("binance", "BTC/USDT:USDT", max_age=5.0) == 64000.0
+
+        hub.latest("binance", "BTCUSDT").updated_at -= 10
+        assert hub.get_price("binance", "BTCUSDT", max_age=5.0) is None
+        assert hub.get_price("bybit", "BTCUSDT") is None
+
+    def test_order_executor_reads_hub(self, hub, tmp_path):
+        """Test market order pricing uses the hub instead of a ticker request"""
+
+        class ExchangeManagerStub:
+            active_exchange = "binance"
+
+            def get_ticker(self, symbol):
+                raise AssertionError("network ticker should not be called")
+
+        hub.publish("binance", "BTCUSDT", {"current_price": 64000.0})
+        executor = OrderExecutor(
+            db_manager=None,
+            config_manager=ConfigManager(str(tmp_path / "settings.json")),
+            exchange_manager=ExchangeManagerStub(),
+            market_data=hub,
+        )
+        params = OrderParams(symbol="BTCUSDT", side="buy", amount=100.0, amount_type="usd", leverage=10)
+        assert executor._get_effective_price(params) == 64000.0
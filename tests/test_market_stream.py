@@ -0,0 +1,121 @@
+"""
+Test suite for the WebSocket market data stream (local replay server, no network)
+"""
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from core.market_stream import (
+    BinanceFuturesAdapter,
+    BybitLinearAdapter,
+    MarketStream,
+    get_adapter,
+)
+from tests.ws_replay_server import ReplayServer, load_recording
+
+PAYLOAD_KEYS = {'best_bid', 'best_ask', 'current_price', 'volume', 'change_24h', 'high_24h', 'low_24h'}
+
+
+def run_until(stream, count, updates, timeout=5.0, **kwargs):
+    """Run stream in a thread until `count` updates arrive, then stop it"""
+    done = threading.Event()
+    result = {}
+
+    def target():
+        result["stopped"] = stream.run(**kwargs)
+        done.set()
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + timeout
+    while len(updates) < count and not done.is_set() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    stream.stop()
+    thread.join(timeout)
+    return result.get("stopped")
+
+
+def make_stream(adapter, url, updates, **kwargs):
+    kwargs.setdefault("min_interval", 0)
+    kwargs.setdefault("reconnect_delay", 0.01)
+    kwargs.setdefault("stale_timeout", 2.0)
+    return MarketStream(adapter, "BTC/USDT:USDT", updates.append, url=url, **kwargs)
+
+
+class TestBinanceStream:
+    """Test ticker + bookTicker replay"""
+
+    def test_payload_matches_rest_format(self):
+        """Test replayed messages produce the price_updated payload"""
+        updates = []
+        with ReplayServer(load_recording("binance_futures_stream.jsonl")) as server:
+            stream = make_stream(BinanceFuturesAdapter(), server.url, updates)
+            assert run_until(stream, 2, updates)
+
+        assert set(updates[0]) == PAYLOAD_KEYS
+        assert updates[0]['current_price'] == 64250.20
+        assert updates[0]['best_bid'] == 64250.10
+        assert updates[0]['change_24h'] == 1.34
+        assert updates[-1]['best_ask'] == 64251.10
+        assert json.loads(server.subscriptions[0])['params'] == ['btcusdt@ticker', 'btcusdt@bookTicker']
+
+    def test_reconnect_resubscribes(self):
+        """Test a dropped connection reconnects and sends the subscription again"""
+        updates = []
+        with ReplayServer(load_recording("binance_futures_stream.jsonl"), close_after_replay=True) as server:
+            stream = make_stream(BinanceFuturesAdapter(), server.url, updates)
+            run_until(stream, 4, updates)
+
+        assert server.connections >= 2
+        assert len(server.subscriptions) >= 2
+        assert server.subscriptions[0] == server.subscriptions[1]
+
+    def test_throttled_updates_coalesce(self):
+        """Test bursts within min_interval emit the latest state once"""
+        updates = []
+        with ReplayServer(load_recording("binance_futures_stream.jsonl"), close_after_replay=True) as server:
+            stream = make_stream(BinanceFuturesAdapter(), server.url, updates, min_interval=60)
+            run_until(stream, 2, updates)
+
+        assert updates[0]['best_bid'] == 64250.10
+        # Pending book update is flushed when the connection drops
+        assert updates[1]['best_bid'] == 64251.00
+
+
+class TestBybitStream:
+    """Test snapshot + delta merge"""
+
+    def test_delta_merges_into_snapshot(self):
+        """Test delta keeps 24h fields from the snapshot"""
+        updates = []
+        with ReplayServer(load_recording("bybit_linear_stream.jsonl")) as server:
+            stream = make_stream(BybitLinearAdapter(), server.url, updates)
+            run_until(stream, 2, updates)
+
+        assert updates[-1]['current_price'] == 64251.10
+        assert updates[-1]['high_24h'] == 64890.00
+        assert updates[-1]['change_24h'] == pytest.approx(1.34)
+        assert json.loads(server.subscriptions[0]) == {"op": "subscribe", "args": ["tickers.BTCUSDT"]}
+
+
+class TestFallback:
+    """Test giving up so the caller can poll REST"""
+
+    def test_unreachable_gives_up(self):
+        """Test run returns False after max_failures refused connections"""
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+
+        stream = make_stream(BinanceFuturesAdapter(), f"ws://127.0.0.1:{port}/stream", [])
+        assert stream.run(max_failures=2) is False
+        assert stream.connections == 0
+
+    def test_no_adapter_for_unknown_exchange(self):
+        """Test exchanges without an adapter fall back to REST"""
+        assert get_adapter("mexc") is None
+        assert isinstance(get_adapter("Binance"), BinanceFuturesAdapter)
@@ -0,0 +1,44 @@
+"""
+Test suite for the in-process metrics registry
+"""
+import pytest
+
+from core.metrics import MetricsRegistry, metric_key
+
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry()
+
+
+class TestMetrics:
+    """Test counters, gauges and histograms"""
+
+    def test_same_name_and_labels_return_same_metric(self, metrics):
+        """Test metrics are created once per (name, labels)"""
+        a = metrics.counter("requests", exchange="binance", lane="order")
+        b = metrics.counter("requests", lane="order", exchange="binance")
+        a.inc()
+        b.inc(2)
+        assert a is b
+        assert metrics.snapshot()["requests{exchange=binance,lane=order}"] == 3
+        with pytest.raises(TypeError):
+            metrics.gauge("requests", exchange="binance", lane="order")
+
+    def test_histogram_percentiles(self, metrics):
+        """Test percentiles report the bucket upper bound and overflow uses the max"""
+        histogram = metrics.histogram("delay_ms", buckets=(10, 100))
+        for value in [1, 2, 3, 50, 500]:
+            histogram.observe(value)
+        assert histogram.percentile(50) == 10
+        assert histogram.percentile(80) == 100
+        assert histogram.percentile(100) == 500
+        snap = metrics.snapshot("delay")["delay_ms"]
+        assert snap["count"] == 5 and snap["buckets"] == {"10": 3, "100": 1, "+Inf": 1}
+
+    def test_snapshot_prefix_and_key_format(self, metrics):
+        """Test snapshot filtering and label formatting"""
+        metrics.gauge("budget_used", exchange="bybit").set(0.25)
+        metrics.counter("other").inc()
+        assert metrics.snapshot("budget") == {"budget_used{exchange=bybit}": 0.25}
+        assert metric_key("x", {}) == "x"
@@ -0,0 +1,150 @@
+"""
+Test suite for the offline mock exchange (sync ccxt order path, faults, replay, streams)
+"""
+import threading
+
+import ccxt
+import pytest
+
+from core import market_cache
+from core.account_state import AccountState
+from core.exchange_manager import ExchangeManager
+from core.exchange_registry import ExchangeRegistry
+from core.market_data_hub import MarketDataHub
+from core.order_executor import OrderExecutor, OrderParams
+from core.rate_limiter import clear_rate_limiters
+from tests.mock_http_exchange import MockBinanceServer, load_session
+from utils.config_manager import ConfigManager
+
+
+class DB:
+    def update_exchange_status(self, name, is_connected):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path):
+    market_cache.configure(cache_dir=tmp_path)
+    market_cache.clear_caches()
+    clear_rate_limiters()
+    yield
+    clear_rate_limiters()
+    market_cache.clear_caches()
+    market_cache.configure(cache_dir=market_cache.DEFAULT_CACHE_DIR)
+
+
+@pytest.fixture
+def server():
+    with MockBinanceServer() as server:
+        yield server
+
+
+@pytest.fixture
+def manager(server):
+    exchange_class = server.exchange_class(asynchronous=False, rate_limit_ms=1)
+    registry = ExchangeRegistry(factory=lambda name, config: exchange_class(config))
+    manager = ExchangeManager(db_manager=DB(), registry=registry)
+    assert manager.connect_exchange("binance", "key", "secret")
+    yield manager
+    registry.close_all()
+
+
+class TestOrderPath:
+    """Test ExchangeManager and OrderExecutor against the mock venue"""
+
+    def test_limit_order_lifecycle(self, manager, server):
+        """Test a resting limit order can be fetched and cancelled, releasing its margin"""
+        order = manager.create_order("BTC/USDT:USDT", "buy", "limit", 0.01, price=60000.0)
+        assert order["status"] == "open"
+        assert manager.get_balance()["used"] == pytest.approx(600.0)
+
+        exchange = manager.get_exchange()
+        assert exchange.fetch_order(order["id"], "BTC/USDT:USDT")["status"] == "open"
+        assert exchange.cancel_order(order["id"], "BTC/USDT:USDT")["status"] == "canceled"
+        assert manager.get_balance()["free"] == pytest.approx(1000.0)
+
+    def test_order_executor_market_order(self, manager, server, tmp_path):
+        """Test the full executor path fills a market order at the mock price"""
+        executor = OrderExecutor(db_manager=None, config_manager=ConfigManager(str(tmp_path / "settings.json")),
+                                 exchange_manager=manager, account_state=AccountState(manager),
+                                 market_data=MarketDataHub(use_stream=False))
+        executor.record_order = lambda *args, **kwargs: None
+        result = executor.execute_market_order(
+            OrderParams(symbol="BTC/USDT:USDT", side="buy", amount=0.01, amount_type="qty", leverage=1))
+
+        assert result.success and result.status == "closed"
+        assert result.avg_price == pytest.approx(64250.2)
+        assert server.orders[0]["type"] == "MARKET"
+
+    def test_insufficient_margin(self, manager):
+        """Test the mock's margin error maps to ccxt.InsufficientFunds"""
+        with pytest.raises(ccxt.InsufficientFunds):
+            manager.create_order("BTC/USDT:USDT", "buy", "market", 1.0)
+
+
+class TestFaults:
+    """Test error injection and the server-side weight limit"""
+
+    def test_injected_error_fails_once(self, manager, server):
+        """Test an injected fault hits only the next matching request"""
+        server.inject_error("/fapi/v2/account", status=503, code=-1001, msg="Internal error")
+        assert manager.get_balance() == {}
+        assert manager.get_balance()["total"] == 1000.0
+
+    def test_weight_limit_returns_429(self):
+        """Test exceeding the weight budget yields a rate-limit error with Retry-After"""
+        with MockBinanceServer(weight_limit=3) as server:
+            exchange = server.exchange_class(asynchronous=False)({})
+            exchange.fapiPublicGetTime()
+            exchange.fapiPublicGetTime()
+            exchange.fapiPublicGetTime()
+            with pytest.raises(ccxt.DDoSProtection):
+                exchange.fapiPublicGetTime()
+            assert exchange.last_response_headers["Retry-After"] == "60"
+
+
+class TestRecordReplay:
+    """Test captured sessions are served back verbatim"""
+
+    def test_replay_serves_recorded_responses(self, tmp_path):
+        """Test a replay server answers with the recorded ticker even after prices change"""
+        with MockBinanceServer(record=True) as server:
+            exchange = server.exchange_class(asynchronous=False)({})
+            exchange.fapiPublicGetTicker24hr({"symbol": "BTCUSDT"})
+            server.save_session(tmp_path / "session.jsonl")
+
+        session = load_session(tmp_path / "session.jsonl")
+        assert session[0]["path"] == "/fapi/v1/ticker/24hr"
+        assert "timestamp" not in session[0]["query"]
+
+        with MockBinanceServer(replay=session, prices={"BTCUSDT": "1.00"}) as server:
+            exchange = server.exchange_class(asynchronous=False)({})
+            for _ in range(2):
+                assert exchange.fapiPublicGetTicker24hr({"symbol": "BTCUSDT"})["lastPrice"] == "64250.20"
+
+
+class TestStream:
+    """Test the WebSocket side feeds the market data hub"""
+
+    def test_price_updates_reach_hub_subscribers(self):
+        """Test set_price pushes ticker events to a hub subscription over WebSocket"""
+        with MockBinanceServer(stream=True) as server:
+            hub = MarketDataHub(stream_urls={"binance": server.ws_url})
+            received = threading.Event()
+            prices = []
+
+            def on_update(data):
+                prices.append(data["current_price"])
+                if data["current_price"] == 65000.0:
+                    received.set()
+
+            sub = hub.subscribe("binance", "BTC/USDT:USDT", on_update)
+            try:
+                for _ in range(50):
+                    server.set_price("BTCUSDT", 65000.0)
+                    if received.wait(0.1):
+                        break
+                assert received.is_set()
+                assert hub.latest("binance", "BTCUSDT").best_ask == 65000.0
+            finally:
+                hub.unsubscribe(sub)
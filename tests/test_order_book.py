@@ -0,0 +1,209 @@
+"""
+Test suite for the local L2 order book and fill estimation
+"""
+import json
+import time
+
+import pytest
+
+from core.order_book import (
+    BinanceDepthAdapter,
+    BybitDepthAdapter,
+    DepthUpdate,
+    OrderBook,
+    OrderBookSequenceError,
+    OrderBookStream,
+    OrderBookSync,
+)
+from core.order_executor import OrderExecutor, OrderParams
+from core.risk_manager import OrderRiskContext, RiskLimitError, RiskManager
+from utils.config_manager import ConfigManager
+from tests.ws_replay_server import ReplayServer
+
+
+def make_book(update_id=100):
+    book = OrderBook("BTCUSDT")
+    book.apply_snapshot(
+        bids=[["100.0", "1"], ["99.0", "2"], ["98.0", "5"]],
+        asks=[["101.0", "1"], ["102.0", "2"], ["103.0", "5"]],
+        update_id=update_id,
+    )
+    return book
+
+
+class TestOrderBook:
+    """Test snapshot/diff maintenance and sequence checks"""
+
+    def test_levels_sorted_best_first(self):
+        """Test both sides keep the best price at the top after diffs"""
+        book = make_book()
+        book.apply_diff(bids=[["100.5", "3"], ["99.0", "0"]], asks=[["100.8", "0.5"]], final_id=101, first_id=101)
+        assert book.top(3) == {'bids': [[100.5, 3.0], [100.0, 1.0], [98.0, 5.0]],
+                               'asks': [[100.8, 0.5], [101.0, 1.0], [102.0, 2.0]]}
+        assert book.mid == pytest.approx(100.65)
+
+    def test_stale_diff_skipped_and_gap_detected(self):
+        """Test diffs covered by the snapshot are ignored and missing ids raise"""
+        book = make_book()
+        assert book.apply_diff([], [["101.0", "9"]], final_id=100, first_id=95) is False
+        assert book.apply_diff([], [], final_id=103, first_id=98) is True   # overlaps the snapshot
+        with pytest.raises(OrderBookSequenceError):
+            book.apply_diff([], [], final_id=110, first_id=105)
+
+    def test_prev_id_chain(self):
+        """Test Binance futures pu must equal the previous final id"""
+        book = make_book()
+        book.apply_diff([], [], final_id=104, first_id=99, prev_id=90)
+        book.apply_diff([], [], final_id=107, first_id=105, prev_id=104)
+        with pytest.raises(OrderBookSequenceError):
+            book.apply_diff([], [], final_id=112, first_id=110, prev_id=109)
+
+    def test_crossed_book_rejected(self):
+        """Test a diff leaving bid >= ask marks the book invalid"""
+        book = make_book()
+        with pytest.raises(OrderBookSequenceError):
+            book.apply_diff([["101.5", "1"]], [], final_id=101)
+
+
+class TestEstimateFill:
+    """Test walking the book"""
+
+    def test_buy_notional_walks_asks(self):
+        """Test average price and slippage across three ask levels"""
+        estimate = make_book().estimate_fill("buy", notional=101 + 204 + 103)
+        assert estimate.complete
+        assert estimate.levels == 3
+        assert estimate.filled_qty == pytest.approx(4.0)
+        assert estimate.avg_price == pytest.approx(102.0)
+        assert estimate.slippage_pct == pytest.approx((102.0 / 101.0 - 1) * 100)
+
+    def test_sell_amount_and_incomplete(self):
+        """Test sells walk bids and oversized orders are marked incomplete"""
+        book = make_book()
+        estimate = book.estimate_fill("sell", amount=2)
+        assert estimate.avg_price == pytest.approx(99.5)
+        assert estimate.worst_price == 99.0
+
+        too_big = book.estimate_fill("sell", amount=50)
+        assert not too_big.complete
+        assert too_big.filled_qty == pytest.approx(8.0)
+
+
+class TestOrderBookSync:
+    """Test buffering and resync"""
+
+    def test_rest_snapshot_replays_buffer_and_resyncs(self):
+        """Test diffs buffered before the snapshot and a gap triggering a new snapshot"""
+        snapshots = [{'bids': [[100.0, 1.0]], 'asks': [[101.0, 1.0]], 'nonce': 10},
+                     {'bids': [[100.0, 4.0]], 'asks': [[101.0, 4.0]], 'nonce': 50}]
+        sync = OrderBookSync("BTCUSDT", fetch_snapshot=lambda: snapshots.pop(0))
+        sync.MIN_RESYNC_INTERVAL = 0
+
+        assert sync.on_update(DepthUpdate([[100.0, 2.0]], [], final_id=11, first_id=9, prev_id=8))
+        assert sync.book.update_id == 11
+        assert sync.book.best_bid == 100.0 and sync.book.bids.best()[1] == 2.0
+
+        sync.on_update(DepthUpdate([], [], final_id=60, first_id=40, prev_id=39))   # pu != 11
+        assert sync.resyncs == 1
+        assert sync.book.update_id == 60
+        assert sync.book.bids.best()[1] == 4.0
+
+    def test_stream_snapshot_invalid_delta_raises(self):
+        """Test books without REST snapshots raise on a bad delta so the stream resubscribes"""
+        sync = OrderBookSync("BTCUSDT")
+        message = {"topic": "orderbook.50.BTCUSDT", "type": "snapshot",
+                   "data": {"s": "BTCUSDT", "b": [["100", "1"]], "a": [["101", "1"]], "u": 5}}
+        assert sync.on_update(BybitDepthAdapter.parse_depth(message))
+        delta = {"topic": "orderbook.50.BTCUSDT", "type": "delta",
+                 "data": {"s": "BTCUSDT", "b": [["101.2", "1"]], "a": [], "u": 6}}
+        with pytest.raises(OrderBookSequenceError):
+            sync.on_update(BybitDepthAdapter.parse_depth(delta))
+        assert not sync.synced
+
+    def test_binance_depth_stream_replay(self):
+        """Test a replayed depth stream builds the book on top of a REST snapshot"""
+        messages = [json.dumps({"result": None, "id": 1})] + [
+            json.dumps({"stream": "btcusdt@depth@100ms", "data": {
+                "e": "depthUpdate", "s": "BTCUSDT", "U": first, "u": final, "pu": prev,
+                "b": bids, "a": asks}})
+            for first, final, prev, bids, asks in [
+                (95, 100, 94, [["100.0", "7"]], []),              # covered by snapshot
+                (99, 103, 100, [["100.0", "3"]], [["101.0", "0"]]),
+                (104, 106, 103, [], [["101.5", "2"]]),
+            ]
+        ]
+        sync = OrderBookSync("BTCUSDT", fetch_snapshot=lambda: {
+            'bids': [[100.0, 1.0]], 'asks': [[101.0, 1.0], [102.0, 1.0]], 'nonce': 100})
+
+        with ReplayServer(messages) as server:
+            stream = OrderBookStream(sync, BinanceDepthAdapter(sync), "BTC/USDT:USDT",
+                                     url=server.url, min_interval=0, reconnect_delay=0.01)
+            stream.start()
+            deadline = time.monotonic() + 5
+            while sync.book.update_id != 106 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            stream.stop()
+            stream.join(2)
+
+        assert json.loads(server.subscriptions[0])['params'] == ['btcusdt@depth@100ms']
+        assert sync.book.top(2) == {'bids': [[100.0, 3.0]], 'asks': [[101.5, 2.0], [102.0, 1.0]]}
+
+
+class TestPreTradeChecks:
+    """Test RiskManager / OrderExecutor use of the estimate"""
+
+    class SettingsDB:
+        def __init__(self, **settings):
+            self.settings = settings
+
+        def get_setting(self, key):
+            return self.settings.get(key)
+
+        def insert_system_log(self, **kwargs):
+            pass
+
+    def test_risk_manager_rejects_depth_and_slippage(self):
+        """Test incomplete fills always fail and slippage fails only past the limit"""
+        book = make_book()
+        risk = RiskManager(self.SettingsDB(**{"risk.max_slippage_pct": "0.5"}))
+        ctx = dict(symbol="BTCUSDT", side="buy", leverage=10, is_paper=True)
+
+        risk.check_order_risk(OrderRiskContext(notional_usd=101, fill_estimate=book.estimate_fill("buy", notional=101), **ctx))
+        with pytest.raises(RiskLimitError):
+            risk.check_order_risk(OrderRiskContext(notional_usd=300, fill_estimate=book.estimate_fill("buy", notional=300), **ctx))
+        with pytest.raises(RiskLimitError):
+            risk.check_order_risk(OrderRiskContext(notional_usd=10_000, fill_estimate=book.estimate_fill("buy", notional=10_000), **ctx))
+
+        RiskManager(self.SettingsDB()).check_order_risk(
+            OrderRiskContext(notional_usd=300, fill_estimate=book.estimate_fill("buy", notional=300), **ctx))
+
+    def test_executor_estimates_market_orders_only(self, tmp_path):
+        """Test market orders are walked on the book with the sized quantity"""
+
+        class Books:
+            calls = []
+
+            def estimate_fill(self, exchange_name, symbol, side, notional=None, amount=None):
+                self.calls.append((exchange_name, symbol, side, amount))
+                return make_book().estimate_fill(side, amount=amount)
+
+        class ExchangeManagerStub:
+            active_exchange = "binance"
+
+        books = Books()
+        executor = OrderExecutor(
+            db_manager=self.SettingsDB(),
+            config_manager=ConfigManager(str(tmp_path / "settings.json")),
+            exchange_manager=ExchangeManagerStub(),
+            order_books=books,
+        )
+        market = OrderParams(symbol="BTCUSDT", side="buy", amount=2.0, amount_type="qty", leverage=5)
+        assert executor._estimate_fill(market, 2.0).avg_price == pytest.approx(101.5)
+        assert books.calls == [("binance", "BTCUSDT", "buy", 2.0)]
+
+        market.reduce_only = True
+        limit = OrderParams(symbol="BTCUSDT", side="buy", amount=2.0, amount_type="qty",
+                            leverage=5, order_type="limit", price=100.0)
+        assert executor._estimate_fill(market, 2.0) is None
+        assert executor._estimate_fill(limit, 2.0) is None
+        assert len(books.calls) == 1
@@ -0,0 +1,183 @@
+"""
+Test suite for smart order routing across two mock venues
+"""
+import pytest
+
+from core import market_cache
+from core.account_state import AccountState
+from core.exchange_manager import ExchangeManager
+from core.exchange_registry import ExchangeRegistry
+from core.market_data_hub import MarketDataHub, MarketSnapshot
+from core.order_executor import OrderExecutor, OrderParams
+from core.order_router import InsufficientRoutingBalance, OrderRouter
+from core.rate_limiter import clear_rate_limiters
+from tests.mock_http_exchange import MockBinanceServer
+from utils.config_manager import ConfigManager
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+class DB:
+    def update_exchange_status(self, name, is_connected):
+        pass
+
+
+class OrdersDB:
+    """Records orders rows and system logs"""
+
+    def __init__(self):
+        self.orders = []
+
+    def insert_order(self, order_data):
+        self.orders.append(order_data)
+        return len(self.orders)
+
+    def insert_system_log(self, level, message, context=None):
+        pass
+
+
+class CountingBooks:
+    """Order book manager that records estimate requests"""
+
+    def __init__(self):
+        self.calls = []
+
+    def estimate_fill(self, exchange_name, symbol, side, amount):
+        self.calls.append(exchange_name)
+        return None
+
+
+class FakeHub:
+    """Market data hub holding fixed snapshots"""
+
+    def __init__(self, snapshots):
+        self.snapshots = snapshots
+
+    def latest(self, exchange_name, symbol):
+        return self.snapshots.get(exchange_name)
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path):
+    market_cache.configure(cache_dir=tmp_path)
+    market_cache.clear_caches()
+    clear_rate_limiters()
+    yield
+    clear_rate_limiters()
+    market_cache.clear_caches()
+    market_cache.configure(cache_dir=market_cache.DEFAULT_CACHE_DIR)
+
+
+@pytest.fixture
+def venues():
+    """binance quotes 64250.20, bybit 64000.00 with a smaller balance"""
+    with MockBinanceServer() as binance, \
+            MockBinanceServer(balance=320.0, prices={"BTCUSDT": "64000.00"}) as bybit:
+        yield {"binance": binance, "bybit": bybit}
+
+
+@pytest.fixture
+def manager(venues):
+    classes = {name: server.exchange_class(asynchronous=False, rate_limit_ms=1) for name, server in venues.items()}
+    registry = ExchangeRegistry(factory=lambda name, config: classes[name](config))
+    manager = ExchangeManager(db_manager=DB(), registry=registry)
+    for name in venues:
+        assert manager.connect_exchange(name, "key", "secret")
+    manager.active_exchange = "binance"
+    yield manager
+    registry.close_all()
+
+
+def make_router(manager, **kwargs):
+    kwargs.setdefault("fees", {"binance": 0.0004, "bybit": 0.0004})
+    return OrderRouter(manager, account_state=AccountState(manager), **kwargs)
+
+
+class TestPlan:
+    """Test venue ranking, splitting and the quote deadline"""
+
+    def test_buys_cheapest_and_sells_richest_venue(self, manager):
+        """Test buys go to the lowest ask and sells to the highest bid"""
+        router = make_router(manager)
+        assert [leg.exchange for leg in router.plan(SYMBOL, "buy", 0.004).legs] == ["bybit"]
+        assert [leg.exchange for leg in router.plan(SYMBOL, "sell", 0.004).legs] == ["binance"]
+
+    def test_fees_change_the_ranking(self, manager):
+        """Test a higher taker fee can outweigh a better raw price"""
+        router = make_router(manager, fees={"binance": 0.0002, "bybit": 0.0050})
+        assert [leg.exchange for leg in router.plan(SYMBOL, "buy", 0.004).legs] == ["binance"]
+
+    def test_split_when_best_venue_lacks_balance(self, manager):
+        """Test the remainder spills over to the next venue, rounded to the lot size"""
+        plan = make_router(manager).plan(SYMBOL, "buy", 0.02)
+        assert [(leg.exchange, leg.amount) for leg in plan.legs] == [("bybit", 0.005), ("binance", 0.015)]
+        assert 64000.0 < plan.quoted_price < 64250.2
+
+    def test_no_split_picks_a_venue_that_covers_the_order(self, manager):
+        """Test with splitting disabled the whole order goes to one venue"""
+        plan = make_router(manager, allow_split=False).plan(SYMBOL, "buy", 0.02, leverage=2)
+        assert [(leg.exchange, leg.amount) for leg in plan.legs] == [("binance", 0.02)]
+        with pytest.raises(InsufficientRoutingBalance):
+            make_router(manager).plan(SYMBOL, "buy", 1.0)
+
+    def test_slow_venue_misses_the_deadline(self, manager, venues):
+        """Test a venue that cannot quote in time is skipped without delaying the order"""
+        venues["bybit"].latency = 0.5
+        plan = make_router(manager, deadline_ms=150).plan(SYMBOL, "buy", 0.004)
+        assert [leg.exchange for leg in plan.legs] == ["binance"]
+        assert plan.timed_out == ["bybit"]
+        assert plan.routing_ms < 400
+
+    def test_fresh_hub_quotes_avoid_rest(self, manager, venues):
+        """Test streamed top-of-book prices are used instead of ticker requests"""
+        hub = FakeHub({
+            "binance": MarketSnapshot("binance", "BTCUSDT", best_bid=63990.0, best_ask=63995.0),
+            "bybit": MarketSnapshot("bybit", "BTCUSDT", best_bid=64010.0, best_ask=64020.0),
+        })
+        router = make_router(manager, market_data=hub)
+        for server in venues.values():
+            server.requests.clear()
+        plan = router.plan(SYMBOL, "buy", 0.004)
+        assert [(leg.exchange, leg.quoted_price) for leg in plan.legs] == [("binance", 63995.0)]
+        assert not any(server.paths("/fapi/v1/ticker") for server in venues.values())
+
+
+class TestExecution:
+    """Test placing routed orders"""
+
+    def test_execute_reports_quoted_and_achieved_prices(self, manager, venues):
+        """Test each leg fills on its venue and records the achieved price"""
+        plan = make_router(manager).execute(SYMBOL, "buy", 0.02)
+        assert len(venues["bybit"].orders) == 1 and len(venues["binance"].orders) == 1
+        assert [leg.achieved_price for leg in plan.legs] == [64000.0, 64250.2]
+        assert plan.achieved_price == pytest.approx(plan.quoted_price)
+
+    def test_executor_aggregates_routed_legs(self, manager, venues, tmp_path):
+        """Test OrderExecutor routes market orders when enabled, merges the legs and records one row per leg"""
+        config = ConfigManager(str(tmp_path / "settings.json"))
+        config.set("trading.smart_routing", True)
+        db, books = OrdersDB(), CountingBooks()
+        executor = OrderExecutor(db_manager=db, config_manager=config, exchange_manager=manager,
+                                 account_state=AccountState(manager), market_data=MarketDataHub(use_stream=False),
+                                 order_router=make_router(manager), order_books=books)
+
+        result = executor.execute_market_order(
+            OrderParams(symbol=SYMBOL, side="buy", amount=0.01, amount_type="qty", leverage=1))
+
+        assert result.success and result.status == "closed"
+        assert result.filled_qty == pytest.approx(0.01)
+        assert result.raw["routed_to"] == "bybit,binance"
+        assert len(result.order_id.split(",")) == 2
+        assert books.calls == []    # active-venue book depth says nothing about the routed venues
+
+        rows = [(row["exchange"], row["exchange_order_id"], row["quantity"]) for row in db.orders]
+        assert rows == [("bybit", str(venues["bybit"].orders[0]["orderId"]), 0.005),
+                        ("binance", str(venues["binance"].orders[0]["orderId"]), 0.005)]
+        db.orders.clear()
+
+        limit = executor.execute_limit_order(
+            OrderParams(symbol=SYMBOL, side="buy", amount=0.001, amount_type="qty", leverage=10,
+                        order_type="limit", price=60000.0))
+        assert limit.success and "routed_to" not in limit.raw
+        assert len(venues["binance"].orders) == 2
+        assert [row["exchange"] for row in db.orders] == ["binance"]
@@ -0,0 +1,50 @@
+"""
+Test suite for the labelled parser benchmark corpus
+"""
+import pytest
+
+from core.command_parser import CommandParser
+from core.parser_benchmark import CorpusRow, evaluate, load_corpus
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    """Bundled benchmark corpus"""
+    return load_corpus()
+
+
+class TestCorpus:
+    """Test corpus loading"""
+
+    def test_corpus_bundled(self, corpus):
+        """Test corpus covers both languages and every source"""
+        assert len(corpus) > 2000
+        assert {row.language for row in corpus} == {"tr", "en"}
+        assert {row.source for row in corpus} == {"template", "noisy", "asr", "negative"}
+
+    def test_optional_columns(self, corpus):
+        """Test empty cells load as None and numbers are typed"""
+        row = next(r for r in corpus if r.source == "negative")
+        assert row.action is None and row.amount is None and not row.valid
+        order = next(r for r in corpus if r.leverage is not None)
+        assert isinstance(order.leverage, int) and isinstance(order.amount, float)
+
+
+class TestEvaluate:
+    """Test report fields and accuracy regression gate"""
+
+    def test_field_mismatch_reported(self):
+        """Test a wrong amount is counted and listed"""
+        rows = [CorpusRow("btc al 100 dolar", "tr", "buy", "BTCUSDT", 200.0, valid=True)]
+        report = evaluate(rows)
+        assert report["accuracy"]["action"] == 1.0
+        assert report["accuracy"]["amount"] == 0.0
+        assert report["errors"][0][1] == ["amount"]
+        assert report["p99_us"] >= report["p50_us"] > 0
+
+    def test_clean_accuracy(self, corpus):
+        """Test parser stays accurate on clean and ASR-style transcripts"""
+        clean = [row for row in corpus if row.source in ("template", "asr")]
+        report = evaluate(clean, CommandParser())
+        for field in ("action", "symbol", "amount", "leverage", "price", "stop_loss", "take_profit"):
+            assert report["accuracy"][field] >= 0.98, field
@@ -0,0 +1,195 @@
+"""
+Test suite for the weight-aware rate-limit scheduler
+"""
+import asyncio
+import threading
+import time
+
+import ccxt
+import ccxt.async_support as ccxt_async
+import pytest
+
+from core.metrics import MetricsRegistry
+from core.rate_limiter import (
+    Lane, RateLimitScheduler, RequestShed, classify_request, install, install_async, request_lane,
+)
+
+
+def make_scheduler(refill_rate=100.0, capacity=10.0, **kwargs):
+    return RateLimitScheduler("test", refill_rate, capacity, metrics=MetricsRegistry(), **kwargs)
+
+
+class TestClassify:
+    """Test lane selection from ccxt request arguments"""
+
+    def test_private_writes_are_orders(self):
+        """Test order/cancel endpoints of several venues land in the order lane"""
+        assert classify_request("fapiPrivate", "POST", "order") == Lane.ORDER
+        assert classify_request("fapiPrivate", "DELETE", "order") == Lane.ORDER
+        assert classify_request(["contract", "private"], "POST", "order/submit") == Lane.ORDER
+        assert classify_request("private", "GET", "v5/account/wallet-balance") == Lane.ACCOUNT
+        assert classify_request("fapiPublic", "GET", "ticker/24hr") == Lane.MARKET
+
+
+class TestScheduler:
+    """Test budget accounting, priorities and shedding"""
+
+    def test_burst_then_refill_rate(self):
+        """Test capacity allows a burst and later requests follow the refill rate"""
+        scheduler = make_scheduler(refill_rate=100.0, capacity=5.0)
+        started = time.monotonic()
+        for _ in range(10):
+            scheduler.acquire(1, Lane.ORDER)
+        elapsed = time.monotonic() - started
+        # 5 from the burst, 5 more at 100/s
+        assert 0.04 <= elapsed < 0.5
+
+    def test_market_lane_keeps_reserve_for_orders(self):
+        """Test market data stops at its reserve while orders can use the whole budget"""
+        scheduler = make_scheduler(refill_rate=1.0, capacity=10.0, max_wait={Lane.MARKET: 0.0})
+        for _ in range(7):
+            scheduler.acquire(1, Lane.MARKET)
+        with pytest.raises(RequestShed):
+            scheduler.acquire(1, Lane.MARKET)
+        for _ in range(3):
+            scheduler.acquire(1, Lane.ORDER)
+        assert scheduler.stats()["shed"]["market"] == 1
+        assert scheduler.stats()["requests"] == {"order": 3, "account": 0, "market": 7}
+
+    def test_shed_error_is_a_ccxt_network_error(self):
+        """Test existing NetworkError handlers catch shed requests"""
+        assert issubclass(RequestShed, ccxt.NetworkError)
+
+    def test_orders_jump_queued_market_requests(self):
+        """Test a waiting order is served before market requests queued earlier"""
+        scheduler = make_scheduler(refill_rate=20.0, capacity=1.0, reserves={Lane.MARKET: 0.0},
+                                   max_wait={Lane.MARKET: None})
+        scheduler.acquire(1, Lane.ORDER)          # drain the bucket
+        served = []
+
+        def request(lane, tag):
+            scheduler.acquire(1, lane)
+            served.append(tag)
+
+        market = [threading.Thread(target=request, args=(Lane.MARKET, f"m{i}")) for i in range(3)]
+        for t in market:
+            t.start()
+        time.sleep(0.01)
+        order = threading.Thread(target=request, args=(Lane.ORDER, "order"))
+        order.start()
+        for t in market + [order]:
+            t.join(5)
+        assert served[0] == "order"
+        assert sorted(served[1:]) == ["m0", "m1", "m2"]
+
+    def test_penalize_pauses_requests(self):
+        """Test a 429 penalty drives the budget negative until refilled"""
+        scheduler = make_scheduler(refill_rate=100.0, capacity=10.0)
+        scheduler.penalize(0.1)
+        scheduler.penalize(0.1)             # concurrent 429s do not stack
+        assert scheduler.budget_used > 1.0
+        waited = scheduler.acquire(1, Lane.ORDER)
+        assert 0.09 <= waited < 0.19
+
+    def test_concurrent_penalties_keep_the_longest(self):
+        """Test simultaneous 429s set the pause to the longest Retry-After instead of summing them"""
+        scheduler = make_scheduler(refill_rate=100.0, capacity=10.0)
+        threads = [threading.Thread(target=scheduler.penalize, args=(0.5,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert scheduler.tokens == pytest.approx(-50.0, abs=1.0)
+
+        scheduler.penalize(0.1)              # a shorter penalty does not shorten the pause
+        assert scheduler.tokens == pytest.approx(-50.0, abs=1.0)
+
+
+class TestInstall:
+    """Test the ccxt integration"""
+
+    def test_requests_go_through_scheduler(self):
+        """Test ccxt calls are charged by endpoint weight and forced lanes apply"""
+        scheduler = make_scheduler(refill_rate=1000.0, capacity=100.0)
+        exchange = ccxt.binance({'apiKey': 'k', 'secret': 's'})
+        exchange.fetch = lambda url, method='GET', headers=None, body=None: {}
+        install(exchange, scheduler)
+
+        exchange.fapiPrivateGetAccount()          # weight 5
+        exchange.fapiPublicGetTicker24hr({'symbol': 'BTCUSDT'})
+        with request_lane(Lane.ORDER):
+            exchange.fapiPublicGetTicker24hr({'symbol': 'BTCUSDT'})
+
+        stats = scheduler.stats()
+        assert stats["requests"] == {"order": 1, "account": 1, "market": 1}
+        assert 0.06 <= stats["budget_used"] <= 0.08
+
+    def test_rate_limit_response_penalizes(self):
+        """Test an exchange rate-limit error pauses the shared budget"""
+        scheduler = make_scheduler(refill_rate=1000.0, capacity=100.0)
+        exchange = ccxt.binance()
+
+        def fetch(url, method='GET', headers=None, body=None):
+            exchange.last_response_headers = {'Retry-After': '0.05'}
+            raise ccxt.RateLimitExceeded("429")
+
+        exchange.fetch = fetch
+        install(exchange, scheduler)
+        with pytest.raises(ccxt.RateLimitExceeded):
+            exchange.fapiPublicGetTime()
+        assert scheduler.budget_used > 1.0
+
+
+class TestInstallAsync:
+    """Test the ccxt.async_support integration"""
+
+    def test_async_requests_share_the_scheduler(self):
+        """Test async calls are charged to the same bucket and lanes follow each coroutine"""
+        scheduler = make_scheduler(refill_rate=1000.0, capacity=100.0)
+
+        async def fetch(url, method='GET', headers=None, body=None):
+            return {}
+
+        async def ordered_ticker(exchange):
+            with request_lane(Lane.ORDER):
+                await exchange.fapiPublicGetTicker24hr({'symbol': 'BTCUSDT'})
+
+        async def run():
+            exchange = ccxt_async.binance({'apiKey': 'k', 'secret': 's'})
+            exchange.fetch = fetch
+            install_async(exchange, scheduler)
+            try:
+                await asyncio.gather(
+                    exchange.fapiPrivateGetAccount(),
+                    exchange.fapiPublicGetTicker24hr({'symbol': 'BTCUSDT'}),
+                    ordered_ticker(exchange),        # forced lane must not leak into siblings
+                )
+            finally:
+                await exchange.close()
+
+        asyncio.run(run())
+        stats = scheduler.stats()
+        assert stats["requests"] == {"order": 1, "account": 1, "market": 1}
+        assert 0.05 <= stats["budget_used"] <= 0.08
+
+    def test_async_rate_limit_response_penalizes(self):
+        """Test an async rate-limit error pauses the shared budget"""
+        scheduler = make_scheduler(refill_rate=1000.0, capacity=100.0)
+
+        async def run():
+            exchange = ccxt_async.binance()
+
+            async def fetch(url, method='GET', headers=None, body=None):
+                exchange.last_response_headers = {'Retry-After': '0.05'}
+                raise ccxt.RateLimitExceeded("429")
+
+            exchange.fetch = fetch
+            install_async(exchange, scheduler)
+            try:
+                await exchange.fapiPublicGetTime()
+            finally:
+                await exchange.close()
+
+        with pytest.raises(ccxt.RateLimitExceeded):
+            asyncio.run(run())
+        assert scheduler.budget_used > 1.0
@@ -0,0 +1,77 @@
+"""
+Test suite for the Turkish/English spoken-number normalizer
+"""
+from pathlib import Path
+
+import pytest
+
+from core.command_parser import CommandParser
+from core.spoken_numbers import find_numbers, parse_number, replace_numbers
+
+
+CORPUS_PATH = Path(__file__).parent / "data" / "spoken_amounts.tsv"
+
+
+def load_corpus():
+    cases = []
+    for line in CORPUS_PATH.read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        text, _, expected = line.partition("\t")
+        cases.append((text, float(expected) if expected.strip() else None))
+    return cases
+
+
+class TestSpokenNumberCorpus:
+    """Test every entry of the spoken amount corpus"""
+
+    @pytest.mark.parametrize("text,expected", load_corpus())
+    def test_corpus(self, text, expected):
+        """Test spoken amount parses to the exact value"""
+        if expected is None:
+            assert find_numbers(text) == []
+        else:
+            assert parse_number(text) == pytest.approx(expected)
+
+
+class TestSpans:
+    """Test span reporting and replacement"""
+
+    def test_spans_cover_compound_number(self):
+        """Test span covers all words of a compound number"""
+        text = "al btc yüz elli dolar"
+        spans = find_numbers(text)
+        assert len(spans) == 1
+        assert text[spans[0].start:spans[0].end] == "yüz elli"
+        assert spans[0].value == 150
+
+    def test_separate_numbers_split(self):
+        """Test adjacent incompatible numbers are not merged"""
+        assert [s.value for s in find_numbers("5 10")] == [5, 10]
+        assert [s.value for s in find_numbers("iki üç")] == [2, 3]
+
+    def test_replace_numbers(self):
+        """Test spoken numbers are replaced with digits"""
+        assert replace_numbers("iki bin beş yüz dolar") == "2500 dolar"
+
+
+class TestParserAmounts:
+    """Test CommandParser amount extraction"""
+
+    @pytest.mark.parametrize("text,amount", [
+        ("btc al yüz elli dolar", 150),
+        ("eth sat iki bin beş yüz dolar", 2500),
+        ("sol al 2.5k", 2500),
+        ("bitcoin al bir virgül beş bin dolar", 1500),
+        ("buy btc one hundred and fifty dollars", 150),
+        ("bir bitcoin al 100 dolar", 100),
+    ])
+    def test_amounts(self, text, amount):
+        """Test spoken and written amounts"""
+        assert CommandParser().parse(text).amount == pytest.approx(amount)
+
+    def test_letter_k_does_not_multiply(self):
+        """Test a 'k' elsewhere in the text does not scale the amount"""
+        cmd = CommandParser().parse("link al 5 dolar")
+        assert cmd.symbol == "LINKUSDT"
+        assert cmd.amount == 5
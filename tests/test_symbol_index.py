@@ -0,0 +1,142 @@
+"""
+Test suite for the exchange-driven symbol index
+"""
+import pytest
+
+from core.command_parser import CommandParser, CommandValidator
+from core.symbol_index import SymbolIndex, phonetic_key
+
+
+MARKETS = ["BTC/USDT", "ETH/USDT", "SOL/USDT", "LINK/USDT", "PEPE/USDT", "TRX/USDT", "ETH/BTC"]
+
+
+@pytest.fixture
+def index():
+    """Create index populated from an exchange market list"""
+    idx = SymbolIndex(quote="USDT")
+    idx.update_markets(MARKETS)
+    return idx
+
+
+class TestPhoneticKey:
+    """Test Turkish-aware phonetic keys"""
+
+    @pytest.mark.parametrize("a,b", [
+        ("solana", "solona"),
+        ("ethereum", "eterium"),
+        ("chainlink", "çeynlink"),
+        ("bitcoin", "bitkoyn"),
+        ("ripple", "riple"),
+    ])
+    def test_spellings_collide(self, a, b):
+        """Test common ASR spellings share a key"""
+        assert phonetic_key(a) == phonetic_key(b)
+
+
+class TestSymbolIndex:
+    """Test market indexing and resolution"""
+
+    def test_only_quote_markets_indexed(self, index):
+        """Test non-USDT markets are skipped"""
+        assert len(index) == 6
+        assert index.contains("ETHUSDT")
+        assert not index.contains("ETHBTC")
+
+    def test_resolve_base_and_spoken_name(self, index):
+        """Test base asset and default spoken names resolve"""
+        assert index.resolve("pepe") == "PEPEUSDT"
+        assert index.resolve("tron") == "TRXUSDT"
+        assert index.resolve("SOL") == "SOLUSDT"
+
+    def test_resolve_phonetic(self, index):
+        """Test misspelled names resolve through the phonetic key"""
+        index.add_spoken_names({"solana": "SOLUSDT"})
+        assert index.resolve("solona") == "SOLUSDT"
+
+    def test_unit_words_ignored(self, index):
+        """Test currency words never resolve to a symbol"""
+        assert index.resolve("dolar") is None
+        assert index.resolve("usdt") is None
+
+    def test_incremental_update(self, index):
+        """Test only the market diff is applied"""
+        added, removed = index.update_markets(["BTC/USDT", "ETH/USDT", "DOGE/USDT:USDT"])
+        assert (added, removed) == (1, 4)
+        assert index.resolve("pepe") is None
+        assert index.resolve("doge") == "DOGEUSDT"
+
+    def test_ccxt_market_dict(self):
+        """Test ccxt load_markets() dict is accepted"""
+        idx = SymbolIndex()
+        idx.update_markets({
+            "BTC/USDT:USDT": {"base": "BTC", "quote": "USDT"},
+            "ETH/USD:ETH": {"base": "ETH", "quote": "USD"},
+        })
+        assert idx.symbols == {"BTCUSDT"}
+
+
+class TestParserWithIndex:
+    """Test parser and validator backed by the exchange index"""
+
+    def test_parser_resolves_exchange_symbol(self, index):
+        """Test coins outside the hardcoded aliases are recognized"""
+        parser = CommandParser(symbol_index=index)
+        cmd = parser.parse("solona al 100 dolar")
+        assert cmd.symbol == "SOLUSDT"
+        assert parser.parse("pepe sat 20 dolar").symbol == "PEPEUSDT"
+
+    def test_validator_uses_index(self, index):
+        """Test validation is a lookup against the exchange markets"""
+        parser = CommandParser(symbol_index=index)
+        cmd = parser.parse("pepe al 50 dolar")
+
+        ok, _ = CommandValidator.validate(cmd, symbol_index=index)
+        assert ok is True
+        ok, errors = CommandValidator.validate(cmd)
+        assert ok is False
+        assert "Geçersiz sembol" in errors[0]
+
+
+class TestFunctionWords:
+    """Test everyday words never resolve to look-alike listings"""
+
+    @pytest.fixture
+    def parser(self):
+        idx = SymbolIndex(quote="USDT")
+        idx.update_markets(MARKETS + ["BAN/USDT", "THE/USDT", "ME/USDT", "HIGH/USDT", "ALT/USDT"])
+        return CommandParser(symbol_index=idx)
+
+    @pytest.mark.parametrize("text", [
+        "bana 100 dolar al",
+        "sell the rest 100 dollars",
+        "buy some for me",
+        "buy high",
+        "alt coin al",
+    ])
+    def test_function_words_are_not_symbols(self, parser, text):
+        """Test pronouns, articles and adjectives fall back to the default symbol"""
+        cmd = parser.parse(text)
+        assert cmd.symbol == "BTCUSDT"
+        assert CommandValidator.needs_confirmation(cmd)
+
+    def test_short_tokens_skip_phonetic_match(self, index):
+        """Test a short token only matches exactly, never by sound"""
+        assert index.match("sol") == ("SOLUSDT", "exact")
+        assert index.match("sool") is None
+
+    def test_symbol_source_sets_confirmation(self, parser):
+        """Test alias matches execute directly while phonetic guesses need confirmation"""
+        alias = parser.parse("btc al 100 dolar")
+        assert alias.confidence == pytest.approx(1.0)
+        assert not CommandValidator.needs_confirmation(alias)
+
+        listed = parser.parse("pepe al 50 dolar")
+        assert listed.symbol == "PEPEUSDT"
+        assert not CommandValidator.needs_confirmation(listed)
+
+        parser.symbol_index.add_spoken_names({"solana": "SOLUSDT"})
+        guessed = parser.parse("solona al 100 dolar")
+        assert guessed.symbol == "SOLUSDT"
+        assert guessed.field_confidence["symbol"] < listed.field_confidence["symbol"]
+        assert CommandValidator.needs_confirmation(guessed)
+        assert CommandValidator.validate(guessed, symbol_index=parser.symbol_index)[0] is True
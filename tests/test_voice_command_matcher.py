@@ -0,0 +1,102 @@
+"""
+Test suite for the indexed, hot-reloadable voice command matcher
+"""
+import os
+import tempfile
+
+import pytest
+
+from core.voice_command_matcher import VoiceCommandMatcher
+from database.db_manager import DatabaseManager
+
+
+@pytest.fixture
+def temp_db():
+    """Create temporary database with the default voice commands"""
+    tmpdir = tempfile.mkdtemp()
+    db = DatabaseManager(os.path.join(tmpdir, "test.db"))
+    db.initialize()
+    yield db
+    db.disconnect()
+
+
+@pytest.fixture
+def matcher(temp_db):
+    """Create matcher that checks for DB changes on every match"""
+    m = VoiceCommandMatcher(temp_db, check_interval=0.0)
+    m.refresh(force=True)
+    return m
+
+
+class TestMatching:
+    """Test longest-match-first phrase matching"""
+
+    def test_longest_phrase_wins(self, matcher):
+        """Test 'satın al' beats 'al' and 'sat'"""
+        match = matcher.match("Bitcoin satın al")
+        assert match.category == "BUY"
+        assert match.phrase == "satin al"
+
+    def test_whole_words_only(self, matcher):
+        """Test 'al' does not match inside 'almak'"""
+        assert matcher.match("bakiyeyi almak istiyorum") is None
+
+    def test_keyword_table_included(self, matcher):
+        """Test command_keywords rows are matched with upper-case categories"""
+        match = matcher.match("pozisyon kapat")
+        assert match.category == "CLOSE"
+        assert match.source == "command_keywords"
+
+    def test_voice_commands_preferred_on_tie(self, matcher):
+        """Test user voice_commands win over keywords of equal length"""
+        match = matcher.match("short")
+        assert match.source == "voice_commands"
+
+
+class TestHotReload:
+    """Test incremental rebuild driven by the DB change counter"""
+
+    def test_insert_visible_without_reload(self, temp_db, matcher):
+        """Test newly inserted phrase matches on the next call"""
+        assert matcher.match("ters çevir") is None
+        temp_db.execute(
+            "INSERT INTO voice_commands (category, phrase, language, is_active) VALUES (?, ?, ?, 1)",
+            ("REVERSE", "ters çevir", "tr"),
+        )
+        assert matcher.match("pozisyonu ters çevir").category == "REVERSE"
+
+    def test_deactivate_and_update(self, temp_db, matcher):
+        """Test deactivated and edited rows are re-indexed"""
+        temp_db.execute("UPDATE voice_commands SET is_active = 0 WHERE phrase = 'durdur'")
+        temp_db.execute("UPDATE command_keywords SET keyword = 'bekle' WHERE keyword = 'durdur'")
+        assert matcher.match("durdur") is None
+        assert matcher.match("bekle").category == "STOP"
+
+    def test_change_handler_runs_on_hot_reload(self, temp_db, matcher):
+        """Test on_change fires when match() picks up an edit, and not when nothing changed"""
+        calls = []
+        matcher.on_change = lambda: calls.append(len(matcher))
+        matcher.match("al")
+        assert calls == []
+
+        temp_db.execute(
+            "INSERT INTO voice_commands (category, phrase, language, is_active) VALUES (?, ?, ?, 1)",
+            ("BUY", "topla", "tr"),
+        )
+        assert matcher.match("topla").category == "BUY"
+        assert len(calls) == 1
+
+    def test_unchanged_tables_not_reloaded(self, matcher):
+        """Test refresh is a no-op when the version counter has not moved"""
+        assert matcher.refresh() is False
+
+    def test_many_phrases(self, temp_db, matcher):
+        """Test hundreds of custom phrases are indexed incrementally"""
+        for i in range(300):
+            temp_db.execute(
+                "INSERT INTO voice_commands (category, phrase, language) VALUES (?, ?, ?)",
+                ("OTHER", f"ozel komut {i}", "tr"),
+            )
+        match = matcher.match("lütfen ozel komut 250 çalıştır")
+        assert match.phrase == "ozel komut 250"
+        assert len(matcher) >= 300
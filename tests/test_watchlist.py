@@ -0,0 +1,128 @@
+"""
+Test suite for the batched multi-symbol watchlist
+"""
+import threading
+
+import numpy as np
+import pytest
+
+from core.market_data_hub import MarketDataHub
+from core.watchlist import Watchlist, WatchlistTable
+
+
+class FakeExchange:
+    """ccxt stand-in returning preset tickers"""
+
+    def __init__(self, prices, batched=True):
+        self.prices = dict(prices)
+        self.has = {'fetchTickers': batched}
+        self.calls = []
+
+    def _ticker(self, symbol):
+        return {'symbol': symbol, 'last': self.prices[symbol], 'bid': None, 'ask': None,
+                'percentage': 1.5, 'quoteVolume': 1e6}
+
+    def fetch_tickers(self, symbols):
+        self.calls.append(('fetch_tickers', tuple(symbols)))
+        return {s: self._ticker(s) for s in symbols}
+
+    def fetch_ticker(self, symbol):
+        self.calls.append(('fetch_ticker', symbol))
+        return self._ticker(symbol)
+
+
+SYMBOLS = ["BTC/USDT:USDT", "ETH/USDT:USDT", "SOL/USDT:USDT"]
+
+
+@pytest.fixture
+def exchange():
+    return FakeExchange({"BTC/USDT:USDT": 64000.0, "ETH/USDT:USDT": 3200.0, "SOL/USDT:USDT": 150.0})
+
+
+class TestWatchlistTable:
+    """Test NumPy snapshot table"""
+
+    def test_changed_mask_only_marks_new_values(self):
+        """Test unchanged and NaN→NaN cells are not marked"""
+        table = WatchlistTable(SYMBOLS)
+        first = table.apply({"BTC/USDT:USDT": {'last': 1.0, 'percentage': 2.0}})
+        assert first[0].tolist() == [True, False, False, True, False]
+
+        second = table.apply({"BTC/USDT:USDT": {'last': 1.5, 'percentage': 2.0}})
+        assert second[0].tolist() == [True, False, False, False, False]
+        assert not second[1:].any()
+
+    def test_symbol_spellings_share_a_row(self):
+        """Test tickers keyed by exchange id map onto unified symbols"""
+        table = WatchlistTable(SYMBOLS)
+        table.apply({"ETHUSDT": {'symbol': "ETHUSDT", 'last': 3200.0}})
+        assert table.get("ETH/USDT", "last") == 3200.0
+        assert table.get("SOL/USDT:USDT", "last") is None
+
+    def test_set_symbols_keeps_values(self):
+        """Test resizing keeps rows of remaining symbols"""
+        table = WatchlistTable(SYMBOLS)
+        table.apply({"SOL/USDT:USDT": {'last': 150.0}})
+        table.set_symbols(["SOL/USDT:USDT", "DOGE/USDT:USDT"])
+        assert table.values.shape == (2, len(WatchlistTable.COLUMNS))
+        assert table.get("SOL/USDT:USDT", "last") == 150.0
+        assert np.isnan(table.values[1]).all()
+
+
+class TestWatchlist:
+    """Test batched polling"""
+
+    def test_one_request_per_poll(self, exchange):
+        """Test all symbols are fetched with one batched call"""
+        watchlist = Watchlist(exchange, SYMBOLS)
+        changed = watchlist.poll_once()
+        assert exchange.calls == [('fetch_tickers', tuple(SYMBOLS))]
+        assert changed[:, 0].all()
+
+        exchange.prices["ETH/USDT:USDT"] = 3210.0
+        changed = watchlist.poll_once()
+        assert watchlist.requests == 2
+        assert np.argwhere(changed).tolist() == [[1, 0]]
+
+    def test_per_symbol_fallback(self, exchange):
+        """Test exchanges without fetchTickers are polled per symbol"""
+        exchange.has['fetchTickers'] = False
+        watchlist = Watchlist(exchange, SYMBOLS)
+        watchlist.poll_once()
+        assert watchlist.requests == 3
+        assert watchlist.table.get("SOL/USDT:USDT", "last") == 150.0
+
+    def test_on_change_and_hub_publish(self, exchange):
+        """Test changes reach the callback and unfed symbols reach the hub"""
+        hub = MarketDataHub(use_stream=False)
+        hub.publish("binance", "BTCUSDT", {"current_price": 64100.0}, source="stream")
+        hub._subscribers[hub.key("binance", "BTCUSDT")] = [object()]   # live feed present
+        seen = []
+        watchlist = Watchlist(exchange, SYMBOLS, hub=hub, exchange_name="binance",
+                              on_change=lambda table, changed: seen.append(int(changed.sum())))
+        watchlist.poll_once()
+        watchlist.poll_once()
+
+        assert seen == [9]
+        assert hub.get_price("binance", "ETHUSDT") == 3200.0
+        # Live feed's fresher price is not overwritten
+        assert hub.get_price("binance", "BTCUSDT") == 64100.0
+
+    def test_client_acquired_and_released_on_worker_thread(self, exchange):
+        """Test connect/disconnect run on the polling thread, not the caller's"""
+        threads = []
+
+        def connect():
+            threads.append(("connect", threading.current_thread().name))
+            return exchange
+
+        seen = threading.Event()
+        watchlist = Watchlist(None, SYMBOLS, interval=0.01, connect=connect,
+                              disconnect=lambda client: threads.append(("release", threading.current_thread().name)),
+                              on_change=lambda table, changed: seen.set())
+        watchlist.start()
+        assert seen.wait(2.0)
+        watchlist.stop(timeout=2.0)
+
+        assert threads == [("connect", "watchlist"), ("release", "watchlist")]
+        assert watchlist.exchange is None
@@ -0,0 +1,303 @@
+"""
+Test suite for WhisperEngine confidence metadata, rejection policy and idle unloading
+"""
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from core.whisper_engine import WhisperEngine, WhisperSettings
+
+
+def _segment(text, start=0.0, end=1.0, avg_logprob=-0.2, no_speech_prob=0.05, compression_ratio=1.2):
+    return SimpleNamespace(
+        text=text,
+        start=start,
+        end=end,
+        avg_logprob=avg_logprob,
+        no_speech_prob=no_speech_prob,
+        compression_ratio=compression_ratio,
+    )
+
+
+class FakeModel:
+    """faster-whisper WhisperModel yerine geçen sahte model"""
+
+    def __init__(self, segments, language="tr"):
+        self.segments = segments
+        self.language = language
+
+    def transcribe(self, audio, language=None, beam_size=5):
+        return iter(self.segments), SimpleNamespace(language=self.language)
+
+
+@pytest.fixture
+def make_engine():
+    """Create engine with injected fake model"""
+    tmpdir = tempfile.mkdtemp()
+
+    def _make(segments, **settings_kwargs):
+        engine = WhisperEngine(WhisperSettings(**settings_kwargs), models_dir=tmpdir)
+        engine._model = FakeModel(segments)
+        return engine
+
+    return _make
+
+
+AUDIO = np.zeros(16000, dtype=np.float32)
+
+
+class TestTranscriptionResult:
+    """Test structured transcription output"""
+
+    def test_segments_carry_timing_and_confidence(self, make_engine):
+        """Test per-segment metadata is preserved"""
+        engine = make_engine([
+            _segment(" Al BTC", 0.0, 1.0, avg_logprob=-0.1),
+            _segment(" 100 dolar", 1.0, 2.0, avg_logprob=-0.3),
+        ])
+        result = engine.transcribe_detailed(AUDIO, 16000)
+
+        assert result.text == "Al BTC 100 dolar"
+        assert result.rejected is False
+        assert result.language == "tr"
+        assert len(result.segments) == 2
+        assert result.segments[1].start == 1.0
+        assert result.segments[1].end == 2.0
+        assert 0.0 < result.confidence <= 1.0
+
+    def test_confidence_is_duration_weighted(self, make_engine):
+        """Test longer segments dominate overall confidence"""
+        engine = make_engine([
+            _segment("uzun", 0.0, 3.0, avg_logprob=0.0),
+            _segment("kısa", 3.0, 4.0, avg_logprob=-0.9),
+        ])
+        result = engine.transcribe_detailed(AUDIO, 16000)
+
+        assert result.confidence > result.segments[1].confidence
+        assert result.confidence == pytest.approx((3 * 1.0 + 1 * np.exp(-0.9)) / 4)
+
+    def test_transcribe_ndarray_returns_text(self, make_engine):
+        """Test legacy string API still works"""
+        engine = make_engine([_segment("durum göster")])
+        assert engine.transcribe_ndarray(AUDIO, 16000) == "durum göster"
+
+    def test_empty_audio(self, make_engine):
+        """Test empty audio is rejected without calling the model"""
+        engine = make_engine([])
+        result = engine.transcribe_detailed(np.zeros(0, dtype=np.float32), 16000)
+        assert result.rejected is True
+        assert result.text == ""
+
+
+class TestRejectionPolicy:
+    """Test hallucination and low-confidence rejection"""
+
+    def test_known_hallucination_rejected(self, make_engine):
+        """Test 'Altyazı M.K.' never reaches the parser"""
+        engine = make_engine([_segment("Altyazı M.K.", avg_logprob=-0.4)])
+        result = engine.transcribe_detailed(AUDIO, 16000)
+
+        assert result.rejected is True
+        assert result.reject_reason == "hallucination"
+        assert engine.transcribe_ndarray(AUDIO, 16000) == ""
+
+    def test_no_speech_segment_dropped(self, make_engine):
+        """Test silence segments are dropped but real speech kept"""
+        engine = make_engine([
+            _segment("bakiye", 0.0, 1.0),
+            _segment("...hmm", 1.0, 2.0, avg_logprob=-1.2, no_speech_prob=0.9),
+        ])
+        result = engine.transcribe_detailed(AUDIO, 16000)
+
+        assert result.text == "bakiye"
+        assert result.segments[1].rejected is True
+        assert result.segments[1].reject_reason == "no_speech"
+
+    def test_high_compression_ratio_rejected(self, make_engine):
+        """Test repetitive output is rejected"""
+        engine = make_engine([_segment("al al al al al al al al", compression_ratio=3.1)])
+        result = engine.transcribe_detailed(AUDIO, 16000)
+        assert result.rejected is True
+        assert result.reject_reason == "high_compression_ratio"
+
+    def test_min_confidence_threshold(self, make_engine):
+        """Test overall confidence threshold is configurable"""
+        segments = [_segment("sat eth", avg_logprob=-0.7)]
+
+        lenient = make_engine(segments, min_confidence=0.3).transcribe_detailed(AUDIO, 16000)
+        strict = make_engine(segments, min_confidence=0.8).transcribe_detailed(AUDIO, 16000)
+
+        assert lenient.rejected is False
+        assert strict.rejected is True
+        assert strict.reject_reason == "low_confidence"
+        assert strict.text == ""
+
+    def test_custom_hallucination_list(self, make_engine):
+        """Test hallucination phrases can be overridden"""
+        engine = make_engine([_segment("Altyazı M.K.")], hallucination_phrases=["foo bar"])
+        result = engine.transcribe_detailed(AUDIO, 16000)
+        assert result.rejected is False
+
+
+class TestParserConfidence:
+    """Test ASR confidence is kept apart from ParsedCommand.confidence"""
+
+    def test_asr_confidence_propagates(self):
+        """Test the ASR confidence is carried on the command without scaling the parse"""
+        from core.command_parser import CommandParser
+
+        parser = CommandParser()
+        cmd = parser.parse("al btc 100 dolar", asr_confidence=0.6)
+        assert cmd.asr_confidence == pytest.approx(0.6)
+        assert cmd.confidence == pytest.approx(1.0)
+
+        default = parser.parse("al btc 100 dolar")
+        assert default.asr_confidence == pytest.approx(1.0)
+
+    def test_accepted_transcript_is_not_rejected_by_validator(self):
+        """Test avg_logprob -0.6 with a default symbol passes validation but asks for confirmation"""
+        from core.command_parser import CommandParser, CommandValidator
+
+        cmd = CommandParser().parse("al 100 dolar", asr_confidence=float(np.exp(-0.6)))
+        ok, errors = CommandValidator.validate(cmd)
+        assert ok is True, errors
+        assert CommandValidator.needs_confirmation(cmd)
+
+        clear = CommandParser().parse("al btc 100 dolar", asr_confidence=float(np.exp(-0.1)))
+        assert not CommandValidator.needs_confirmation(clear)
+
+
+class ReloadableEngine(WhisperEngine):
+    """Model yüklemesini sahte modelle değiştiren engine"""
+
+    def _detect_device(self):
+        return "cpu", "int8"
+
+    def _create_model(self, device, compute_type):
+        self.created = getattr(self, "created", 0) + 1
+        return FakeModel([_segment("al btc")])
+
+
+class TestIdleUnload:
+    """Test idle model unloading and background reload"""
+
+    def _engine(self, **kwargs):
+        return ReloadableEngine(WhisperSettings(**kwargs), models_dir=tempfile.mkdtemp())
+
+    def test_unload_and_lazy_reload(self):
+        """Test unloaded model is reloaded on next transcribe"""
+        engine = self._engine()
+        assert engine.transcribe_ndarray(AUDIO, 16000) == "al btc"
+        assert engine.is_model_loaded is True
+
+        assert engine.unload_model() is True
+        assert engine.is_model_loaded is False
+
+        assert engine.transcribe_ndarray(AUDIO, 16000) == "al btc"
+        assert engine.created == 2
+
+    def test_unload_skipped_while_transcribing(self):
+        """Test model is not unloaded during an active call"""
+        engine = self._engine()
+        engine.preload_model()
+        engine._active_calls = 1
+        assert engine.unload_model() is False
+        assert engine.is_model_loaded is True
+
+    def test_prefetch_loads_in_background(self):
+        """Test prefetch_model starts a background load"""
+        engine = self._engine()
+        engine.prefetch_model()
+        engine._reload_thread.join(timeout=5)
+        assert engine.is_model_loaded is True
+        assert engine.get_device_info()["load_count"] == 1
+
+    def test_idle_monitor_unloads(self):
+        """Test idle monitor unloads after the configured idle time"""
+        import time
+
+        engine = self._engine(idle_unload_minutes=0.5 / 60)  # 0.5 saniye
+        engine.preload_model()
+        deadline = time.time() + 5
+        while engine.is_model_loaded and time.time() < deadline:
+            time.sleep(0.1)
+        engine.shutdown()
+
+        assert engine.is_model_loaded is False
+
+    def test_diagnostics_report_memory(self):
+        """Test diagnostics include idle and resident memory info"""
+        engine = self._engine(idle_unload_minutes=30)
+        info = engine.get_device_info()
+        assert info["model_loaded"] is False
+        assert info["idle_unload_minutes"] == 30
+        assert "resident_memory_mb" in info
+        assert "idle_seconds" in info
+
+
+class DetectingModel(FakeModel):
+    """Fake model following faster-whisper 1.0.3: detection happens inside transcribe(language=None),
+    reported through TranscriptionInfo, and segments are decoded lazily"""
+
+    def __init__(self, segments, probs):
+        super().__init__(segments)
+        self.probs = probs
+        self.decoded_with = []
+        self.consumed = []
+
+    def _segments(self, language):
+        self.consumed.append(language)
+        yield from self.segments
+
+    def transcribe(self, audio, language=None, beam_size=5):
+        self.decoded_with.append(language)
+        if language is None:
+            best = max(self.probs, key=lambda x: x[1])
+            info = SimpleNamespace(language=best[0], language_probability=best[1], all_language_probs=self.probs)
+        else:
+            info = SimpleNamespace(language=language, language_probability=1.0, all_language_probs=None)
+        return self._segments(language), info
+
+
+class TestLanguageSelection:
+    """Test fixed vs auto-detected decode language"""
+
+    def _engine(self, probs, **kwargs):
+        engine = WhisperEngine(WhisperSettings(**kwargs), models_dir=tempfile.mkdtemp())
+        engine._model = DetectingModel([_segment("buy btc")], probs)
+        return engine
+
+    def test_fixed_language_skips_detection(self):
+        """Test a configured language is used as is"""
+        engine = self._engine([("en", 0.9)], language="tr")
+        result = engine.transcribe_detailed(AUDIO, 16000)
+        assert result.language == "tr"
+        assert result.detected_language is None      # forced, so the parser uses the mixed grammar
+        assert engine._model.decoded_with == ["tr"]
+
+    def test_detected_allowed_language_decoded_once(self):
+        """Test an allowed detected language is read from TranscriptionInfo with a single decode"""
+        engine = self._engine([("en", 0.8), ("tr", 0.2)], language=None, languages=["tr", "en"])
+        result = engine.transcribe_detailed(AUDIO, 16000)
+        assert result.detected_language == "en"
+        assert result.language_probability == 0.8
+        assert engine._model.decoded_with == [None]
+
+    def test_detection_restricted_to_allowed(self):
+        """Test a disallowed detection is re-decoded in the most likely allowed language"""
+        engine = self._engine([("de", 0.6), ("en", 0.3), ("tr", 0.1)], language=None, languages=["tr", "en"])
+        result = engine.transcribe_detailed(AUDIO, 16000)
+        assert result.language == "en"
+        assert result.detected_language == "en"
+        assert result.language_probability == 0.3
+        assert engine._model.decoded_with == [None, "en"]
+        assert engine._model.consumed == ["en"]      # the German pass was never decoded
+
+    def test_free_detection(self):
+        """Test no allowed set leaves detection to Whisper"""
+        engine = self._engine([("de", 0.6)], language=None)
+        result = engine.transcribe_detailed(AUDIO, 16000)
+        assert engine._model.decoded_with == [None]
+        assert result.detected_language == "de"
@@ -0,0 +1,173 @@
+"""
+Local WebSocket stand-in server that replays recorded exchange messages.
+
+Minimal RFC 6455 implementation (handshake, text/close frames) so stream
+tests need neither network access nor an extra server dependency.
+"""
+import base64
+import hashlib
+import socket
+import struct
+import threading
+from pathlib import Path
+from typing import List
+
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def load_recording(name: str) -> List[str]:
+    """Recorded messages from tests/data/<name>, one JSON message per line"""
+    path = Path(__file__).parent / "data" / name
+    return [line for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+class ReplayServer:
+    """
+    Accepts connections on 127.0.0.1, reads the client's subscribe frames,
+    then replays the recording.
+
+    close_after_replay: Drop the connection after replaying (tests reconnect)
+    """
+
+    def __init__(self, messages: List[str], subscribe_frames: int = 1, close_after_replay: bool = False):
+        self.messages = messages
+        self.subscribe_frames = subscribe_frames
+        self.close_after_replay = close_after_replay
+        self.subscriptions: List[str] = []
+        self.connections = 0
+        self._clients: List[tuple] = []          # (conn, subscribe frames, send lock)
+        self._clients_lock = threading.Lock()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(5)
+        self._sock.settimeout(0.2)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self._sock.getsockname()[1]}/stream"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(2)
+        self._sock.close()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: socket.socket):
+        conn.settimeout(5)
+        try:
+            self._handshake(conn)
+            frames = [self._recv_text(conn) for _ in range(self.subscribe_frames)]
+            self.subscriptions.extend(frames)
+            send_lock = threading.Lock()
+            with send_lock:
+                for message in self.messages:
+                    self._send(conn, 0x1, message.encode("utf-8"))
+            if self.close_after_replay:
+                self._send(conn, 0x8, b"")
+                return
+            client = (conn, frames, send_lock)
+            with self._clients_lock:
+                self._clients.append(client)
+            # Keep the connection open until the client closes it
+            while not self._stop.is_set():
+                try:
+                    if self._recv_frame(conn)[0] == 0x8:
+                        return
+                except socket.timeout:
+                    continue
+        except (OSError, ConnectionError):
+            pass
+        finally:
+            with self._clients_lock:
+                self._clients = [c for c in self._clients if c[0] is not conn]
+            conn.close()
+
+    def broadcast(self, message: str, match: str = "") -> int:
+        """Push a live message to connected clients whose subscribe frames contain `match`"""
+        with self._clients_lock:
+            clients = [c for c in self._clients if any(match in frame for frame in c[1])]
+        sent = 0
+        for conn, _, send_lock in clients:
+            try:
+                with send_lock:
+                    self._send(conn, 0x1, message.encode("utf-8"))
+                sent += 1
+            except OSError:
+                pass
+        return sent
+
+    @staticmethod
+    def _handshake(conn: socket.socket):
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = conn.recv(4096)
+            if not chunk:
+                raise ConnectionError("handshake aborted")
+            request += chunk
+        headers = dict(
+            line.split(": ", 1) for line in request.decode("latin-1").split("\r\n")[1:] if ": " in line
+        )
+        key = {k.lower(): v for k, v in headers.items()}["sec-websocket-key"].strip()
+        accept = base64.b64encode(hashlib.sha1((key + _GUID).encode()).digest()).decode()
+        conn.sendall((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode())
+
+    @staticmethod
+    def _recv_exact(conn: socket.socket, n: int) -> bytes:
+        data = b""
+        while len(data) < n:
+            chunk = conn.recv(n - len(data))
+            if not chunk:
+                raise ConnectionError("connection closed")
+            data += chunk
+        return data
+
+    def _recv_frame(self, conn: socket.socket):
+        b1, b2 = self._recv_exact(conn, 2)
+        length = b2 & 0x7F
+        if length == 126:
+            length = struct.unpack(">H", self._recv_exact(conn, 2))[0]
+        elif length == 127:
+            length = struct.unpack(">Q", self._recv_exact(conn, 8))[0]
+        mask = self._recv_exact(conn, 4) if b2 & 0x80 else b"\0\0\0\0"
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(self._recv_exact(conn, length)))
+        return b1 & 0x0F, payload
+
+    def _recv_text(self, conn: socket.socket) -> str:
+        while True:
+            opcode, payload = self._recv_frame(conn)
+            if opcode == 0x1:
+                return payload.decode("utf-8")
+            if opcode == 0x8:
+                raise ConnectionError("client closed")
+
+    @staticmethod
+    def _send(conn: socket.socket, opcode: int, payload: bytes):
+        header = bytes([0x80 | opcode])
+        if len(payload) < 126:
+            header += bytes([len(payload)])
+        elif len(payload) < 1 << 16:
+            header += bytes([126]) + struct.pack(">H", len(payload))
+        else:
+            header += bytes([127]) + struct.pack(">Q", len(payload))
+        conn.sendall(header + payload)
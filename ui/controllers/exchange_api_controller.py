@@ -2,6 +2,9 @@
 from PyQt5.QtWidgets import QDialog, QMessageBox
 from PyQt5.QtCore import QThread, pyqtSignal
 from database.db_manager import get_db
+from core.exchange_manager import futures_symbols as usdt_futures_symbols
+from core.exchange_registry import get_exchange_registry
+from core.market_cache import load_markets
 from utils.validators import validate_api_key, validate_secret_key
 from utils.logger import get_logger
 
@@ -22,53 +25,18 @@ class ConnectionTestThread(QThread):
     def run(self):
         """Test connection in background thread"""
         try:
-            import ccxt
-            
-            # Exchange configuration
-            exchange_class = getattr(ccxt, self.exchange_name)
-            
-            config = {
-                'apiKey': self.api_key,
-                'secret': self.secret_key,
-                'enableRateLimit': True,
-                'timeout': 30000,
-            }
-            
-            # Add passphrase for KuCoin
-            if self.passphrase:
-                config['password'] = self.passphrase
-            
-            # Binance için testnet desteği
-            if self.exchange_name == 'binance':
-                config['options'] = {'defaultType': 'future'}
-            
-            # Create exchange instance
-            exchange = exchange_class(config)
-            
-            # Enable testnet/sandbox mode
-            try:
-                exchange.set_sandbox_mode(True)
-                logger.info(f"{self.exchange_name} testnet mode enabled")
-            except:
-                pass
-            
-            # Test by fetching balance
-            balance = exchange.fetch_balance()
-            
-            # Fetch futures markets
-            markets = exchange.load_markets()
-            futures_symbols = []
-            
-            for symbol, market in markets.items():
-                # Only futures/swap markets
-                if market.get('type') in ['future', 'swap'] or market.get('future') or market.get('swap'):
-                    # Only USDT pairs
-                    if 'USDT' in symbol:
-                        clean_symbol = symbol.replace(':USDT', '')
-                        futures_symbols.append(clean_symbol)
+            # Shared client: a re-test or the following connect reuses session and markets
+            with get_exchange_registry().client(
+                self.exchange_name, self.api_key, self.secret_key, self.passphrase
+            ) as exchange:
+                # Test by fetching balance
+                balance = exchange.fetch_balance()
+                
+                # Fetch futures markets (shared market cache; downloads only when stale)
+                markets = load_markets(exchange)
             
-            # Sort symbols
-            futures_symbols = sorted(list(set(futures_symbols)))
+            # USDT futures/swap symbols, sorted
+            futures_symbols = usdt_futures_symbols(markets)
             
             # Success
             total_balance = balance.get('total', {})
@@ -283,9 +251,6 @@ class ExchangeApiController(QDialog):
     def _get_balance_info(self):
         """Get balance info from last test"""
         try:
-            import ccxt
-            exchange_class = getattr(ccxt, self.exchange_name)
-            
             api_key = self.ui.lineEditAPIKey.text().strip()
             secret_key = self.ui.lineEditSecretKey.text().strip()
             passphrase = None
@@ -293,26 +258,9 @@ class ExchangeApiController(QDialog):
             if hasattr(self.ui, 'lineEditPassphrase'):
                 passphrase = self.ui.lineEditPassphrase.text().strip() or None
             
-            config = {
-                'apiKey': api_key,
-                'secret': secret_key,
-                'enableRateLimit': True,
-            }
-            
-            if passphrase:
-                config['password'] = passphrase
-            
-            if self.exchange_name == 'binance':
-                config['options'] = {'defaultType': 'future'}
-            
-            exchange = exchange_class(config)
-            
-            try:
-                exchange.set_sandbox_mode(True)
-            except:
-                pass
-            
-            balance = exchange.fetch_balance()
+            # Same keys as the connection test → same shared client
+            with get_exchange_registry().client(self.exchange_name, api_key, secret_key, passphrase) as exchange:
+                balance = exchange.fetch_balance()
             return balance.get('total', {})
         except:
             return {}
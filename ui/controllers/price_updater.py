@@ -1,17 +1,19 @@
 """Price Updater - Real-time price updates for selected symbol"""
 from PyQt5.QtCore import QThread, pyqtSignal
-import time
+import threading
+from core.exchange_registry import get_exchange_registry
+from core.market_data_hub import get_market_data_hub
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
 class PriceUpdateThread(QThread):
-    """Thread for real-time price updates"""
+    """Thread for real-time price updates (subscriber of the shared market data hub)"""
     price_updated = pyqtSignal(dict)  # {best_bid, best_ask, current_price}
     error_occurred = pyqtSignal(str)
     
-    def __init__(self, exchange_name, symbol, api_key, secret_key, passphrase=None):
+    def __init__(self, exchange_name, symbol, api_key, secret_key, passphrase=None, hub=None, registry=None):
         super().__init__()
         self.exchange_name = exchange_name
         self.symbol = symbol
@@ -20,81 +22,46 @@ class PriceUpdateThread(QThread):
         self.passphrase = passphrase
         self.running = True
         self.exchange = None
+        self.hub = hub or get_market_data_hub()
+        self.registry = registry if registry is not None else get_exchange_registry()
+        self.subscription = None
+        self._stopped = threading.Event()
     
     def run(self):
         """Fetch prices continuously"""
         try:
-            import ccxt
-            
-            # Setup exchange
-            exchange_class = getattr(ccxt, self.exchange_name)
-            
-            config = {
-                'apiKey': self.api_key,
-                'secret': self.secret_key,
-                'enableRateLimit': True,
-            }
-            
-            if self.passphrase:
-                config['password'] = self.passphrase
-            
-            if self.exchange_name == 'binance':
-                config['options'] = {'defaultType': 'future'}
-            
-            self.exchange = exchange_class(config)
-            
-            try:
-                self.exchange.set_sandbox_mode(True)
-            except:
-                pass
+            # Shared client (no new session / market load per symbol switch)
+            self.exchange = self.registry.acquire(
+                self.exchange_name, self.api_key, self.secret_key, self.passphrase
+            )
             
             # Format symbol for CCXT (add :USDT back)
             ccxt_symbol = self.symbol if ':' in self.symbol else f"{self.symbol}:USDT"
             
             logger.info(f"Starting price updates for {ccxt_symbol}")
             
+            # Tek upstream (WebSocket / REST yedeği) hub'da; bu thread sadece abone
+            self.subscription = self.hub.subscribe(
+                self.exchange_name,
+                ccxt_symbol,
+                self.price_updated.emit,
+                on_error=self.error_occurred.emit,
+                rest_exchange=self.exchange,
+            )
             while self.running:
-                try:
-                    # Fetch ticker for current price
-                    ticker = self.exchange.fetch_ticker(ccxt_symbol)
-                    
-                    # Fetch order book for bid/ask (Binance minimum 5)
-                    orderbook = self.exchange.fetch_order_book(ccxt_symbol, limit=5)
-                    
-                    # Extract prices
-                    best_bid = orderbook['bids'][0][0] if orderbook['bids'] else None
-                    best_ask = orderbook['asks'][0][0] if orderbook['asks'] else None
-                    current_price = ticker.get('last')
-                    
-                    # LOG WITH INFO
-                    logger.info(f"[{ccxt_symbol}] Price: {current_price}, Bid: {best_bid}, Ask: {best_ask}")
-                    
-                    price_data = {
-                        'best_bid': best_bid,
-                        'best_ask': best_ask,
-                        'current_price': current_price,
-                        'volume': ticker.get('quoteVolume', 0.0),
-                        'change_24h': ticker.get('percentage', 0.0),
-                        'high_24h': ticker.get('high', 0.0),   # YENİ
-                        'low_24h': ticker.get('low', 0.0),     # YENİ
-                    }
-
-                    
-                    self.price_updated.emit(price_data)
-                    
-                    # Wait 1 second before next update
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Price fetch error: {e}")
-                    self.error_occurred.emit(str(e))
-                    time.sleep(5)
+                self._stopped.wait(1.0)
             
         except Exception as e:
             logger.error(f"Price updater failed: {e}")
             self.error_occurred.emit(str(e))
+        finally:
+            self.hub.unsubscribe(self.subscription)
+            self.subscription = None
+            self.registry.release(self.exchange)
+            self.exchange = None
     
     def stop(self):
         """Stop the price update thread"""
         self.running = False
+        self._stopped.set()
         logger.info("Price updater stopped")
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""Watchlist Panel - multi-symbol price table backed by one batched fetch_tickers call"""
+from PyQt5.QtWidgets import QDockWidget, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QColor
+import numpy as np
+
+from core.exchange_registry import get_exchange_registry
+from core.market_data_hub import get_market_data_hub
+from core.watchlist import Watchlist, WatchlistTable
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def create_public_exchange(exchange_name):
+    """Ticker okumak için anahtarsız paylaşılan ccxt örneği (watchlist thread'i alır ve bırakır)"""
+    return get_exchange_registry().acquire(exchange_name)
+
+
+class WatchlistPanel(QDockWidget):
+    """Dock widget showing the watchlist; only changed cells are redrawn"""
+    table_changed = pyqtSignal(object, object)  # values (copy), changed mask
+
+    HEADERS = ["Symbol", "Last", "Bid", "Ask", "24h %", "Volume"]
+
+    def __init__(self, parent=None):
+        super().__init__("Watchlist", parent)
+        self.setObjectName("dockWatchlist")
+        self.watchlist = None
+
+        self.table = QTableWidget(0, len(self.HEADERS), self)
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.setWidget(self.table)
+
+        # Poll thread → GUI thread (queued)
+        self.table_changed.connect(self._redraw_cells)
+
+    def start(self, exchange_name, symbols, interval=2.0):
+        """Start polling; replaces any running watchlist. The public client is
+        acquired on the watchlist thread so market loading never blocks the GUI."""
+        self.stop()
+        self.watchlist = Watchlist(
+            None,
+            symbols,
+            interval=interval,
+            on_change=self._on_change,
+            hub=get_market_data_hub(),
+            exchange_name=exchange_name,
+            connect=lambda: create_public_exchange(exchange_name),
+            disconnect=get_exchange_registry().release,
+        )
+        self._reset_rows(self.watchlist.symbols)
+        self.watchlist.start()
+
+    def stop(self):
+        if self.watchlist is not None:
+            self.watchlist.stop(timeout=3.0)
+            self.watchlist = None
+
+    def _reset_rows(self, symbols):
+        self.table.setRowCount(len(symbols))
+        for row, symbol in enumerate(symbols):
+            self.table.setItem(row, 0, QTableWidgetItem(symbol.split(':')[0]))
+            for col in range(1, len(self.HEADERS)):
+                item = QTableWidgetItem("-")
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+
+    def _on_change(self, table: WatchlistTable, changed: np.ndarray):
+        # Poll thread'inde çağrılır; tablo bir sonraki turda değişeceği için kopya gönder
+        self.table_changed.emit(table.values.copy(), changed)
+
+    def _redraw_cells(self, values, changed):
+        """Sadece değişen hücreleri güncelle"""
+        if values.shape[0] != self.table.rowCount():
+            return
+        change_col = WatchlistTable.COLUMNS.index("change_24h")
+        volume_col = WatchlistTable.COLUMNS.index("quote_volume")
+
+        for row, col in np.argwhere(changed):
+            item = self.table.item(row, col + 1)
+            if item is None:
+                continue
+            value = values[row, col]
+            if np.isnan(value):
+                item.setText("-")
+            elif col == change_col:
+                item.setText(f"{value:+.2f}%")
+                item.setForeground(QColor("#4CAF50" if value > 0 else "#f44336" if value < 0 else "#FFC107"))
+            elif col == volume_col:
+                item.setText(f"{value:,.0f}")
+            else:
+                item.setText(f"{value:,.6f}" if value < 1 else f"{value:,.4f}" if value < 100 else f"{value:,.2f}")
@@ -37,7 +37,13 @@ class ConfigManager:
                 "use_gpu": True,
                 "wake_word": "Whisper",
                 "active_mode_duration": 15,
-                "min_confidence": 0.7
+                "min_confidence": 0.7,
+                "max_no_speech_prob": 0.6,
+                "min_avg_logprob": -1.0,
+                "min_transcript_confidence": 0.3,
+                "idle_unload_minutes": 30,
+                "language": "tr",
+                "languages": ["tr", "en"]
             },
             "tts": {
                 "enabled": True,
@@ -51,6 +57,15 @@ class ConfigManager:
                 "default_leverage": 10,
                 "position_mode": "one-way",
                 "default_order_type": "market",
+                "voice_context_timeout": 60.0,
+                "voice_dedupe_window": 3.0,
+                "max_price_age": 5.0,
+                "balance_max_age": 10.0,
+                "balance_refresh_interval": 30.0,
+                "smart_routing": False,
+                "routing_deadline_ms": 150.0,
+                "routing_allow_split": True,
+                "routing_fees": {},
                 "max_positions": 5,
                 "max_position_size_percent": 20.0,
                 "daily_loss_limit": 500.0
@@ -64,13 +79,27 @@ class ConfigManager:
             },
             "exchange": {
                 "default": "binance",
-                "environment": "testnet"
+                "environment": "testnet",
+                "market_cache_ttl": 3600,
+                "rate_limit_burst_seconds": 5.0,
+                "rate_limit_max_wait": {"account": 5.0, "market": 1.0},
+                "latency_probe_interval": 15.0,
+                "min_timeout_ms": 2000.0,
+                "max_timeout_ms": 30000.0,
+                "timeout_multiplier": 4.0,
+                "max_retries": 1
             },
             "ui": {
                 "show_charts": True,
                 "auto_scroll_logs": True,
                 "confirmation_dialogs": True,
-                "sound_alerts": True
+                "sound_alerts": True,
+                "watchlist_symbols": [
+                    "BTC/USDT:USDT", "ETH/USDT:USDT", "SOL/USDT:USDT", "BNB/USDT:USDT",
+                    "XRP/USDT:USDT", "DOGE/USDT:USDT", "ADA/USDT:USDT", "AVAX/USDT:USDT",
+                    "LINK/USDT:USDT", "LTC/USDT:USDT"
+                ],
+                "watchlist_interval": 2.0
             }
         }
     